@@ -0,0 +1,84 @@
+"""
+Véhicules disponibles les plus proches d'un point : 5 000 agences réparties sur la
+France et 100 000 véhicules. Compare le parcours des agences par l'arbre k-d
+(VehiculesProches) au filtrage de toute la flotte suivi d'un tri par distance.
+
+    python -m <package>.benchmarks.bench_agences
+"""
+import random
+import statistics
+import time
+
+from ..lib.application.use_cases.vehiculesProches import VehiculesProches
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.InMemoryAgenceRepository import InMemoryAgenceRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+AGENCES = 5_000
+VEHICULES = 100_000
+REPETITIONS = 200
+MODELES = [("Renault", "Clio", "Citadine"), ("Peugeot", "3008", "SUV"), ("Toyota", "Corolla", "Berline"),
+           ("Tesla", "Model 3", "Berline"), ("Citroën", "Berlingo", "Utilitaire")]
+REQUETES = [{}, {'modele': "clio"}, {'type_vehicule': "Berline", 'prix_max': 60.0}, {'marque': "tesla"}]
+
+
+def peupler(agences, vehicules):
+    hasard = random.Random(11)
+    for i in range(AGENCES):
+        agences.create_agence(f"Agence {i}", hasard.uniform(42.5, 51.0), hasard.uniform(-4.5, 8.0))
+    flotte = []
+    for i in range(VEHICULES):
+        marque, modele, type_vehicule = hasard.choice(MODELES)
+        flotte.append(Vehicule(marque, modele, 2022, Immatriculation(f"AB-{i:06d}", "75"), 0,
+                               float(hasard.randint(30, 120)), "Nickel", type_vehicule, hasard.random() < 0.6,
+                               agence_id=hasard.randint(1, AGENCES)))
+    vehicules.save_all(flotte)
+
+
+def parcours(agences, vehicules, latitude, longitude, k, **criteres):
+    """Sans index : tous les véhicules filtrés, triés par distance de leur agence."""
+    candidats = [(agences.get_by_id(v.agence_id).distance_km(latitude, longitude), v)
+                 for v in vehicules.iter_by_criteria(disponible=True, **criteres)]
+    candidats.sort(key=lambda element: element[0])
+    return candidats[:k]
+
+
+def latences(fonction, repetitions=REPETITIONS):
+    mesures = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        mesures.append(time.perf_counter() - debut)
+    mesures.sort()
+    return statistics.median(mesures), mesures[int(len(mesures) * 0.99) - 1]
+
+
+def main():
+    agences = InMemoryAgenceRepository()
+    agences._initialize()
+    vehicules = InMemoryVehiculeRepository()
+    vehicules._initialize()
+    peupler(agences, vehicules)
+    debut = time.perf_counter()
+    agences.spatial_index()
+    print(f"{AGENCES} agences, {VEHICULES} véhicules ; arbre k-d construit en "
+          f"{(time.perf_counter() - debut) * 1000:.0f} ms")
+
+    proches = VehiculesProches(agences, vehicules)
+    hasard = random.Random(2)
+    points = [(hasard.uniform(43.0, 50.5), hasard.uniform(-4.0, 7.5)) for _ in range(REPETITIONS)]
+    print(f"{'critères (k = 10)':52} {'parcours':>10} {'arbre k-d p50/p99':>20}")
+    for criteres in REQUETES:
+        for latitude, longitude in points[:5]:
+            attendu = [round(d, 6) for d, _ in parcours(agences, vehicules, latitude, longitude, 10, **criteres)]
+            obtenu = [round(p.distance_km, 6) for p in proches.plus_proches(latitude, longitude, 10, **criteres)]
+            assert obtenu == attendu
+        avant = latences(lambda: parcours(agences, vehicules, *points[0], 10, **criteres), repetitions=3)[0]
+        requetes = iter(points * 2)
+        p50, p99 = latences(lambda: proches.plus_proches(*next(requetes), 10, **criteres))
+        print(f"  {str(criteres):50} {avant * 1000:7.0f} ms {p50 * 1000:9.3f}/{p99 * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
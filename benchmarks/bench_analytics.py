@@ -0,0 +1,95 @@
+"""
+Analyses sur les contrats : boucle Python sur get_all() contre instantané en colonnes NumPy.
+
+    python -m <package>.benchmarks.bench_analytics
+"""
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+
+from ..lib.domain.client import Client
+from ..lib.domain.contratLocation import ContratLocation
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.ContratColumns import ContratColumns
+
+TYPES = ("Citadine", "Berline", "SUV", "Utilitaire")
+FLOTTE = {t: 2500 for t in TYPES}
+NB_CONTRATS_OBJETS = 200_000
+NB_CONTRATS_COLONNES = 10_000_000
+DEBUT, FIN = date(2024, 6, 1), date(2024, 7, 1)
+
+
+def contrats(n: int):
+    client = Client("Client", "Bench", "P0", "0600000000", "bench@mail", None)
+    vehicules = [Vehicule("Renault", "Clio", 2020, f"AB-{i:04d}", 1000, 40.0 + i % 30, "Nickel", TYPES[i % 4])
+                 for i in range(1000)]
+    origine = date(2022, 1, 1)
+    for i in range(n):
+        vehicule = vehicules[i * 7 % 1000]
+        duree = 1 + i * 13 % 21
+        yield ContratLocation(origine + timedelta(days=i * 31 % 1095), duree, 100.0,
+                              vehicule.prix_journalier * duree, 100.0, client, vehicule, None)
+
+
+def boucle_python(liste):
+    revenus, jours, nombres, durees = defaultdict(float), defaultdict(int), defaultdict(int), defaultdict(int)
+    for contrat in liste:
+        revenus[contrat.dateDebut.strftime("%Y-%m")] += contrat.cout
+        fin = contrat.dateDebut + timedelta(days=contrat.duree)
+        recouvrement = (min(fin, FIN) - max(contrat.dateDebut, DEBUT)).days
+        type_vehicule = contrat.vehicule.typeVehicule
+        jours[type_vehicule] += max(recouvrement, 0)
+        nombres[type_vehicule] += 1
+        durees[type_vehicule] += contrat.duree
+    return sorted(revenus.items()), jours, {t: durees[t] / nombres[t] for t in nombres}
+
+
+def requetes(colonnes: ContratColumns):
+    return (colonnes.revenue_by_month(), colonnes.utilization_by_type(DEBUT, FIN, FLOTTE),
+            colonnes.mean_duration_by_type(), colonnes.duration_histogram((1, 2, 4, 8, 15)))
+
+
+def chrono(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return resultat, time.perf_counter() - debut
+
+
+def colonnes_synthetiques(n: int) -> ContratColumns:
+    rng = np.random.default_rng(42)
+    duree = rng.integers(1, 22, n, dtype=np.int32)
+    return ContratColumns(
+        debut=rng.integers(date(2015, 1, 1).toordinal(), date(2025, 1, 1).toordinal(), n, dtype=np.int32),
+        duree=duree,
+        cout=duree * rng.uniform(30.0, 120.0, n),
+        caution=np.full(n, 100.0),
+        type_code=rng.integers(0, len(TYPES), n, dtype=np.int16),
+        types=TYPES,
+    )
+
+
+def main() -> None:
+    liste = list(contrats(NB_CONTRATS_OBJETS))
+    print(f"{NB_CONTRATS_OBJETS} contrats en objets")
+    _, duree_python = chrono(boucle_python, liste)
+    colonnes, duree_instantane = chrono(ContratColumns.from_contrats, liste)
+    _, duree_requetes = chrono(requetes, colonnes)
+    print(f"  boucle Python sur get_all()   {duree_python * 1000:8.1f} ms")
+    print(f"  construction de l'instantané  {duree_instantane * 1000:8.1f} ms (une fois par TTL)")
+    print(f"  requêtes vectorisées          {duree_requetes * 1000:8.1f} ms  (x{duree_python / duree_requetes:.0f})")
+
+    colonnes, duree_generation = chrono(colonnes_synthetiques, NB_CONTRATS_COLONNES)
+    octets = sum(getattr(colonnes, c).nbytes for c in ("debut", "duree", "cout", "caution", "type_code"))
+    print(f"{NB_CONTRATS_COLONNES} contrats synthétiques en colonnes ({octets / 2**20:.0f} Mo)")
+    for nom, requete in (("revenus par mois", lambda: colonnes.revenue_by_month()),
+                         ("utilisation par type", lambda: colonnes.utilization_by_type(DEBUT, FIN, FLOTTE)),
+                         ("durée moyenne par type", lambda: colonnes.mean_duration_by_type()),
+                         ("histogramme des durées", lambda: colonnes.duration_histogram((1, 2, 4, 8, 15)))):
+        _, duree = chrono(requete)
+        print(f"  {nom:<24} {duree * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Règlement des cautions : contrat par contrat contre clôture journalière en un lot.
+
+    python -m <package>.benchmarks.bench_caution
+"""
+import os
+import tempfile
+import time
+from datetime import date, datetime
+
+from ..lib.application.use_cases.utilisationCaution import UtilisationCaution
+from ..lib.domain.caution import SoldeCaution
+from ..lib.domain.client import Client
+from ..lib.domain.contratLocation import ContratLocation
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.InMemoryCautionRepository import InMemoryCautionRepository
+
+NB_CONTRATS = 20_000
+ETATS = ("Nickel", "Nickel", "Sale", "Nickel", "Endommagé", "Nickel", "Nickel", "Volé")
+
+
+def contrats():
+    clients = []
+    for i in range(NB_CONTRATS // 4):
+        client = Client("Client", f"N{i}", f"P{i}", "0600000000", "c@mail", None)
+        client.id = i
+        clients.append(client)
+    vehicule = Vehicule("Renault", "Clio", 2020, "AB-0001", 1000, 40.0, "Nickel", "Citadine")
+    resultat = []
+    for i in range(NB_CONTRATS):
+        contrat = ContratLocation(date(2025, 1, 1), 3, 500.0, 120.0, 100.0, clients[i % len(clients)], vehicule, None)
+        contrat.id = i
+        resultat.append(contrat)
+    return resultat
+
+
+def preparer(journal):
+    registre = InMemoryCautionRepository()
+    registre._initialize()
+    registre.attach_journal(journal)
+    caution = UtilisationCaution(registre, horloge=lambda: datetime(2025, 3, 31, 18))
+    return registre, caution
+
+
+def main() -> None:
+    liste = contrats()
+    restitutions = [(contrat, ETATS[i % len(ETATS)]) for i, contrat in enumerate(liste)]
+    with tempfile.TemporaryDirectory() as dossier:
+        registre, caution = preparer(os.path.join(dossier, "unitaire.jsonl"))
+        for contrat in liste:
+            caution.bloquer(contrat)
+        debut = time.perf_counter()
+        for contrat, etat in restitutions:
+            caution.regler(contrat, etat)
+        unitaire = time.perf_counter() - debut
+
+        registre, caution = preparer(os.path.join(dossier, "lot.jsonl"))
+        for contrat in liste:
+            caution.bloquer(contrat)
+        debut = time.perf_counter()
+        rapport = caution.cloture_journaliere(restitutions)
+        lot = time.perf_counter() - debut
+        assert rapport.contrats == NB_CONTRATS and registre.outstanding_total() == 0
+
+        debut = time.perf_counter()
+        for i in range(NB_CONTRATS // 4):
+            registre.balance_by_client(i)
+        o1 = time.perf_counter() - debut
+        debut = time.perf_counter()
+        for i in range(200):
+            solde = SoldeCaution()
+            for mouvement in registre.iter_all():
+                if mouvement.client_id == i:
+                    solde.appliquer(mouvement)
+        parcours = (time.perf_counter() - debut) / 200 * (NB_CONTRATS // 4)
+
+    print(f"{NB_CONTRATS} cautions réglées en fin de journée (journal sur disque)")
+    print(f"  contrat par contrat      {unitaire * 1000:8.0f} ms")
+    print(f"  clôture en un lot        {lot * 1000:8.0f} ms  (x{unitaire / lot:.1f})")
+    print(f"{NB_CONTRATS // 4} soldes clients")
+    print(f"  parcours du registre     {parcours * 1000:8.0f} ms (extrapolé depuis 200 clients)")
+    print(f"  soldes tenus à jour      {o1 * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
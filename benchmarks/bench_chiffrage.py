@@ -0,0 +1,49 @@
+"""
+Chiffrage de devis en masse : dans le processus appelant contre pool de processus.
+
+    python -m <package>.benchmarks.bench_chiffrage
+"""
+import os
+
+from ..lib.application.use_cases.chiffrageDevis import ChiffrageDevis
+from ..lib.domain.tarifAtelier import PIECES
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.InMemoryDevisRepository import InMemoryDevisRepository
+from ..lib.infrastructure.ProcessPoolJobRunner import ProcessPoolJobRunner
+
+NB_DEVIS = 100_000
+REFERENCES = sorted(PIECES)
+
+
+def demandes():
+    for i in range(NB_DEVIS):
+        vehicule = Vehicule("Renault", "Clio", 2005 + i % 20, f"BC-{i:06d}", (i * 7919) % 300_000,
+                            35.0 + i % 40, "Sale", ("Citadine", "Berline", "SUV", "Utilitaire")[i % 4])
+        operations = [(REFERENCES[(i + k) % len(REFERENCES)], 1 + k % 2) for k in range(1 + i % 5)]
+        yield vehicule, operations
+
+
+def mesurer(workers: int) -> float:
+    repository = InMemoryDevisRepository()
+    repository._initialize()
+    runner = ProcessPoolJobRunner(max_workers=workers)
+    try:
+        # Démarrage des processus hors mesure, comme pour un serveur déjà chaud
+        runner.warm()
+        return ChiffrageDevis(repository, runner, taille_lot=2048).chiffrer_devis(demandes()).devis_par_seconde
+    finally:
+        runner.shutdown()
+
+
+def main() -> None:
+    coeurs = os.cpu_count() or 1
+    print(f"{NB_DEVIS} devis, {coeurs} cœur(s) disponible(s)")
+    reference = mesurer(0)
+    print(f"  processus appelant : {reference:10.0f} devis/s")
+    for workers in sorted({1, 2, coeurs}):
+        debit = mesurer(workers)
+        print(f"  pool de {workers:2d}         : {debit:10.0f} devis/s  (x{debit / reference:.2f})")
+
+
+if __name__ == '__main__':
+    main()
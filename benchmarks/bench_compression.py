@@ -0,0 +1,73 @@
+"""
+Bande passante et CPU de GET /vehicules (catalogue complet) selon l'encodage négocié :
+sans compression, compression à chaque requête, variantes compressées gardées par ETag,
+et revalidation If-None-Match (304). Brotli n'est mesuré que si le paquet est installé.
+
+    python -m <package>.benchmarks.bench_compression
+"""
+import random
+import time
+
+from ..lib.application.controllers import create_app
+from ..lib.infrastructure.CompressionCache import CompressionCache
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+VEHICULES = 10_000
+REQUETES = 30
+MODELES = [("Renault", "Clio", "Citadine"), ("Peugeot", "208", "Citadine"), ("Peugeot", "3008", "SUV"),
+           ("Toyota", "Corolla", "Berline"), ("Tesla", "Model 3", "Berline"), ("Citroën", "Berlingo", "Utilitaire")]
+ETATS = ["Nickel", "Sale", "Endommagé"]
+
+
+def preparer():
+    InMemoryVehiculeRepository()._initialize()
+    app = create_app({'TESTING': True}, blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    hasard = random.Random(42)
+    for i in range(VEHICULES):
+        marque, modele, type_vehicule = hasard.choice(MODELES)
+        repository.create_vehicule(marque, modele, hasard.randint(2015, 2024), f"CP-{i:06d}",
+                                   hasard.randint(0, 200_000), float(hasard.randint(30, 150)),
+                                   hasard.choice(ETATS), type_vehicule)
+    return app
+
+
+def mesurer(client, entetes, repetitions=REQUETES):
+    reponse = client.get('/api/vehicules', headers=entetes)
+    debut = time.process_time()
+    for _ in range(repetitions):
+        reponse = client.get('/api/vehicules', headers=entetes)
+    return reponse, (time.process_time() - debut) / repetitions
+
+
+def main():
+    app = preparer()
+    client = app.test_client()
+    cache = app.extensions['container'].resolve('compression')
+    print(f"GET /vehicules, {VEHICULES} véhicules, CPU moyen sur {REQUETES} requêtes")
+
+    brut, cpu_brut = mesurer(client, {})
+    taille_brute = len(brut.data)
+    print(f"  {'identity':28} {taille_brute / 1024:8.0f} Ko  {cpu_brut * 1000:7.2f} ms CPU")
+
+    for encodage in cache.encodages:
+        # Compression à chaque requête : ce que ferait un middleware sans cache
+        seul = CompressionCache(maxsize=0)
+        debut = time.process_time()
+        for _ in range(REQUETES):
+            taille = len(seul.compresser(client.get('/api/vehicules').data, encodage))
+        cpu = (time.process_time() - debut) / REQUETES
+        print(f"  {encodage + ' par requête':28} {taille / 1024:8.0f} Ko  {cpu * 1000:7.2f} ms CPU"
+              f"  (x{taille_brute / taille:.0f} plus petit)")
+
+        reponse, cpu = mesurer(client, {'Accept-Encoding': encodage})
+        print(f"  {encodage + ' gardé par ETag':28} {len(reponse.data) / 1024:8.0f} Ko  {cpu * 1000:7.2f} ms CPU")
+
+    etag = client.get('/api/vehicules', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    reponse, cpu = mesurer(client, {'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    print(f"  {'304 If-None-Match':28} {len(reponse.data) / 1024:8.0f} Ko  {cpu * 1000:7.2f} ms CPU")
+    print(f"  compressions : {cache.compressions}, variantes resservies : {cache.hits}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Encodage par dictionnaire de marque, modele, etat et typeVehicule sur une flotte de
+1 000 000 de véhicules importée depuis un CSV (une copie de chaque chaîne par ligne).
+
+Mesure la mémoire des véhicules avec et sans chaînes canoniques, puis la recherche par
+critères : filtre d'origine (lower() sur chaque véhicule) contre variantes précalculées.
+
+    python -m <package>.benchmarks.bench_dictionnaire
+"""
+import gc
+import random
+import time
+import tracemalloc
+
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+VEHICULES = 1_000_000
+MODELES = [("Renault", "Clio", "Citadine"), ("Renault", "Megane", "Berline"), ("Peugeot", "208", "Citadine"),
+           ("Peugeot", "3008", "SUV"), ("Toyota", "Corolla", "Berline"), ("Toyota", "Yaris", "Citadine"),
+           ("Tesla", "Model 3", "Berline"), ("Citroën", "Berlingo", "Utilitaire")]
+ETATS = ["Nickel", "Sale", "Endommagé"]
+REQUETES = [
+    {'marque': "renault"},
+    {'marque': "PEUGEOT", 'modele': "3008"},
+    {'type_vehicule': "Berline", 'disponible': True},
+    {'marque': "tesla", 'prix_max': 60.0},
+]
+
+
+class VehiculeSansDictionnaire(Vehicule):
+    """Véhicule d'avant l'encodage : chaque instance garde ses propres chaînes."""
+    __setattr__ = object.__setattr__
+
+
+def lignes_csv():
+    hasard = random.Random(7)
+    lignes = []
+    for i in range(VEHICULES):
+        marque, modele, type_vehicule = hasard.choice(MODELES)
+        lignes.append(f"{marque},{modele},{hasard.randint(2015, 2024)},AB-{i:07d},{hasard.randint(0, 200_000)},"
+                      f"{hasard.randint(30, 150)},{hasard.choice(ETATS)},{type_vehicule}")
+    return '\n'.join(lignes)
+
+
+def importer(csv: str, classe):
+    vehicules = []
+    for ligne in csv.split('\n'):
+        marque, modele, annee, immatriculation, km, prix, etat, type_vehicule = ligne.split(',')
+        vehicules.append(classe(marque, modele, int(annee), Immatriculation(immatriculation, "75"),
+                                int(km), float(prix), etat, type_vehicule, True, len(vehicules) + 1))
+    return vehicules
+
+
+def memoire(csv: str, classe) -> int:
+    gc.collect()
+    tracemalloc.start()
+    vehicules = importer(csv, classe)
+    taille = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del vehicules
+    gc.collect()
+    return taille
+
+
+def filtre_d_origine(vehicules, marque=None, modele=None, disponible=None, type_vehicule=None, prix_max=None):
+    marque = marque.lower() if marque else None
+    modele = modele.lower() if modele else None
+    for vehicule in vehicules:
+        if marque and vehicule.marque.lower() != marque:
+            continue
+        if modele and vehicule.modele.lower() != modele:
+            continue
+        if disponible is not None and vehicule.disponible != disponible:
+            continue
+        if type_vehicule and vehicule.typeVehicule != type_vehicule:
+            continue
+        if prix_max is not None and vehicule.prix_journalier > prix_max:
+            continue
+        yield vehicule
+
+
+def chronometrer(fonction, repetitions=3) -> float:
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main():
+    csv = lignes_csv()
+    print(f"{VEHICULES} véhicules importés depuis un CSV")
+    sans = memoire(csv, VehiculeSansDictionnaire)
+    avec = memoire(csv, Vehicule)
+    print(f"  mémoire sans dictionnaire : {sans / 2**20:7.0f} Mo")
+    print(f"  mémoire avec dictionnaire : {avec / 2**20:7.0f} Mo  (-{(sans - avec) / 2**20:.0f} Mo, "
+          f"{(sans - avec) / VEHICULES:.0f} octets par véhicule)")
+
+    repository = InMemoryVehiculeRepository()
+    repository._initialize()
+    repository.save_all(importer(csv, Vehicule))
+    del csv
+    vehicules = repository._vehicules.values()
+    print("Recherche par critères (meilleur de 3)")
+    for criteres in REQUETES:
+        attendu = sum(1 for _ in filtre_d_origine(vehicules, **criteres))
+        assert repository.count_by_criteria(**criteres) == attendu
+        avant = chronometrer(lambda: sum(1 for _ in filtre_d_origine(vehicules, **criteres)))
+        apres = chronometrer(lambda: repository.count_by_criteria(**criteres))
+        print(f"  {str(criteres):50} {attendu:7d} résultats  {avant * 1000:6.0f} -> {apres * 1000:4.0f} ms"
+              f"  (x{avant / apres:.1f})")
+
+
+if __name__ == '__main__':
+    main()
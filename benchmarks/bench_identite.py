@@ -0,0 +1,103 @@
+"""
+Appartenance d'un véhicule aux locations d'un client : égalité champ par champ dans
+une liste (ancien modèle) contre identité hachée dans un ensemble.
+
+    python -m <package>.benchmarks.bench_identite
+"""
+import contextlib
+import dataclasses
+import io
+import time
+
+from ..lib.application.use_cases.restitutionVehicule import RestitutionVehicule
+from ..lib.domain.client import Client
+from ..lib.domain.vehicule import Vehicule
+
+
+@dataclasses.dataclass(eq=True)
+class VehiculeParValeur(Vehicule):
+    """Véhicule comparé sur tous ses champs, comme avant l'introduction d'`Entite`."""
+
+
+@dataclasses.dataclass(eq=False)
+class ClientParListe(Client):
+    """Client dont les locations sont une liste parcourue à chaque vérification."""
+
+    def a_en_location(self, voiture) -> bool:
+        return voiture in self.locations_actives
+
+    def retirer_location(self, voiture) -> bool:
+        if voiture in self.locations_actives:
+            self.locations_actives.remove(voiture)
+            return True
+        return False
+
+    def louer_voiture(self, voiture) -> bool:
+        if voiture.louer():
+            self.locations_actives.append(voiture)
+            return True
+        return False
+
+
+class Registre:
+    """Stockage minimal par ID, identique pour les deux modèles comparés."""
+
+    def __init__(self):
+        self.entites = {}
+
+    def get_by_id(self, entite_id):
+        return self.entites.get(entite_id)
+
+    def save(self, entite) -> int:
+        if entite.id is None:
+            entite.id = len(self.entites) + 1
+        self.entites[entite.id] = entite
+        return entite.id
+
+
+def preparer(classe_client, classe_vehicule, nb_locations: int):
+    clients, vehicules = Registre(), Registre()
+    client = classe_client("Client", "Flotte", "P0", "0600000000", "flotte@mail", None)
+    if classe_client is ClientParListe:
+        client.locations_actives = []
+    for i in range(nb_locations):
+        # Les véhicules d'une même flotte ne diffèrent souvent que par leur plaque
+        vehicule = classe_vehicule("Renault", "Clio", 2020, f"FL-{i:06d}", 1000, 40.0, "Nickel", "Citadine")
+        vehicules.save(vehicule)
+        client.louer_voiture(vehicule)
+    clients.save(client)
+    return clients, vehicules, client
+
+
+def restituer(classe_client, classe_vehicule, nb_locations: int) -> float:
+    clients, vehicules, client = preparer(classe_client, classe_vehicule, nb_locations)
+    use_case = RestitutionVehicule(clients, vehicules)
+    ids = [v.id for v in list(client.locations_actives)]
+    debut = time.perf_counter()
+    for vehicule_id in reversed(ids):
+        use_case.restituer_vehicule(client.id, vehicule_id, 100, "nickel")
+    return time.perf_counter() - debut
+
+
+def retourner(classe_client, classe_vehicule, nb_locations: int) -> float:
+    _, _, client = preparer(classe_client, classe_vehicule, nb_locations)
+    louees = list(client.locations_actives)
+    debut = time.perf_counter()
+    for vehicule in reversed(louees):
+        client.retourner_voiture(vehicule, 100)
+    return time.perf_counter() - debut
+
+
+def main() -> None:
+    for nb_locations in (500, 2000, 5000):
+        print(f"{nb_locations} véhicules loués par un même client")
+        for nom, mesure in (("restituer_vehicule", restituer), ("retourner_voiture", retourner)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                ancien = mesure(ClientParListe, VehiculeParValeur, nb_locations)
+                nouveau = mesure(Client, Vehicule, nb_locations)
+            print(f"  {nom:<20} liste/valeur {ancien * 1000:9.1f} ms"
+                  f"   ensemble/identité {nouveau * 1000:7.1f} ms   x{ancien / nouveau:.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Un écran du back-office : pour chaque véhicule affiché, mise à jour de la disponibilité,
+coût de location puis location. Appels séquentiels, un par opération, comparés à une
+seule requête POST /vehicules/batch (normale puis tout-ou-rien).
+
+    python -m <package>.benchmarks.bench_lot
+"""
+import contextlib
+import io
+import time
+
+from ..lib.application.controllers import create_app
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+VEHICULES_PAR_ECRAN = 10
+ECRANS = 200
+
+
+def preparer():
+    InMemoryVehiculeRepository()._initialize()
+    app = create_app({'TESTING': True, 'RATE_LIMIT_CAPACITY': 0}, blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    for i in range(VEHICULES_PAR_ECRAN):
+        repository.create_vehicule("Renault", "Clio", 2020, f"LOT-{i}", 1000, 40.0, "Nickel", "Citadine")
+    return app
+
+
+def operations():
+    for vehicule_id in range(1, VEHICULES_PAR_ECRAN + 1):
+        yield {'op': 'set_availability', 'id': vehicule_id, 'disponible': True}
+        yield {'op': 'rental_cost', 'id': vehicule_id, 'duree': 3}
+        yield {'op': 'rent', 'id': vehicule_id}
+
+
+def sequentiel(client):
+    for op in operations():
+        if op['op'] == 'set_availability':
+            client.patch(f"/api/vehicules/{op['id']}/availability", json={'disponible': True})
+        elif op['op'] == 'rental_cost':
+            client.get(f"/api/vehicules/{op['id']}/rental_cost?duree={op['duree']}")
+        else:
+            client.post(f"/api/vehicules/{op['id']}/rent")
+    return VEHICULES_PAR_ECRAN * 3
+
+
+def par_lot(client, atomique=False):
+    reponse = client.post('/api/vehicules/batch', json={'atomic': atomique, 'operations': list(operations())})
+    assert reponse.status_code == 200
+    return 1
+
+
+def mesurer(nom, fonction):
+    client = preparer().test_client()
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(ECRANS):
+            requetes = fonction(client)
+    duree = (time.perf_counter() - debut) / ECRANS
+    print(f"  {nom:14} {requetes:3d} requête(s)  {duree * 1000:7.2f} ms par écran")
+    return duree
+
+
+def main():
+    print(f"Écran de {VEHICULES_PAR_ECRAN} véhicules ({VEHICULES_PAR_ECRAN * 3} opérations), {ECRANS} écrans")
+    reference = mesurer("séquentiel", sequentiel)
+    lot = mesurer("lot", par_lot)
+    atomique = mesurer("lot atomique", lambda client: par_lot(client, True))
+    print(f"  gain : x{reference / lot:.1f} (lot), x{reference / atomique:.1f} (atomique)")
+
+
+if __name__ == '__main__':
+    main()
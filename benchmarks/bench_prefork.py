@@ -0,0 +1,79 @@
+"""
+Débit de lecture des disponibilités partagées selon le nombre de workers pré-forkés.
+
+Chaque worker lit en boucle la disponibilité de véhicules tirés de la flotte, comme le
+ferait GET /vehicules/<id> ; quelques locations/retours concurrents maintiennent des
+écritures pendant la mesure.
+
+    python -m <package>.benchmarks.bench_prefork
+"""
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.SharedAvailability import SharedAvailability
+from ..lib.infrastructure.SharedAvailabilityVehiculeRepository import SharedAvailabilityVehiculeRepository
+
+NB_VEHICULES = 10_000
+LECTURES_PAR_WORKER = 300_000
+
+
+def travailler(repository, depart, resultats):
+    depart.wait()
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(LECTURES_PAR_WORKER):
+            vehicule_id = i * 7919 % NB_VEHICULES + 1
+            if i % 1000 == 0:
+                if repository.is_available(vehicule_id):
+                    repository.set_availability(vehicule_id, False)
+                else:
+                    repository.set_availability(vehicule_id, True)
+            else:
+                repository.is_available(vehicule_id)
+    resultats.put(time.perf_counter() - debut)
+
+
+def mesurer(repository, workers: int) -> float:
+    contexte = multiprocessing.get_context('fork')
+    depart, resultats = contexte.Event(), contexte.Queue()
+    processus = [contexte.Process(target=travailler, args=(repository, depart, resultats)) for _ in range(workers)]
+    for p in processus:
+        p.start()
+    debut = time.perf_counter()
+    depart.set()
+    for _ in processus:
+        resultats.get()
+    duree = time.perf_counter() - debut
+    for p in processus:
+        p.join()
+    return workers * LECTURES_PAR_WORKER / duree
+
+
+def main() -> None:
+    catalogue = InMemoryVehiculeRepository()
+    catalogue._initialize()
+    for i in range(NB_VEHICULES):
+        catalogue.create_vehicule("Renault", "Clio", 2020, f"PF-{i:06d}", 1000, 40.0, "Nickel", "Citadine")
+    disponibilites = SharedAvailability(NB_VEHICULES)
+    try:
+        repository = SharedAvailabilityVehiculeRepository(catalogue, disponibilites)
+        coeurs = os.cpu_count() or 1
+        # Le débit ne peut croître que jusqu'au nombre de cœurs disponibles
+        print(f"{coeurs} cœur(s) disponible(s)")
+        paliers = sorted({1, 2, 4, coeurs} | {n for n in (8, 16) if n <= coeurs})
+        reference = None
+        for workers in paliers:
+            debit = mesurer(repository, workers)
+            reference = reference or debit
+            print(f"{workers:2d} workers : {debit / 1e6:6.2f} M lectures/s  (x{debit / reference:.1f})")
+    finally:
+        disponibilites.close()
+        disponibilites.unlink()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Recherche plein texte approchée sur une flotte de 100 000 véhicules : construction de
+l'index de trigrammes, latence des requêtes (index seul et GET /vehicules/search/text)
+et coût de la maintenance incrémentale, comparés à un parcours de toute la flotte.
+
+    python -m <package>.benchmarks.bench_recherche
+"""
+import contextlib
+import io
+import random
+import statistics
+import time
+
+from ..lib.application.controllers import create_app
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.VehiculeSearchIndex import VehiculeSearchIndex, similarite, trigrammes
+
+VEHICULES = 100_000
+REPETITIONS = 200
+MARQUES = {
+    "Renault": ["Clio", "Megane", "Captur", "Kangoo", "Zoe"],
+    "Peugeot": ["208", "2008", "308", "3008", "5008", "Partner"],
+    "Citroën": ["C3", "C4", "Berlingo", "C5 Aircross"],
+    "Toyota": ["Yaris", "Corolla", "C-HR", "RAV4"],
+    "Tesla": ["Model 3", "Model Y"],
+    "Volkswagen": ["Polo", "Golf", "Tiguan", "Transporter"],
+}
+TYPES = ["Citadine", "Berline", "SUV", "Utilitaire"]
+REQUETES = [("peugeot 20", {}), ("Renaut", {}), ("model 3", {'disponible': True}),
+            ("golf", {'prix_max': 60.0}), ("suv", {'disponible': True, 'prix_max': 80.0}), ("AB-1234", {})]
+
+
+def flotte():
+    hasard = random.Random(3)
+    for i in range(VEHICULES):
+        marque = hasard.choice(list(MARQUES))
+        plaque = f"{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}-{i % 10_000:04d}-{hasard.randint(10, 99)}"
+        yield Vehicule(marque, hasard.choice(MARQUES[marque]), 2020, Immatriculation(plaque, "75"),
+                       hasard.randint(0, 150_000), float(hasard.randint(30, 120)), "Nickel",
+                       hasard.choice(TYPES), hasard.random() < 0.7)
+
+
+def parcours(vehicules, texte, disponible=None, prix_max=None, limit=20):
+    """Sans index : similarité de chaque mot avec les mots de chaque véhicule."""
+    mots = [(mot, trigrammes(mot)) for mot in texte.lower().split()]
+    resultats = []
+    for vehicule in vehicules:
+        if disponible is not None and vehicule.disponible != disponible:
+            continue
+        if prix_max is not None and vehicule.prix_journalier > prix_max:
+            continue
+        termes = f"{vehicule.marque} {vehicule.modele} {vehicule.typeVehicule}".lower().split()
+        score = 0.0
+        for mot, trig in mots:
+            meilleur = max(similarite(mot, trig, terme, trigrammes(terme)) for terme in termes)
+            if meilleur < 0.3:
+                break
+            score += meilleur
+        else:
+            resultats.append((score, vehicule))
+    resultats.sort(key=lambda element: -element[0])
+    return resultats[:limit]
+
+
+def latences(fonction, repetitions=REPETITIONS):
+    mesures = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        mesures.append(time.perf_counter() - debut)
+    mesures.sort()
+    return statistics.median(mesures), mesures[int(len(mesures) * 0.99) - 1]
+
+
+def main():
+    InMemoryVehiculeRepository()._initialize()
+    app = create_app({'TESTING': True}, blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    vehicules = list(flotte())
+    repository.save_all(vehicules)
+
+    index = VehiculeSearchIndex()
+    debut = time.perf_counter()
+    index.add_all(vehicules)
+    print(f"{VEHICULES} véhicules, index construit en {time.perf_counter() - debut:.2f} s")
+
+    client = app.test_client()
+    print(f"{'requête':44} {'parcours':>10} {'index p50/p99':>16} {'HTTP p50':>9}")
+    for texte, filtres in REQUETES:
+        attendu = parcours(vehicules, texte, **filtres)
+        trouve = index.search(texte, **filtres)
+        if attendu:
+            assert round(attendu[0][0], 4) == trouve[0][0]
+        avant = latences(lambda: parcours(vehicules, texte, **filtres), repetitions=3)[0]
+        p50, p99 = latences(lambda: index.search(texte, **filtres))
+        url = f"/api/vehicules/search/text?q={texte}" + ''.join(
+            f"&{cle}={str(valeur).lower()}" for cle, valeur in filtres.items())
+        http = latences(lambda: client.get(url))[0]
+        libelle = f"{texte!r} {filtres or ''}"
+        print(f"  {libelle:42} {avant * 1000:8.0f} ms {p50 * 1000:6.3f}/{p99 * 1000:.3f} ms {http * 1000:6.2f} ms")
+
+    nouveaux = [Vehicule("Renault", "Austral", 2024, Immatriculation(f"ZZ-{i:04d}-99", "75"), 0, 55.0, "Nickel",
+                         "SUV") for i in range(1000)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        debut = time.perf_counter()
+        for vehicule in nouveaux:
+            repository.save(vehicule)
+        ajout = (time.perf_counter() - debut) / len(nouveaux)
+        debut = time.perf_counter()
+        for vehicule in nouveaux:
+            repository.delete(vehicule.id)
+        retrait = (time.perf_counter() - debut) / len(nouveaux)
+    print(f"Maintenance par le repository : save {ajout * 1e6:.0f} µs, delete {retrait * 1e6:.0f} µs par véhicule")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Restitution de fin de journée : appels unitaires contre traitement en lot.
+
+Chaque écriture passe par un proxy qui simule l'aller-retour d'un backend persistant.
+
+    python -m <package>.benchmarks.bench_restitution
+"""
+import contextlib
+import io
+import time
+
+from ..lib.application.use_cases.restitutionVehicule import RestitutionVehicule
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+LATENCE_ECRITURE = 0.0002
+
+
+class EcrituresLentes:
+    def __init__(self, repository):
+        self.repository = repository
+        self.ecritures = 0
+
+    def __getattr__(self, nom):
+        attribut = getattr(self.repository, nom)
+        if nom not in ('save', 'save_all'):
+            return attribut
+
+        def ecrire(*args, **kwargs):
+            self.ecritures += 1
+            time.sleep(LATENCE_ECRITURE)
+            return attribut(*args, **kwargs)
+        return ecrire
+
+
+def preparer(nb_clients: int, locations_par_client: int):
+    clients = InMemoryClientRepository()
+    clients._initialize()
+    vehicules = InMemoryVehiculeRepository()
+    vehicules._initialize()
+    restitutions = []
+    for c in range(nb_clients):
+        client = clients.create_client("Client", str(c), f"P{c}", "0600000000", f"c{c}@mail")
+        for l in range(locations_par_client):
+            vehicule = vehicules.create_vehicule("Renault", "Clio", 2020, f"V{c}-{l}", 1000, 40.0, "Nickel", "Citadine")
+            vehicule.disponible = False
+            client.locations_actives.add(vehicule)
+            restitutions.append((client.id, vehicule.id, 120, "nickel"))
+    clients, vehicules = EcrituresLentes(clients), EcrituresLentes(vehicules)
+    return RestitutionVehicule(clients, vehicules), restitutions, (clients, vehicules)
+
+
+def mesurer(traitement, nb_clients: int, locations_par_client: int):
+    use_case, restitutions, proxies = preparer(nb_clients, locations_par_client)
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        traitement(use_case, restitutions)
+    return time.perf_counter() - debut, sum(p.ecritures for p in proxies)
+
+
+def unitaire(use_case, restitutions):
+    for restitution in restitutions:
+        use_case.restituer_vehicule(*restitution)
+
+
+def en_lot(use_case, restitutions):
+    use_case.restituer_vehicules(restitutions)
+
+
+def main() -> None:
+    print(f"Latence simulée par écriture : {LATENCE_ECRITURE * 1e6:.0f} µs")
+    for nb_clients, locations_par_client in ((200, 25), (5, 1000)):
+        print(f"{nb_clients * locations_par_client} restitutions ({nb_clients} clients x {locations_par_client} véhicules)")
+        for nom, traitement in (("restituer_vehicule unitaire", unitaire), ("restituer_vehicules en lot", en_lot)):
+            duree, ecritures = mesurer(traitement, nb_clients, locations_par_client)
+            print(f"  {nom:<28} {duree * 1000:9.1f} ms  {ecritures:6d} écritures")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Débit de sérialisation JSON d'un catalogue de 100 000 véhicules.
+
+    python -m <package>.benchmarks.bench_serialization
+"""
+import json
+import time
+
+from ..lib.application.serialization import dumps_many
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.vehicule import Vehicule
+
+MARQUES = [("Renault", "Clio"), ("Peugeot", "208"), ("Citroën", "C3"), ("Toyota", "Yaris"), ("Dacia", "Sandero")]
+
+
+def flotte(taille: int):
+    return [
+        Vehicule(marque, modele, 2015 + i % 10, Immatriculation(f"AA-{i:06d}", f"{i % 95 + 1:02d}"),
+                 i * 7 % 200000, 30.0 + i % 50, "Nickel", "Citadine", i % 3 != 0)
+        for i, (marque, modele) in ((i, MARQUES[i % len(MARQUES)]) for i in range(taille))
+    ]
+
+
+def mesurer(nom: str, serialiser, vehicules, repetitions: int = 5) -> None:
+    corps = serialiser(vehicules)
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        serialiser(vehicules)
+    duree = (time.perf_counter() - debut) / repetitions
+    print(f"{nom:<22} {len(corps) / 1e6:7.2f} Mo  {duree * 1000:8.1f} ms  {len(corps) / 1e6 / duree:8.1f} Mo/s")
+
+
+def main(taille: int = 100_000) -> None:
+    vehicules = flotte(taille)
+    print(f"Sérialisation de {taille} véhicules")
+    mesurer("to_dict + json.dumps", lambda vs: json.dumps([v.to_dict() for v in vs]).encode(), vehicules)
+    mesurer("dumps_many", dumps_many, vehicules)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Appels au backend par seconde quand une foule de requêtes simultanées demande le même
+véhicule (« thundering herd »), sans puis avec regroupement des lectures (single-flight).
+
+Chaque lecture du backend coûte un aller-retour simulé avec une base de données. En mode
+threads, des clients bouclent sur GET /vehicules/<id> ; en mode asynchrone, des vagues de
+coroutines lisent le même véhicule.
+
+    python -m <package>.benchmarks.bench_single_flight
+"""
+import asyncio
+import threading
+import time
+
+from ..lib.application.controllers import create_app
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.SingleFlightVehiculeRepository import SingleFlightVehiculeRepository
+
+DUREE = 3.0
+CLIENTS = 64
+VAGUES = 200
+COROUTINES = 500
+IO_LECTURE = 0.002  # secondes d'aller-retour avec la base par lecture
+
+
+class LecturesDistantes(InMemoryVehiculeRepository):
+    _instance = None
+    appels = 0
+
+    def get_by_id(self, vehicule_id):
+        LecturesDistantes.appels += 1
+        time.sleep(IO_LECTURE)
+        return super().get_by_id(vehicule_id)
+
+
+def mode_threads(single_flight: bool):
+    app = create_app({'TESTING': True, 'SINGLE_FLIGHT': single_flight,
+                      'REPOSITORIES': {'vehicule_repository': f'{__name__}:LecturesDistantes'}},
+                     blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    repository.create_vehicule("Renault", "Clio", 2020, "SF-0", 1000, 40.0, "Nickel", "Citadine")
+    LecturesDistantes.appels = 0
+    arret = threading.Event()
+    requetes = [0] * CLIENTS
+
+    def client(numero):
+        http = app.test_client()
+        while not arret.is_set():
+            assert http.get('/api/vehicules/1').status_code == 200
+            requetes[numero] += 1
+
+    fils = [threading.Thread(target=client, args=(i,)) for i in range(CLIENTS)]
+    debut = time.perf_counter()
+    for f in fils:
+        f.start()
+    time.sleep(DUREE)
+    arret.set()
+    for f in fils:
+        f.join()
+    duree = time.perf_counter() - debut
+    return sum(requetes) / duree, LecturesDistantes.appels / duree
+
+
+def mode_async(single_flight: bool):
+    backend = LecturesDistantes()
+    backend._initialize()
+    backend.create_vehicule("Renault", "Clio", 2020, "SF-0", 1000, 40.0, "Nickel", "Citadine")
+    repository = SingleFlightVehiculeRepository(backend)
+    LecturesDistantes.appels = 0
+
+    def lire():
+        if single_flight:
+            return repository.aget_by_id(1)
+        return asyncio.to_thread(backend.get_by_id, 1)
+
+    async def herde():
+        for _ in range(VAGUES):
+            await asyncio.gather(*(lire() for _ in range(COROUTINES)))
+
+    debut = time.perf_counter()
+    asyncio.run(herde())
+    duree = time.perf_counter() - debut
+    return VAGUES * COROUTINES / duree, LecturesDistantes.appels / duree
+
+
+def main():
+    InMemoryVehiculeRepository()._initialize()
+    print(f"Threads : {CLIENTS} clients, {DUREE:.0f} s, lecture backend {IO_LECTURE * 1000:.0f} ms")
+    for single_flight in (False, True):
+        requetes, appels = mode_threads(single_flight)
+        print(f"  single-flight={single_flight!s:5}  {requetes:8.0f} req/s  {appels:8.0f} appels backend/s"
+              f"  ({appels / requetes:.3f} appel par requête)")
+
+    print(f"Asynchrone : {VAGUES} vagues de {COROUTINES} coroutines")
+    for single_flight in (False, True):
+        lectures, appels = mode_async(single_flight)
+        print(f"  single-flight={single_flight!s:5}  {lectures:8.0f} lectures/s  {appels:8.0f} appels backend/s"
+              f"  ({appels / lectures:.3f} appel par lecture)")
+
+
+if __name__ == '__main__':
+    main()
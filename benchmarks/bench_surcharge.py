@@ -0,0 +1,125 @@
+"""
+Latence des lectures pendant une rafale d'écritures, sans puis avec limitation de débit
+et contrôle d'admission.
+
+Le serveur (werkzeug, un thread par requête) tourne dans un processus à part ; chaque
+écriture y coûte quelques millisecondes de CPU puis une attente d'entrée/sortie, comme
+un enregistrement en base. Pendant la rafale, un client mesure GET /vehicules/<id>.
+
+    python -m <package>.benchmarks.bench_surcharge
+"""
+import contextlib
+import http.client
+import io
+import json
+import multiprocessing
+import socket
+import statistics
+import threading
+import time
+
+from ..lib.application.controllers import create_app
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+DUREE = 8.0
+ECRIVAINS = 64
+CLIENTS = 8
+CPU_ECRITURE = 0.005  # secondes de calcul par écriture
+IO_ECRITURE = 0.05  # secondes d'attente (aller-retour avec la base) par écriture
+
+
+class EcrituresCouteuses(InMemoryVehiculeRepository):
+    _instance = None
+
+    def create_vehicule(self, *args, **kwargs):
+        fin = time.perf_counter() + CPU_ECRITURE
+        while time.perf_counter() < fin:
+            pass
+        time.sleep(IO_ECRITURE)
+        return super().create_vehicule(*args, **kwargs)
+
+
+def servir(config, ecoute, pret):
+    from werkzeug.serving import make_server
+    app = create_app({**config, 'REPOSITORIES': {'vehicule_repository': f'{__name__}:EcrituresCouteuses'}},
+                     blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    with contextlib.redirect_stdout(io.StringIO()):
+        repository.create_vehicule("Renault", "Clio", 2020, "SUR-0", 1000, 40.0, "Nickel", "Citadine")
+    serveur = make_server('127.0.0.1', 0, app, threaded=True, fd=ecoute.fileno())
+    pret.set()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        serveur.serve_forever()
+
+
+def ecrire(port, numero, arret, statuts):
+    corps = {"marque": "Renault", "modele": "Clio", "annee": 2020, "kilometrage": 1000,
+             "prix_journalier": 40.0, "etat": "Nickel", "type_vehicule": "Citadine"}
+    i = 0
+    while not arret.is_set():
+        corps["immatriculation"] = f"W{numero}-{i}"
+        i += 1
+        try:
+            connexion = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            connexion.request('POST', '/api/vehicules', json.dumps(corps),
+                              {'Content-Type': 'application/json', 'X-Api-Key': f'promo-{numero % CLIENTS}'})
+            reponse = connexion.getresponse()
+            reponse.read()
+            statuts.append(reponse.status)
+            connexion.close()
+            if reponse.status in (429, 503):
+                time.sleep(0.05)
+        except OSError:
+            statuts.append(0)
+
+
+def lire(port, arret, latences):
+    while not arret.is_set():
+        debut = time.perf_counter()
+        connexion = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        connexion.request('GET', '/api/vehicules/1')
+        connexion.getresponse().read()
+        connexion.close()
+        latences.append(time.perf_counter() - debut)
+        time.sleep(0.005)
+
+
+def mesurer(config):
+    ecoute = socket.create_server(('127.0.0.1', 0), backlog=1024)
+    port = ecoute.getsockname()[1]
+    contexte = multiprocessing.get_context('fork')
+    pret = contexte.Event()
+    serveur = contexte.Process(target=servir, args=(config, ecoute, pret), daemon=True)
+    serveur.start()
+    pret.wait()
+    arret, latences, statuts = threading.Event(), [], []
+    fils = [threading.Thread(target=ecrire, args=(port, n, arret, statuts)) for n in range(ECRIVAINS)]
+    fils.append(threading.Thread(target=lire, args=(port, arret, latences)))
+    for f in fils:
+        f.start()
+    time.sleep(DUREE)
+    arret.set()
+    for f in fils:
+        f.join()
+    serveur.terminate()
+    serveur.join()
+    ecoute.close()
+    latences.sort()
+    return latences, statuts
+
+
+def main() -> None:
+    for nom, config in (("sans protection", {'RATE_LIMIT_CAPACITY': 0, 'ADMISSION_MAX_IN_FLIGHT': 0}),
+                        ("limitation + admission", {'RATE_LIMIT_CAPACITY': 20, 'RATE_LIMIT_PER_SECOND': 10.0,
+                                                    'ADMISSION_MAX_IN_FLIGHT': 4, 'ADMISSION_QUEUE_SIZE': 8,
+                                                    'ADMISSION_TIMEOUT': 0.01})):
+        latences, statuts = mesurer(config)
+        p50 = statistics.median(latences) * 1000
+        p99 = latences[int(len(latences) * 0.99) - 1] * 1000
+        acceptees = sum(1 for s in statuts if s == 201)
+        print(f"{nom:<24} lectures p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  ({len(latences)} lectures) | "
+              f"écritures 201: {acceptees}, 429: {statuts.count(429)}, 503: {statuts.count(503)}")
+
+
+if __name__ == '__main__':
+    main()
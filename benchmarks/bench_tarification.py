@@ -0,0 +1,150 @@
+"""
+Tarification dynamique : simulation de 120 jours de demande, modérée puis soutenue, sur
+une flotte de 2 000 véhicules (pics le week-end et en été), avec prix statiques puis ajustés
+par l'occupation, l'anticipation et la durée. Les clients refusent au-delà de leur
+prix de réserve ; une demande sans véhicule libre est perdue.
+
+Mesure ensuite le coût d'un prix : compteurs d'occupation tenus à jour (O(1)) contre
+un comptage de la flotte à chaque devis, sur 100 000 véhicules.
+
+    python -m <package>.benchmarks.bench_tarification
+"""
+import contextlib
+import heapq
+import io
+import math
+import random
+import time
+from collections import deque
+from datetime import date, timedelta
+
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.tarification import POLITIQUE_PAR_DEFAUT
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.DynamicPricingVehiculeRepository import DynamicPricingVehiculeRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+JOURS = 120
+FLOTTE = {"Citadine": (800, 40.0), "Berline": (500, 60.0), "SUV": (400, 75.0), "Utilitaire": (300, 70.0)}
+# Lundi ... dimanche : creux en milieu de semaine, pic du vendredi au dimanche
+SEMAINE = [0.8, 0.6, 0.6, 0.8, 1.8, 1.9, 1.2]
+ANTICIPATIONS = [0, 1, 2, 5, 10, 20, 45, 90]
+DUREES = [1, 2, 3, 4, 5, 7, 10, 14, 21, 30]
+POIDS_DUREES = [14, 18, 16, 10, 8, 12, 8, 7, 4, 3]
+# Demandes par véhicule et par jour, avant les effets de la semaine et de la saison
+DEMANDES = {"modérée": 0.09, "soutenue": 0.15}
+GRANDE_FLOTTE = 100_000
+DEVIS = 20_000
+
+
+def flotte(taille_par_type=None):
+    vehicules = []
+    for type_vehicule, (nombre, prix) in FLOTTE.items():
+        nombre = taille_par_type or nombre
+        for i in range(nombre):
+            vehicules.append(Vehicule("Marque", type_vehicule, 2022,
+                                      Immatriculation(f"{type_vehicule[:2].upper()}-{i:06d}", "75"), 0, prix,
+                                      "Nickel", type_vehicule))
+    return vehicules
+
+
+def demandes(intensite: float):
+    """Demandes pré-tirées : (jour, type, anticipation, durée, prix de réserve relatif)."""
+    hasard = random.Random(17)
+    resultat = []
+    for jour in range(JOURS):
+        saison = 1.5 if 50 <= jour < 80 else 1.0
+        for type_vehicule, (nombre, _) in FLOTTE.items():
+            for _ in range(int(nombre * intensite * SEMAINE[jour % 7] * saison * hasard.uniform(0.85, 1.15))):
+                resultat.append((jour, type_vehicule, hasard.choice(ANTICIPATIONS),
+                                 hasard.choices(DUREES, POIDS_DUREES)[0], 1.1 * math.exp(hasard.gauss(0, 0.25))))
+    return resultat
+
+
+def simuler(repository, vehicules, liste_demandes, origine: date):
+    libres = {type_vehicule: deque() for type_vehicule in FLOTTE}
+    for vehicule in vehicules:
+        libres[vehicule.typeVehicule].append(vehicule.id)
+    retours = []
+    revenu, locations, refus_prix, perdues, jours_loues = 0.0, 0, 0, 0, 0
+    indice = 0
+    for jour in range(JOURS):
+        while retours and retours[0][0] <= jour:
+            _, vehicule_id, type_vehicule = heapq.heappop(retours)
+            repository.retourner_vehicule(vehicule_id, 100)
+            libres[type_vehicule].append(vehicule_id)
+        while indice < len(liste_demandes) and liste_demandes[indice][0] == jour:
+            _, type_vehicule, anticipation, duree, reserve = liste_demandes[indice]
+            indice += 1
+            if not libres[type_vehicule]:
+                perdues += 1
+                continue
+            vehicule_id = libres[type_vehicule][0]
+            cout = repository.calculate_rental_cost(vehicule_id, duree, origine + timedelta(days=anticipation))
+            if cout / duree > reserve * FLOTTE[type_vehicule][1]:
+                refus_prix += 1
+                continue
+            libres[type_vehicule].popleft()
+            repository.louer_vehicule(vehicule_id)
+            heapq.heappush(retours, (jour + duree, vehicule_id, type_vehicule))
+            revenu += cout
+            locations += 1
+        jours_loues += sum(nombre for nombre, _ in FLOTTE.values()) - sum(map(len, libres.values()))
+    occupation = jours_loues / (JOURS * sum(nombre for nombre, _ in FLOTTE.values()))
+    return revenu, locations, refus_prix, perdues, occupation
+
+
+def latence(fonction, repetitions):
+    debut = time.perf_counter()
+    for i in range(repetitions):
+        fonction(i)
+    return (time.perf_counter() - debut) / repetitions
+
+
+def main():
+    origine = date.today()
+    print(f"Flotte de {sum(nombre for nombre, _ in FLOTTE.values())} véhicules, {JOURS} jours")
+    print(f"  {'demande':20} {'prix':10} {'revenu':>12} {'locations':>10} {'refus prix':>11} {'perdues':>8}"
+          f" {'occupation':>11}")
+    for niveau, intensite in DEMANDES.items():
+        liste_demandes = demandes(intensite)
+        for libelle, dynamique in (("statiques", False), ("dynamiques", True)):
+            base = InMemoryVehiculeRepository()
+            base._initialize()
+            vehicules = flotte()
+            base.save_all(vehicules)
+            repository = DynamicPricingVehiculeRepository(base, POLITIQUE_PAR_DEFAUT) if dynamique else base
+            with contextlib.redirect_stdout(io.StringIO()):
+                revenu, locations, refus_prix, perdues, occupation = simuler(repository, vehicules,
+                                                                             liste_demandes, origine)
+            demande = f"{niveau} ({len(liste_demandes)})"
+            print(f"  {demande:20} {libelle:10} {revenu:10.0f} € {locations:10d} {refus_prix:11d} {perdues:8d}"
+                  f" {occupation:10.1%}")
+
+    base = InMemoryVehiculeRepository()
+    base._initialize()
+    vehicules = flotte(GRANDE_FLOTTE // len(FLOTTE))
+    base.save_all(vehicules)
+    repository = DynamicPricingVehiculeRepository(base, POLITIQUE_PAR_DEFAUT)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for vehicule in vehicules[::3]:
+            repository.louer_vehicule(vehicule.id)
+    debut = origine + timedelta(days=10)
+    ids = [vehicule.id for vehicule in vehicules]
+
+    def par_comptage(i):
+        vehicule = base.get_by_id(ids[i % len(ids)])
+        total = base.count_by_criteria(type_vehicule=vehicule.typeVehicule)
+        loues = base.count_by_criteria(type_vehicule=vehicule.typeVehicule, disponible=False)
+        return POLITIQUE_PAR_DEFAUT.prix_journalier(vehicule.prix_journalier, loues / total, 10, 3) * 3
+
+    assert par_comptage(7) == repository.calculate_rental_cost(ids[7], 3, debut)
+    avant = latence(par_comptage, 20)
+    apres = latence(lambda i: repository.calculate_rental_cost(ids[i % len(ids)], 3, debut), DEVIS)
+    statique = latence(lambda i: base.calculate_rental_cost(ids[i % len(ids)], 3), DEVIS)
+    print(f"Coût d'un devis sur {GRANDE_FLOTTE} véhicules : comptage {avant * 1000:.1f} ms, "
+          f"compteurs {apres * 1e6:.2f} µs (prix statique {statique * 1e6:.2f} µs)")
+
+
+if __name__ == '__main__':
+    main()
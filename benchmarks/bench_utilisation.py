@@ -0,0 +1,78 @@
+"""
+Taux d'utilisation par véhicule : recalcul depuis les contrats contre agrégats journaliers.
+
+    python -m <package>.benchmarks.bench_utilisation
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from ..lib.infrastructure.UtilizationRollups import UtilizationRollups
+
+NB_VEHICULES = 1000
+NB_CONTRATS = 300_000
+ORIGINE = date(2016, 1, 1)
+FIN = date(2026, 1, 1)
+FENETRE = 90
+
+
+def historique():
+    """(immatriculation, début, durée) : environ 300 contrats par véhicule sur dix ans."""
+    alea = random.Random(42)
+    jours = (FIN - ORIGINE).days - 30
+    return [(f"AB-{i % NB_VEHICULES:04d}", ORIGINE + timedelta(days=alea.randrange(jours)), alea.randint(1, 14))
+            for i in range(NB_CONTRATS)]
+
+
+def recalcul(contrats, debut, fin):
+    """Ce que fait un rapport sans agrégats : relire tous les contrats pour chaque véhicule."""
+    taux = {}
+    for i in range(NB_VEHICULES):
+        cle = f"AB-{i:04d}"
+        jours = set()
+        for immatriculation, debut_contrat, duree in contrats:
+            if immatriculation == cle:
+                fin_contrat = debut_contrat + timedelta(days=duree)
+                for o in range(max(debut_contrat, debut).toordinal(), min(fin_contrat, fin).toordinal()):
+                    jours.add(o)
+        taux[cle] = len(jours) / (fin - debut).days
+    return taux
+
+
+def main() -> None:
+    contrats = historique()
+    debut, fin = FIN - timedelta(days=FENETRE), FIN
+
+    rollups = UtilizationRollups()
+    t0 = time.perf_counter()
+    for immatriculation, debut_contrat, duree in contrats:
+        rollups.mark(immatriculation, debut_contrat, debut_contrat + timedelta(days=duree))
+    mise_a_jour = (time.perf_counter() - t0) / NB_CONTRATS
+
+    t0 = time.perf_counter()
+    attendu = recalcul(contrats[:NB_CONTRATS // 10], debut, fin)
+    duree_recalcul = (time.perf_counter() - t0) * 10
+
+    t0 = time.perf_counter()
+    taux = {cle: rollups.utilization(cle, debut, fin) for cle in rollups.keys()}
+    duree_rollups = time.perf_counter() - t0
+    assert len(taux) == NB_VEHICULES and len(attendu) == NB_VEHICULES
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "utilisation.bin")
+        taille = rollups.save(chemin)
+        t0 = time.perf_counter()
+        UtilizationRollups.load(chemin)
+        duree_chargement = time.perf_counter() - t0
+
+    print(f"{NB_VEHICULES} véhicules, {NB_CONTRATS} contrats sur dix ans, fenêtre de {FENETRE} jours")
+    print(f"  mise à jour par contrat         {mise_a_jour * 1e6:8.1f} µs")
+    print(f"  recalcul depuis les contrats    {duree_recalcul * 1000:8.0f} ms (extrapolé depuis 10 %)")
+    print(f"  agrégats journaliers            {duree_rollups * 1000:8.1f} ms  (x{duree_recalcul / duree_rollups:.0f})")
+    print(f"  fichier d'agrégats              {taille / 1024:8.1f} Ko, relu en {duree_chargement * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
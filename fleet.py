@@ -0,0 +1,69 @@
+"""
+Import et export en masse de la flotte en ligne de commande.
+
+Les repositories sont ceux du conteneur du processus (backend REPOSITORY_BACKEND). Avec
+le backend en mémoire, rien ne survit à la commande : l'import ne fait que valider le
+fichier et l'export ne contient que ce que la commande elle-même a chargé (rien).
+"""
+import argparse
+import sys
+import time
+
+from .lib.application.container import Container, default_container
+from .lib.application.use_cases.importExportFlotte import COLONNES_VEHICULE, COLONNES_CONTRAT, TYPES_COLONNES
+from .lib.infrastructure.FleetFileStore import open_fleet_file
+
+
+def _persistant(container: Container, repository: str) -> bool:
+    """Indique si le repository donné conserve ses données au-delà du processus."""
+    return (container.config['REPOSITORY_BACKEND'] != 'memory'
+            or repository in container.config['REPOSITORIES'])
+
+
+def main(argv=None, container: Container = None) -> int:
+    parser = argparse.ArgumentParser(description="Import et export en masse de la flotte (CSV ou Parquet).")
+    commandes = parser.add_subparsers(dest='commande', required=True)
+
+    importer = commandes.add_parser('import', help="Importer des véhicules depuis un fichier")
+    importer.add_argument('fichier')
+    importer.add_argument('--taille-lot', type=int, default=5000)
+
+    exporter = commandes.add_parser('export', help="Exporter la flotte ou les contrats vers un fichier")
+    exporter.add_argument('entite', choices=('vehicules', 'contrats'))
+    exporter.add_argument('fichier')
+    exporter.add_argument('--taille-lot', type=int, default=5000)
+
+    args = parser.parse_args(argv)
+    fichier = open_fleet_file(args.fichier)
+    container = container if container is not None else default_container()
+    flotte = container.resolve('import_export_flotte')
+
+    if args.commande == 'import':
+        persistant = _persistant(container, 'vehicule_repository')
+        if not persistant:
+            print("Backend en mémoire : import en validation seule, rien n'est conservé après la commande.",
+                  file=sys.stderr)
+        rapport = flotte.importer_vehicules(fichier.read_chunks(args.taille_lot))
+        for numero, erreur in rapport.erreurs:
+            print(f"Ligne {numero} rejetée : {erreur}", file=sys.stderr)
+        print(f"{rapport.lignes} véhicules {'importés' if persistant else 'validés'}, {rapport.rejets} rejetés "
+              f"en {rapport.duree:.2f}s ({rapport.lignes_par_seconde:.0f} lignes/s)")
+        return 1 if rapport.rejets else 0
+
+    repository = 'vehicule_repository' if args.entite == 'vehicules' else 'contrat_repository'
+    if not _persistant(container, repository):
+        print("Backend en mémoire : seules les données chargées par cette commande sont exportées.",
+              file=sys.stderr)
+
+    debut = time.perf_counter()
+    if args.entite == 'vehicules':
+        lignes = fichier.write(COLONNES_VEHICULE, flotte.exporter_vehicules(), args.taille_lot, TYPES_COLONNES)
+    else:
+        lignes = fichier.write(COLONNES_CONTRAT, flotte.exporter_contrats(), args.taille_lot, TYPES_COLONNES)
+    duree = time.perf_counter() - debut
+    print(f"{lignes} lignes exportées en {duree:.2f}s ({lignes / duree if duree > 0 else lignes:.0f} lignes/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
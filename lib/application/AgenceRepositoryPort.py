@@ -0,0 +1,39 @@
+from typing import Optional, List, Iterator, Tuple
+import abc
+from ..domain.agence import Agence
+
+
+class AgenceRepositoryPort(abc.ABC):
+
+    @abc.abstractmethod
+    def get_by_id(self, agence_id: int) -> Optional[Agence]:
+        pass
+
+    @abc.abstractmethod
+    def get_all(self) -> List[Agence]:
+        pass
+
+    @abc.abstractmethod
+    def iter_all(self) -> Iterator[Agence]:
+        pass
+
+    @abc.abstractmethod
+    def count_all(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def save(self, agence: Agence) -> int:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, agence_id: int) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def create_agence(self, nom: str, latitude: float, longitude: float) -> Agence:
+        pass
+
+    @abc.abstractmethod
+    def iter_nearest(self, latitude: float, longitude: float) -> Iterator[Tuple[float, Agence]]:
+        """Couples (distance en km, agence), de la plus proche à la plus éloignée."""
+        pass
@@ -1,11 +1,10 @@
-from typing import Optional, List
+from typing import Optional, List, Iterator
 import dataclasses
 import abc
 from ..domain.assurance import Assurance
 
 
 class AssuranceRepositoryPort(abc.ABC):
-    @abc.abstractmethod
     # def __init__(self):
         # if type(self) == AssuranceRepositoryPort:
             # raise Exception("Abstract classes can't be instantiated")
@@ -18,6 +17,14 @@ class AssuranceRepositoryPort(abc.ABC):
     def get_all(self) -> List[Assurance]:
         pass
 
+    @abc.abstractmethod
+    def iter_all(self) -> Iterator[Assurance]:
+        pass
+
+    @abc.abstractmethod
+    def count_all(self) -> int:
+        pass
+
     @abc.abstractmethod
     def save(self, assurance: Assurance) -> int:
         pass
@@ -33,3 +40,7 @@ class AssuranceRepositoryPort(abc.ABC):
     @abc.abstractmethod
     def create_assurance(self, nom: str) -> Assurance:
         pass
+
+    @abc.abstractmethod
+    def get_tarif(self, assurance_id: int, type_vehicule: str, duree: int) -> float:
+        pass
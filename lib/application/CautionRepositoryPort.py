@@ -0,0 +1,45 @@
+import abc
+from typing import Iterable, Iterator, Optional
+
+from ..domain.caution import MouvementCaution, SoldeCaution
+
+
+class CautionRepositoryPort(abc.ABC):
+    """Registre des cautions : les mouvements sont ajoutés, jamais modifiés ni supprimés."""
+
+    @abc.abstractmethod
+    def append(self, mouvement: MouvementCaution) -> None:
+        pass
+
+    @abc.abstractmethod
+    def append_many(self, mouvements: Iterable[MouvementCaution]) -> int:
+        pass
+
+    @abc.abstractmethod
+    def iter_all(self, contrat_id: Optional[int] = None) -> Iterator[MouvementCaution]:
+        pass
+
+    @abc.abstractmethod
+    def count_all(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def balance_by_contract(self, contrat_id: int) -> SoldeCaution:
+        pass
+
+    @abc.abstractmethod
+    def balance_by_client(self, client_id) -> SoldeCaution:
+        pass
+
+    @abc.abstractmethod
+    def outstanding_total(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def iter_outstanding(self) -> Iterator[int]:
+        pass
+
+    @abc.abstractmethod
+    def iter_outstanding_by_vehicle(self, immatriculation: str) -> Iterator[int]:
+        """Contrats du véhicule dont l'empreinte est en cours, du plus ancien au plus récent."""
+        pass
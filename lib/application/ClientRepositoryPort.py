@@ -1,6 +1,7 @@
-from typing import Optional, List
+from typing import Optional, List, Iterator, Iterable
 import abc
 from ..domain.client import Client
+from ..domain.vehicule import Vehicule
 
 class ClientRepositoryPort(abc.ABC):
     # def __init__(self):
@@ -15,10 +16,22 @@ class ClientRepositoryPort(abc.ABC):
     def get_all(self) -> List[Client]:
         pass
 
+    @abc.abstractmethod
+    def iter_all(self) -> Iterator[Client]:
+        pass
+
+    @abc.abstractmethod
+    def count_all(self) -> int:
+        pass
+
     @abc.abstractmethod
     def save(self, client: Client) -> int:
         pass
 
+    @abc.abstractmethod
+    def save_all(self, clients: Iterable[Client]) -> int:
+        pass
+
     @abc.abstractmethod
     def delete(self, client_id: int) -> bool:
         pass
@@ -39,6 +52,18 @@ class ClientRepositoryPort(abc.ABC):
     def find_with_active_rentals(self) -> List[Client]:
         pass
 
+    @abc.abstractmethod
+    def iter_with_active_rentals(self) -> Iterator[Client]:
+        pass
+
+    @abc.abstractmethod
+    def count_with_active_rentals(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def iter_historique(self, client_id: int) -> Iterator[Vehicule]:
+        pass
+
     @abc.abstractmethod
     def create_client(self, nom: str, prenom: str, permis: str, telephone: str, email: str, voitureLouer=None) -> Client:
         pass
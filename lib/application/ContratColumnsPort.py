@@ -0,0 +1,36 @@
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import abc
+from ..domain.contratLocation import ContratLocation
+
+
+class ContratColumnsPort(abc.ABC):
+    """Instantané des contrats sur lequel portent les agrégations analytiques."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def revenue_by_month(self) -> List[Tuple[str, float]]:
+        pass
+
+    @abc.abstractmethod
+    def utilization_by_type(self, debut: date, fin: date, flotte: Dict[str, int]) -> Dict[str, float]:
+        pass
+
+    @abc.abstractmethod
+    def mean_duration(self) -> float:
+        pass
+
+    @abc.abstractmethod
+    def mean_duration_by_type(self) -> Dict[str, float]:
+        pass
+
+    @abc.abstractmethod
+    def duration_histogram(self, bornes: Sequence[int]) -> List[Tuple[int, Optional[int], int]]:
+        pass
+
+
+# Construit un instantané à partir des contrats
+ContratColumnsFactory = Callable[[Iterable[ContratLocation]], ContratColumnsPort]
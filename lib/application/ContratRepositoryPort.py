@@ -1,4 +1,4 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Iterator
 from datetime import date
 import abc
 from ..domain.client import Client
@@ -19,6 +19,14 @@ class ContratRepositoryPort(abc.ABC):
     def get_all(self) -> List[ContratLocation]:
         pass
 
+    @abc.abstractmethod
+    def iter_all(self) -> Iterator[ContratLocation]:
+        pass
+
+    @abc.abstractmethod
+    def count_all(self) -> int:
+        pass
+
     @abc.abstractmethod
     def save(self, contrat: ContratLocation) -> int:
         pass
@@ -39,6 +47,14 @@ class ContratRepositoryPort(abc.ABC):
     def find_active_contracts(self, date_reference: Optional[date] = None) -> List[ContratLocation]:
         pass
 
+    @abc.abstractmethod
+    def iter_active_contracts(self, date_reference: Optional[date] = None) -> Iterator[ContratLocation]:
+        pass
+
+    @abc.abstractmethod
+    def count_active_contracts(self, date_reference: Optional[date] = None) -> int:
+        pass
+
     @abc.abstractmethod
     def close_contract(self, contrat_id: int, km_parcourus: int) -> bool:
         pass
@@ -1,6 +1,6 @@
 import abc
 import dataclasses
-from typing import Optional, List
+from typing import Optional, List, Iterator
 
 from ..domain.devis import Devis
 from ..domain.immatriculation import Immatriculation
@@ -14,6 +14,14 @@ class DevisRepositoryPort(abc.ABC):
     def get_all(self) -> List[Devis]:
         pass
 
+    @abc.abstractmethod
+    def iter_all(self) -> Iterator[Devis]:
+        pass
+
+    @abc.abstractmethod
+    def count_all(self) -> int:
+        pass
+
     @abc.abstractmethod
     def save(self, devis: Devis):
         pass
@@ -0,0 +1,32 @@
+from datetime import date
+from pathlib import Path
+from typing import Dict, Union
+import abc
+
+
+class UtilizationRollupsPort(abc.ABC):
+    """Agrégats de jours loués par véhicule (clé : immatriculation)."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def mark(self, cle, debut: date, fin: date, rented: bool = True) -> int:
+        pass
+
+    @abc.abstractmethod
+    def rented_days(self, cle, debut: date, fin: date) -> int:
+        pass
+
+    @abc.abstractmethod
+    def utilization(self, cle, debut: date, fin: date) -> float:
+        pass
+
+    @abc.abstractmethod
+    def rented_days_by_month(self, cle) -> Dict[str, int]:
+        pass
+
+    @abc.abstractmethod
+    def save(self, chemin: Union[str, Path]) -> int:
+        pass
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Iterator, Iterable
 from datetime import date
 import abc
 from ..domain.vehicule import Vehicule
@@ -8,6 +8,10 @@ class VehiculeRepositoryPort(abc.ABC):
     #     if type(self) == VehiculeRepositoryPort:
     #         raise Exception("Abstract classes can't be instantiated")
         
+    @abc.abstractmethod
+    def get_by_id(self, vehicule_id: int) -> Optional[Vehicule]:
+        pass
+
     @abc.abstractmethod
     def get_by_immatriculation(self, vehicule_id: int) -> Optional[Vehicule]:
         pass
@@ -20,10 +24,30 @@ class VehiculeRepositoryPort(abc.ABC):
     def get_available(self) -> List[Vehicule]:
         pass
 
+    @abc.abstractmethod
+    def iter_all(self) -> Iterator[Vehicule]:
+        pass
+
+    @abc.abstractmethod
+    def iter_available(self) -> Iterator[Vehicule]:
+        pass
+
+    @abc.abstractmethod
+    def count_all(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def count_available(self) -> int:
+        pass
+
     @abc.abstractmethod
     def save(self, vehicule: Vehicule) -> int:
         pass
 
+    @abc.abstractmethod
+    def save_all(self, vehicules: Iterable[Vehicule]) -> int:
+        pass
+
     @abc.abstractmethod
     def delete(self, vehicule_id: int) -> bool:
         pass
@@ -49,7 +73,8 @@ class VehiculeRepositoryPort(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def calculate_rental_cost(self, vehicule_id: int, duree: int) -> float:
+    def calculate_rental_cost(self, vehicule_id: int, duree: int, date_debut: Optional[date] = None) -> float:
+        """`date_debut` : départ prévu, pour les tarifs qui dépendent de l'anticipation."""
         pass
 
     @abc.abstractmethod
@@ -60,6 +85,32 @@ class VehiculeRepositoryPort(abc.ABC):
                          prix_max: Optional[float] = None) -> List[Vehicule]:
         pass
 
+    @abc.abstractmethod
+    def iter_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        pass
+
+    def iter_by_agence(self, agence_id: int,
+                       marque: Optional[str] = None,
+                       modele: Optional[str] = None,
+                       disponible: Optional[bool] = None,
+                       type_vehicule: Optional[str] = None,
+                       prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        """Véhicules de l'agence donnée satisfaisant les critères de `iter_by_criteria`."""
+        return (v for v in self.iter_by_criteria(marque, modele, disponible, type_vehicule, prix_max)
+                if v.agence_id == agence_id)
+
+    @abc.abstractmethod
+    def count_by_criteria(self, marque: Optional[str] = None,
+                          modele: Optional[str] = None,
+                          disponible: Optional[bool] = None,
+                          type_vehicule: Optional[str] = None,
+                          prix_max: Optional[float] = None) -> int:
+        pass
+
     @abc.abstractmethod
     def create_vehicule(self, marque: str, modele: str, annee: int,
                         immatriculation: str, kilometrage: int,
@@ -0,0 +1,382 @@
+import importlib
+import os
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional
+
+Fournisseur = Callable[['Container'], Any]
+
+# Implémentations des ports par backend, sous la forme "module:Classe". Les modules
+# relatifs sont résolus depuis ce package ; un chemin absolu permet de brancher un
+# backend externe sans modifier le code.
+BACKENDS: Dict[str, Dict[str, str]] = {
+    'memory': {
+        'vehicule_repository': '..infrastructure.InMemoryVehiculeRepository:InMemoryVehiculeRepository',
+        'client_repository': '..infrastructure.InMemoryClientRepository:InMemoryClientRepository',
+        'contrat_repository': '..infrastructure.InMemoryContratRepository:InMemoryContratRepository',
+        'devis_repository': '..infrastructure.InMemoryDevisRepository:InMemoryDevisRepository',
+        'caution_repository': '..infrastructure.InMemoryCautionRepository:InMemoryCautionRepository',
+        'assurance_repository': '..infrastructure.InMemoryAssuranceRepository:InMemoryAssuranceRepository',
+        'agence_repository': '..infrastructure.InMemoryAgenceRepository:InMemoryAgenceRepository',
+    },
+}
+
+CONFIG_PAR_DEFAUT = {
+    'REPOSITORY_BACKEND': 'memory',
+    # Surcharges ponctuelles : {'vehicule_repository': 'mon.module:MaClasse'}
+    'REPOSITORIES': {},
+    # 0 désactive le cache LRU devant le repository des véhicules
+    'VEHICULE_CACHE_MAXSIZE': 256,
+    'VEHICULE_CACHE_TTL': 60.0,
+    # Regroupement des lectures identiques simultanées des véhicules (single-flight)
+    'SINGLE_FLIGHT': True,
+    # Index de recherche plein texte approchée (trigrammes), tenu à jour par le repository
+    'SEARCH_INDEX': True,
+    # Prix journaliers dynamiques (occupation du type, anticipation, durée) dans le coût
+    # des locations ; None = POLITIQUE_PAR_DEFAUT, sinon les arguments de PolitiqueTarifaire.compiler.
+    # Incompatible avec SHARED_AVAILABILITY : l'occupation est comptée par processus
+    'DYNAMIC_PRICING': False,
+    'DYNAMIC_PRICING_POLICY': None,
+    # SharedAvailability partagée par les workers (mode pré-fork), sinon None
+    'SHARED_AVAILABILITY': None,
+    # Processus de chiffrage des devis (None = un par cœur, 0 = dans le processus appelant)
+    'PRICING_WORKERS': None,
+    'PRICING_START_METHOD': 'spawn',
+    'PRICING_CHUNK_SIZE': 512,
+    # Atelier : nombre de baies et taille maximale de la file des devis acceptés
+    'WORKSHOP_BAYS': 2,
+    'WORKSHOP_QUEUE_SIZE': 1000,
+    # Durée de vie de l'instantané en colonnes des contrats (secondes)
+    'ANALYTICS_TTL': 60.0,
+    # Agrégats journaliers d'utilisation tenus à jour par le repository des contrats,
+    # relus depuis / écrits dans UTILISATION_ROLLUPS_PATH s'il est renseigné
+    'UTILISATION_ROLLUPS': True,
+    'UTILISATION_ROLLUPS_PATH': None,
+    # Journal en ajout seul du registre des cautions (None = en mémoire uniquement)
+    'CAUTION_JOURNAL': None,
+    # Catalogue JSON des assurances et de leurs grilles tarifaires (None = catalogue livré)
+    'ASSURANCE_CATALOGUE': None,
+    # Limitation de débit des écritures par client et par route (seau à jetons) ;
+    # RATE_LIMITS : {'vehicule_bp.louer_vehicule': (capacité, jetons par seconde)},
+    # une capacité nulle désactive la limitation
+    'RATE_LIMIT_CAPACITY': 20,
+    'RATE_LIMIT_PER_SECOND': 10.0,
+    'RATE_LIMITS': {},
+    # SharedTokenBuckets partagés par les workers (mode pré-fork), sinon None
+    'SHARED_RATE_BUCKETS': None,
+    # Admission des écritures : requêtes simultanées, file d'attente et attente maximale
+    # (secondes) avant délestage en 503 ; 0 désactive le contrôle d'admission
+    'ADMISSION_MAX_IN_FLIGHT': 32,
+    'ADMISSION_QUEUE_SIZE': 64,
+    'ADMISSION_TIMEOUT': 0.05,
+    'ADMISSION_RETRY_AFTER': 1.0,
+    # Réponses mémorisées par en-tête Idempotency-Key (0 désactive) et leur durée de vie (secondes)
+    'IDEMPOTENCY_MAXSIZE': 10_000,
+    'IDEMPOTENCY_TTL': 86_400.0,
+    # Nombre maximal d'opérations par requête POST /vehicules/batch
+    'BATCH_MAX_OPERATIONS': 100,
+    # Compression négociée des réponses de lecture à partir de COMPRESSION_MIN_SIZE
+    # octets (0 désactive ETag et compression) ; variantes compressées gardées par ETag
+    'COMPRESSION_MIN_SIZE': 1024,
+    'COMPRESSION_CACHE_SIZE': 64,
+    'COMPRESSION_GZIP_LEVEL': 6,
+    'COMPRESSION_BROTLI_QUALITY': 5,
+}
+
+
+class Container:
+    """
+    Registre paresseux des dépendances de l'application.
+
+    Chaque dépendance est décrite par un fournisseur ; elle n'est construite qu'à sa
+    première résolution, puis la même instance est rendue à tous les appelants du
+    processus. Un processus issu d'un fork garde les instances déjà construites par
+    son parent (partagées en copie sur écriture) : le fork doit avoir lieu quand aucune
+    requête n'est en cours, comme le fait le serveur pré-fork.
+    """
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        self.config: Dict[str, Any] = {**CONFIG_PAR_DEFAUT, **(config or {})}
+        self._fournisseurs: Dict[str, Fournisseur] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+    def register(self, nom: str, fournisseur: Fournisseur) -> None:
+        with self._lock:
+            self._fournisseurs[nom] = fournisseur
+            self._instances.pop(nom, None)
+
+    def resolve(self, nom: str) -> Any:
+        if self._pid != os.getpid():
+            self._apres_fork()
+        try:
+            return self._instances[nom]
+        except KeyError:
+            pass
+        with self._lock:
+            if nom not in self._instances:
+                if nom not in self._fournisseurs:
+                    raise KeyError(f"Aucun fournisseur enregistré pour '{nom}'.")
+                self._instances[nom] = self._fournisseurs[nom](self)
+            return self._instances[nom]
+
+    def warm(self, *noms: str) -> 'Container':
+        """Construit d'avance les dépendances données (toutes par défaut)."""
+        for nom in noms or list(self._fournisseurs):
+            self.resolve(nom)
+        return self
+
+    def is_built(self, nom: str) -> bool:
+        return nom in self._instances
+
+    def reset(self) -> None:
+        """Oublie les instances construites ; les fournisseurs restent enregistrés."""
+        with self._lock:
+            self._instances.clear()
+
+    def _apres_fork(self) -> None:
+        # Le verrou du registre a pu être copié dans un état acquis : on repart d'un
+        # verrou neuf. Les instances héritées sont conservées ; celles qui détiennent des
+        # ressources propres au processus (pool de processus) les recréent d'elles-mêmes.
+        self._lock = threading.RLock()
+        self._instances = dict(self._instances)
+        self._pid = os.getpid()
+
+
+def _charger(chemin: str):
+    module, _, attribut = chemin.partition(':')
+    return getattr(importlib.import_module(module, __package__), attribut)
+
+
+def _implementation(nom: str) -> Fournisseur:
+    def fournir(container: Container):
+        chemin = container.config['REPOSITORIES'].get(nom)
+        if chemin is None:
+            backend = container.config['REPOSITORY_BACKEND']
+            if backend not in BACKENDS:
+                raise ValueError(f"Backend de repositories inconnu : '{backend}'")
+            chemin = BACKENDS[backend].get(nom)
+            if chemin is None:
+                raise KeyError(f"Le backend '{backend}' ne fournit pas '{nom}'.")
+        return _charger(chemin)()
+    return fournir
+
+
+# ===== Fournisseurs par défaut (les modules sont importés à la demande) =====
+
+def _vehicule_repository(container: Container):
+    repository = _implementation('vehicule_repository')(container)
+    vol = container.resolve('single_flight')
+    if vol is not None:
+        # Sous le cache : ses défauts de cache simultanés ne lisent le backend qu'une fois
+        from ..infrastructure.SingleFlightVehiculeRepository import SingleFlightVehiculeRepository
+        repository = SingleFlightVehiculeRepository(repository, vol)
+    index = container.resolve('vehicule_search')
+    if index is not None:
+        from ..infrastructure.SearchIndexVehiculeRepository import SearchIndexVehiculeRepository
+        repository = SearchIndexVehiculeRepository(repository, index)
+    maxsize = container.config['VEHICULE_CACHE_MAXSIZE']
+    if maxsize:
+        from ..infrastructure.CachedVehiculeRepository import CachedVehiculeRepository
+        repository = CachedVehiculeRepository(repository, maxsize=maxsize, ttl=container.config['VEHICULE_CACHE_TTL'])
+    politique = container.resolve('politique_tarifaire')
+    if politique is not None:
+        # Au-dessus du cache : toutes les locations et tous les retours passent par ses compteurs
+        from ..infrastructure.DynamicPricingVehiculeRepository import DynamicPricingVehiculeRepository
+        repository = DynamicPricingVehiculeRepository(repository, politique)
+    disponibilites = container.config['SHARED_AVAILABILITY']
+    if disponibilites is not None:
+        # Au-dessus du cache : le filtre de disponibilité est toujours lu dans l'état partagé
+        from ..infrastructure.SharedAvailabilityVehiculeRepository import SharedAvailabilityVehiculeRepository
+        repository = SharedAvailabilityVehiculeRepository(repository, disponibilites)
+    return repository
+
+
+def _single_flight(container: Container):
+    if not container.config['SINGLE_FLIGHT']:
+        return None
+    from ..infrastructure.SingleFlight import SingleFlight
+    return SingleFlight()
+
+
+def _vehicule_search(container: Container):
+    if not container.config['SEARCH_INDEX']:
+        return None
+    from ..infrastructure.VehiculeSearchIndex import VehiculeSearchIndex
+    return VehiculeSearchIndex()
+
+
+def _politique_tarifaire(container: Container):
+    if not container.config['DYNAMIC_PRICING']:
+        return None
+    if container.config['SHARED_AVAILABILITY'] is not None:
+        # Chaque worker ne verrait que ses propres locations : deux workers chiffreraient
+        # différemment la même demande
+        raise ValueError("DYNAMIC_PRICING n'est pas disponible avec SHARED_AVAILABILITY (mode pré-fork).")
+    from ..domain.tarification import POLITIQUE_PAR_DEFAUT, PolitiqueTarifaire
+    politique = container.config['DYNAMIC_PRICING_POLICY']
+    return POLITIQUE_PAR_DEFAUT if politique is None else PolitiqueTarifaire.compiler(**politique)
+
+
+def _utilisation_rollups(container: Container):
+    from ..infrastructure.UtilizationRollups import UtilizationRollups
+    chemin = container.config['UTILISATION_ROLLUPS_PATH']
+    if chemin is not None and os.path.exists(chemin):
+        return UtilizationRollups.load(chemin)
+    return UtilizationRollups()
+
+
+def _contrat_repository(container: Container):
+    repository = _implementation('contrat_repository')(container)
+    if container.config['UTILISATION_ROLLUPS']:
+        from ..infrastructure.RollupContratRepository import RollupContratRepository
+        repository = RollupContratRepository(repository, container.resolve('utilisation_rollups'))
+    return repository
+
+
+def _caution_repository(container: Container):
+    repository = _implementation('caution_repository')(container)
+    journal = container.config['CAUTION_JOURNAL']
+    if journal is not None:
+        repository.attach_journal(journal)
+    return repository
+
+
+def _assurance_repository(container: Container):
+    repository = _implementation('assurance_repository')(container)
+    catalogue = container.config['ASSURANCE_CATALOGUE']
+    if catalogue is not None:
+        repository.load_catalogue(catalogue)
+    return repository
+
+
+def _proposer_devis(container: Container):
+    from .use_cases.ProposerDevisUseCase import ProposerDevisUseCase
+    return ProposerDevisUseCase(container.resolve('vehicule_repository'), container.resolve('devis_repository'))
+
+
+def _restitution_vehicule(container: Container):
+    from .use_cases.restitutionVehicule import RestitutionVehicule
+    return RestitutionVehicule(container.resolve('client_repository'), container.resolve('vehicule_repository'),
+                               container.resolve('agence_repository'),
+                               container.resolve('utilisation_caution').regler_restitutions,
+                               container.resolve('contrat_repository'))
+
+
+def _vehicules_proches(container: Container):
+    from .use_cases.vehiculesProches import VehiculesProches
+    return VehiculesProches(container.resolve('agence_repository'), container.resolve('vehicule_repository'))
+
+
+def _import_export_flotte(container: Container):
+    from .use_cases.importExportFlotte import ImportExportFlotte
+    return ImportExportFlotte(container.resolve('vehicule_repository'), container.resolve('contrat_repository'))
+
+
+def _job_runner(container: Container):
+    from ..infrastructure.ProcessPoolJobRunner import ProcessPoolJobRunner
+    return ProcessPoolJobRunner(container.config['PRICING_WORKERS'], container.config['PRICING_START_METHOD'])
+
+
+def _chiffrage_devis(container: Container):
+    from .use_cases.chiffrageDevis import ChiffrageDevis
+    return ChiffrageDevis(container.resolve('devis_repository'), container.resolve('job_runner'),
+                          container.config['PRICING_CHUNK_SIZE'])
+
+
+def _atelier(container: Container):
+    from .use_cases.reparerVehicule import Atelier
+    return Atelier(container.resolve('vehicule_repository'), container.config['WORKSHOP_BAYS'],
+                   container.config['WORKSHOP_QUEUE_SIZE'])
+
+
+def _analyse_contrats(container: Container):
+    from ..infrastructure.ContratColumns import ContratColumns
+    from .use_cases.analyseContrats import AnalyseContrats
+    return AnalyseContrats(container.resolve('contrat_repository'), container.resolve('vehicule_repository'),
+                           ContratColumns.from_contrats, container.config['ANALYTICS_TTL'])
+
+
+def _utilisation_flotte(container: Container):
+    from .use_cases.utilisationFlotte import UtilisationFlotte
+    return UtilisationFlotte(container.resolve('utilisation_rollups'), container.resolve('vehicule_repository'),
+                             container.config['UTILISATION_ROLLUPS_PATH'])
+
+
+def _utilisation_caution(container: Container):
+    from .use_cases.utilisationCaution import UtilisationCaution
+    return UtilisationCaution(container.resolve('caution_repository'), container.resolve('contrat_repository'))
+
+
+def _rate_limiter(container: Container):
+    if not container.config['RATE_LIMIT_CAPACITY'] and not container.config['RATE_LIMITS']:
+        return None
+    from ..infrastructure.RateLimiter import TokenBucketLimiter
+    return TokenBucketLimiter(container.config['RATE_LIMIT_CAPACITY'], container.config['RATE_LIMIT_PER_SECOND'],
+                              container.config['RATE_LIMITS'], container.config['SHARED_RATE_BUCKETS'])
+
+
+def _admission(container: Container):
+    if not container.config['ADMISSION_MAX_IN_FLIGHT']:
+        return None
+    from ..infrastructure.AdmissionQueue import AdmissionQueue
+    return AdmissionQueue(container.config['ADMISSION_MAX_IN_FLIGHT'], container.config['ADMISSION_QUEUE_SIZE'],
+                          container.config['ADMISSION_TIMEOUT'], container.config['ADMISSION_RETRY_AFTER'])
+
+
+def _idempotency_store(container: Container):
+    if not container.config['IDEMPOTENCY_MAXSIZE']:
+        return None
+    from ..infrastructure.IdempotencyStore import IdempotencyStore
+    return IdempotencyStore(container.config['IDEMPOTENCY_MAXSIZE'], container.config['IDEMPOTENCY_TTL'])
+
+
+def _compression(container: Container):
+    if not container.config['COMPRESSION_MIN_SIZE']:
+        return None
+    from ..infrastructure.CompressionCache import CompressionCache
+    return CompressionCache(container.config['COMPRESSION_CACHE_SIZE'], container.config['COMPRESSION_GZIP_LEVEL'],
+                            container.config['COMPRESSION_BROTLI_QUALITY'])
+
+
+def create_container(config: Optional[Mapping[str, Any]] = None) -> Container:
+    container = Container(config)
+    container.register('single_flight', _single_flight)
+    container.register('vehicule_search', _vehicule_search)
+    container.register('politique_tarifaire', _politique_tarifaire)
+    container.register('vehicule_repository', _vehicule_repository)
+    container.register('contrat_repository', _contrat_repository)
+    for nom in ('client_repository', 'devis_repository', 'agence_repository'):
+        container.register(nom, _implementation(nom))
+    container.register('caution_repository', _caution_repository)
+    container.register('assurance_repository', _assurance_repository)
+    container.register('utilisation_rollups', _utilisation_rollups)
+    container.register('proposer_devis', _proposer_devis)
+    container.register('restitution_vehicule', _restitution_vehicule)
+    container.register('vehicules_proches', _vehicules_proches)
+    container.register('import_export_flotte', _import_export_flotte)
+    container.register('job_runner', _job_runner)
+    container.register('chiffrage_devis', _chiffrage_devis)
+    container.register('atelier', _atelier)
+    container.register('analyse_contrats', _analyse_contrats)
+    container.register('utilisation_flotte', _utilisation_flotte)
+    container.register('utilisation_caution', _utilisation_caution)
+    container.register('rate_limiter', _rate_limiter)
+    container.register('admission', _admission)
+    container.register('idempotency_store', _idempotency_store)
+    container.register('compression', _compression)
+    return container
+
+
+_container_par_defaut: Optional[Container] = None
+_verrou_defaut = threading.Lock()
+
+
+def default_container() -> Container:
+    """Conteneur du processus, utilisé quand aucun conteneur n'est fourni explicitement."""
+    global _container_par_defaut
+    if _container_par_defaut is None:
+        with _verrou_defaut:
+            if _container_par_defaut is None:
+                _container_par_defaut = create_container()
+    return _container_par_defaut
@@ -0,0 +1,26 @@
+from datetime import date, timedelta
+
+from flask import Blueprint, current_app, jsonify, request
+
+analytics_bp = Blueprint('analytics_bp', __name__)
+
+
+def _date(parametre: str, defaut: date) -> date:
+    valeur = request.args.get(parametre)
+    return date.fromisoformat(valeur) if valeur else defaut
+
+
+@analytics_bp.route('/analytics', methods=['GET'])
+def get_analytics():
+    try:
+        fin = _date('fin', date.today())
+        debut = _date('debut', fin - timedelta(days=30))
+    except ValueError:
+        return jsonify({'error': 'Dates attendues au format AAAA-MM-JJ'}), 400
+    try:
+        analyse = current_app.extensions['container'].resolve('analyse_contrats')
+        return jsonify(analyse.rapport(debut, fin)), 200
+    except ImportError as e:
+        return jsonify({'error': str(e)}), 501
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
@@ -1,37 +1,415 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, g, request, jsonify
 from datetime import date
+from itertools import islice
+import contextlib
+import functools
+import hashlib
+import json
+import math
+import threading
+from typing import Optional
 
 from ..VehiculeRepositoryPort import VehiculeRepositoryPort
-
-from ...infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..use_cases.sessionVehicules import SessionVehicules
+from ...domain.exceptions import NotFoundException, VehiculeNotAvailableException
+from ..serialization import dumps, dumps_many
 
 vehicule_bp = Blueprint('vehicule_bp', __name__)
 
+
+def _reponse_json(corps: bytes, status: int) -> Response:
+    return Response(corps, status=status, mimetype='application/json')
+
+
+def _pagination():
+    """Paramètres `offset` et `limit` de la requête ; None si l'un d'eux est négatif."""
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    if offset < 0 or limit is not None and limit < 0:
+        return None
+    return offset, limit
+
+
+def _paginer(vehicules):
+    """Applique `offset` et `limit` sans matérialiser tout le résultat ; None s'ils sont invalides."""
+    pagination = _pagination()
+    if pagination is None:
+        return None
+    offset, limit = pagination
+    stop = offset + limit if limit is not None else None
+    return islice(vehicules, offset, stop)
+
+
+def _pagination_invalide():
+    return jsonify({'error': 'offset and limit must be non-negative integers'}), 400
+
+
+def _criteres_recherche():
+    disponible = request.args.get('disponible')
+    return {
+        'marque': request.args.get('marque'),
+        'modele': request.args.get('modele'),
+        'disponible': disponible.lower() in ('1', 'true', 'oui') if disponible is not None else None,
+        'type_vehicule': request.args.get('type_vehicule'),
+        'prix_max': request.args.get('prix_max', type=float)
+    }
+
+# Les lectures ne sont ni limitées ni soumises à l'admission
+METHODES_LECTURE = frozenset(('GET', 'HEAD', 'OPTIONS'))
+# En-tête déclaré par le client appelant : non authentifié, il ne sert qu'à séparer
+# les clés d'idempotence de clients partageant une adresse, jamais à la limitation
+EN_TETE_CLIENT = 'X-Api-Key'
+EN_TETE_IDEMPOTENCE = 'Idempotency-Key'
+
+
+def _cle_client() -> str:
+    return request.remote_addr or '-'
+
+
+def _refus(status: int, message: str, attente: float) -> Response:
+    reponse = jsonify({'error': message})
+    reponse.status_code = status
+    reponse.headers['Retry-After'] = str(max(1, math.ceil(attente)))
+    return reponse
+
+
+@vehicule_bp.before_request
+def _admettre():
+    """
+    Limitation de débit par adresse et par route, résolution de la clé d'idempotence,
+    puis contrôle d'admission des écritures.
+
+    Un doublon est donc rejoué ou refusé sans occuper de place d'admission.
+    """
+    if request.method in METHODES_LECTURE:
+        return None
+    container = current_app.extensions['container']
+    limiteur = container.resolve('rate_limiter')
+    if limiteur is not None:
+        attente = limiteur.acquire(request.endpoint, _cle_client())
+        if attente:
+            return _refus(429, 'Too many requests', attente)
+    doublon = _resoudre_idempotence(container)
+    if doublon is not None:
+        return doublon
+    admission = container.resolve('admission')
+    if admission is not None:
+        if not admission.entrer():
+            return _refus(503, 'Server overloaded', admission.retry_after)
+        g.admission = admission
+    return None
+
+
+@vehicule_bp.teardown_request
+def _liberer_admission(exc):
+    admission = g.pop('admission', None)
+    if admission is not None:
+        admission.sortir()
+    # Clé réservée mais vue jamais exécutée (admission refusée, erreur avant la vue)
+    idempotence = g.pop('idempotence', None)
+    if idempotence is not None:
+        store, cle, entree = idempotence
+        store.abandon(cle, entree)
+
+
+@vehicule_bp.after_request
+def _compresser(reponse: Response) -> Response:
+    """
+    ETag et compression négociée (Accept-Encoding) des réponses JSON de lecture.
+
+    Les variantes compressées sont gardées par ETag : un corps qui ne change pas n'est
+    compressé qu'une fois. If-None-Match sur l'ETag courant rend 304 sans corps.
+    """
+    if (request.method not in METHODES_LECTURE or reponse.status_code != 200
+            or reponse.mimetype != 'application/json' or reponse.direct_passthrough
+            or 'Content-Encoding' in reponse.headers):
+        return reponse
+    container = current_app.extensions['container']
+    cache = container.resolve('compression')
+    if cache is None:
+        return reponse
+    corps = reponse.get_data()
+    etag = cache.etag(corps)
+    reponse.vary.add('Accept-Encoding')
+    connues = request.if_none_match
+    if connues.star_tag or etag in {e.partition('-')[0] for e in connues.as_set(include_weak=True)}:
+        reponse.set_etag(etag)
+        reponse.status_code = 304
+        reponse.set_data(b'')
+        return reponse
+    encodage = cache.choisir(request.headers.get('Accept-Encoding'))
+    if encodage is None or len(corps) < container.config['COMPRESSION_MIN_SIZE']:
+        reponse.set_etag(etag)
+        return reponse
+    # Une ETag par représentation : la variante compressée n'a pas les mêmes octets
+    reponse.set_etag(f'{etag}-{encodage}')
+    reponse.set_data(cache.get(etag, corps, encodage))
+    reponse.headers['Content-Encoding'] = encodage
+    return reponse
+
+
+def _resoudre_idempotence(container) -> Optional[Response]:
+    """
+    Réserve la clé Idempotency-Key d'une route `idempotent` avant l'admission.
+
+    :return: La réponse à rendre pour un doublon, ou None si la requête doit s'exécuter
+    """
+    cle = request.headers.get(EN_TETE_IDEMPOTENCE)
+    vue = current_app.view_functions.get(request.endpoint)
+    if not cle or not getattr(vue, 'idempotent', False):
+        return None
+    store = container.resolve('idempotency_store')
+    if store is None:
+        return None
+    cle = f"{_cle_client()}|{request.headers.get(EN_TETE_CLIENT, '')}|{cle}"
+    empreinte = hashlib.sha256(f"{request.method} {request.path}\n".encode() + request.get_data()).hexdigest()
+    entree, proprietaire = store.begin(cle, empreinte)
+    if proprietaire:
+        g.idempotence = (store, cle, entree)
+        return None
+    if entree.empreinte != empreinte:
+        return jsonify({'error': 'Idempotency-Key already used for another request'}), 422
+    if entree.reponse is None:
+        return jsonify({'error': 'Request with this Idempotency-Key still in progress'}), 409
+    status, mimetype, corps = entree.reponse
+    reponse = Response(corps, status=status, mimetype=mimetype)
+    reponse.headers['Idempotent-Replayed'] = 'true'
+    return reponse
+
+
+def idempotent(vue):
+    """
+    Rejoue la première réponse d'une requête portant le même en-tête Idempotency-Key.
+
+    La clé est propre au client (adresse et X-Api-Key) et résolue avant l'admission.
+    Un doublon reçu pendant l'exécution de l'original est refusé aussitôt (409), sans
+    attendre ; une clé réutilisée pour une autre requête est refusée (422).
+    Les erreurs serveur ne sont pas mémorisées, la requête pourra être rejouée.
+    """
+    @functools.wraps(vue)
+    def enveloppe(*args, **kwargs):
+        idempotence = g.pop('idempotence', None)
+        if idempotence is None:
+            return vue(*args, **kwargs)
+        store, cle, entree = idempotence
+        try:
+            reponse = current_app.make_response(vue(*args, **kwargs))
+        except BaseException:
+            store.abandon(cle, entree)
+            raise
+        if reponse.status_code >= 500:
+            store.abandon(cle, entree)
+        else:
+            store.complete(cle, entree, (reponse.status_code, reponse.mimetype, reponse.get_data()))
+        return reponse
+    enveloppe.idempotent = True
+    return enveloppe
+
+
+# ===== Opérations d'un lot (POST /vehicules/batch) =====
+# Chaque opération reçoit la session du lot et le dictionnaire de l'opération, et rend
+# (statut, corps JSON) comme la route équivalente.
+
+def _erreur(message: str) -> bytes:
+    return json.dumps({'error': message}).encode()
+
+
+def _message(message: str) -> bytes:
+    return json.dumps({'message': message}).encode()
+
+
+def _lot_lire(session, op):
+    vehicule = session.repository.get_by_id(op['id'])
+    return (200, dumps(vehicule)) if vehicule else (404, _erreur('Vehicule not found'))
+
+
+def _lot_creer(session, op):
+    vehicule = session.create_vehicule(op['marque'], op['modele'], op['annee'], op['immatriculation'],
+                                       op['kilometrage'], op['prix_journalier'], op['etat'], op['type_vehicule'])
+    return 201, dumps(vehicule)
+
+
+def _lot_supprimer(session, op):
+    if session.delete(op['id']):
+        return 200, _message('Vehicule deleted')
+    return 404, _erreur('Vehicule not found')
+
+
+def _lot_disponibilite(session, op):
+    if session.set_availability(op['id'], op['disponible']):
+        return 200, _message('Availability updated')
+    return 404, _erreur('Vehicule not found')
+
+
+def _lot_louer(session, op):
+    try:
+        success = session.louer_vehicule(op['id'])
+    except VehiculeNotAvailableException:
+        success = False
+    if success:
+        return 200, _message('Vehicule rented')
+    return 404, _erreur('Vehicule not available')
+
+
+def _lot_retourner(session, op):
+    if session.retourner_vehicule(op['id'], op['km_parcourus']):
+        return 200, _message('Vehicule returned')
+    return 404, _erreur('Vehicule not found')
+
+
+def _lot_cout(session, op):
+    date_debut = date.fromisoformat(op['date_debut']) if op.get('date_debut') else None
+    cout = session.repository.calculate_rental_cost(op['id'], int(op['duree']), date_debut)
+    return 200, json.dumps({'rental_cost': cout}).encode()
+
+
+def _criteres_operation(op):
+    return {cle: op.get(cle) for cle in ('marque', 'modele', 'disponible', 'type_vehicule', 'prix_max')}
+
+
+def _lot_compter(session, op):
+    return 200, json.dumps({'count': session.repository.count_by_criteria(**_criteres_operation(op))}).encode()
+
+
+def _lot_rechercher(session, op):
+    offset = op.get('offset', 0)
+    limit = op.get('limit')
+    vehicules = session.repository.iter_by_criteria(**_criteres_operation(op))
+    return 200, dumps_many(islice(vehicules, offset, offset + limit if limit is not None else None))
+
+
+OPERATIONS_LOT = {
+    'get': _lot_lire,
+    'create': _lot_creer,
+    'delete': _lot_supprimer,
+    'set_availability': _lot_disponibilite,
+    'rent': _lot_louer,
+    'return': _lot_retourner,
+    'rental_cost': _lot_cout,
+    'count': _lot_compter,
+    'search': _lot_rechercher,
+}
+
+_NON_EXECUTEE = (424, _erreur('Not executed: a previous operation failed'))
+
+
+def _executer_operation(session: SessionVehicules, op):
+    operation = OPERATIONS_LOT.get(op.get('op')) if isinstance(op, dict) else None
+    if operation is None:
+        return 400, _erreur('Unknown operation')
+    try:
+        return operation(session, op)
+    except NotFoundException:
+        return 404, _erreur('Vehicule not found')
+    except (KeyError, TypeError, ValueError) as e:
+        return 400, _erreur(f'Invalid operation: {e}')
+
+
+def _controleur() -> 'VehiculeController':
+    """Contrôleur de l'application courante, construit à la première requête."""
+    controleur = current_app.extensions.get('vehicule_controller')
+    if controleur is None:
+        container = current_app.extensions['container']
+        controleur = current_app.extensions['vehicule_controller'] = VehiculeController(
+            container.resolve('vehicule_repository'), container.resolve('single_flight'),
+            container.resolve('vehicule_search'))
+    return controleur
+
 class VehiculeController:
-    def __init__(self, repository: VehiculeRepositoryPort):
+    def __init__(self, repository: VehiculeRepositoryPort, vol=None, recherche=None):
         self.repository = repository
+        # Index plein texte tenu à jour par le repository (None s'il est désactivé)
+        self.recherche = recherche
+        # SingleFlight partagé avec le repository : lecture et sérialisation d'un même
+        # véhicule ne sont faites qu'une fois pour des requêtes simultanées
+        self.vol = vol
+        # Les lots tout-ou-rien ne s'entrelacent pas entre eux
+        self._verrou_lots = threading.Lock()
+
+    def executer_lot(self, operations, atomique: bool):
+        """
+        Exécute les opérations dans l'ordre, dans une même session du repository.
+
+        En mode atomique, la première opération en échec (statut >= 400) annule toutes
+        les précédentes et les suivantes ne sont pas exécutées.
+
+        :return: (statut HTTP, corps JSON) ; 409 si un lot atomique a été annulé
+        """
+        session = SessionVehicules(self.repository)
+        resultats = []
+        valide = True
+        with self._verrou_lots if atomique else contextlib.nullcontext():
+            try:
+                for op in operations:
+                    resultat = _executer_operation(session, op)
+                    resultats.append(resultat)
+                    if atomique and resultat[0] >= 400:
+                        valide = False
+                        break
+            except BaseException:
+                if atomique:
+                    session.annuler()
+                raise
+            if not valide:
+                session.annuler()
+        resultats += [_NON_EXECUTEE] * (len(operations) - len(resultats))
+        corps = b','.join(b'{"status":%d,"body":%s}' % resultat for resultat in resultats)
+        entete = b'{"atomic":%s,"committed":%s,"results":[' % (
+            b'true' if atomique else b'false', b'true' if valide else b'false')
+        return (200 if valide else 409), entete + corps + b']}'
+
+    def vehicule_json(self, vehicule_id: int):
+        def lire():
+            vehicule = self.repository.get_by_id(vehicule_id)
+            return dumps(vehicule) if vehicule else None
+        if self.vol is None:
+            return lire()
+        return self.vol.do(('json', vehicule_id), lire)
 
     @vehicule_bp.route('/vehicules/<int:vehicule_id>', methods=['GET'])
     def get_vehicule(vehicule_id):
-        vehicule = vehicule_controller.repository.get_by_id(vehicule_id)
-        if vehicule:
-            return jsonify(vehicule.to_dict()), 200
+        corps = _controleur().vehicule_json(vehicule_id)
+        if corps is not None:
+            return _reponse_json(corps, 200)
         return jsonify({'error': 'Vehicule not found'}), 404
 
+    @vehicule_bp.route('/vehicules/batch', methods=['POST'])
+    @idempotent
+    def batch_vehicules():
+        data = request.get_json(silent=True)
+        operations = data.get('operations') if isinstance(data, dict) else None
+        if not isinstance(operations, list):
+            return jsonify({'error': "Expected a JSON object with an 'operations' array"}), 400
+        maximum = current_app.extensions['container'].config['BATCH_MAX_OPERATIONS']
+        if len(operations) > maximum:
+            return jsonify({'error': f'At most {maximum} operations per batch'}), 413
+        status, corps = _controleur().executer_lot(operations, bool(data.get('atomic')))
+        return _reponse_json(corps, status)
+
     @vehicule_bp.route('/vehicules', methods=['GET'])
     def get_all_vehicules():
-        vehicules = vehicule_controller.repository.get_all()
-        return jsonify([vehicule.to_dict() for vehicule in vehicules]), 200
+        vehicules = _paginer(_controleur().repository.iter_all())
+        if vehicules is None:
+            return _pagination_invalide()
+        return _reponse_json(dumps_many(vehicules), 200)
 
     @vehicule_bp.route('/vehicules/available', methods=['GET'])
     def get_available_vehicules():
-        vehicules = vehicule_controller.repository.get_available()
-        return jsonify([vehicule.to_dict() for vehicule in vehicules]), 200
+        vehicules = _paginer(_controleur().repository.iter_available())
+        if vehicules is None:
+            return _pagination_invalide()
+        return _reponse_json(dumps_many(vehicules), 200)
+
+    @vehicule_bp.route('/vehicules/count', methods=['GET'])
+    def count_vehicules():
+        count = _controleur().repository.count_by_criteria(**_criteres_recherche())
+        return jsonify({'count': count}), 200
 
     @vehicule_bp.route('/vehicules', methods=['POST'])
+    @idempotent
     def create_vehicule():
         data = request.json
-        vehicule = vehicule_controller.repository.create_vehicule(
+        vehicule = _controleur().repository.create_vehicule(
             marque=data['marque'],
             modele=data['modele'],
             annee=data['annee'],
@@ -41,11 +419,11 @@ class VehiculeController:
             etat=data['etat'],
             type_vehicule=data['type_vehicule']
         )
-        return jsonify(vehicule.to_dict()), 201
+        return _reponse_json(dumps(vehicule), 201)
 
     @vehicule_bp.route('/vehicules/<int:vehicule_id>', methods=['DELETE'])
     def delete_vehicule(vehicule_id):
-        success = vehicule_controller.repository.delete(vehicule_id)
+        success = _controleur().repository.delete(vehicule_id)
         if success:
             return jsonify({'message': 'Vehicule deleted'}), 200
         return jsonify({'error': 'Vehicule not found'}), 404
@@ -53,22 +431,27 @@ class VehiculeController:
     @vehicule_bp.route('/vehicules/<int:vehicule_id>/availability', methods=['PATCH'])
     def set_availability(vehicule_id):
         data = request.json
-        success = vehicule_controller.repository.set_availability(vehicule_id, data['disponible'])
+        success = _controleur().repository.set_availability(vehicule_id, data['disponible'])
         if success:
             return jsonify({'message': 'Availability updated'}), 200
         return jsonify({'error': 'Vehicule not found'}), 404
 
     @vehicule_bp.route('/vehicules/<int:vehicule_id>/rent', methods=['POST'])
+    @idempotent
     def louer_vehicule(vehicule_id):
-        success = vehicule_controller.repository.louer_vehicule(vehicule_id)
+        try:
+            success = _controleur().repository.louer_vehicule(vehicule_id)
+        except VehiculeNotAvailableException:
+            success = False
         if success:
             return jsonify({'message': 'Vehicule rented'}), 200
         return jsonify({'error': 'Vehicule not available'}), 404
 
     @vehicule_bp.route('/vehicules/<int:vehicule_id>/return', methods=['POST'])
+    @idempotent
     def retourner_vehicule(vehicule_id):
         data = request.json
-        success = vehicule_controller.repository.retourner_vehicule(vehicule_id, data['km_parcourus'])
+        success = _controleur().repository.retourner_vehicule(vehicule_id, data['km_parcourus'])
         if success:
             return jsonify({'message': 'Vehicule returned'}), 200
         return jsonify({'error': 'Vehicule not found'}), 404
@@ -76,21 +459,55 @@ class VehiculeController:
     @vehicule_bp.route('/vehicules/<int:vehicule_id>/rental_cost', methods=['GET'])
     def calculate_rental_cost(vehicule_id):
         duree = int(request.args.get('duree'))
-        cost = vehicule_controller.repository.calculate_rental_cost(vehicule_id, duree)
+        date_debut = request.args.get('date_debut')
+        try:
+            date_debut = date.fromisoformat(date_debut) if date_debut else None
+        except ValueError:
+            return jsonify({'error': 'Invalid date_debut, expected YYYY-MM-DD'}), 400
+        cost = _controleur().repository.calculate_rental_cost(vehicule_id, duree, date_debut)
         return jsonify({'rental_cost': cost}), 200
 
     @vehicule_bp.route('/vehicules/search', methods=['GET'])
     def find_by_criteria():
-        criteria = {
-            'marque': request.args.get('marque'),
-            'modele': request.args.get('modele'),
-            'disponible': request.args.get('disponible'),
-            'type_vehicule': request.args.get('type_vehicule'),
-            'prix_max': request.args.get('prix_max')
-        }
-        vehicules = vehicule_controller.repository.find_by_criteria(**criteria)
-        return jsonify([vehicule.to_dict() for vehicule in vehicules]), 200
-
-
-repository = InMemoryVehiculeRepository()
-vehicule_controller = VehiculeController(repository)
\ No newline at end of file
+        vehicules = _paginer(_controleur().repository.iter_by_criteria(**_criteres_recherche()))
+        if vehicules is None:
+            return _pagination_invalide()
+        return _reponse_json(dumps_many(vehicules), 200)
+
+    @vehicule_bp.route('/vehicules/search/text', methods=['GET'])
+    def search_text():
+        controleur = _controleur()
+        recherche = controleur.recherche
+        if recherche is None:
+            return jsonify({'error': 'Full-text search disabled'}), 501
+        texte = request.args.get('q', '')
+        if not texte.strip():
+            return jsonify({'error': "Missing query parameter 'q'"}), 400
+        pagination = _pagination()
+        if pagination is None:
+            return _pagination_invalide()
+        offset, limit = pagination
+        criteres = _criteres_recherche()
+        # Disponibilité lue par le repository : l'objet indexé peut être périmé (état partagé)
+        resultats = recherche.search(texte, criteres['disponible'], criteres['prix_max'],
+                                     limit=min(limit if limit is not None else 20, 100), offset=offset,
+                                     disponibilite=lambda vehicule: controleur.repository.is_available(vehicule.id))
+        corps = b','.join(b'{"score":%s,"vehicule":%s}' % (repr(score).encode(), dumps(vehicule))
+                          for score, vehicule in resultats)
+        return _reponse_json(b'[' + corps + b']', 200)
+
+    @vehicule_bp.route('/vehicules/nearest', methods=['GET'])
+    def nearest_vehicules():
+        latitude = request.args.get('lat', type=float)
+        longitude = request.args.get('lon', type=float)
+        if latitude is None or longitude is None:
+            return jsonify({'error': "Missing query parameters 'lat' and 'lon'"}), 400
+        criteres = _criteres_recherche()
+        del criteres['disponible']
+        proches = current_app.extensions['container'].resolve('vehicules_proches').plus_proches(
+            latitude, longitude, k=min(request.args.get('k', 5, type=int), 100),
+            rayon_km=request.args.get('rayon_km', type=float), **criteres)
+        corps = b','.join(b'{"distance_km":%s,"agence":%s,"vehicule":%s}' % (
+            repr(round(p.distance_km, 3)).encode(), json.dumps(p.agence.to_dict()).encode(), dumps(p.vehicule))
+            for p in proches)
+        return _reponse_json(b'[' + corps + b']', 200)
@@ -0,0 +1,44 @@
+import importlib
+from typing import Any, Iterable, Mapping, Optional
+
+from ..container import Container, create_container
+
+# nom -> (module relatif, blueprint, préfixe d'URL) ; le module n'est importé que si
+# le blueprint est activé
+BLUEPRINTS = {
+    'main': ('.routes', 'main_bp', None),
+    'vehicules': ('.VehiculeController', 'vehicule_bp', '/api'),
+    'analytics': ('.AnalyticsController', 'analytics_bp', '/api'),
+}
+
+
+def create_app(config: Optional[Mapping[str, Any]] = None,
+               container: Optional[Container] = None,
+               blueprints: Optional[Iterable[str]] = None):
+    """
+    Fabrique de l'application Flask.
+
+    :param config: Valeurs ajoutées à `app.config`
+    :param container: Conteneur de dépendances ; un conteneur par défaut sinon
+    :param blueprints: Noms (clés de BLUEPRINTS) des blueprints à enregistrer, tous par défaut
+    :return: L'application ; les repositories sont construits à la première requête qui les utilise
+    """
+    from flask import Flask
+
+    app = Flask(__name__)
+    if config:
+        app.config.update(config)
+    container = container if container is not None else create_container(app.config)
+    if app.config.get('WARM_CONTAINER'):
+        # Pour un serveur à workers : tout construire avant la première requête
+        container.warm()
+    app.extensions['container'] = container
+
+    noms = app.config.get('BLUEPRINTS', BLUEPRINTS) if blueprints is None else blueprints
+    for nom in noms:
+        if nom not in BLUEPRINTS:
+            raise ValueError(f"Blueprint inconnu : '{nom}'")
+        module, attribut, prefixe = BLUEPRINTS[nom]
+        blueprint = getattr(importlib.import_module(module, __name__), attribut)
+        app.register_blueprint(blueprint, url_prefix=prefixe)
+    return app
@@ -3,32 +3,17 @@ class DevisIntrouvable(Exception):
 
 class ContratLocationException(Exception):
     pass
-class ClientInexistantException(Exception):
+class ClientInexistantException(ContratLocationException):
     pass
-class VehiculeInexistantException(Exception):
+class VehiculeInexistantException(ContratLocationException):
     pass
-class AssuranceInexistanteException(Exception):
+class AssuranceInexistanteException(ContratLocationException):
     pass
-class VehiculeNonDisponibleException(Exception):
+class VehiculeNonDisponibleException(ContratLocationException):
     pass
-class DateInvalideException(Exception):
+class DateInvalideException(ContratLocationException):
     pass
-class EnregistrementContratException(Exception):
-    pass
-
-class ContratLocationException(Exception):
-    pass
-class ClientInexistantException(Exception):
-    pass
-class VehiculeInexistantException(Exception):
-    pass
-class AssuranceInexistanteException(Exception):
-    pass
-class VehiculeNonDisponibleException(Exception):
-    pass
-class DateInvalideException(Exception):
-    pass
-class EnregistrementContratException(Exception):
+class EnregistrementContratException(ContratLocationException):
     pass
 
 class PrixDevisInvalideException(Exception):
@@ -36,3 +21,6 @@ class PrixDevisInvalideException(Exception):
 
 class VehiculeIntrouvableException(Exception):
     pass
+
+class AtelierSatureException(Exception):
+    pass
@@ -0,0 +1,127 @@
+"""
+Sérialisation JSON rapide des entités exposées par l'API.
+
+Chaque classe dispose d'un encodeur généré une fois au chargement du module : les
+clés JSON sont pré-échappées, les cas courants (chaînes répétées, entiers, flottants
+finis, booléens) sont traités en ligne et chaque champ est lu directement sur l'objet,
+sans dictionnaire intermédiaire que `json.dumps` devrait ensuite reparcourir.
+"""
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+from ..domain.contratLocation import ContratLocation
+from ..domain.immatriculation import Immatriculation
+from ..domain.vehicule import Vehicule
+
+
+class _ChainesEncodees(dict):
+    """Cache des chaînes déjà échappées (marques, modèles, états...), borné en taille."""
+
+    def __init__(self, taille_max: int = 4096):
+        super().__init__()
+        self.taille_max = taille_max
+
+    def __missing__(self, valeur) -> str:
+        if valeur.__class__ is not str:
+            return _autre(valeur)
+        if len(self) >= self.taille_max:
+            self.clear()
+        encodee = self[valeur] = encode_basestring_ascii(valeur)
+        return encodee
+
+
+def _autre(valeur) -> str:
+    return json.dumps(valeur, default=str)
+
+
+def _texte(valeur) -> str:
+    return encode_basestring_ascii(valeur if valeur.__class__ is str else str(valeur)) if valeur is not None else 'null'
+
+
+def _date(valeur) -> str:
+    return '"' + valeur.isoformat() + '"' if valeur is not None else 'null'
+
+
+# Fragments d'expression insérés dans le code généré par _compiler.
+def _chaine(attribut: str) -> str:
+    return f"S[{attribut}]"
+
+
+def _immatriculation(attribut: str) -> str:
+    return f"(E(v.formatee) if (v := {attribut}).__class__ is I else T(v))"
+
+
+def _nombre(attribut: str) -> str:
+    return f"(repr(v) if (v := {attribut}).__class__ is int or (v.__class__ is float and -INF < v < INF) else X(v))"
+
+
+def _booleen(attribut: str) -> str:
+    return f"('true' if {attribut} else 'false')"
+
+
+def _compiler(nom: str, champs: Sequence[Tuple[str, str]], **dependances) -> Callable[[object], str]:
+    """Génère `nom(o) -> str` à partir de couples (clé JSON, expression Python sur `o`)."""
+    morceaux = []
+    for i, (cle, expression) in enumerate(champs):
+        morceaux.append(repr(('{' if i == 0 else ',') + json.dumps(cle) + ':'))
+        morceaux.append(expression)
+    morceaux.append(repr('}'))
+    source = f"def {nom}(o):\n    return ''.join(({', '.join(morceaux)},))\n"
+    namespace = {
+        'S': _ChainesEncodees(), 'E': encode_basestring_ascii, 'I': Immatriculation,
+        'T': _texte, 'D': _date, 'X': _autre, 'INF': float('inf'), **dependances,
+    }
+    exec(source, namespace)
+    return namespace[nom]
+
+
+encoder_vehicule = _compiler('encoder_vehicule', [
+    ('id', 'X(o.id)'),
+    ('marque', _chaine('o.marque')),
+    ('modele', _chaine('o.modele')),
+    ('annee', _nombre('o.annee')),
+    ('immatriculation', _immatriculation('o.immatriculation')),
+    ('kilometrage', _nombre('o.kilometrage')),
+    ('prix_journalier', _nombre('o.prix_journalier')),
+    ('etat', _chaine('o.etat')),
+    ('typeVehicule', _chaine('o.typeVehicule')),
+    ('disponible', _booleen('o.disponible')),
+    ('agenceId', 'X(o.agence_id)'),
+])
+
+_encoder_client = _compiler('_encoder_client', [
+    ('id', 'X(o.id)'),
+    ('nom', _chaine('o.nom')),
+    ('prenom', _chaine('o.prenom')),
+])
+
+encoder_contrat = _compiler('encoder_contrat', [
+    ('id', 'X(o.id)'),
+    ('dateDebut', 'D(o.dateDebut)'),
+    ('dateFin', 'D(o.date_fin)'),
+    ('duree', _nombre('o.duree')),
+    ('caution', _nombre('o.caution')),
+    ('cout', _nombre('o.cout')),
+    ('etatInitialDuVehicule', _nombre('o.etatInitialDuVehicule')),
+    ('estActif', _booleen('o.est_actif')),
+    ('assurance', "(S[o.assurance.nom] if o.assurance is not None else 'null')"),
+    ('client', 'C(o.client)'),
+    ('vehicule', 'V(o.vehicule)'),
+], C=_encoder_client, V=encoder_vehicule)
+
+ENCODEURS: Dict[type, Callable[[object], str]] = {
+    Vehicule: encoder_vehicule,
+    ContratLocation: encoder_contrat,
+}
+
+
+def dumps(entite) -> bytes:
+    """Sérialise une entité connue (voir ENCODEURS) en JSON."""
+    return ENCODEURS[type(entite)](entite).encode('ascii')
+
+
+def dumps_many(entites: Iterable) -> bytes:
+    """Sérialise une séquence d'entités en tableau JSON, en un seul passage."""
+    encodeurs = ENCODEURS
+    return ('[' + ','.join([encodeurs[type(e)](e) for e in entites]) + ']').encode('ascii')
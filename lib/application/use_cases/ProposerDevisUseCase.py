@@ -2,13 +2,17 @@ import dataclasses
 from ...domain.vehicule import Vehicule
 from ...domain.devis import Devis
 from ..exceptions import VehiculeIntrouvableException, PrixDevisInvalideException
-from ...infrastructure.InMemoryDevisRepository import InMemoryDevisRepository
-from ...infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..container import default_container
+from ..DevisRepositoryPort import DevisRepositoryPort
+from ..VehiculeRepositoryPort import VehiculeRepositoryPort
 
 @dataclasses.dataclass
 class ProposerDevisUseCase:
-    vehiculeRepository: InMemoryVehiculeRepository = InMemoryVehiculeRepository()
-    devisRepository: InMemoryDevisRepository = InMemoryDevisRepository()
+    # Sans injection explicite, les repositories viennent du conteneur du processus
+    vehiculeRepository: VehiculeRepositoryPort = dataclasses.field(
+        default_factory=lambda: default_container().resolve('vehicule_repository'))
+    devisRepository: DevisRepositoryPort = dataclasses.field(
+        default_factory=lambda: default_container().resolve('devis_repository'))
 
     def proposerDevis(self, vehicule: Vehicule, prix: int) -> Devis:
         if vehicule is None:
@@ -1,11 +1,18 @@
-import pytest
+from typing import Optional
 
 from ...domain.devis import Devis
+from ...domain.prestation import Prestation
+from ..container import default_container
 from ..exceptions import DevisIntrouvable
+from .reparerVehicule import Atelier
 
 class RealiserPrestationUseCase:
-    def realiserPrestation(self, devis: Devis) -> Devis:
+    def __init__(self, atelier: Optional[Atelier] = None):
+        self.atelier = atelier if atelier is not None else default_container().resolve('atelier')
+
+    def realiserPrestation(self, devis: Devis) -> Prestation:
         if devis is None:
             raise DevisIntrouvable("Devis invalide")
         
-        # TODO: realiser prestation
+        # Le devis accepté entre dans la file de l'atelier ; il démarre dès qu'une baie est libre
+        return self.atelier.soumettre(devis)
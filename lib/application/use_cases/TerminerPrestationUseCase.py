@@ -1,12 +1,19 @@
-import pytest
+from typing import Optional
 
 from ...domain.devis import Devis
+from ...domain.prestation import Prestation
+from ..container import default_container
 from ..exceptions import DevisIntrouvable
+from .reparerVehicule import Atelier
 
 
 class TerminerPrestationUseCase:
-    def terminerPrestation(self, devis: Devis) -> Devis:
+    def __init__(self, atelier: Optional[Atelier] = None):
+        self.atelier = atelier if atelier is not None else default_container().resolve('atelier')
+
+    def terminerPrestation(self, devis: Devis) -> Prestation:
         if devis is None:
             raise DevisIntrouvable("Devis invalide")
         
-        # TODO: terminer prestation
+        # Libère la baie, remet le véhicule en location et démarre la prestation suivante
+        return self.atelier.terminer(devis)
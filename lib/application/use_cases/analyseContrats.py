@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import Counter
+from datetime import date
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..ContratColumnsPort import ContratColumnsFactory, ContratColumnsPort
+from ..ContratRepositoryPort import ContratRepositoryPort
+from ..VehiculeRepositoryPort import VehiculeRepositoryPort
+
+BORNES_DUREE = (1, 2, 4, 8, 15, 31)
+
+
+class AnalyseContrats:
+    """
+    Requêtes analytiques sur les contrats (chiffre d'affaires, utilisation, durées).
+
+    Les contrats sont copiés une fois dans un instantané construit par `colonnes` (en
+    colonnes NumPy en production), puis toutes les agrégations portent sur lui.
+    L'instantané est reconstruit quand le nombre de contrats change ou après `ttl`
+    secondes.
+    """
+
+    def __init__(self, contrat_repository: ContratRepositoryPort,
+                 vehicule_repository: VehiculeRepositoryPort,
+                 colonnes: ContratColumnsFactory,
+                 ttl: float = 60.0, horloge: Callable[[], float] = time.monotonic):
+        self.contrat_repository = contrat_repository
+        self.vehicule_repository = vehicule_repository
+        self.colonnes = colonnes
+        self.ttl = ttl
+        self._horloge = horloge
+        self._lock = threading.Lock()
+        self._instantane: Optional[ContratColumnsPort] = None
+        self._expire_a = 0.0
+
+    def instantane(self) -> ContratColumnsPort:
+        with self._lock:
+            if (self._instantane is None or self._horloge() >= self._expire_a
+                    or len(self._instantane) != self.contrat_repository.count_all()):
+                self._instantane = self.colonnes(self.contrat_repository.iter_all())
+                self._expire_a = self._horloge() + self.ttl
+            return self._instantane
+
+    def rafraichir(self) -> None:
+        with self._lock:
+            self._instantane = None
+
+    def revenus_par_mois(self) -> List[Dict]:
+        return [{'mois': mois, 'revenu': round(revenu, 2)} for mois, revenu in self.instantane().revenue_by_month()]
+
+    def utilisation_par_type(self, debut: date, fin: date) -> Dict[str, float]:
+        flotte = Counter(vehicule.typeVehicule for vehicule in self.vehicule_repository.iter_all())
+        return self.instantane().utilization_by_type(debut, fin, flotte)
+
+    def durees(self, bornes: Sequence[int] = BORNES_DUREE) -> Dict:
+        colonnes = self.instantane()
+        return {
+            'moyenne': colonnes.mean_duration(),
+            'moyenne_par_type': colonnes.mean_duration_by_type(),
+            'histogramme': [{'min': basse, 'max': haute, 'contrats': n}
+                            for basse, haute, n in colonnes.duration_histogram(bornes)],
+        }
+
+    def rapport(self, debut: date, fin: date) -> Dict:
+        """
+        Regroupe toutes les analyses pour la période donnée.
+
+        :param debut: Début de la période d'utilisation (inclus)
+        :param fin: Fin de la période d'utilisation (exclue)
+        :return: Un dictionnaire sérialisable en JSON
+        """
+        return {
+            'contrats': len(self.instantane()),
+            'revenus_par_mois': self.revenus_par_mois(),
+            'utilisation_par_type': self.utilisation_par_type(debut, fin),
+            'durees': self.durees(),
+        }
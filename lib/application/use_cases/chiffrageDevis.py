@@ -0,0 +1,88 @@
+import dataclasses
+import time
+from datetime import date
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from ..DevisRepositoryPort import DevisRepositoryPort
+from ...domain.devis import Devis
+from ...domain.tarifAtelier import Operation, chiffrer, erreur_operations
+from ...domain.vehicule import Vehicule
+
+# Forme compacte et picklable d'une demande :
+# (annee, kilometrage, type_vehicule, prix_journalier, operations, annee_reference)
+DemandeCompacte = Tuple[int, int, str, float, Tuple[Operation, ...], int]
+
+
+def _chiffrer_lot(lot: Sequence[DemandeCompacte]) -> List[Tuple[float, float]]:
+    """Exécuté dans les workers : uniquement des valeurs simples en entrée et en sortie."""
+    return [chiffrer(*demande) for demande in lot]
+
+
+@dataclasses.dataclass
+class RapportChiffrage:
+    devis: List[Devis] = dataclasses.field(default_factory=list)
+    # Véhicules dont la réparation coûterait plus que leur valeur résiduelle
+    irreparables: List[Vehicule] = dataclasses.field(default_factory=list)
+    # (rang de la demande, motif) des demandes rejetées avant chiffrage
+    erreurs: List[Tuple[int, str]] = dataclasses.field(default_factory=list)
+    duree: float = 0.0
+
+    @property
+    def rejets(self) -> int:
+        return len(self.erreurs)
+
+    @property
+    def devis_par_seconde(self) -> float:
+        return len(self.devis) / self.duree if self.duree > 0 else float(len(self.devis))
+
+
+class ChiffrageDevis:
+    """
+    Cas d'usage de chiffrage de devis d'atelier en masse.
+
+    Les demandes sont réduites à des tuples de valeurs simples, découpées en lots et
+    chiffrées par le `runner` (un pool de processus en production), puis les devis
+    sont reconstruits et enregistrés dans le processus appelant.
+    """
+
+    def __init__(self, devis_repository: DevisRepositoryPort, runner, taille_lot: int = 512):
+        self.devis_repository = devis_repository
+        self.runner = runner
+        self.taille_lot = taille_lot
+
+    def chiffrer_devis(self, demandes: Iterable[Tuple[Vehicule, Sequence[Operation]]],
+                       annee_reference: Optional[int] = None) -> RapportChiffrage:
+        """
+        Chiffre et enregistre un devis par demande.
+
+        Les opérations sont validées avant l'envoi aux workers : une demande invalide
+        est rejetée dans le rapport sans interrompre le chiffrage des autres.
+
+        :param demandes: Couples (véhicule, opérations) où une opération est (référence de pièce, quantité)
+        :param annee_reference: Année servant au calcul de la dépréciation (année courante par défaut)
+        :return: Le rapport (devis créés, véhicules non rentables à réparer, demandes rejetées, durée)
+        """
+        debut = time.perf_counter()
+        annee_reference = annee_reference or date.today().year
+        rapport = RapportChiffrage()
+        vehicules, compactes = [], []
+        for rang, (vehicule, operations) in enumerate(demandes):
+            operations = tuple(operations)
+            erreur = erreur_operations(operations)
+            if erreur is not None:
+                rapport.erreurs.append((rang, erreur))
+                continue
+            vehicules.append(vehicule)
+            compactes.append((vehicule.annee, vehicule.kilometrage, vehicule.typeVehicule,
+                              vehicule.prix_journalier, operations, annee_reference))
+
+        chiffrages = self.runner.map_chunks(_chiffrer_lot, compactes, self.taille_lot)
+
+        for vehicule, (prix, valeur) in zip(vehicules, chiffrages):
+            devis = Devis(vehicule, prix)
+            self.devis_repository.save(devis)
+            rapport.devis.append(devis)
+            if prix > valeur:
+                rapport.irreparables.append(vehicule)
+        rapport.duree = time.perf_counter() - debut
+        return rapport
@@ -0,0 +1,174 @@
+import dataclasses
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..ContratRepositoryPort import ContratRepositoryPort
+from ..VehiculeRepositoryPort import VehiculeRepositoryPort
+from ...domain.immatriculation import Immatriculation
+from ...domain.vehicule import Vehicule
+
+COLONNES_VEHICULE = ("marque", "modele", "annee", "immatriculation", "departement",
+                     "kilometrage", "prix_journalier", "etat", "type_vehicule", "disponible")
+COLONNES_CONTRAT = ("id", "client_id", "client", "immatriculation", "departement",
+                    "date_debut", "duree", "caution", "cout", "est_actif")
+# Type des colonnes non textuelles, pour les formats typés (Parquet) ; les autres sont du texte
+TYPES_COLONNES = {
+    "annee": int, "kilometrage": int, "prix_journalier": float, "disponible": bool,
+    "id": int, "client_id": int, "duree": int, "caution": float, "cout": float, "est_actif": bool,
+}
+
+_VRAI = {"1", "true", "vrai", "oui", "yes"}
+_FAUX = {"0", "false", "faux", "non", "no"}
+
+
+@dataclasses.dataclass
+class RapportTransfert:
+    lignes: int = 0
+    rejets: int = 0
+    erreurs: List[Tuple[int, str]] = dataclasses.field(default_factory=list)
+    duree: float = 0.0
+
+    @property
+    def lignes_par_seconde(self) -> float:
+        return self.lignes / self.duree if self.duree > 0 else float(self.lignes)
+
+
+class ImportExportFlotte:
+    """
+    Cas d'usage d'import et d'export en masse de la flotte.
+
+    L'import consomme des lots de lignes (dictionnaires) et les enregistre lot par lot
+    via `save_all`, de sorte que la mémoire reste bornée par la taille d'un lot.
+    Les exports sont des générateurs qui parcourent les repositories sans tout charger.
+    """
+
+    def __init__(self, vehicule_repository: VehiculeRepositoryPort,
+                 contrat_repository: Optional[ContratRepositoryPort] = None,
+                 max_erreurs: int = 1000):
+        self.vehicule_repository = vehicule_repository
+        self.contrat_repository = contrat_repository
+        self.max_erreurs = max_erreurs
+
+    def importer_vehicules(self, lots: Iterable[List[Dict]]) -> RapportTransfert:
+        """
+        Valide et enregistre les véhicules, lot par lot.
+
+        :param lots: Lots de lignes dont les clés sont COLONNES_VEHICULE
+        :return: Le rapport (lignes importées, rejets, erreurs par numéro de ligne)
+        """
+        rapport = RapportTransfert()
+        debut = time.perf_counter()
+        numero = 0
+        for lot in lots:
+            valides = []
+            vues = set()
+            for ligne in lot:
+                numero += 1
+                try:
+                    vehicule = self._vehicule_depuis_ligne(ligne)
+                    if vehicule.immatriculation in vues or \
+                            self.vehicule_repository.get_by_immatriculation(vehicule.immatriculation) is not None:
+                        raise ValueError(f"immatriculation {vehicule.immatriculation} déjà présente")
+                except KeyError as e:
+                    self._rejeter(rapport, numero, f"colonne manquante : {e.args[0]}")
+                except (TypeError, ValueError) as e:
+                    self._rejeter(rapport, numero, str(e))
+                else:
+                    vues.add(vehicule.immatriculation)
+                    valides.append(vehicule)
+            rapport.lignes += self.vehicule_repository.save_all(valides)
+        rapport.duree = time.perf_counter() - debut
+        return rapport
+
+    def exporter_vehicules(self) -> Iterator[Dict]:
+        for vehicule in self.vehicule_repository.iter_all():
+            # Les véhicules créés par l'API ont une immatriculation en simple chaîne
+            immatriculation = vehicule.immatriculation
+            yield {
+                "marque": vehicule.marque,
+                "modele": vehicule.modele,
+                "annee": vehicule.annee,
+                "immatriculation": getattr(immatriculation, 'identifiant', str(immatriculation)),
+                "departement": getattr(immatriculation, 'departement', None),
+                "kilometrage": vehicule.kilometrage,
+                "prix_journalier": vehicule.prix_journalier,
+                "etat": vehicule.etat,
+                "type_vehicule": vehicule.typeVehicule,
+                "disponible": vehicule.disponible,
+            }
+
+    def exporter_contrats(self) -> Iterator[Dict]:
+        if self.contrat_repository is None:
+            raise ValueError("Aucun repository de contrats n'a été fourni pour l'export.")
+        for contrat in self.contrat_repository.iter_all():
+            immatriculation = contrat.vehicule.immatriculation
+            yield {
+                "id": contrat.id,
+                "client_id": getattr(contrat.client, 'id', None),
+                "client": f"{contrat.client.nom} {contrat.client.prenom}",
+                "immatriculation": getattr(immatriculation, 'identifiant', str(immatriculation)),
+                "departement": getattr(immatriculation, 'departement', None),
+                "date_debut": contrat.dateDebut.isoformat(),
+                "duree": contrat.duree,
+                "caution": contrat.caution,
+                "cout": contrat.cout,
+                "est_actif": contrat.est_actif,
+            }
+
+    # ===== Validation =====
+
+    def _rejeter(self, rapport: RapportTransfert, numero: int, erreur: str) -> None:
+        rapport.rejets += 1
+        if len(rapport.erreurs) < self.max_erreurs:
+            rapport.erreurs.append((numero, erreur))
+
+    @staticmethod
+    def _texte(ligne: Dict, colonne: str) -> str:
+        valeur = ligne[colonne]
+        if valeur is None or not str(valeur).strip():
+            raise ValueError(f"colonne '{colonne}' vide")
+        return str(valeur).strip()
+
+    @staticmethod
+    def _entier_positif(ligne: Dict, colonne: str) -> int:
+        valeur = int(ligne[colonne])
+        if valeur < 0:
+            raise ValueError(f"colonne '{colonne}' négative")
+        return valeur
+
+    @staticmethod
+    def _booleen(valeur, defaut: bool = True) -> bool:
+        if isinstance(valeur, bool):
+            return valeur
+        texte = "" if valeur is None else str(valeur).strip().lower()
+        if not texte:
+            return defaut
+        if texte in _VRAI:
+            return True
+        if texte in _FAUX:
+            return False
+        raise ValueError(f"valeur booléenne invalide : '{valeur}'")
+
+    def _immatriculation(self, ligne: Dict):
+        """Immatriculation de la ligne ; simple chaîne sans département, comme à l'export."""
+        identifiant = self._texte(ligne, "immatriculation")
+        departement = ligne["departement"]
+        if departement is None or not str(departement).strip():
+            return identifiant
+        return Immatriculation(identifiant, str(departement).strip())
+
+    def _vehicule_depuis_ligne(self, ligne: Dict) -> Vehicule:
+        prix_journalier = float(ligne["prix_journalier"])
+        if prix_journalier < 0:
+            raise ValueError("colonne 'prix_journalier' négative")
+        return Vehicule(
+            marque=self._texte(ligne, "marque"),
+            modele=self._texte(ligne, "modele"),
+            annee=self._entier_positif(ligne, "annee"),
+            immatriculation=self._immatriculation(ligne),
+            kilometrage=self._entier_positif(ligne, "kilometrage"),
+            prix_journalier=prix_journalier,
+            etat=self._texte(ligne, "etat"),
+            typeVehicule=self._texte(ligne, "type_vehicule"),
+            disponible=self._booleen(ligne.get("disponible")),
+        )
@@ -0,0 +1,198 @@
+import dataclasses
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..VehiculeRepositoryPort import VehiculeRepositoryPort
+from ..exceptions import AtelierSatureException, DevisIntrouvable
+from ...domain.devis import Devis
+from ...domain.exceptions import VehiculeNotEligibleForDevisException
+from ...domain.prestation import EN_ATTENTE, EN_COURS, Prestation
+
+
+@dataclasses.dataclass
+class MetriquesAtelier:
+    profondeur_file: int = 0
+    profondeur_max: int = 0
+    en_cours: int = 0
+    terminees: int = 0
+    annulees: int = 0
+    attente_moyenne: float = 0.0
+    attente_max: float = 0.0
+    # Part du temps d'ouverture pendant laquelle les baies ont travaillé (0 à 1)
+    utilisation_baies: float = 0.0
+
+
+class Atelier:
+    """
+    Pipeline des prestations d'atelier.
+
+    Les devis acceptés entrent dans une file bornée, triée par coût d'immobilisation
+    décroissant (les véhicules qui rapportent le plus repartent en premier, à coût égal
+    dans l'ordre d'arrivée), puis sont répartis sur `nb_baies` baies. Un véhicule est
+    indisponible à la location dès son entrée en file et ne le redevient qu'à la fin de
+    sa dernière prestation active. Un véhicule loué ou volé n'entre pas à l'atelier.
+    """
+
+    def __init__(self, vehicule_repository: VehiculeRepositoryPort, nb_baies: int = 2,
+                 capacite_file: int = 1000, horloge: Callable[[], float] = time.monotonic):
+        if nb_baies < 1:
+            raise ValueError("L'atelier doit avoir au moins une baie.")
+        self.vehicule_repository = vehicule_repository
+        self.nb_baies = nb_baies
+        self.capacite_file = capacite_file
+        self._horloge = horloge
+        self._lock = threading.Lock()
+        self._file: List[Tuple[float, int, Prestation]] = []
+        self._sequence = itertools.count()
+        self._baies_libres = list(range(1, nb_baies + 1))
+        self._en_cours: Dict[int, Prestation] = {}
+        self._actives: Dict[object, Prestation] = {}
+        # Immatriculation -> nombre de prestations actives (en file ou en cours) du véhicule
+        self._par_vehicule: Dict[object, int] = {}
+        self._en_attente = 0
+        self._ouverture = horloge()
+        self._metriques = MetriquesAtelier()
+        self._somme_attente = 0.0
+        self._demarrees = 0
+        self._occupation = 0.0
+
+    @staticmethod
+    def cout_immobilisation(devis: Devis) -> float:
+        """Recette perdue par jour d'immobilisation du véhicule."""
+        return devis.vehicule.prix_journalier
+
+    # ===== Transitions =====
+
+    def soumettre(self, devis: Devis) -> Prestation:
+        """
+        Place un devis accepté dans la file et démarre les prestations si des baies sont libres.
+
+        :param devis: Le devis accepté
+        :return: La prestation (déjà en cours si une baie était libre)
+        :raises VehiculeNotEligibleForDevisException: Si le véhicule est loué ou volé
+        """
+        if devis is None:
+            raise DevisIntrouvable("Devis invalide")
+        vehicule = devis.vehicule
+        with self._lock:
+            prestation = self._actives.get(devis.id)
+            if prestation is not None:
+                return prestation
+            if self._en_attente >= self.capacite_file:
+                raise AtelierSatureException(f"File de l'atelier pleine ({self.capacite_file} prestations).")
+            # Déjà à l'atelier, il est indisponible pour cette raison ; sinon il doit être disponible
+            if not self._par_vehicule.get(vehicule.immatriculation) and not self._eligible(vehicule):
+                raise VehiculeNotEligibleForDevisException(
+                    f"Le véhicule {vehicule.immatriculation} est loué ou volé : il ne peut pas entrer à l'atelier.")
+            prestation = Prestation(devis, self.cout_immobilisation(devis), self._horloge())
+            self._actives[devis.id] = prestation
+            self._par_vehicule[vehicule.immatriculation] = self._par_vehicule.get(vehicule.immatriculation, 0) + 1
+            heapq.heappush(self._file, (-prestation.cout_immobilisation, next(self._sequence), prestation))
+            self._en_attente += 1
+            self._metriques.profondeur_max = max(self._metriques.profondeur_max, self._en_attente)
+            self._demarrer_suivantes()
+        self._rendre_disponible(prestation, False)
+        return prestation
+
+    def terminer(self, devis: Devis) -> Prestation:
+        """
+        Termine la prestation en cours du devis et libère sa baie ; le véhicule est remis
+        en location si c'était sa dernière prestation active.
+        """
+        if devis is None:
+            raise DevisIntrouvable("Devis invalide")
+        with self._lock:
+            prestation = self._actives.get(devis.id)
+            if prestation is None:
+                raise DevisIntrouvable(f"Aucune prestation active pour le devis {devis.id}")
+            prestation.terminer(self._horloge())
+            self._liberer(prestation)
+            derniere = self._sortir(prestation)
+            self._metriques.terminees += 1
+            self._demarrer_suivantes()
+        self._rendre_disponible(prestation, derniere, etat="Nickel")
+        return prestation
+
+    def annuler(self, devis: Devis) -> Prestation:
+        with self._lock:
+            prestation = self._actives.get(devis.id)
+            if prestation is None:
+                raise DevisIntrouvable(f"Aucune prestation active pour le devis {devis.id}")
+            etat = prestation.etat
+            prestation.annuler(self._horloge())
+            if etat == EN_COURS:
+                self._liberer(prestation)
+            else:
+                # Retirée de la file au moment où elle en sortirait
+                del self._actives[devis.id]
+                self._en_attente -= 1
+            derniere = self._sortir(prestation)
+            self._metriques.annulees += 1
+            self._demarrer_suivantes()
+        if derniere:
+            self._rendre_disponible(prestation, True)
+        return prestation
+
+    def prestation(self, devis: Devis) -> Optional[Prestation]:
+        return self._actives.get(devis.id)
+
+    def _demarrer_suivantes(self) -> None:
+        while self._baies_libres and self._file:
+            _, _, prestation = heapq.heappop(self._file)
+            if prestation.etat != EN_ATTENTE:
+                continue
+            self._en_attente -= 1
+            baie = heapq.heappop(self._baies_libres)
+            prestation.demarrer(baie, self._horloge())
+            self._en_cours[baie] = prestation
+            attente = prestation.attente
+            self._demarrees += 1
+            self._somme_attente += attente
+            self._metriques.attente_max = max(self._metriques.attente_max, attente)
+
+    def _liberer(self, prestation: Prestation) -> None:
+        del self._en_cours[prestation.baie]
+        del self._actives[prestation.devis.id]
+        heapq.heappush(self._baies_libres, prestation.baie)
+        self._occupation += prestation.fin - prestation.debut
+
+    def _eligible(self, vehicule) -> bool:
+        # État à jour du repository ; un véhicule qu'il ne connaît pas encore est pris tel quel
+        enregistre = self.vehicule_repository.get_by_immatriculation(vehicule.immatriculation)
+        courant = enregistre if enregistre is not None else vehicule
+        return courant.disponible and courant.etat != "Volé"
+
+    def _sortir(self, prestation: Prestation) -> bool:
+        """Retire la prestation du compte de son véhicule ; True si c'était la dernière."""
+        cle = prestation.vehicule.immatriculation
+        restantes = self._par_vehicule[cle] - 1
+        if restantes:
+            self._par_vehicule[cle] = restantes
+        else:
+            del self._par_vehicule[cle]
+        return not restantes
+
+    def _rendre_disponible(self, prestation: Prestation, disponible: bool, etat: Optional[str] = None) -> None:
+        vehicule = prestation.vehicule
+        vehicule.disponible = disponible
+        if etat is not None:
+            vehicule.etat = etat
+        self.vehicule_repository.save(vehicule)
+
+    # ===== Instrumentation =====
+
+    def metriques(self) -> MetriquesAtelier:
+        with self._lock:
+            maintenant = self._horloge()
+            occupation = self._occupation + sum(maintenant - p.debut for p in self._en_cours.values())
+            ouverture = maintenant - self._ouverture
+            return dataclasses.replace(
+                self._metriques,
+                profondeur_file=self._en_attente,
+                en_cours=len(self._en_cours),
+                attente_moyenne=self._somme_attente / self._demarrees if self._demarrees else 0.0,
+                utilisation_baies=occupation / (self.nb_baies * ouverture) if ouverture > 0 else 0.0,
+            )
@@ -1,9 +1,34 @@
+from ..AgenceRepositoryPort import AgenceRepositoryPort
 from ..ClientRepositoryPort import ClientRepositoryPort
+from ..ContratRepositoryPort import ContratRepositoryPort
 from ..VehiculeRepositoryPort import VehiculeRepositoryPort
 
-from typing import Optional
+import dataclasses
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from ...domain.exceptions import NotFoundException
 from ...domain.vehicule import Vehicule
 
+# Saisie normalisée (minuscules) -> état enregistré sur le véhicule
+ETATS_RESTITUTION = {
+    "nickel": "Nickel",
+    "sale": "Sale",
+    "endommagé": "Endommagé",
+    "volé": "Volé",
+}
+
+
+@dataclasses.dataclass
+class ResultatRestitution:
+    client_id: int
+    vehicule_id: object
+    vehicule: Optional[Vehicule] = None
+    erreur: Optional[str] = None
+
+    @property
+    def succes(self) -> bool:
+        return self.erreur is None
+
 class RestitutionVehicule:
 
     """
@@ -13,19 +38,32 @@ class RestitutionVehicule:
       - sale
       - endommagé
       - volé
+
+    Le véhicule peut être rendu dans une autre agence que celle de départ : il y est
+    alors rattaché. Avec `contrat_repository`, le contrat en cours du véhicule est clôturé
+    (ce qui libère les jours non consommés des agrégats d'utilisation) ; avec `reglement`
+    (`UtilisationCaution.regler_restitutions` dans le conteneur), les cautions des
+    véhicules restitués sont réglées dans la foulée.
     """
 
     def __init__(self,
                  client_repository: ClientRepositoryPort,
-                 vehicule_repository: VehiculeRepositoryPort):
+                 vehicule_repository: VehiculeRepositoryPort,
+                 agence_repository: Optional[AgenceRepositoryPort] = None,
+                 reglement: Optional[Callable[[List['ResultatRestitution']], Any]] = None,
+                 contrat_repository: Optional[ContratRepositoryPort] = None):
         self.client_repository = client_repository
         self.vehicule_repository = vehicule_repository
+        self.agence_repository = agence_repository
+        self.reglement = reglement
+        self.contrat_repository = contrat_repository
 
     def restituer_vehicule(self,
                            client_id: int,
                            vehicule_id: int,
                            km_parcourus: int,
-                           etat_restitution: str) -> Optional[Vehicule]:
+                           etat_restitution: str,
+                           agence_id: Optional[int] = None) -> Optional[Vehicule]:
         """
         Permet de gérer la restitution d'un véhicule par un client.
 
@@ -33,23 +71,27 @@ class RestitutionVehicule:
         :param vehicule_id: L'ID du véhicule retourné
         :param km_parcourus: Le nombre de kilomètres effectués depuis la location
         :param etat_restitution: Valeur parmi ("nickel", "sale", "endommagé", "volé")
+        :param agence_id: L'ID de l'agence où le véhicule est rendu (None : inchangée)
         :return: L'objet Vehicule mis à jour, ou None s'il y a une erreur
         """
 
         # 1. Récupérer le client et le véhicule via les repositories
         client = self.client_repository.get_by_id(client_id)
-        vehicule = self.vehicule_repository.get_by_immatriculation(vehicule_id)
+        vehicule = self.vehicule_repository.get_by_id(vehicule_id)
 
         if not client or not vehicule:
             print("Restitution échouée : client ou véhicule introuvable.")
             return None
 
         # 2. Vérifier que le client a bien loué ce véhicule
-        #    (i.e. qu'il se trouve dans historique_locations)
-        if vehicule not in client.historique_locations:
+        #    (i.e. qu'il se trouve dans ses locations en cours)
+        if not client.a_en_location(vehicule):
             print("Restitution échouée : ce véhicule n'est pas loué par ce client.")
             return None
-            
+
+        if agence_id is not None and self._agence(agence_id) is None:
+            print(f"Restitution échouée : agence {agence_id} introuvable.")
+            return None
 
         # 3. Mettre à jour l'état du véhicule selon l’état constaté au retour
         #    On imagine que l’attribut `etat` du véhicule peut prendre des valeurs
@@ -80,15 +122,126 @@ class RestitutionVehicule:
         # 5. Rendre le véhicule de nouveau disponible, sauf si volé
         if vehicule.etat != "Volé":
             vehicule.disponible = True
+            if agence_id is not None:
+                vehicule.agence_id = agence_id
 
-        # 6. Retirer le véhicule de l’historique des locations du client
-        client.historique_locations.remove(vehicule)
+        # 6. Retirer le véhicule des locations en cours du client
+        client.retirer_location(vehicule)
 
         # 7. Persister les changements dans les repositories
         self.vehicule_repository.save(vehicule)
         self.client_repository.save(client)
 
-        # 8. Retourner l’objet véhicule mis à jour
+        # 8. Clôturer le contrat puis régler sa caution (prélèvement selon l'état, libération du reste)
+        resultats = [ResultatRestitution(client_id, vehicule_id, vehicule)]
+        self._cloturer(resultats, {vehicule_id: km_parcourus})
+        self._regler(resultats)
+
+        # 9. Retourner l’objet véhicule mis à jour
         print(f"Le véhicule {vehicule.marque} {vehicule.modele} (ID: {vehicule.immatriculation}) "
               f"a été restitué par {client.nom} {client.prenom} avec l'état '{vehicule.etat}'.")
         return vehicule
+
+    def restituer_vehicules(self,
+                            restitutions: Iterable[Tuple]) -> List[ResultatRestitution]:
+        """
+        Traite une vague de restitutions en une seule unité de travail.
+
+        Les restitutions sont regroupées par client : chaque client et chaque véhicule
+        n'est lu qu'une fois, l'appartenance est vérifiée en O(1) et toutes les
+        modifications sont persistées à la fin par un seul `save_all` par repository.
+
+        :param restitutions: Tuples (client_id, vehicule_id, km_parcourus, etat_restitution),
+            suivis de l'ID de l'agence de retour s'il change
+        :return: Un résultat par restitution, dans l'ordre d'entrée
+        """
+        resultats: List[ResultatRestitution] = []
+        par_client: Dict[int, List[Tuple[ResultatRestitution, int, str, Optional[int]]]] = defaultdict(list)
+        km_par_vehicule: Dict[object, int] = {}
+
+        for client_id, vehicule_id, km_parcourus, etat_restitution, *agence in restitutions:
+            resultat = ResultatRestitution(client_id, vehicule_id)
+            resultats.append(resultat)
+            etat = ETATS_RESTITUTION.get(etat_restitution.lower())
+            if etat is None:
+                resultat.erreur = f"État de restitution non reconnu : {etat_restitution}"
+                continue
+            agence_id = agence[0] if agence else None
+            if agence_id is not None and self._agence(agence_id) is None:
+                resultat.erreur = "Agence introuvable."
+                continue
+            par_client[client_id].append((resultat, km_parcourus, etat, agence_id))
+
+        vehicules_modifies: Set[Vehicule] = set()
+        clients_modifies = []
+        for client_id, restitutions_client in par_client.items():
+            client = self._lire(self.client_repository.get_by_id, client_id)
+            if not client:
+                for resultat, *_ in restitutions_client:
+                    resultat.erreur = "Client introuvable."
+                continue
+
+            client_modifie = False
+            for resultat, km_parcourus, etat, agence_id in restitutions_client:
+                vehicule = self._lire(self.vehicule_repository.get_by_id, resultat.vehicule_id)
+                if not vehicule:
+                    resultat.erreur = "Véhicule introuvable."
+                    continue
+                if not client.retirer_location(vehicule):
+                    resultat.erreur = "Ce véhicule n'est pas loué par ce client."
+                    continue
+
+                vehicule.etat = etat
+                vehicule.kilometrage += km_parcourus
+                if etat != "Volé":
+                    vehicule.disponible = True
+                    if agence_id is not None:
+                        vehicule.agence_id = agence_id
+                client_modifie = True
+                km_par_vehicule[resultat.vehicule_id] = km_parcourus
+                vehicules_modifies.add(vehicule)
+                resultat.vehicule = vehicule
+
+            if client_modifie:
+                clients_modifies.append(client)
+
+        # Un seul enregistrement groupé par repository
+        self.vehicule_repository.save_all(vehicules_modifies)
+        self.client_repository.save_all(clients_modifies)
+        # Puis la clôture des contrats et un seul règlement des cautions pour toute la vague
+        self._cloturer(resultats, km_par_vehicule)
+        self._regler(resultats)
+
+        reussies = sum(1 for r in resultats if r.succes)
+        print(f"Restitution en lot : {reussies}/{len(resultats)} véhicules restitués.")
+        return resultats
+
+    def _cloturer(self, resultats: List[ResultatRestitution], km_par_vehicule: Dict[object, int]) -> None:
+        """Clôture le contrat actif de chaque véhicule restitué avec succès, pour son client."""
+        if self.contrat_repository is None:
+            return
+        for resultat in resultats:
+            if not resultat.succes:
+                continue
+            for contrat in self.contrat_repository.find_by_vehicule(resultat.vehicule.id):
+                if contrat.est_actif and getattr(contrat.client, 'id', None) == resultat.client_id:
+                    self.contrat_repository.close_contract(contrat.id, km_par_vehicule[resultat.vehicule_id])
+
+    def _regler(self, resultats: List[ResultatRestitution]) -> None:
+        if self.reglement is None or not any(resultat.succes for resultat in resultats):
+            return
+        rapport = self.reglement(resultats)
+        for identifiant, erreur in rapport.erreurs:
+            print(f"Caution non réglée ({identifiant}) : {erreur}")
+
+    def _agence(self, agence_id: int):
+        if self.agence_repository is None:
+            return None
+        return self._lire(self.agence_repository.get_by_id, agence_id)
+
+    @staticmethod
+    def _lire(lecture, identifiant):
+        try:
+            return lecture(identifiant)
+        except NotFoundException:
+            return None
@@ -0,0 +1,107 @@
+import dataclasses
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from ..VehiculeRepositoryPort import VehiculeRepositoryPort
+from ...domain.exceptions import NotFoundException
+from ...domain.vehicule import Vehicule
+
+T = TypeVar('T')
+
+
+class SessionVehicules:
+    """
+    Suite d'opérations sur le repository des véhicules, annulable en bloc.
+
+    Chaque mutation garde une copie du véhicule concerné avant et après l'opération.
+    `annuler` reprend ces copies dans l'ordre inverse et ne rétablit que les champs que
+    la session a modifiés, et seulement s'ils ont encore la valeur qu'elle a écrite :
+    une modification concurrente faite hors de la session (route unitaire, autre
+    processus) n'est jamais écrasée et est signalée comme conflit. Les véhicules créés
+    par la session sont supprimés. Les lectures passent directement par `repository`.
+    """
+
+    def __init__(self, repository: VehiculeRepositoryPort):
+        self.repository = repository
+        # (copie d'avant, ou None pour un véhicule créé par la session ;
+        #  copie d'après, ou None pour un véhicule supprimé ; son ID)
+        self._journal: List[Tuple[Optional[Vehicule], Optional[Vehicule], object]] = []
+
+    @property
+    def mutations(self) -> int:
+        return len(self._journal)
+
+    def _lire(self, vehicule_id) -> Optional[Vehicule]:
+        try:
+            return self.repository.get_by_id(vehicule_id)
+        except NotFoundException:
+            return None
+
+    def _copie(self, vehicule_id) -> Optional[Vehicule]:
+        vehicule = self._lire(vehicule_id)
+        return dataclasses.replace(vehicule) if vehicule is not None else None
+
+    def _muter(self, vehicule_id, mutation: Callable[[], T]) -> T:
+        vehicule = self.repository.get_by_id(vehicule_id)
+        if vehicule is None:
+            return mutation()
+        avant = dataclasses.replace(vehicule)
+        try:
+            return mutation()
+        finally:
+            self._journal.append((avant, self._copie(vehicule_id), vehicule_id))
+
+    def create_vehicule(self, marque: str, modele: str, annee: int, immatriculation, kilometrage: int,
+                        prix_journalier: float, etat: str, type_vehicule: str) -> Vehicule:
+        vehicule = self.repository.create_vehicule(marque, modele, annee, immatriculation,
+                                                   kilometrage, prix_journalier, etat, type_vehicule)
+        self._journal.append((None, dataclasses.replace(vehicule), vehicule.id))
+        return vehicule
+
+    def delete(self, vehicule_id) -> bool:
+        return self._muter(vehicule_id, lambda: self.repository.delete(vehicule_id))
+
+    def set_availability(self, vehicule_id, disponible: bool) -> bool:
+        return self._muter(vehicule_id, lambda: self.repository.set_availability(vehicule_id, disponible))
+
+    def louer_vehicule(self, vehicule_id) -> bool:
+        return self._muter(vehicule_id, lambda: self.repository.louer_vehicule(vehicule_id))
+
+    def retourner_vehicule(self, vehicule_id, km_parcourus: int) -> bool:
+        return self._muter(vehicule_id, lambda: self.repository.retourner_vehicule(vehicule_id, km_parcourus))
+
+    def annuler(self) -> List[Tuple[object, str]]:
+        """
+        Défait les mutations de la session, de la dernière à la première.
+
+        :return: Les (ID, champ) laissés en l'état parce qu'ils ont été modifiés depuis
+            hors de la session ; le champ vaut "*" pour un véhicule supprimé ou recréé
+        """
+        conflits: List[Tuple[object, str]] = []
+        while self._journal:
+            avant, apres, vehicule_id = self._journal.pop()
+            actuel = self._lire(vehicule_id)
+            if avant is None:
+                if actuel is not None:
+                    self.repository.delete(vehicule_id)
+                continue
+            if apres is None or actuel is None:
+                # Supprimé par la session : recréé seulement s'il n'existe toujours pas
+                if apres is None and actuel is None:
+                    self.repository.save(avant)
+                else:
+                    conflits.append((vehicule_id, "*"))
+                continue
+            restaures = 0
+            for champ in dataclasses.fields(avant):
+                ecrit = getattr(apres, champ.name)
+                if getattr(avant, champ.name) == ecrit:
+                    continue
+                if getattr(actuel, champ.name) != ecrit:
+                    conflits.append((vehicule_id, champ.name))
+                    continue
+                # Restauration sur place : les références déjà distribuées restent valables
+                setattr(actuel, champ.name, getattr(avant, champ.name))
+                restaures += 1
+            if restaures:
+                self.repository.save(actuel)
+        return conflits
@@ -1,20 +1,40 @@
 # lib/use_cases/locationVehicule/signerContratDeLocation.py
 from datetime import date, timedelta
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Iterator, Mapping
 
 # Importation des exceptions depuis le fichier séparé
 from ..exceptions import (
-    ContratLocationError, ClientInexistantError, VehiculeInexistantError,
-    AssuranceInexistanteError, VehiculeNonDisponibleError, DateInvalideError,
-    EnregistrementContratError
+    ContratLocationException, ClientInexistantException, VehiculeInexistantException,
+    AssuranceInexistanteException, VehiculeNonDisponibleException, DateInvalideException,
+    EnregistrementContratException
 )
 
 # Importations des entités et repositories
 from ...domain.contratLocation import ContratLocation
-from ...application.ClientRepositoryPort import ClientRepository
-from ...application.VehiculeRepositoryPort import VehiculeRepository
-from ...application.AssuranceRepositoryPort import AssuranceRepository
-from ...application.ContratRepositoryPort import ContratRepository
+from ...domain.exceptions import NotFoundException, VehiculeNotAvailableException
+from ..VehiculeRepositoryPort import VehiculeRepositoryPort
+from .utilisationCaution import UtilisationCaution
+from ..container import Container, default_container
+
+
+class _Repositories(Mapping):
+    """Vue des repositories du conteneur, résolus seulement à leur première utilisation."""
+
+    CLES = ('client', 'vehicule', 'assurance', 'contrat', 'caution')
+
+    def __init__(self, container: Container):
+        self.container = container
+
+    def __getitem__(self, cle: str) -> Any:
+        if cle not in self.CLES:
+            raise KeyError(cle)
+        return self.container.resolve(f'{cle}_repository')
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.CLES)
+
+    def __len__(self) -> int:
+        return len(self.CLES)
 
 
 class SignerContratDeLocation:
@@ -25,7 +45,8 @@ class SignerContratDeLocation:
     
     @staticmethod
     def main(client_id: int, vehicule_id: int, date_debut: date, duree: int, 
-             assurance_id: Optional[int] = None) -> ContratLocation:
+             assurance_id: Optional[int] = None,
+             container: Optional[Container] = None) -> ContratLocation:
         """
         Point d'entrée de l'application - Couche de présentation (UI/API)
         
@@ -35,6 +56,7 @@ class SignerContratDeLocation:
             date_debut: Date de début de la location
             duree: Durée de location en jours
             assurance_id: Identifiant de l'assurance (optionnel)
+            container: Conteneur fournissant les repositories (celui du processus par défaut)
             
         Returns:
             Le contrat de location créé
@@ -49,7 +71,7 @@ class SignerContratDeLocation:
             SignerContratDeLocation._valider_parametres_entree(date_debut, duree)
             
             # 2. INITIALISATION - Couche de données
-            repositories = SignerContratDeLocation._initialiser_repositories()
+            repositories = SignerContratDeLocation._initialiser_repositories(container)
             
             # 3. LOGIQUE MÉTIER - Couche du milieu
             contrat = SignerContratDeLocation._executer_logique_contrat(
@@ -61,18 +83,18 @@ class SignerContratDeLocation:
             
             return contrat
             
-        except (ClientInexistantError, VehiculeInexistantError, 
-                AssuranceInexistanteError, VehiculeNonDisponibleError, 
-                DateInvalideError, EnregistrementContratError) as e:
-            # Ces exceptions sont déjà des sous-classes de ContratLocationError
+        except (ClientInexistantException, VehiculeInexistantException, 
+                AssuranceInexistanteException, VehiculeNonDisponibleException, 
+                DateInvalideException, EnregistrementContratException) as e:
+            # Ces exceptions sont déjà des sous-classes de ContratLocationException
             print(f"Erreur: {str(e)}")
             raise
             
         except Exception as e:
-            # Capturer toute autre exception et la convertir en ContratLocationError
+            # Capturer toute autre exception et la convertir en ContratLocationException
             error_msg = f"Erreur inattendue lors de la création du contrat: {str(e)}"
             print(error_msg)
-            raise ContratLocationError(error_msg) from e
+            raise ContratLocationException(error_msg) from e
             
         finally:
             print("\n=== Fin du programme ===")
@@ -89,15 +111,15 @@ class SignerContratDeLocation:
             duree: Durée de location en jours
             
         Raises:
-            DateInvalideError: Si les paramètres ne sont pas valides
+            DateInvalideException: Si les paramètres ne sont pas valides
         """
         # Vérifier que la date de début est dans le futur
         if date_debut < date.today():
-            raise DateInvalideError("La date de début doit être dans le futur")
+            raise DateInvalideException("La date de début doit être dans le futur")
         
         # Vérifier que la durée est positive
         if duree <= 0:
-            raise DateInvalideError("La durée de location doit être positive")
+            raise DateInvalideException("La durée de location doit être positive")
     
     @staticmethod
     def _presenter_resultats(contrat: ContratLocation, date_debut: date, duree: int) -> None:
@@ -123,31 +145,32 @@ class SignerContratDeLocation:
         client = contrat.getClient()
         
         print(f"\nRécapitulatif:")
-        print(f"  Le véhicule {vehicule.getMarque()} {vehicule.getModele()} est loué à {client.getNom()} {client.getPrenom()}")
+        print(f"  Le véhicule {vehicule.marque} {vehicule.modele} est loué à {client.nom} {client.prenom}")
         print(f"  Période: du {date_debut} au {date_fin}")
         print(f"  Montant total: {contrat.getCout()} €")
 
     # ===== COUCHE DE DONNÉES =====
     
     @staticmethod
-    def _initialiser_repositories() -> Dict[str, Any]:
+    def _initialiser_repositories(container: Optional[Container] = None) -> Mapping[str, Any]:
         """
-        Initialise les repositories - Couche de données.
+        Récupère les repositories auprès du conteneur - Couche de données.
+        
+        Les instances sont construites une seule fois par processus et partagées
+        entre les appels ; seules celles réellement utilisées sont résolues.
+        
+        Args:
+            container: Conteneur à utiliser (celui du processus par défaut)
         
         Returns:
-            Un dictionnaire contenant les repositories
+            Une vue clé -> repository ('client', 'vehicule', 'assurance', 'contrat', 'caution')
         """
-        return {
-            'client': ClientRepository(),
-            'vehicule': VehiculeRepository(),
-            'assurance': AssuranceRepository(),
-            'contrat': ContratRepository()
-        }
+        return _Repositories(container if container is not None else default_container())
 
     # ===== COUCHE LOGIQUE (MILIEU) =====
     
     @staticmethod
-    def _executer_logique_contrat(repositories: Dict[str, Any], 
+    def _executer_logique_contrat(repositories: Mapping[str, Any], 
                                 client_id: int, vehicule_id: int, 
                                 assurance_id: Optional[int], 
                                 date_debut: date, duree: int) -> ContratLocation:
@@ -181,7 +204,7 @@ class SignerContratDeLocation:
         
         # 3. Calculer le coût
         cout = SignerContratDeLocation._calculer_cout(
-            repositories['vehicule'], vehicule_id, duree, assurance
+            repositories['vehicule'], vehicule_id, duree, assurance, vehicule.typeVehicule, date_debut
         )
         
         # 4. Créer et sauvegarder le contrat
@@ -192,7 +215,7 @@ class SignerContratDeLocation:
         return contrat
     
     @staticmethod
-    def _recuperer_donnees(repositories: Dict[str, Any], client_id: int, vehicule_id: int, 
+    def _recuperer_donnees(repositories: Mapping[str, Any], client_id: int, vehicule_id: int, 
                          assurance_id: Optional[int]) -> Tuple[Any, Any, Optional[Any]]:
         """
         Récupère les données nécessaires depuis les repositories.
@@ -201,70 +224,89 @@ class SignerContratDeLocation:
             Tuple contenant client, vehicule, assurance (qui peut être None)
         
         Raises:
-            ClientInexistantError, VehiculeInexistantError, AssuranceInexistanteError
+            ClientInexistantException, VehiculeInexistantException, AssuranceInexistanteException
         """
         # Récupérer le client
-        client = repositories['client'].get_by_id(client_id)
+        client = SignerContratDeLocation._lire(repositories['client'], client_id)
         if not client:
-            raise ClientInexistantError(f"Le client avec l'ID {client_id} n'existe pas")
+            raise ClientInexistantException(f"Le client avec l'ID {client_id} n'existe pas")
             
         # Récupérer le véhicule
-        vehicule = repositories['vehicule'].get_by_id(vehicule_id)
+        vehicule = SignerContratDeLocation._lire(repositories['vehicule'], vehicule_id)
         if not vehicule:
-            raise VehiculeInexistantError(f"Le véhicule avec l'ID {vehicule_id} n'existe pas")
+            raise VehiculeInexistantException(f"Le véhicule avec l'ID {vehicule_id} n'existe pas")
         
         # Récupérer l'assurance si un ID est fourni
         assurance = None
         if assurance_id:
-            assurance = repositories['assurance'].get_by_id(assurance_id)
+            assurance = SignerContratDeLocation._lire(repositories['assurance'], assurance_id)
             if not assurance:
-                raise AssuranceInexistanteError(f"L'assurance avec l'ID {assurance_id} n'existe pas")
+                raise AssuranceInexistanteException(f"L'assurance avec l'ID {assurance_id} n'existe pas")
         
         return client, vehicule, assurance
     
     @staticmethod
-    def _verifier_disponibilite(vehicule_repo: VehiculeRepository, vehicule_id: int, 
+    def _lire(repository: Any, identifiant: int) -> Optional[Any]:
+        """Lit une entité par son ID ; None si le repository la signale introuvable."""
+        try:
+            return repository.get_by_id(identifiant)
+        except NotFoundException:
+            return None
+
+    @staticmethod
+    def _verifier_disponibilite(vehicule_repo: VehiculeRepositoryPort, vehicule_id: int, 
                               vehicule: Any, date_debut: date, date_fin: date) -> None:
         """
         Vérifie si le véhicule est disponible pour la période demandée.
         
         Raises:
-            VehiculeNonDisponibleError si le véhicule n'est pas disponible
+            VehiculeNonDisponibleException si le véhicule n'est pas disponible
         """
         if not vehicule_repo.is_available_between(vehicule_id, date_debut, date_fin):
-            marque_modele = f"{vehicule.getMarque()} {vehicule.getModele()}"
-            raise VehiculeNonDisponibleError(f"Le véhicule {marque_modele} n'est pas disponible pour la période demandée")
+            marque_modele = f"{vehicule.marque} {vehicule.modele}"
+            raise VehiculeNonDisponibleException(f"Le véhicule {marque_modele} n'est pas disponible pour la période demandée")
     
     @staticmethod
-    def _calculer_cout(vehicule_repo: VehiculeRepository, vehicule_id: int, 
-                      duree: int, assurance: Optional[Any]) -> float:
+    def _calculer_cout(vehicule_repo: VehiculeRepositoryPort, vehicule_id: int, 
+                      duree: int, assurance: Optional[Any],
+                      type_vehicule: Optional[str] = None,
+                      date_debut: Optional[date] = None) -> float:
         """
         Calcule le coût total de la location, incluant l'assurance si présente.
         
+        Le tarif journalier de l'assurance est lu dans sa grille, selon le type du
+        véhicule et la tranche de durée. Avec la tarification dynamique, le prix du
+        véhicule dépend aussi de la date de début (anticipation de la réservation).
+        
         Returns:
             Le coût total de la location
         """
         # Calculer le coût de base du véhicule
-        cout = vehicule_repo.calculate_rental_cost(vehicule_id, duree)
+        cout = vehicule_repo.calculate_rental_cost(vehicule_id, duree, date_debut)
         
         # Ajouter le coût de l'assurance si applicable
         if assurance:
-            cout += assurance.getTarif() * duree
+            cout += assurance.getTarif(type_vehicule, duree) * duree
             
         return cout
     
     @staticmethod
-    def _creer_et_sauvegarder_contrat(repositories: Dict[str, Any], date_debut: date, 
+    def _creer_et_sauvegarder_contrat(repositories: Mapping[str, Any], date_debut: date, 
                                     duree: int, cout: float, client: Any, vehicule: Any, 
                                     assurance: Optional[Any], vehicule_id: int) -> ContratLocation:
         """
         Crée le contrat et le sauvegarde dans la base de données.
         
+        Le véhicule est d'abord loué par `louer_vehicule`, qui ne réussit qu'une fois
+        (transition atomique de l'état partagé entre workers) : de deux signatures
+        simultanées du même véhicule, une seule enregistre son contrat.
+        
         Returns:
             Le contrat créé et sauvegardé
             
         Raises:
-            EnregistrementContratError si l'enregistrement échoue
+            VehiculeNonDisponibleException si le véhicule vient d'être loué par ailleurs
+            EnregistrementContratException si l'enregistrement échoue
         """
         # Création du contrat
         contrat = ContratLocation(
@@ -272,20 +314,30 @@ class SignerContratDeLocation:
             duree=duree,
             caution=500.0,  # valeur par défaut
             cout=cout,
+            etatInitialDuVehicule=100.0,
             client=client,
             vehicule=vehicule,
             assurance=assurance
         )
         
-        # Enregistrer le contrat dans la base de données
+        # Louer le véhicule : échoue si une autre signature l'a obtenu entre-temps
+        try:
+            repositories['vehicule'].louer_vehicule(vehicule_id)
+        except VehiculeNotAvailableException:
+            marque_modele = f"{vehicule.marque} {vehicule.modele}"
+            raise VehiculeNonDisponibleException(f"Le véhicule {marque_modele} n'est pas disponible pour la période demandée")
+        
+        # Enregistrer le contrat dans la base de données ; en cas d'échec, le véhicule est relâché
         try:
             contrat_id = repositories['contrat'].save(contrat)
             contrat.id = contrat_id
         except Exception as e:
-            raise EnregistrementContratError(f"Erreur lors de l'enregistrement du contrat: {str(e)}")
+            repositories['vehicule'].set_availability(vehicule_id, True)
+            raise EnregistrementContratException(f"Erreur lors de l'enregistrement du contrat: {str(e)}")
         
-        # Mettre à jour la disponibilité du véhicule
-        repositories['vehicule'].set_availability(vehicule_id, False)
+        # Bloquer l'empreinte de la caution dans le registre
+        if contrat.caution > 0:
+            UtilisationCaution(repositories['caution']).bloquer(contrat)
         
         return contrat
 
@@ -307,6 +359,6 @@ if __name__ == "__main__":
         contrat = SignerContratDeLocation.main(client_id, vehicule_id, date.today() + timedelta(days=1), duree, assurance_id)
         print(f"\nSuccès: Contrat créé avec l'ID {contrat.id}")
         sys.exit(0)
-    except ContratLocationError as e:
+    except ContratLocationException as e:
         print(f"\nErreur dans le processus de location: {str(e)}")
         sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,165 @@
+import dataclasses
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from ..CautionRepositoryPort import CautionRepositoryPort
+from ..ContratRepositoryPort import ContratRepositoryPort
+from .restitutionVehicule import ETATS_RESTITUTION, ResultatRestitution
+from ...domain.caution import (EMPREINTE, LIBERATION, PRELEVEMENT, MouvementCaution, SoldeCaution,
+                               centimes)
+from ...domain.contratLocation import ContratLocation
+from ...domain.exceptions import InvalidCautionOperationException, NotFoundException
+
+# Part de l'empreinte prélevée selon l'état constaté à la restitution ; le reste est libéré
+PRELEVEMENT_PAR_ETAT = {
+    "Endommagé": 0.5,
+    "Volé": 1.0,
+}
+
+
+@dataclasses.dataclass
+class RapportReglement:
+    contrats: int = 0
+    preleve: float = 0.0
+    libere: float = 0.0
+    erreurs: List[Tuple[object, str]] = dataclasses.field(default_factory=list)
+
+
+class UtilisationCaution:
+    """
+    Cas d'usage des cautions : empreinte à la signature, prélèvements partiels en cas
+    de dommages ou de vol, libération du reste.
+
+    Chaque opération ajoute des mouvements au registre, qui tient les soldes à jour ;
+    le règlement de fin de journée calcule les mouvements de tous les contrats restitués
+    puis les enregistre en un seul lot.
+    """
+
+    def __init__(self, caution_repository: CautionRepositoryPort,
+                 contrat_repository: Optional[ContratRepositoryPort] = None,
+                 horloge: Callable[[], datetime] = datetime.now):
+        self.caution_repository = caution_repository
+        self.contrat_repository = contrat_repository
+        self._horloge = horloge
+
+    def _mouvement(self, contrat: ContratLocation, type_mouvement: str, montant: int, motif: str) -> MouvementCaution:
+        return MouvementCaution(contrat.id, contrat.client.id, type_mouvement, montant, self._horloge(), motif,
+                                str(contrat.vehicule.immatriculation))
+
+    # ===== Opérations unitaires =====
+
+    def bloquer(self, contrat: ContratLocation, motif: str = "Signature du contrat") -> MouvementCaution:
+        mouvement = self._mouvement(contrat, EMPREINTE, centimes(contrat.caution), motif)
+        self.caution_repository.append(mouvement)
+        return mouvement
+
+    def prelever(self, contrat: ContratLocation, montant: float, motif: str) -> MouvementCaution:
+        mouvement = self._mouvement(contrat, PRELEVEMENT, centimes(montant), motif)
+        self.caution_repository.append(mouvement)
+        return mouvement
+
+    def liberer(self, contrat: ContratLocation, montant: Optional[float] = None,
+                motif: str = "Restitution") -> Optional[MouvementCaution]:
+        """Libère `montant`, ou tout ce qui reste bloqué ; None s'il ne reste rien."""
+        reste = self.caution_repository.balance_by_contract(contrat.id).en_cours
+        montant = reste if montant is None else centimes(montant)
+        if not montant:
+            return None
+        mouvement = self._mouvement(contrat, LIBERATION, montant, motif)
+        self.caution_repository.append(mouvement)
+        return mouvement
+
+    # ===== Règlement à la restitution =====
+
+    def _reglement(self, contrat: ContratLocation, etat: str) -> List[MouvementCaution]:
+        etat = ETATS_RESTITUTION.get(etat.lower(), etat)
+        solde = self.caution_repository.balance_by_contract(contrat.id)
+        if not solde.en_cours:
+            raise InvalidCautionOperationException(f"Aucune empreinte en cours pour le contrat {contrat.id}.")
+        preleve = min(solde.en_cours, round(solde.bloque * PRELEVEMENT_PAR_ETAT.get(etat, 0.0)))
+        mouvements = []
+        if preleve:
+            mouvements.append(self._mouvement(contrat, PRELEVEMENT, preleve, f"Restitution : {etat}"))
+        if solde.en_cours - preleve:
+            mouvements.append(self._mouvement(contrat, LIBERATION, solde.en_cours - preleve, f"Restitution : {etat}"))
+        return mouvements
+
+    def regler(self, contrat: ContratLocation, etat: str) -> List[MouvementCaution]:
+        """Prélève la part due selon l'état de restitution et libère le reste."""
+        mouvements = self._reglement(contrat, etat)
+        self.caution_repository.append_many(mouvements)
+        return mouvements
+
+    def cloture_journaliere(self, restitutions: Iterable[Tuple[ContratLocation, str]]) -> RapportReglement:
+        """
+        Règle en un passage toutes les restitutions de la journée.
+
+        Les contrats sans empreinte en cours sont signalés dans le rapport ; les autres
+        mouvements sont enregistrés en un seul lot.
+
+        :param restitutions: Couples (contrat, état de restitution)
+        """
+        rapport = RapportReglement()
+        mouvements: List[MouvementCaution] = []
+        regles = set()
+        for contrat, etat in restitutions:
+            if contrat.id in regles:
+                rapport.erreurs.append((contrat.id, "Contrat déjà réglé dans ce lot."))
+                continue
+            try:
+                mouvements.extend(self._reglement(contrat, etat))
+            except InvalidCautionOperationException as e:
+                rapport.erreurs.append((contrat.id, str(e)))
+                continue
+            regles.add(contrat.id)
+        self.caution_repository.append_many(mouvements)
+        rapport.contrats = len(regles)
+        rapport.preleve = sum(m.centimes for m in mouvements if m.type == PRELEVEMENT) / 100
+        rapport.libere = sum(m.centimes for m in mouvements if m.type == LIBERATION) / 100
+        return rapport
+
+    def regler_restitutions(self, resultats: Iterable[ResultatRestitution]) -> RapportReglement:
+        """
+        Règle les cautions d'une vague de `RestitutionVehicule.restituer_vehicules`.
+
+        Seuls les véhicules restitués sont consultés, via l'index des empreintes en cours
+        par véhicule du registre. Si un véhicule a plusieurs empreintes en cours, c'est le
+        plus ancien contrat du client qui le rend qui est réglé.
+        """
+        if self.contrat_repository is None:
+            raise ValueError("Un repository de contrats est nécessaire pour retrouver les contrats restitués.")
+        restitutions = []
+        erreurs = []
+        for resultat in resultats:
+            if not resultat.succes:
+                continue
+            contrat = self._contrat_en_cours(resultat)
+            if contrat is None:
+                erreurs.append((resultat.vehicule_id, "Aucune caution en cours pour ce véhicule."))
+                continue
+            restitutions.append((contrat, resultat.vehicule.etat))
+        rapport = self.cloture_journaliere(restitutions)
+        rapport.erreurs.extend(erreurs)
+        return rapport
+
+    def _contrat_en_cours(self, resultat: ResultatRestitution) -> Optional[ContratLocation]:
+        immatriculation = str(resultat.vehicule.immatriculation)
+        for contrat_id in self.caution_repository.iter_outstanding_by_vehicle(immatriculation):
+            try:
+                contrat = self.contrat_repository.get_by_id(contrat_id)
+            except NotFoundException:
+                continue
+            if contrat is not None and getattr(contrat.client, 'id', None) == resultat.client_id:
+                return contrat
+        return None
+
+    # ===== Soldes =====
+
+    def solde_contrat(self, contrat_id: int) -> SoldeCaution:
+        return self.caution_repository.balance_by_contract(contrat_id)
+
+    def solde_client(self, client_id) -> SoldeCaution:
+        return self.caution_repository.balance_by_client(client_id)
+
+    def empreintes_en_cours(self) -> float:
+        return self.caution_repository.outstanding_total() / 100
@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from ..UtilizationRollupsPort import UtilizationRollupsPort
+from ..VehiculeRepositoryPort import VehiculeRepositoryPort
+from ...domain.vehicule import Vehicule
+
+
+class UtilisationFlotte:
+    """
+    Taux d'utilisation des véhicules (jours loués / jours calendaires) sur des fenêtres
+    glissantes, pour repérer les véhicules à vendre.
+
+    Les taux sont lus dans les agrégats journaliers tenus à jour par le repository des
+    contrats, sans relire l'historique des contrats.
+    """
+
+    def __init__(self, rollups: UtilizationRollupsPort, vehicule_repository: VehiculeRepositoryPort,
+                 chemin: Optional[Union[str, Path]] = None,
+                 aujourd_hui: Callable[[], date] = date.today):
+        self.rollups = rollups
+        self.vehicule_repository = vehicule_repository
+        self.chemin = chemin
+        self._aujourd_hui = aujourd_hui
+
+    def _fenetre(self, jours: int, fin: Optional[date]) -> Tuple[date, date]:
+        if jours <= 0:
+            raise ValueError("La fenêtre doit durer au moins un jour.")
+        fin = fin if fin is not None else self._aujourd_hui()
+        return fin - timedelta(days=jours), fin
+
+    def taux(self, vehicule: Union[Vehicule, str], jours: int = 90, fin: Optional[date] = None) -> float:
+        """
+        :param vehicule: Le véhicule ou son immatriculation
+        :param jours: Longueur de la fenêtre glissante, qui se termine la veille de `fin`
+        :param fin: Fin (exclue) de la fenêtre, aujourd'hui par défaut
+        """
+        debut, fin = self._fenetre(jours, fin)
+        return self.rollups.utilization(getattr(vehicule, 'immatriculation', vehicule), debut, fin)
+
+    def jours_par_mois(self, vehicule: Union[Vehicule, str]) -> Dict[str, int]:
+        return self.rollups.rented_days_by_month(getattr(vehicule, 'immatriculation', vehicule))
+
+    def candidats_a_la_vente(self, jours: int = 90, seuil: float = 0.3,
+                             fin: Optional[date] = None) -> List[Tuple[Vehicule, float]]:
+        """Véhicules dont le taux sur la fenêtre est inférieur à `seuil`, du moins utilisé au plus utilisé."""
+        debut, fin = self._fenetre(jours, fin)
+        candidats = []
+        for vehicule in self.vehicule_repository.iter_all():
+            taux = self.rollups.utilization(vehicule.immatriculation, debut, fin)
+            if taux < seuil:
+                candidats.append((vehicule, taux))
+        candidats.sort(key=lambda candidat: candidat[1])
+        return candidats
+
+    def sauvegarder(self, chemin: Optional[Union[str, Path]] = None) -> int:
+        """Écrit les agrégats sur disque ; renvoie la taille du fichier en octets."""
+        chemin = chemin if chemin is not None else self.chemin
+        if chemin is None:
+            raise ValueError("Aucun fichier d'agrégats configuré (UTILISATION_ROLLUPS_PATH).")
+        return self.rollups.save(chemin)
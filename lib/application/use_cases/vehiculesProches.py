@@ -0,0 +1,53 @@
+import dataclasses
+from typing import List, Optional
+
+from ..AgenceRepositoryPort import AgenceRepositoryPort
+from ..VehiculeRepositoryPort import VehiculeRepositoryPort
+from ...domain.agence import Agence
+from ...domain.vehicule import Vehicule
+
+
+@dataclasses.dataclass
+class VehiculeProche:
+    distance_km: float
+    agence: Agence
+    vehicule: Vehicule
+
+
+class VehiculesProches:
+    """
+    Cas d'usage : les k véhicules disponibles les plus proches d'un point, parmi ceux
+    qui satisfont les critères de `find_by_criteria`.
+
+    Les agences sont parcourues par distance croissante grâce à l'index spatial du
+    repository des agences ; seuls les véhicules des agences visitées sont examinés,
+    et le parcours s'arrête dès que k véhicules sont trouvés. Les véhicules d'une même
+    agence sont à la même distance et gardent l'ordre du repository.
+    """
+
+    def __init__(self, agence_repository: AgenceRepositoryPort, vehicule_repository: VehiculeRepositoryPort):
+        self.agence_repository = agence_repository
+        self.vehicule_repository = vehicule_repository
+
+    def plus_proches(self, latitude: float, longitude: float, k: int = 5,
+                     marque: Optional[str] = None,
+                     modele: Optional[str] = None,
+                     type_vehicule: Optional[str] = None,
+                     prix_max: Optional[float] = None,
+                     rayon_km: Optional[float] = None) -> List[VehiculeProche]:
+        """
+        :param rayon_km: Distance maximale des agences retenues (None : sans limite)
+        :return: Au plus k véhicules disponibles, du plus proche au plus éloigné
+        """
+        resultats: List[VehiculeProche] = []
+        if k <= 0:
+            return resultats
+        for distance, agence in self.agence_repository.iter_nearest(latitude, longitude):
+            if rayon_km is not None and distance > rayon_km:
+                break
+            for vehicule in self.vehicule_repository.iter_by_agence(agence.id, marque, modele, True,
+                                                                    type_vehicule, prix_max):
+                resultats.append(VehiculeProche(distance, agence, vehicule))
+                if len(resultats) >= k:
+                    return resultats
+        return resultats
@@ -0,0 +1,52 @@
+import dataclasses
+import math
+from typing import Optional, Tuple
+from .entite import Entite
+from .exceptions import ValidationException
+
+# Rayon terrestre moyen (km)
+RAYON_TERRE_KM = 6371.0088
+
+
+def point_sur_la_sphere(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Coordonnées cartésiennes du point sur la sphère unité."""
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+
+def corde_en_km(corde: float) -> float:
+    """Distance à la surface correspondant à une corde de la sphère unité."""
+    return 2 * RAYON_TERRE_KM * math.asin(min(1.0, corde / 2))
+
+
+@dataclasses.dataclass(eq=False)
+class Agence(Entite):
+    nom: str
+    latitude: float
+    longitude: float
+    id: Optional[int] = None
+
+    def __post_init__(self):
+        if not -90.0 <= self.latitude <= 90.0 or not -180.0 <= self.longitude <= 180.0:
+            raise ValidationException(f"Coordonnées invalides pour l'agence {self.nom} : "
+                                      f"({self.latitude}, {self.longitude}).")
+
+    def _identite(self):
+        return self.nom
+
+    @property
+    def point(self) -> Tuple[float, float, float]:
+        return point_sur_la_sphere(self.latitude, self.longitude)
+
+    def distance_km(self, latitude: float, longitude: float) -> float:
+        """Distance orthodromique (km) entre l'agence et le point donné."""
+        a, b = self.point, point_sur_la_sphere(latitude, longitude)
+        return corde_en_km(math.dist(a, b))
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'nom': self.nom,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+        }
@@ -1,5 +1,59 @@
+import bisect
 import dataclasses
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence, Tuple
+
+# Type de véhicule utilisé quand le type demandé n'a pas de ligne dans la grille
+TYPE_PAR_DEFAUT = "*"
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class GrilleTarifaire:
+    """
+    Tarifs journaliers d'une assurance par type de véhicule et tranche de durée.
+
+    `bornes` donne le premier jour de chaque tranche (la dernière est ouverte). La
+    tranche de chaque durée jusqu'à la dernière borne est précalculée : une lecture
+    de tarif coûte deux accès indexés.
+    """
+    bornes: Tuple[int, ...]
+    tarifs: Mapping[str, Tuple[float, ...]]
+    _tranches: Tuple[int, ...] = dataclasses.field(repr=False, compare=False)
+
+    @classmethod
+    def compiler(cls, tarifs: Mapping[str, Sequence[float]], bornes: Sequence[int]) -> 'GrilleTarifaire':
+        bornes = tuple(sorted(bornes))
+        if not bornes or bornes[0] != 1:
+            raise ValueError("La première tranche de durée doit commencer à 1 jour.")
+        lignes = {}
+        for type_vehicule, ligne in tarifs.items():
+            if len(ligne) != len(bornes):
+                raise ValueError(f"{type_vehicule} : {len(ligne)} tarifs pour {len(bornes)} tranches de durée.")
+            lignes[type_vehicule] = tuple(float(tarif) for tarif in ligne)
+        tranches = tuple(bisect.bisect_right(bornes, duree) - 1 for duree in range(bornes[-1] + 1))
+        return cls(bornes, MappingProxyType(lignes), tranches)
+
+    def tranche(self, duree: int) -> int:
+        if duree < 1:
+            raise ValueError("La durée de location doit être positive.")
+        return self._tranches[duree] if duree < len(self._tranches) else len(self.bornes) - 1
+
+    def tarif(self, type_vehicule: str, duree: int) -> float:
+        ligne = self.tarifs.get(type_vehicule) or self.tarifs.get(TYPE_PAR_DEFAUT)
+        if ligne is None:
+            raise KeyError(f"Aucun tarif pour le type de véhicule '{type_vehicule}'.")
+        return ligne[self.tranche(duree)]
+
 
 @dataclasses.dataclass
 class Assurance():
-    nom: str
\ No newline at end of file
+    nom: str
+    tarif_journalier: float = 0.0
+    grille: Optional[GrilleTarifaire] = dataclasses.field(default=None, repr=False)
+    id: Optional[int] = None
+
+    def getTarif(self, type_vehicule: Optional[str] = None, duree: Optional[int] = None) -> float:
+        """Tarif journalier ; celui de la grille si le type de véhicule et la durée sont connus."""
+        if self.grille is not None and type_vehicule is not None and duree is not None:
+            return self.grille.tarif(type_vehicule, duree)
+        return self.tarif_journalier
@@ -1,4 +1,6 @@
 import dataclasses
+from datetime import datetime
+from typing import Optional
 
 @dataclasses.dataclass
 class caution():
@@ -16,3 +18,57 @@ class caution():
     def signiatureCautionEmployer():
         pass 
 
+
+# Types de mouvements du registre des cautions
+EMPREINTE = "empreinte"        # montant bloqué à la signature
+PRELEVEMENT = "prelevement"    # part de l'empreinte encaissée (dommages, vol)
+LIBERATION = "liberation"      # part de l'empreinte rendue au client
+TYPES_MOUVEMENT = (EMPREINTE, PRELEVEMENT, LIBERATION)
+
+
+@dataclasses.dataclass(frozen=True)
+class MouvementCaution:
+    """Écriture du registre des cautions ; les montants sont en centimes."""
+    contrat_id: int
+    client_id: object
+    type: str
+    centimes: int
+    date: datetime
+    motif: str = ""
+    # Immatriculation du véhicule loué, pour retrouver les empreintes à la restitution
+    vehicule: Optional[str] = None
+
+    def __post_init__(self):
+        if self.type not in TYPES_MOUVEMENT:
+            raise ValueError(f"Type de mouvement inconnu : {self.type}")
+        if self.centimes <= 0:
+            raise ValueError("Le montant d'un mouvement doit être strictement positif.")
+
+    @property
+    def montant(self) -> float:
+        return self.centimes / 100
+
+
+@dataclasses.dataclass
+class SoldeCaution:
+    """Cumuls des mouvements d'un contrat ou d'un client, en centimes."""
+    bloque: int = 0
+    preleve: int = 0
+    libere: int = 0
+
+    @property
+    def en_cours(self) -> int:
+        """Part de l'empreinte ni prélevée ni libérée."""
+        return self.bloque - self.preleve - self.libere
+
+    def appliquer(self, mouvement: MouvementCaution) -> None:
+        if mouvement.type == EMPREINTE:
+            self.bloque += mouvement.centimes
+        elif mouvement.type == PRELEVEMENT:
+            self.preleve += mouvement.centimes
+        else:
+            self.libere += mouvement.centimes
+
+
+def centimes(montant: float) -> int:
+    return int(round(montant * 100))
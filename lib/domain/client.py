@@ -1,31 +1,50 @@
 import dataclasses
+import uuid
+from typing import Optional
+from .entite import Entite
 from .permis import Permis
 from .telephone import Telephone
 from .email import Email
 
-@dataclasses.dataclass
-class Client:
+@dataclasses.dataclass(eq=False)
+class Client(Entite):
     nom: str
     prenom: str
     permis: Permis
     telephone: Telephone
     email: Email
     voitureLouer: None
-    historique_locations: list[str] = dataclasses.field(default_factory=list)
+    # Locations en cours ; l'historique complet est conservé à part par le repository.
+    locations_actives: set = dataclasses.field(default_factory=set)
+    id: Optional[int] = None
+    uid: uuid.UUID = dataclasses.field(default_factory=uuid.uuid4, repr=False)
+
+    def _identite(self):
+        return self.uid
+
+    def a_en_location(self, voiture) -> bool:
+        """Indique si le client a actuellement cette voiture en location."""
+        return voiture in self.locations_actives
+
+    def retirer_location(self, voiture) -> bool:
+        """Retire la voiture des locations en cours, sans toucher à la voiture elle-même."""
+        if voiture in self.locations_actives:
+            self.locations_actives.remove(voiture)
+            return True
+        return False
 
     def louer_voiture(self, voiture) -> bool:
-        """Ajoute une voiture à l'historique des locations si elle est disponible."""
+        """Ajoute une voiture aux locations en cours si elle est disponible."""
         if voiture.louer():
-            self.historique_locations.append(voiture)
+            self.locations_actives.add(voiture)
             print(f"{self.nom} {self.prenom} a loué la voiture {voiture.marque} {voiture.modele}.")
             return True
         return False
 
     def retourner_voiture(self, voiture, km_parcourus: int) -> None:
-        """Retourne la voiture et la supprime de l'historique des locations."""
-        if voiture in self.historique_locations:
+        """Retourne la voiture et la retire des locations en cours."""
+        if self.retirer_location(voiture):
             voiture.retourner(km_parcourus)
-            self.historique_locations.remove(voiture)
             print(f"{self.nom} {self.prenom} a retourné la voiture {voiture.marque} {voiture.modele}.")
         else:
             print(f"{self.nom} {self.prenom} n'a pas cette voiture en location.")
@@ -37,7 +56,7 @@ class Client:
               f"Permis: {self.permis}\n"
               f"Téléphone: {self.telephone}\n"
               f"Email: {self.email}\n"
-              f"Locations en cours: {len(self.historique_locations)}\n")
+              f"Locations en cours: {len(self.locations_actives)}\n")
 
     @staticmethod
     def osef() -> None:
@@ -1,13 +1,15 @@
-from datetime import date
+from datetime import date, timedelta
 from typing import Union, Any, Optional
 import dataclasses
+import uuid
 
+from .entite import Entite
 from .client import Client
 from .vehicule import Vehicule
 from .assurance import Assurance
 
-@dataclasses.dataclass
-class ContratLocation:
+@dataclasses.dataclass(eq=False)
+class ContratLocation(Entite):
     dateDebut: date
     duree: int
     caution: float
@@ -16,6 +18,16 @@ class ContratLocation:
     client: Client
     vehicule: Vehicule
     assurance: Optional[Assurance]
+    id: Optional[int] = None
+    est_actif: bool = True
+    uid: uuid.UUID = dataclasses.field(default_factory=uuid.uuid4, repr=False)
+
+    def _identite(self):
+        return self.uid
+
+    @property
+    def date_fin(self) -> date:
+        return self.dateDebut + timedelta(days=self.duree)
     
     def getDateDebut(self) -> date:
         return self.dateDebut
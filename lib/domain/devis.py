@@ -7,5 +7,5 @@ from .vehicule import Vehicule
 class Devis():
     vehicule: Vehicule
     prix: float
-    id: uuid.UUID = uuid.uuid4()
+    id: uuid.UUID = dataclasses.field(default_factory=uuid.uuid4)
     date = date.today()
@@ -0,0 +1,81 @@
+import threading
+from typing import Dict, FrozenSet, List, Optional
+
+
+class DictionnaireChaines:
+    """
+    Encodage par dictionnaire d'un attribut texte très répété (marque, modèle...).
+
+    Chaque valeur distincte reçoit un petit code entier et une chaîne canonique, que
+    les entités gardent à la place de leur propre copie. La forme en minuscules de
+    chaque code est calculée une seule fois ; `variantes` rend toutes les chaînes
+    canoniques qui s'écrivent pareil à la casse près, pour filtrer sans appeler
+    `lower()` sur chaque entité.
+    """
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self._chaines: List[str] = []
+        self._minuscules: List[str] = []
+        self._variantes: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._chaines)
+
+    def interner(self, valeur):
+        """Chaîne canonique de `valeur` ; les valeurs qui ne sont pas des str sont rendues telles quelles."""
+        if valeur.__class__ is not str:
+            return valeur
+        code = self._codes.get(valeur)
+        if code is None:
+            code = self._ajouter(valeur)
+        return self._chaines[code]
+
+    def canonique(self, valeur: str) -> Optional[str]:
+        """Chaîne canonique d'une valeur déjà connue, sans l'ajouter (pour les requêtes)."""
+        code = self._codes.get(valeur)
+        return self._chaines[code] if code is not None else None
+
+    def code(self, valeur: str) -> int:
+        code = self._codes.get(valeur)
+        return code if code is not None else self._ajouter(valeur)
+
+    def chaine(self, code: int) -> str:
+        return self._chaines[code]
+
+    def minuscule(self, valeur: str) -> str:
+        code = self._codes.get(valeur)
+        return self._minuscules[code] if code is not None else valeur.lower()
+
+    def variantes(self, valeur: str) -> FrozenSet[str]:
+        """Chaînes canoniques égales à `valeur` sans tenir compte de la casse (ensemble vide si aucune)."""
+        return self._variantes.get(valeur.lower(), frozenset())
+
+    def _ajouter(self, valeur: str) -> int:
+        with self._lock:
+            code = self._codes.get(valeur)
+            if code is not None:
+                return code
+            code = len(self._chaines)
+            minuscule = valeur.lower()
+            self._chaines.append(valeur)
+            self._minuscules.append(minuscule)
+            # Remplacé d'un bloc : les lectures concurrentes voient l'ancien ou le nouvel ensemble
+            self._variantes[minuscule] = self._variantes.get(minuscule, frozenset()) | {valeur}
+            self._codes[valeur] = code
+            return code
+
+
+MARQUES = DictionnaireChaines()
+MODELES = DictionnaireChaines()
+ETATS = DictionnaireChaines()
+TYPES_VEHICULE = DictionnaireChaines()
+
+# Attribut de Vehicule -> dictionnaire qui l'encode
+DICTIONNAIRES_VEHICULE: Dict[str, DictionnaireChaines] = {
+    'marque': MARQUES,
+    'modele': MODELES,
+    'etat': ETATS,
+    'typeVehicule': TYPES_VEHICULE,
+}
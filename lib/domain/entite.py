@@ -0,0 +1,19 @@
+class Entite:
+    """
+    Base des entités du domaine : égalité et hachage reposent sur l'identité de
+    l'entité (voir `_identite`) et non sur la comparaison de tous ses champs.
+
+    Les sous-classes dataclass doivent être déclarées avec `eq=False` pour ne pas
+    remplacer ces méthodes par celles générées automatiquement.
+    """
+
+    def _identite(self):
+        raise NotImplementedError
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self is other or self._identite() == other._identite()
+
+    def __hash__(self) -> int:
+        return hash(self._identite())
@@ -12,6 +12,10 @@ class ValidationException(Exception):
     """Exception levée lorsqu'une validation échoue."""
     pass
 
+class InvalidDateFormatException(ValidationException):
+    """Exception levée lorsqu'une date n'est pas au format attendu."""
+    pass
+
 class ClientNotFoundException(NotFoundException):
     """Exception levée lorsqu'un client n'est pas trouvé."""
     pass
@@ -51,3 +55,15 @@ class InvalidDevisPriceException(ValidationException):
 class VehiculeNotEligibleForDevisException(InvalidOperationException):
     """Exception levée lorsque le véhicule n'est pas éligible pour un devis."""
     pass
+
+class InvalidPrestationStateException(InvalidOperationException):
+    """Exception levée lorsqu'une prestation ne peut pas passer dans l'état demandé."""
+    pass
+
+class InvalidCautionOperationException(InvalidOperationException):
+    """Exception levée lorsqu'un mouvement de caution dépasse l'empreinte en cours."""
+    pass
+
+class AgenceNotFoundException(NotFoundException):
+    """Exception levée lorsqu'une agence n'est pas trouvée."""
+    pass
@@ -1,9 +1,15 @@
 import dataclasses
+import functools
 
 @dataclasses.dataclass(frozen=True)
 class Immatriculation:
     identifiant: str
     departement: str
 
-    def __str__(self) -> str:
+    @functools.cached_property
+    def formatee(self) -> str:
+        """Forme affichable, calculée une seule fois puisque l'objet est immuable."""
         return self.identifiant + " " + self.departement
+
+    def __str__(self) -> str:
+        return self.formatee
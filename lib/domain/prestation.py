@@ -0,0 +1,63 @@
+import dataclasses
+import uuid
+from typing import Optional
+
+from .devis import Devis
+from .entite import Entite
+from .exceptions import InvalidPrestationStateException
+
+EN_ATTENTE = "En attente"
+EN_COURS = "En cours"
+TERMINEE = "Terminée"
+ANNULEE = "Annulée"
+
+# État courant -> états atteignables
+TRANSITIONS = {
+    EN_ATTENTE: (EN_COURS, ANNULEE),
+    EN_COURS: (TERMINEE, ANNULEE),
+    TERMINEE: (),
+    ANNULEE: (),
+}
+
+
+@dataclasses.dataclass(eq=False)
+class Prestation(Entite):
+    """Passage d'un véhicule à l'atelier pour réaliser un devis accepté."""
+    devis: Devis
+    # Coût d'immobilisation du véhicule par jour : sert de priorité dans la file
+    cout_immobilisation: float
+    soumise_a: float
+    etat: str = EN_ATTENTE
+    baie: Optional[int] = None
+    debut: Optional[float] = None
+    fin: Optional[float] = None
+    uid: uuid.UUID = dataclasses.field(default_factory=uuid.uuid4, repr=False)
+
+    def _identite(self):
+        return self.uid
+
+    @property
+    def vehicule(self):
+        return self.devis.vehicule
+
+    @property
+    def attente(self) -> Optional[float]:
+        return self.debut - self.soumise_a if self.debut is not None else None
+
+    def _passer(self, etat: str) -> None:
+        if etat not in TRANSITIONS[self.etat]:
+            raise InvalidPrestationStateException(f"Prestation {self.etat.lower()} : passage à '{etat}' impossible.")
+        self.etat = etat
+
+    def demarrer(self, baie: int, instant: float) -> None:
+        self._passer(EN_COURS)
+        self.baie = baie
+        self.debut = instant
+
+    def terminer(self, instant: float) -> None:
+        self._passer(TERMINEE)
+        self.fin = instant
+
+    def annuler(self, instant: float) -> None:
+        self._passer(ANNULEE)
+        self.fin = instant
@@ -0,0 +1,81 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+# Catalogue des pièces : référence -> (prix unitaire HT, heures de pose par unité)
+PIECES: Dict[str, Tuple[float, float]] = {
+    'plaquettes': (45.0, 0.8),
+    'disques': (120.0, 1.5),
+    'pneu': (90.0, 0.4),
+    'vidange': (60.0, 0.5),
+    'courroie': (250.0, 3.0),
+    'batterie': (140.0, 0.3),
+    'amortisseur': (110.0, 1.2),
+    'embrayage': (600.0, 6.0),
+    'carrosserie': (180.0, 2.5),
+}
+
+# Taux horaire de main d'œuvre par type de véhicule
+TAUX_HORAIRE: Dict[str, float] = {
+    'Citadine': 55.0,
+    'Berline': 65.0,
+    'SUV': 70.0,
+    'Utilitaire': 60.0,
+}
+TAUX_HORAIRE_DEFAUT = 60.0
+
+# Valeur à neuf estimée à partir du prix de location journalier
+JOURS_LOCATION_VALEUR_NEUVE = 450
+DEPRECIATION_MENSUELLE = 0.012
+DEPRECIATION_PAR_TRANCHE_10000_KM = 0.025
+VALEUR_PLANCHER = 0.08
+
+# Opération : (référence de pièce, quantité)
+Operation = Tuple[str, int]
+
+
+def erreur_operations(operations: Sequence[Operation]) -> Optional[str]:
+    """Motif de rejet des opérations (pièce inconnue, quantité invalide), None si elles sont chiffrables."""
+    for operation in operations:
+        try:
+            reference, quantite = operation
+        except (TypeError, ValueError):
+            return f"Opération invalide : {operation!r}"
+        if reference not in PIECES:
+            return f"Pièce inconnue : {reference!r}"
+        if isinstance(quantite, bool) or not isinstance(quantite, int) or quantite <= 0:
+            return f"Quantité invalide pour {reference} : {quantite!r}"
+    return None
+
+
+def valeur_residuelle(prix_journalier: float, annee: int, kilometrage: int, annee_reference: int) -> float:
+    """
+    Valeur du véhicule après dépréciation dégressive mois par mois, puis par tranche de
+    kilométrage ; forme close, en temps constant quels que soient l'âge et le kilométrage.
+    """
+    valeur_neuve = prix_journalier * JOURS_LOCATION_VALEUR_NEUVE
+    mois = max(0, annee_reference - annee) * 12
+    tranches = max(0, kilometrage) // 10_000
+    valeur = (valeur_neuve * (1 - DEPRECIATION_MENSUELLE) ** mois
+              * (1 - DEPRECIATION_PAR_TRANCHE_10000_KM) ** tranches)
+    return max(valeur, valeur_neuve * VALEUR_PLANCHER)
+
+
+def coefficient_usure(kilometrage: int) -> float:
+    """Majoration de la main d'œuvre sur les véhicules très roulés (pièces grippées, accès difficile)."""
+    return 1.0 + min(kilometrage, 300_000) / 1_000_000
+
+
+def chiffrer(annee: int, kilometrage: int, type_vehicule: str, prix_journalier: float,
+             operations: Sequence[Operation], annee_reference: int) -> Tuple[float, float]:
+    """
+    Chiffre une intervention d'atelier.
+
+    :return: (prix du devis TTC arrondi au centime, valeur résiduelle du véhicule)
+    """
+    taux = TAUX_HORAIRE.get(type_vehicule, TAUX_HORAIRE_DEFAUT) * coefficient_usure(kilometrage)
+    pieces = heures = 0.0
+    for reference, quantite in operations:
+        prix_piece, pose = PIECES[reference]
+        pieces += prix_piece * quantite
+        heures += pose * quantite
+    prix = round((pieces + heures * taux) * 1.2, 2)
+    return prix, valeur_residuelle(prix_journalier, annee, kilometrage, annee_reference)
@@ -0,0 +1,80 @@
+import bisect
+import dataclasses
+from typing import Sequence, Tuple
+
+Paliers = Tuple[Tuple[int, float], ...]
+
+
+def _table(paliers: Paliers) -> Tuple[float, ...]:
+    """Coefficient de chaque valeur entière jusqu'au dernier palier (1.0 avant le premier)."""
+    seuils = [seuil for seuil, _ in paliers]
+    return tuple(paliers[i][1] if i >= 0 else 1.0
+                 for i in (bisect.bisect_right(seuils, valeur) - 1 for valeur in range(seuils[-1] + 1)))
+
+
+def _lire(table: Tuple[float, ...], valeur: int) -> float:
+    if valeur < 0:
+        return table[0]
+    return table[valeur] if valeur < len(table) else table[-1]
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class PolitiqueTarifaire:
+    """
+    Coefficients appliqués au prix journalier de base d'un véhicule selon le taux
+    d'occupation de son type (en %), l'anticipation de la réservation (jours avant le
+    départ) et la durée de location (jours).
+
+    Chaque facteur est décrit par des paliers (seuil, coefficient) ; le produit des
+    trois est borné par `plancher` et `plafond`. Le coefficient de chaque point
+    d'occupation et de chaque jour jusqu'au dernier palier est précalculé : un prix
+    coûte trois accès indexés.
+    """
+    occupation: Paliers
+    anticipation: Paliers
+    duree: Paliers
+    plancher: float
+    plafond: float
+    _par_occupation: Tuple[float, ...] = dataclasses.field(repr=False, compare=False)
+    _par_anticipation: Tuple[float, ...] = dataclasses.field(repr=False, compare=False)
+    _par_duree: Tuple[float, ...] = dataclasses.field(repr=False, compare=False)
+
+    @classmethod
+    def compiler(cls, occupation: Sequence[Tuple[int, float]], anticipation: Sequence[Tuple[int, float]],
+                 duree: Sequence[Tuple[int, float]], plancher: float = 0.7,
+                 plafond: float = 1.6) -> 'PolitiqueTarifaire':
+        if not 0 < plancher <= plafond:
+            raise ValueError("Le plancher doit être positif et ne pas dépasser le plafond.")
+        facteurs = []
+        for nom, paliers in (("occupation", occupation), ("anticipation", anticipation), ("durée", duree)):
+            paliers = tuple(sorted((int(seuil), float(coefficient)) for seuil, coefficient in paliers))
+            if not paliers or paliers[0][0] < 0:
+                raise ValueError(f"Paliers de {nom} vides ou négatifs.")
+            facteurs.append(paliers)
+        occupation, anticipation, duree = facteurs
+        if occupation[-1][0] > 100:
+            raise ValueError("Les paliers d'occupation sont des pourcentages.")
+        return cls(occupation, anticipation, duree, float(plancher), float(plafond),
+                   _table(occupation + ((100, occupation[-1][1]),)), _table(anticipation), _table(duree))
+
+    def coefficient(self, taux_occupation: float, anticipation: int, duree: int) -> float:
+        """
+        :param taux_occupation: Part des véhicules du type actuellement loués (0 à 1)
+        :param anticipation: Jours entre la réservation et le départ
+        :param duree: Durée de location en jours
+        """
+        coefficient = (self._par_occupation[min(100, max(0, int(taux_occupation * 100)))]
+                       * _lire(self._par_anticipation, anticipation) * _lire(self._par_duree, duree))
+        return min(self.plafond, max(self.plancher, coefficient))
+
+    def prix_journalier(self, prix_de_base: float, taux_occupation: float, anticipation: int, duree: int) -> float:
+        return round(prix_de_base * self.coefficient(taux_occupation, anticipation, duree), 2)
+
+
+# Remises quand la flotte est peu louée, majorations aux pics ; dernière minute majorée,
+# réservations anticipées et longues durées remisées
+POLITIQUE_PAR_DEFAUT = PolitiqueTarifaire.compiler(
+    occupation=[(0, 0.85), (40, 0.95), (60, 1.0), (75, 1.1), (85, 1.25), (95, 1.4)],
+    anticipation=[(0, 1.1), (3, 1.0), (14, 0.95), (60, 0.9)],
+    duree=[(1, 1.0), (4, 0.95), (8, 0.9), (30, 0.8)],
+)
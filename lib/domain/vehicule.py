@@ -1,8 +1,11 @@
 import dataclasses
+from typing import Optional
+from .dictionnaire import DICTIONNAIRES_VEHICULE
+from .entite import Entite
 from .immatriculation import Immatriculation
 
-@dataclasses.dataclass
-class Vehicule:
+@dataclasses.dataclass(eq=False)
+class Vehicule(Entite):
     marque: str
     modele: str
     annee: int
@@ -12,6 +15,21 @@ class Vehicule:
     etat: str
     typeVehicule: str
     disponible: bool = True
+    id: Optional[int] = None
+    # Agence où le véhicule est stationné (None : non rattaché)
+    agence_id: Optional[int] = None
+
+    def __setattr__(self, nom, valeur):
+        # Marque, modèle, état et type : chaîne canonique partagée par toute la flotte
+        dictionnaire = DICTIONNAIRES_VEHICULE.get(nom)
+        if dictionnaire is not None:
+            valeur = dictionnaire.interner(valeur)
+        object.__setattr__(self, nom, valeur)
+
+    def _identite(self):
+        # L'immatriculation identifie le véhicule ; elle ne doit pas changer une fois
+        # le véhicule placé dans un ensemble ou un dictionnaire.
+        return self.immatriculation
 
     def louer(self) -> bool:
         """Marque la voiture comme louée si elle est disponible."""
@@ -23,12 +41,13 @@ class Vehicule:
             print(f"La voiture {self.marque} {self.modele} ({self.immatriculation}) est déjà louée.")
             return False
 
-    def retourner(self, nouveaux_km: int, nouvel_etat: str) -> None:
-        """Retourne la voiture et met à jour le kilométrage."""
+    def retourner(self, nouveaux_km: int, nouvel_etat: Optional[str] = None) -> None:
+        """Retourne la voiture et met à jour le kilométrage (et l'état s'il est fourni)."""
         if not self.disponible:
             self.kilometrage += nouveaux_km
             self.disponible = True
-            self.etat = nouvel_etat
+            if nouvel_etat is not None:
+                self.etat = nouvel_etat
             print(f"La voiture {self.marque} {self.modele} ({self.immatriculation}) a été retournée avec {nouveaux_km} km de plus et un état '{self.etat}'.")
         else:
             print(f"La voiture {self.marque} {self.modele} ({self.immatriculation}) a été retournée avec {nouveaux_km} km de plus et un état '{self.etat}'.")
@@ -44,6 +63,7 @@ class Vehicule:
 
     def to_dict(self):
         return {
+            'id': self.id,
             'marque': self.marque,
             'modele': self.modele,
             'annee': self.annee,
@@ -52,5 +72,6 @@ class Vehicule:
             'prix_journalier': self.prix_journalier,
             'etat': self.etat,
             'typeVehicule': self.typeVehicule,
-            'disponible': self.disponible
+            'disponible': self.disponible,
+            'agenceId': self.agence_id
         }
\ No newline at end of file
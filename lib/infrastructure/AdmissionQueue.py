@@ -0,0 +1,62 @@
+import threading
+
+
+class AdmissionQueue:
+    """
+    Contrôle d'admission des requêtes d'écriture.
+
+    Au plus `max_en_cours` requêtes sont traitées à la fois ; au-delà, jusqu'à
+    `taille_file` requêtes attendent une place pendant `attente_max` secondes au plus.
+    Les autres sont rejetées tout de suite (délestage) : mieux vaut un 503 rapide avec
+    Retry-After qu'une file qui allonge la latence de toutes les requêtes du processus.
+    """
+
+    def __init__(self, max_en_cours: int = 32, taille_file: int = 64,
+                 attente_max: float = 0.05, retry_after: float = 1.0):
+        if max_en_cours < 1:
+            raise ValueError("L'admission doit accepter au moins une requête à la fois.")
+        self.max_en_cours = max_en_cours
+        self.taille_file = taille_file
+        self.attente_max = attente_max
+        self.retry_after = retry_after
+        self._condition = threading.Condition()
+        self._en_cours = 0
+        self._en_attente = 0
+        self.admises = 0
+        self.rejetees = 0
+
+    @property
+    def en_cours(self) -> int:
+        return self._en_cours
+
+    @property
+    def en_attente(self) -> int:
+        return self._en_attente
+
+    def entrer(self) -> bool:
+        """Réserve une place ; False si la requête doit être délestée."""
+        with self._condition:
+            if self._en_cours < self.max_en_cours and not self._en_attente:
+                return self._admettre()
+            if self._en_attente >= self.taille_file or self.attente_max <= 0:
+                self.rejetees += 1
+                return False
+            self._en_attente += 1
+            try:
+                place = self._condition.wait_for(lambda: self._en_cours < self.max_en_cours, self.attente_max)
+            finally:
+                self._en_attente -= 1
+            if not place:
+                self.rejetees += 1
+                return False
+            return self._admettre()
+
+    def _admettre(self) -> bool:
+        self._en_cours += 1
+        self.admises += 1
+        return True
+
+    def sortir(self) -> None:
+        with self._condition:
+            self._en_cours -= 1
+            self._condition.notify()
@@ -0,0 +1,80 @@
+import heapq
+import itertools
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ..domain.agence import Agence, corde_en_km, point_sur_la_sphere
+
+Point = Tuple[float, float, float]
+
+
+class AgenceSpatialIndex:
+    """
+    Arbre k-d immuable sur les agences, pour parcourir les agences de la plus proche à
+    la plus éloignée d'un point.
+
+    Les coordonnées sont projetées sur la sphère unité (x, y, z) : la distance
+    euclidienne (la corde) croît avec la distance à la surface, sans cas particulier à
+    l'antiméridien ni aux pôles. Le parcours est un best-first incrémental : une file
+    de priorité mêle les nœuds de l'arbre (clé = borne inférieure de leur distance) et
+    les agences (clé = distance exacte). Obtenir les k premières agences coûte
+    O(k log n) en pratique, sans fixer k ni de rayon à l'avance.
+    """
+
+    def __init__(self, agences: Iterable[Agence]):
+        elements = [(point_sur_la_sphere(a.latitude, a.longitude), a) for a in agences]
+        # Nœud i : point, agence, axe de coupe, fils gauche, fils droit (-1 si absent)
+        self._points: List[Point] = []
+        self._agences: List[Agence] = []
+        self._axes: List[int] = []
+        self._gauches: List[int] = []
+        self._droits: List[int] = []
+        self._racine = self._construire(elements)
+
+    def __len__(self) -> int:
+        return len(self._agences)
+
+    def _construire(self, elements) -> int:
+        if not elements:
+            return -1
+        # Coupe selon l'axe le plus étendu, à la médiane
+        axe = max(range(3), key=lambda a: max(e[0][a] for e in elements) - min(e[0][a] for e in elements))
+        elements.sort(key=lambda e: e[0][axe])
+        milieu = len(elements) // 2
+        noeud = len(self._agences)
+        point, agence = elements[milieu]
+        self._points.append(point)
+        self._agences.append(agence)
+        self._axes.append(axe)
+        self._gauches.append(-1)
+        self._droits.append(-1)
+        self._gauches[noeud] = self._construire(elements[:milieu])
+        self._droits[noeud] = self._construire(elements[milieu + 1:])
+        return noeud
+
+    def iter_nearest(self, latitude: float, longitude: float,
+                     rayon_km: Optional[float] = None) -> Iterator[Tuple[float, Agence]]:
+        """Couples (distance en km, agence) par distance croissante, jusqu'à `rayon_km`."""
+        if self._racine < 0:
+            return
+        cible = point_sur_la_sphere(latitude, longitude)
+        points, agences, axes, gauches, droits = self._points, self._agences, self._axes, self._gauches, self._droits
+        compteur = itertools.count()
+        # (clé, ordre, est_une_agence, indice du nœud)
+        file = [(0.0, next(compteur), False, self._racine)]
+        while file:
+            cle, _, est_une_agence, noeud = heapq.heappop(file)
+            if est_une_agence:
+                distance = corde_en_km(cle ** 0.5)
+                if rayon_km is not None and distance > rayon_km:
+                    return
+                yield distance, agences[noeud]
+                continue
+            point = points[noeud]
+            exacte = (point[0] - cible[0]) ** 2 + (point[1] - cible[1]) ** 2 + (point[2] - cible[2]) ** 2
+            heapq.heappush(file, (exacte, next(compteur), True, noeud))
+            ecart = cible[axes[noeud]] - point[axes[noeud]]
+            proche, loin = (gauches[noeud], droits[noeud]) if ecart < 0 else (droits[noeud], gauches[noeud])
+            if proche >= 0:
+                heapq.heappush(file, (cle, next(compteur), False, proche))
+            if loin >= 0:
+                heapq.heappush(file, (max(cle, ecart * ecart), next(compteur), False, loin))
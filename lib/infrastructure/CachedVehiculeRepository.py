@@ -0,0 +1,264 @@
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..application.VehiculeRepositoryPort import VehiculeRepositoryPort
+from ..domain.dictionnaire import MARQUES, MODELES
+from ..domain.vehicule import Vehicule
+
+# (marque, modele, disponible, type_vehicule, prix_max) une fois normalisés
+CleCriteres = Tuple[Optional[str], Optional[str], Optional[bool], Optional[str], Optional[float]]
+# (marque, modele, disponible, type_vehicule, prix_journalier) d'un véhicule
+Empreinte = Tuple[str, str, bool, str, float]
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class CachedVehiculeRepository(VehiculeRepositoryPort):
+    """
+    Décorateur LRU des résultats des recherches par critères (`find_by_criteria`,
+    `iter_by_criteria`, `count_by_criteria`) au-dessus de n'importe quel
+    VehiculeRepositoryPort : les trois partagent la même entrée par critères.
+
+    Chaque mutation passant par ce décorateur n'invalide que les entrées dont les
+    critères correspondent aux anciennes ou aux nouvelles valeurs du véhicule modifié.
+    Les modifications faites directement sur le repository décoré ne sont pas vues.
+    """
+
+    def __init__(self, repository: VehiculeRepositoryPort, maxsize: int = 256,
+                 ttl: Optional[float] = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.repository = repository
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CleCriteres, Tuple[Optional[float], Tuple[Vehicule, ...]]] = OrderedDict()
+        self._empreintes: Dict[object, Empreinte] = {}
+        self._generation = 0
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return dataclasses.replace(self._stats, size=len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._empreintes.clear()
+
+    # ===== Normalisation et correspondance =====
+
+    @staticmethod
+    def _normaliser(marque, modele, disponible, type_vehicule, prix_max) -> CleCriteres:
+        return (
+            marque.lower() if marque else None,
+            modele.lower() if modele else None,
+            disponible,
+            type_vehicule or None,
+            float(prix_max) if prix_max is not None else None,
+        )
+
+    @staticmethod
+    def _empreinte(vehicule: Vehicule) -> Empreinte:
+        return (MARQUES.minuscule(vehicule.marque), MODELES.minuscule(vehicule.modele), vehicule.disponible,
+                vehicule.typeVehicule, vehicule.prix_journalier)
+
+    @staticmethod
+    def _correspond(cle: CleCriteres, empreinte: Empreinte) -> bool:
+        marque, modele, disponible, type_vehicule, prix_max = cle
+        return ((marque is None or empreinte[0] == marque)
+                and (modele is None or empreinte[1] == modele)
+                and (disponible is None or empreinte[2] == disponible)
+                and (type_vehicule is None or empreinte[3] == type_vehicule)
+                and (prix_max is None or empreinte[4] <= prix_max))
+
+    def _invalider(self, *empreintes: Optional[Empreinte]) -> None:
+        empreintes = [e for e in empreintes if e is not None]
+        if not empreintes:
+            return
+        with self._lock:
+            perimees = [cle for cle in self._entries
+                        if any(self._correspond(cle, e) for e in empreintes)]
+            for cle in perimees:
+                del self._entries[cle]
+            self._generation += 1
+            self._stats.invalidations += len(perimees)
+
+    def _lire(self, vehicule_id) -> Optional[Vehicule]:
+        if isinstance(vehicule_id, int) and not isinstance(vehicule_id, bool):
+            return self.repository.get_by_id(vehicule_id)
+        return self.repository.get_by_immatriculation(vehicule_id)
+
+    def _muter(self, vehicule_id, operation, supprime: bool = False):
+        avant = self._lire(vehicule_id)
+        # Les empreintes sont indexées par immatriculation, quel que soit l'identifiant reçu
+        cle = avant.immatriculation if avant is not None else vehicule_id
+        with self._lock:
+            enregistree = self._empreintes.get(cle)
+        ancienne = self._empreinte(avant) if avant is not None else None
+
+        result = operation()
+
+        apres = None if supprime else self._lire(vehicule_id)
+        nouvelle = self._empreinte(apres) if apres is not None else None
+        with self._lock:
+            if nouvelle is None:
+                self._empreintes.pop(cle, None)
+            else:
+                self._empreintes[cle] = nouvelle
+        self._invalider(enregistree, ancienne, nouvelle)
+        return result
+
+    # ===== Requêtes mises en cache =====
+
+    def _en_cache(self, cle: CleCriteres) -> Optional[Tuple[Vehicule, ...]]:
+        """Résultat encore valide pour ces critères, ou None."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(cle)
+            if entry is None:
+                return None
+            expires_at, vehicules = entry
+            if expires_at is None or now < expires_at:
+                self._entries.move_to_end(cle)
+                self._stats.hits += 1
+                return vehicules
+            del self._entries[cle]
+            return None
+
+    def _rechercher(self, marque, modele, disponible, type_vehicule, prix_max) -> Tuple[Vehicule, ...]:
+        """Résultat des critères, lu dans le cache ou calculé puis mis en cache."""
+        cle = self._normaliser(marque, modele, disponible, type_vehicule, prix_max)
+        vehicules = self._en_cache(cle)
+        if vehicules is not None:
+            return vehicules
+        now = self._clock()
+        with self._lock:
+            self._stats.misses += 1
+            generation = self._generation
+
+        vehicules = tuple(self.repository.iter_by_criteria(*cle))
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if generation != self._generation:
+                # Une mutation a eu lieu pendant le calcul : on ne met pas en cache
+                return vehicules
+            for vehicule in vehicules:
+                self._empreintes[vehicule.immatriculation] = self._empreinte(vehicule)
+            self._entries[cle] = (expires_at, vehicules)
+            self._entries.move_to_end(cle)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+        return vehicules
+
+    def find_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> List[Vehicule]:
+        return list(self._rechercher(marque, modele, disponible, type_vehicule, prix_max))
+
+    def iter_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return iter(self._rechercher(marque, modele, disponible, type_vehicule, prix_max))
+
+    def iter_by_agence(self, agence_id: int,
+                       marque: Optional[str] = None,
+                       modele: Optional[str] = None,
+                       disponible: Optional[bool] = None,
+                       type_vehicule: Optional[str] = None,
+                       prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return self.repository.iter_by_agence(agence_id, marque, modele, disponible, type_vehicule, prix_max)
+
+    def count_by_criteria(self, marque: Optional[str] = None,
+                          modele: Optional[str] = None,
+                          disponible: Optional[bool] = None,
+                          type_vehicule: Optional[str] = None,
+                          prix_max: Optional[float] = None) -> int:
+        return len(self._rechercher(marque, modele, disponible, type_vehicule, prix_max))
+
+    # ===== Lectures déléguées =====
+
+    def get_by_id(self, vehicule_id: int) -> Optional[Vehicule]:
+        return self.repository.get_by_id(vehicule_id)
+
+    def get_by_immatriculation(self, vehicule_id) -> Optional[Vehicule]:
+        return self.repository.get_by_immatriculation(vehicule_id)
+
+    def get_all(self) -> List[Vehicule]:
+        return self.repository.get_all()
+
+    def get_available(self) -> List[Vehicule]:
+        return self.repository.get_available()
+
+    def iter_all(self) -> Iterator[Vehicule]:
+        return self.repository.iter_all()
+
+    def iter_available(self) -> Iterator[Vehicule]:
+        return self.repository.iter_available()
+
+    def count_all(self) -> int:
+        return self.repository.count_all()
+
+    def count_available(self) -> int:
+        return self.repository.count_available()
+
+    def is_available(self, vehicule_id) -> bool:
+        return self.repository.is_available(vehicule_id)
+
+    def is_available_between(self, vehicule_id, date_debut: date, date_fin: date) -> bool:
+        return self.repository.is_available_between(vehicule_id, date_debut, date_fin)
+
+    def calculate_rental_cost(self, vehicule_id, duree: int, date_debut: Optional[date] = None) -> float:
+        return self.repository.calculate_rental_cost(vehicule_id, duree, date_debut)
+
+    # ===== Mutations avec invalidation ciblée =====
+
+    def save(self, vehicule: Vehicule) -> int:
+        return self._muter(vehicule.immatriculation, lambda: self.repository.save(vehicule))
+
+    def save_all(self, vehicules: Iterable[Vehicule]) -> int:
+        # Pour un lot, comparer chaque véhicule à chaque entrée coûte plus cher que de tout vider
+        result = self.repository.save_all(vehicules)
+        with self._lock:
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self._empreintes.clear()
+            self._generation += 1
+        return result
+
+    def delete(self, vehicule_id) -> bool:
+        return self._muter(vehicule_id, lambda: self.repository.delete(vehicule_id), supprime=True)
+
+    def set_availability(self, vehicule_id, disponible: bool) -> bool:
+        return self._muter(vehicule_id, lambda: self.repository.set_availability(vehicule_id, disponible))
+
+    def louer_vehicule(self, vehicule_id) -> bool:
+        return self._muter(vehicule_id, lambda: self.repository.louer_vehicule(vehicule_id))
+
+    def retourner_vehicule(self, vehicule_id, km_parcourus: int) -> bool:
+        return self._muter(vehicule_id, lambda: self.repository.retourner_vehicule(vehicule_id, km_parcourus))
+
+    def create_vehicule(self, marque: str, modele: str, annee: int,
+                        immatriculation, kilometrage: int,
+                        prix_journalier: float, etat: str,
+                        type_vehicule: str) -> Vehicule:
+        vehicule = self.repository.create_vehicule(marque, modele, annee, immatriculation,
+                                                   kilometrage, prix_journalier, etat, type_vehicule)
+        self._invalider(self._empreinte(vehicule))
+        return vehicule
@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .SingleFlight import SingleFlight
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def negocier(accept_encoding: Optional[str], disponibles) -> Optional[str]:
+    """
+    Choisit un encodage d'après l'en-tête Accept-Encoding.
+
+    :param disponibles: Encodages proposés, par ordre de préférence du serveur
+    :return: L'encodage retenu, ou None pour la représentation non compressée
+    """
+    if not accept_encoding:
+        return None
+    poids: Dict[str, float] = {}
+    for element in accept_encoding.split(','):
+        nom, _, parametres = element.strip().partition(';')
+        q = 1.0
+        parametres = parametres.strip()
+        if parametres.startswith('q='):
+            try:
+                q = float(parametres[2:])
+            except ValueError:
+                q = 0.0
+        poids[nom.strip().lower()] = q
+    meilleur, meilleur_q = None, 0.0
+    for encodage in disponibles:
+        q = poids.get(encodage, poids.get('*', 0.0))
+        if q > meilleur_q:
+            meilleur, meilleur_q = encodage, q
+    return meilleur
+
+
+class CompressionCache:
+    """
+    Corps de réponse compressés, indexés par leur ETag.
+
+    L'ETag est une empreinte du corps non compressé : tant qu'une représentation ne
+    change pas, elle n'est compressée qu'une fois par encodage, y compris quand des
+    requêtes simultanées la demandent. Les `maxsize` variantes les plus récentes sont
+    gardées. Brotli n'est proposé que si le paquet `brotli` est installé.
+    """
+
+    def __init__(self, maxsize: int = 64, niveau_gzip: int = 6, qualite_brotli: int = 5):
+        self.maxsize = maxsize
+        self.niveau_gzip = niveau_gzip
+        self.qualite_brotli = qualite_brotli
+        self._brotli = _brotli()
+        self.encodages = ('br', 'gzip') if self._brotli is not None else ('gzip',)
+        self._variantes: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._vol = SingleFlight()
+        self.compressions = 0
+        self.hits = 0
+
+    def choisir(self, accept_encoding: Optional[str]) -> Optional[str]:
+        return negocier(accept_encoding, self.encodages)
+
+    @staticmethod
+    def etag(corps: bytes) -> str:
+        return hashlib.blake2b(corps, digest_size=16).hexdigest()
+
+    def compresser(self, corps: bytes, encodage: str) -> bytes:
+        if encodage == 'gzip':
+            # mtime fixé : les mêmes octets pour un même corps
+            return gzip.compress(corps, self.niveau_gzip, mtime=0)
+        if encodage == 'br' and self._brotli is not None:
+            return self._brotli.compress(corps, quality=self.qualite_brotli)
+        raise ValueError(f"Encodage non pris en charge : '{encodage}'")
+
+    def get(self, etag: str, corps: bytes, encodage: str) -> bytes:
+        """Variante compressée de `corps` (dont l'ETag est `etag`), calculée une seule fois."""
+        cle = (etag, encodage)
+        with self._lock:
+            variante = self._variantes.get(cle)
+            if variante is not None:
+                self._variantes.move_to_end(cle)
+                self.hits += 1
+                return variante
+        return self._vol.do(cle, lambda: self._calculer(cle, corps, encodage))
+
+    def _calculer(self, cle, corps: bytes, encodage: str) -> bytes:
+        variante = self.compresser(corps, encodage)
+        with self._lock:
+            self.compressions += 1
+            self._variantes[cle] = variante
+            while len(self._variantes) > self.maxsize:
+                self._variantes.popitem(last=False)
+        return variante
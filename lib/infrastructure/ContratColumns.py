@@ -0,0 +1,113 @@
+import dataclasses
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..application.ContratColumnsPort import ContratColumnsPort
+from ..domain.contratLocation import ContratLocation
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("L'analyse des contrats nécessite numpy (pip install 'groupe3ddd[analytics]').") from e
+    return numpy
+
+
+# Ordinal (date.toordinal) du 1970-01-01, origine de datetime64
+_ORDINAL_EPOCH = date(1970, 1, 1).toordinal()
+
+
+@dataclasses.dataclass
+class ContratColumns(ContratColumnsPort):
+    """
+    Instantané colonne par colonne des contrats, pour les agrégations vectorisées.
+
+    `debut` contient les dates de début en ordinaux de jours, `type_code` l'indice du
+    type de véhicule dans `types`.
+    """
+    debut: 'numpy.ndarray'
+    duree: 'numpy.ndarray'
+    cout: 'numpy.ndarray'
+    caution: 'numpy.ndarray'
+    type_code: 'numpy.ndarray'
+    types: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.debut)
+
+    @classmethod
+    def from_contrats(cls, contrats: Iterable[ContratLocation]) -> 'ContratColumns':
+        np = _numpy()
+        codes: Dict[str, int] = {}
+        debut, duree, cout, caution, type_code = [], [], [], [], []
+        for contrat in contrats:
+            debut.append(contrat.dateDebut.toordinal())
+            duree.append(contrat.duree)
+            cout.append(contrat.cout)
+            caution.append(contrat.caution)
+            type_code.append(codes.setdefault(contrat.vehicule.typeVehicule, len(codes)))
+        return cls(
+            debut=np.array(debut, dtype=np.int32),
+            duree=np.array(duree, dtype=np.int32),
+            cout=np.array(cout, dtype=np.float64),
+            caution=np.array(caution, dtype=np.float64),
+            type_code=np.array(type_code, dtype=np.int16),
+            types=tuple(codes),
+        )
+
+    # ===== Agrégations =====
+
+    def _mois(self):
+        """Mois de début de chaque contrat, en mois écoulés depuis 1970-01."""
+        np = _numpy()
+        return (self.debut - _ORDINAL_EPOCH).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+    def revenue_by_month(self) -> List[Tuple[str, float]]:
+        """Chiffre d'affaires (somme des coûts) par mois de début de contrat."""
+        np = _numpy()
+        if not len(self):
+            return []
+        mois = self._mois()
+        premier = int(mois.min())
+        sommes = np.bincount(mois - premier, weights=self.cout)
+        presents = np.flatnonzero(np.bincount(mois - premier))
+        libelles = (presents + premier).astype('datetime64[M]').astype(str)
+        return list(zip(libelles.tolist(), sommes[presents].tolist()))
+
+    def utilization_by_type(self, debut: date, fin: date, flotte: Dict[str, int]) -> Dict[str, float]:
+        """
+        Taux d'utilisation par type de véhicule sur [debut, fin[ : jours loués / jours disponibles.
+
+        :param flotte: Nombre de véhicules par type
+        """
+        np = _numpy()
+        jours = (fin - debut).days
+        if jours <= 0:
+            raise ValueError("La période d'analyse doit durer au moins un jour.")
+        debut_ord, fin_ord = debut.toordinal(), fin.toordinal()
+        recouvrement = np.minimum(self.debut + self.duree, fin_ord) - np.maximum(self.debut, debut_ord)
+        np.clip(recouvrement, 0, None, out=recouvrement)
+        jours_loues = np.bincount(self.type_code, weights=recouvrement, minlength=len(self.types))
+        return {
+            type_vehicule: float(jours_loues[code]) / (flotte[type_vehicule] * jours) if flotte.get(type_vehicule) else 0.0
+            for code, type_vehicule in enumerate(self.types)
+        }
+
+    def mean_duration(self) -> float:
+        return float(self.duree.mean()) if len(self) else 0.0
+
+    def mean_duration_by_type(self) -> Dict[str, float]:
+        np = _numpy()
+        nombres = np.bincount(self.type_code, minlength=len(self.types))
+        sommes = np.bincount(self.type_code, weights=self.duree, minlength=len(self.types))
+        return {t: float(sommes[c] / nombres[c]) for c, t in enumerate(self.types) if nombres[c]}
+
+    def duration_histogram(self, bornes: Sequence[int]) -> List[Tuple[int, Optional[int], int]]:
+        """Nombre de contrats par tranche de durée [bornes[i], bornes[i+1][ ; la dernière tranche est ouverte."""
+        np = _numpy()
+        bornes = sorted(bornes)
+        indices = np.searchsorted(np.asarray(bornes), self.duree, side='right') - 1
+        comptes = np.bincount(indices[indices >= 0], minlength=len(bornes))
+        hautes = list(bornes[1:]) + [None]
+        return [(basse, haute, int(n)) for basse, haute, n in zip(bornes, hautes, comptes)]
@@ -0,0 +1,157 @@
+from datetime import date
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from ..application.VehiculeRepositoryPort import VehiculeRepositoryPort
+from ..domain.exceptions import VehiculeNotFoundException
+from ..domain.tarification import PolitiqueTarifaire
+from ..domain.vehicule import Vehicule
+from .OccupationFlotte import OccupationFlotte
+
+
+class DynamicPricingVehiculeRepository(VehiculeRepositoryPort):
+    """
+    Décorateur qui calcule le coût de location avec un prix journalier dynamique :
+    le prix de base du véhicule est ajusté par la politique tarifaire selon
+    l'occupation de son type, l'anticipation et la durée de la location.
+
+    Les compteurs d'occupation sont construits à partir du repository décoré, puis
+    tenus à jour à chaque location, retour ou enregistrement passant par lui. Ils sont
+    propres au processus.
+    """
+
+    def __init__(self, repository: VehiculeRepositoryPort, politique: PolitiqueTarifaire,
+                 occupation: Optional[OccupationFlotte] = None, horloge: Callable[[], date] = date.today):
+        self.repository = repository
+        self.politique = politique
+        self.occupation = occupation if occupation is not None else OccupationFlotte()
+        self._horloge = horloge
+        self.occupation.reconstruire(repository.iter_all())
+
+    def _lire(self, vehicule_id) -> Optional[Vehicule]:
+        if isinstance(vehicule_id, int) and not isinstance(vehicule_id, bool):
+            return self.repository.get_by_id(vehicule_id)
+        return self.repository.get_by_immatriculation(vehicule_id)
+
+    def _suivre(self, vehicule_id) -> None:
+        vehicule = self._lire(vehicule_id)
+        if vehicule is not None:
+            self.occupation.suivre(vehicule)
+
+    # ===== Tarification =====
+
+    def tarif_journalier(self, vehicule: Vehicule, duree: int, date_debut: Optional[date] = None) -> float:
+        anticipation = (date_debut - self._horloge()).days if date_debut is not None else 0
+        return self.politique.prix_journalier(vehicule.prix_journalier, self.occupation.taux(vehicule.typeVehicule),
+                                              anticipation, duree)
+
+    def calculate_rental_cost(self, vehicule_id, duree: int, date_debut: Optional[date] = None) -> float:
+        vehicule = self._lire(vehicule_id)
+        if vehicule is None:
+            raise VehiculeNotFoundException(f"Véhicule avec l'ID {vehicule_id} non trouvé.")
+        return round(self.tarif_journalier(vehicule, duree, date_debut) * duree, 2)
+
+    # ===== Lectures déléguées =====
+
+    def get_by_id(self, vehicule_id: int) -> Optional[Vehicule]:
+        return self.repository.get_by_id(vehicule_id)
+
+    def get_by_immatriculation(self, vehicule_id) -> Optional[Vehicule]:
+        return self.repository.get_by_immatriculation(vehicule_id)
+
+    def get_all(self) -> List[Vehicule]:
+        return self.repository.get_all()
+
+    def get_available(self) -> List[Vehicule]:
+        return self.repository.get_available()
+
+    def iter_all(self) -> Iterator[Vehicule]:
+        return self.repository.iter_all()
+
+    def iter_available(self) -> Iterator[Vehicule]:
+        return self.repository.iter_available()
+
+    def count_all(self) -> int:
+        return self.repository.count_all()
+
+    def count_available(self) -> int:
+        return self.repository.count_available()
+
+    def is_available(self, vehicule_id) -> bool:
+        return self.repository.is_available(vehicule_id)
+
+    def is_available_between(self, vehicule_id, date_debut: date, date_fin: date) -> bool:
+        return self.repository.is_available_between(vehicule_id, date_debut, date_fin)
+
+    def find_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> List[Vehicule]:
+        return self.repository.find_by_criteria(marque, modele, disponible, type_vehicule, prix_max)
+
+    def iter_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return self.repository.iter_by_criteria(marque, modele, disponible, type_vehicule, prix_max)
+
+    def iter_by_agence(self, agence_id: int,
+                       marque: Optional[str] = None,
+                       modele: Optional[str] = None,
+                       disponible: Optional[bool] = None,
+                       type_vehicule: Optional[str] = None,
+                       prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return self.repository.iter_by_agence(agence_id, marque, modele, disponible, type_vehicule, prix_max)
+
+    def count_by_criteria(self, marque: Optional[str] = None,
+                          modele: Optional[str] = None,
+                          disponible: Optional[bool] = None,
+                          type_vehicule: Optional[str] = None,
+                          prix_max: Optional[float] = None) -> int:
+        return self.repository.count_by_criteria(marque, modele, disponible, type_vehicule, prix_max)
+
+    # ===== Mutations suivies par les compteurs =====
+
+    def save(self, vehicule: Vehicule) -> int:
+        result = self.repository.save(vehicule)
+        self.occupation.suivre(vehicule)
+        return result
+
+    def save_all(self, vehicules: Iterable[Vehicule]) -> int:
+        vehicules = list(vehicules)
+        result = self.repository.save_all(vehicules)
+        for vehicule in vehicules:
+            self.occupation.suivre(vehicule)
+        return result
+
+    def delete(self, vehicule_id) -> bool:
+        avant = self._lire(vehicule_id)
+        result = self.repository.delete(vehicule_id)
+        if avant is not None:
+            self.occupation.oublier(avant.id if avant.id is not None else avant.immatriculation)
+        return result
+
+    def set_availability(self, vehicule_id, disponible: bool) -> bool:
+        result = self.repository.set_availability(vehicule_id, disponible)
+        self._suivre(vehicule_id)
+        return result
+
+    def louer_vehicule(self, vehicule_id) -> bool:
+        result = self.repository.louer_vehicule(vehicule_id)
+        self._suivre(vehicule_id)
+        return result
+
+    def retourner_vehicule(self, vehicule_id, km_parcourus: int) -> bool:
+        result = self.repository.retourner_vehicule(vehicule_id, km_parcourus)
+        self._suivre(vehicule_id)
+        return result
+
+    def create_vehicule(self, marque: str, modele: str, annee: int,
+                        immatriculation, kilometrage: int,
+                        prix_journalier: float, etat: str,
+                        type_vehicule: str) -> Vehicule:
+        vehicule = self.repository.create_vehicule(marque, modele, annee, immatriculation,
+                                                   kilometrage, prix_journalier, etat, type_vehicule)
+        self.occupation.suivre(vehicule)
+        return vehicule
@@ -0,0 +1,83 @@
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+Ligne = Dict[str, object]
+
+
+class CsvFleetFile:
+    def __init__(self, chemin: Union[str, Path]):
+        self.chemin = Path(chemin)
+
+    def read_chunks(self, taille_lot: int) -> Iterator[List[Ligne]]:
+        with open(self.chemin, newline='', encoding='utf-8') as fichier:
+            lot = []
+            for ligne in csv.DictReader(fichier):
+                lot.append(ligne)
+                if len(lot) >= taille_lot:
+                    yield lot
+                    lot = []
+            if lot:
+                yield lot
+
+    def write(self, colonnes: Sequence[str], lignes: Iterable[Ligne], taille_lot: int,
+              types: Optional[Mapping[str, type]] = None) -> int:
+        compte = 0
+        with open(self.chemin, 'w', newline='', encoding='utf-8') as fichier:
+            writer = csv.DictWriter(fichier, fieldnames=colonnes)
+            writer.writeheader()
+            for ligne in lignes:
+                writer.writerow(ligne)
+                compte += 1
+        return compte
+
+
+class ParquetFleetFile:
+    def __init__(self, chemin: Union[str, Path]):
+        self.chemin = Path(chemin)
+
+    @staticmethod
+    def _pyarrow():
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Le format Parquet nécessite pyarrow (pip install 'groupe3ddd[parquet]').") from e
+        return pyarrow
+
+    def read_chunks(self, taille_lot: int) -> Iterator[List[Ligne]]:
+        pa = self._pyarrow()
+        fichier = pa.parquet.ParquetFile(self.chemin)
+        for batch in fichier.iter_batches(batch_size=taille_lot):
+            yield batch.to_pylist()
+
+    def write(self, colonnes: Sequence[str], lignes: Iterable[Ligne], taille_lot: int,
+              types: Optional[Mapping[str, type]] = None) -> int:
+        """
+        :param types: Type Python (int, float, bool) des colonnes non textuelles ; le schéma
+            est déclaré d'avance, si bien qu'un lot de valeurs nulles ne fige pas le type
+        """
+        pa = self._pyarrow()
+        arrow = {int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+        schema = pa.schema([(c, arrow.get((types or {}).get(c), pa.string())) for c in colonnes])
+        compte = 0
+        lot = []
+        with pa.parquet.ParquetWriter(self.chemin, schema) as writer:
+            for ligne in lignes:
+                lot.append(ligne)
+                if len(lot) >= taille_lot:
+                    writer.write_table(pa.Table.from_pylist(lot, schema=schema))
+                    compte += len(lot)
+                    lot = []
+            writer.write_table(pa.Table.from_pylist(lot, schema=schema))
+            compte += len(lot)
+        return compte
+
+
+def open_fleet_file(chemin: Union[str, Path]):
+    suffixe = Path(chemin).suffix.lower()
+    if suffixe == '.csv':
+        return CsvFleetFile(chemin)
+    if suffixe in ('.parquet', '.pq'):
+        return ParquetFleetFile(chemin)
+    raise ValueError(f"Format de fichier non supporté : '{suffixe}' (attendu .csv ou .parquet)")
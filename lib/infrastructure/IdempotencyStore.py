@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+# (statut, type MIME, corps) de la première réponse
+Reponse = Tuple[int, str, bytes]
+
+
+class IdempotencyEntry:
+    """Traitement d'une clé : en cours tant que `reponse` est None."""
+
+    __slots__ = ('empreinte', 'reponse', 'expire_a', 'abandonnee')
+
+    def __init__(self, empreinte: str):
+        self.empreinte = empreinte
+        self.reponse: Optional[Reponse] = None
+        self.expire_a = float('inf')
+        self.abandonnee = False
+
+
+class IdempotencyStore:
+    """
+    Réponses déjà rendues, par clé d'idempotence, en mémoire du processus.
+
+    La première requête d'une clé en devient propriétaire et l'exécute ; les doublons
+    concurrents trouvent l'entrée en cours sans s'exécuter, les suivants rejouent sa
+    réponse jusqu'à son expiration (`ttl`). Au-delà de `maxsize` clés, les plus anciennes
+    réponses terminées sont oubliées.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 86_400.0,
+                 horloge: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._horloge = horloge
+        self._entrees: 'OrderedDict[str, IdempotencyEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+    def begin(self, cle: str, empreinte: str) -> Tuple[IdempotencyEntry, bool]:
+        """
+        :return: L'entrée de la clé, et True si l'appelant doit exécuter la requête
+        """
+        with self._lock:
+            entree = self._entrees.get(cle)
+            if entree is not None and entree.expire_a > self._horloge():
+                self._entrees.move_to_end(cle)
+                return entree, False
+            entree = self._entrees[cle] = IdempotencyEntry(empreinte)
+            self._evincer()
+            return entree, True
+
+    def complete(self, cle: str, entree: IdempotencyEntry, reponse: Reponse) -> None:
+        with self._lock:
+            entree.reponse = reponse
+            entree.expire_a = self._horloge() + self.ttl
+
+    def abandon(self, cle: str, entree: IdempotencyEntry) -> None:
+        """Oublie une requête qui n'a pas abouti : le prochain essai l'exécutera à nouveau."""
+        with self._lock:
+            if self._entrees.get(cle) is entree:
+                del self._entrees[cle]
+            entree.abandonnee = True
+
+    def _evincer(self) -> None:
+        if len(self._entrees) <= self.maxsize:
+            return
+        maintenant = self._horloge()
+        for cle in list(self._entrees):
+            if len(self._entrees) <= self.maxsize:
+                break
+            entree = self._entrees[cle]
+            # Les requêtes en cours restent : leurs doublons les attendent
+            if entree.reponse is not None or entree.expire_a <= maintenant:
+                del self._entrees[cle]
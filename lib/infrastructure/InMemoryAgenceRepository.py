@@ -0,0 +1,73 @@
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..application.AgenceRepositoryPort import AgenceRepositoryPort
+from ..domain.agence import Agence
+from ..domain.exceptions import AgenceNotFoundException
+from .AgenceSpatialIndex import AgenceSpatialIndex
+
+
+class InMemoryAgenceRepository(AgenceRepositoryPort):
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(InMemoryAgenceRepository, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._agences: Dict[int, Agence] = {}
+        self._next_id = 1
+        # Arbre k-d reconstruit à la première recherche qui suit une modification ;
+        # les agences changent rarement comparé aux recherches
+        self._index: Optional[AgenceSpatialIndex] = None
+        self._lock = threading.Lock()
+
+    def get_by_id(self, agence_id: int) -> Optional[Agence]:
+        agence = self._agences.get(agence_id)
+        if agence is None:
+            raise AgenceNotFoundException(f"Agence avec l'ID {agence_id} non trouvée.")
+        return agence
+
+    def get_all(self) -> List[Agence]:
+        return list(self._agences.values())
+
+    def iter_all(self) -> Iterator[Agence]:
+        return iter(tuple(self._agences.values()))
+
+    def count_all(self) -> int:
+        return len(self._agences)
+
+    def save(self, agence: Agence) -> int:
+        with self._lock:
+            if agence.id is None:
+                agence.id = self._next_id
+                self._next_id += 1
+            self._agences[agence.id] = agence
+            self._index = None
+        return agence.id
+
+    def delete(self, agence_id: int) -> bool:
+        with self._lock:
+            if self._agences.pop(agence_id, None) is None:
+                raise AgenceNotFoundException(f"Agence avec l'ID {agence_id} non trouvée pour suppression.")
+            self._index = None
+        return True
+
+    def create_agence(self, nom: str, latitude: float, longitude: float) -> Agence:
+        agence = Agence(nom, latitude, longitude)
+        self.save(agence)
+        return agence
+
+    def spatial_index(self) -> AgenceSpatialIndex:
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = AgenceSpatialIndex(self._agences.values())
+                index = self._index
+        return index
+
+    def iter_nearest(self, latitude: float, longitude: float) -> Iterator[Tuple[float, Agence]]:
+        return self.spatial_index().iter_nearest(latitude, longitude)
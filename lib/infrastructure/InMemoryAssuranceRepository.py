@@ -1,72 +1,142 @@
-from ..application.ClientRepositoryPort import ClientRepositoryPort
-from ..domain.client import Client
-from ..domain.exceptions import ClientNotFoundException, ClientAlreadyExistsException
-from typing import List, Optional
+import functools
+import json
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 
-class InMemoryClientRepository(ClientRepositoryPort):
+from ..application.AssuranceRepositoryPort import AssuranceRepositoryPort
+from ..domain.assurance import TYPE_PAR_DEFAUT, Assurance, GrilleTarifaire
+from ..domain.exceptions import AssuranceAlreadyExistsException, AssuranceNotFoundException
+
+# Catalogue livré avec l'application : tarifs journaliers par type de véhicule, pour
+# les locations de 1-3, 4-7, 8-14, 15-30 et 31 jours ou plus
+CATALOGUE_PAR_DEFAUT = {
+    "bornes": [1, 4, 8, 15, 31],
+    "assurances": {
+        "Tiers": {
+            "tarif_journalier": 8.0,
+            "tarifs": {
+                "Citadine": [8.0, 7.0, 6.0, 5.0, 4.0],
+                "Berline": [10.0, 9.0, 8.0, 7.0, 6.0],
+                "SUV": [12.0, 11.0, 10.0, 8.5, 7.0],
+                "Utilitaire": [14.0, 12.5, 11.0, 9.5, 8.0],
+                TYPE_PAR_DEFAUT: [10.0, 9.0, 8.0, 7.0, 6.0],
+            },
+        },
+        "Tous risques": {
+            "tarif_journalier": 15.0,
+            "tarifs": {
+                "Citadine": [15.0, 13.5, 12.0, 10.0, 8.5],
+                "Berline": [18.0, 16.0, 14.5, 12.5, 10.5],
+                "SUV": [22.0, 20.0, 18.0, 15.5, 13.0],
+                "Utilitaire": [25.0, 22.5, 20.0, 17.0, 14.5],
+                TYPE_PAR_DEFAUT: [18.0, 16.0, 14.5, 12.5, 10.5],
+            },
+        },
+    },
+}
+
+
+@functools.lru_cache(maxsize=None)
+def charger_catalogue(chemin: Optional[str] = None) -> Mapping[str, Tuple[float, GrilleTarifaire]]:
+    """
+    Compile le catalogue (fichier JSON, ou celui livré par défaut) en grilles immuables.
+
+    Chaque fichier n'est lu et compilé qu'une fois par processus ; les grilles sont
+    partagées par toutes les assurances qui les utilisent.
+
+    :return: nom de l'assurance -> (tarif journalier de base, grille)
+    """
+    if chemin is None:
+        catalogue = CATALOGUE_PAR_DEFAUT
+    else:
+        with open(chemin, encoding='utf-8') as fichier:
+            catalogue = json.load(fichier)
+    bornes = catalogue["bornes"]
+    return MappingProxyType({
+        nom: (float(produit.get("tarif_journalier", 0.0)), GrilleTarifaire.compiler(produit["tarifs"], bornes))
+        for nom, produit in catalogue["assurances"].items()
+    })
+
+
+class InMemoryAssuranceRepository(AssuranceRepositoryPort):
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(InMemoryClientRepository, cls).__new__(cls)
+            cls._instance = super(InMemoryAssuranceRepository, cls).__new__(cls)
             cls._instance._initialize()
         return cls._instance
 
     def _initialize(self):
-        self._clients = {}
+        self._assurances: Dict[int, Assurance] = {}
         self._next_id = 1
+        # Nom en minuscules -> ids des assurances
+        self._par_nom: Dict[str, List[int]] = {}
+        self._catalogue = charger_catalogue()
+        for nom in self._catalogue:
+            self.create_assurance(nom)
+
+    def load_catalogue(self, chemin: Optional[str] = None) -> int:
+        """Remplace les assurances par celles du catalogue `chemin` (compilé une fois par processus)."""
+        self._assurances, self._par_nom, self._next_id = {}, {}, 1
+        self._catalogue = charger_catalogue(chemin)
+        for nom in self._catalogue:
+            self.create_assurance(nom)
+        return len(self._assurances)
 
-    def get_by_id(self, client_id: int) -> Optional[Client]:
-        client = self._clients.get(client_id)
-        if client is None:
-            raise ClientNotFoundException(f"Client avec l'ID {client_id} non trouvé.")
-        return client
+    def get_by_id(self, assurance_id: int) -> Optional[Assurance]:
+        assurance = self._assurances.get(assurance_id)
+        if assurance is None:
+            raise AssuranceNotFoundException(f"Assurance avec l'ID {assurance_id} non trouvée.")
+        return assurance
 
-    def get_all(self) -> List[Client]:
-        return list(self._clients.values())
+    def get_all(self) -> List[Assurance]:
+        return list(self._assurances.values())
 
-    def save(self, client: Client) -> int:
-        if not hasattr(client, 'id') or client.id is None:
-            client.id = self._next_id
+    def iter_all(self) -> Iterator[Assurance]:
+        return iter(self._assurances.values())
+
+    def count_all(self) -> int:
+        return len(self._assurances)
+
+    def save(self, assurance: Assurance) -> int:
+        if assurance.id is None:
+            assurance.id = self._next_id
             self._next_id += 1
-        self._clients[client.id] = client
-        return client.id
-
-    def delete(self, client_id: int) -> bool:
-        if client_id in self._clients:
-            del self._clients[client_id]
-            return True
-        raise ClientNotFoundException(f"Client avec l'ID {client_id} non trouvé pour suppression.")
-
-    def find_by_name(self, nom: str, prenom: Optional[str] = None) -> List[Client]:
-        results = []
-        for client in self._clients.values():
-            if client.nom.lower() == nom.lower():
-                if prenom is None or client.prenom.lower() == prenom.lower():
-                    results.append(client)
-        if not results:
-            raise ClientNotFoundException(f"Client avec le nom '{nom}' et prénom '{prenom}' non trouvé.")
-        return results
-
-    def find_by_permis(self, permis: str) -> Optional[Client]:
-        for client in self._clients.values():
-            if client.permis == permis:
-                return client
-        raise ClientNotFoundException(f"Client avec le permis '{permis}' non trouvé.")
-
-    def find_by_email(self, email: str) -> Optional[Client]:
-        for client in self._clients.values():
-            if client.email.lower() == email.lower():
-                return client
-        raise ClientNotFoundException(f"Client avec l'email '{email}' non trouvé.")
-
-    def find_with_active_rentals(self) -> List[Client]:
-        return [client for client in self._clients.values() if client.historique_locations]
-
-    def create_client(self, nom: str, prenom: str, permis: str, telephone: str, email: str, voitureLouer=None) -> Client:
-        if any(client.permis == permis for client in self._clients.values()):
-            raise ClientAlreadyExistsException(f"Un client avec le permis '{permis}' existe déjà.")
-
-        client = Client(nom, prenom, permis, telephone, email, voitureLouer)
-        self.save(client)
-        return client
+        precedente = self._assurances.get(assurance.id)
+        if precedente is not None:
+            self._desindexer(precedente)
+        self._assurances[assurance.id] = assurance
+        self._par_nom.setdefault(assurance.nom.lower(), []).append(assurance.id)
+        return assurance.id
+
+    def _desindexer(self, assurance: Assurance) -> None:
+        ids = self._par_nom.get(assurance.nom.lower(), [])
+        if assurance.id in ids:
+            ids.remove(assurance.id)
+        if not ids:
+            self._par_nom.pop(assurance.nom.lower(), None)
+
+    def delete(self, assurance_id: int) -> bool:
+        assurance = self._assurances.pop(assurance_id, None)
+        if assurance is None:
+            raise AssuranceNotFoundException(f"Assurance avec l'ID {assurance_id} non trouvée pour suppression.")
+        self._desindexer(assurance)
+        return True
+
+    def find_by_name(self, nom: str) -> List[Assurance]:
+        ids = self._par_nom.get(nom.lower())
+        if not ids:
+            raise AssuranceNotFoundException(f"Assurance avec le nom '{nom}' non trouvée.")
+        return [self._assurances[i] for i in ids]
+
+    def create_assurance(self, nom: str) -> Assurance:
+        if nom.lower() in self._par_nom:
+            raise AssuranceAlreadyExistsException(f"Une assurance nommée '{nom}' existe déjà.")
+        tarif_journalier, grille = self._catalogue.get(nom, (0.0, None))
+        assurance = Assurance(nom, tarif_journalier, grille)
+        self.save(assurance)
+        return assurance
+
+    def get_tarif(self, assurance_id: int, type_vehicule: str, duree: int) -> float:
+        return self.get_by_id(assurance_id).getTarif(type_vehicule, duree)
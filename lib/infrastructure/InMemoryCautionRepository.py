@@ -0,0 +1,153 @@
+import dataclasses
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from ..application.CautionRepositoryPort import CautionRepositoryPort
+from ..domain.caution import EMPREINTE, MouvementCaution, SoldeCaution
+from ..domain.exceptions import InvalidCautionOperationException
+
+
+class InMemoryCautionRepository(CautionRepositoryPort):
+    """
+    Registre des cautions en mémoire, en ajout seul.
+
+    Les soldes par contrat et par client ainsi que le total des empreintes en cours
+    sont tenus à jour à chaque ajout : toutes les requêtes de solde sont en O(1), de même
+    que la recherche des empreintes en cours d'un véhicule.
+    Si un journal est attaché, chaque mouvement y est aussi ajouté (une ligne JSON
+    par mouvement) et le registre est reconstruit en le relisant.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(InMemoryCautionRepository, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._mouvements: List[MouvementCaution] = []
+        self._par_contrat: Dict[int, List[int]] = {}
+        self._soldes_contrat: Dict[int, SoldeCaution] = {}
+        self._soldes_client: Dict[object, SoldeCaution] = {}
+        # Contrats dont une partie de l'empreinte est encore bloquée
+        self._en_cours: Dict[int, None] = {}
+        # Immatriculation -> contrats en cours, dans l'ordre de leur première empreinte
+        self._en_cours_par_vehicule: Dict[str, Dict[int, None]] = {}
+        self._vehicule_contrat: Dict[int, str] = {}
+        self._total_en_cours = 0
+        self._journal: Optional[Path] = None
+        self._lock = threading.Lock()
+
+    # ===== Journal =====
+
+    def attach_journal(self, chemin: Union[str, Path]) -> int:
+        """Rejoue le journal `chemin` s'il existe, puis y ajoute les mouvements suivants."""
+        chemin = Path(chemin)
+        mouvements = []
+        if chemin.exists():
+            with open(chemin, encoding='utf-8') as fichier:
+                for ligne in fichier:
+                    contrat_id, client_id, type_mouvement, montant, horodatage, motif, *vehicule = json.loads(ligne)
+                    mouvements.append(MouvementCaution(contrat_id, client_id, type_mouvement, montant,
+                                                       datetime.fromisoformat(horodatage), motif,
+                                                       vehicule[0] if vehicule else None))
+        with self._lock:
+            self._journal = None
+            self._ajouter(mouvements)
+            self._journal = chemin
+        return len(mouvements)
+
+    @staticmethod
+    def _ligne(mouvement: MouvementCaution) -> str:
+        return json.dumps([mouvement.contrat_id, mouvement.client_id, mouvement.type, mouvement.centimes,
+                           mouvement.date.isoformat(), mouvement.motif, mouvement.vehicule], ensure_ascii=False) + "\n"
+
+    # ===== Écritures =====
+
+    def append(self, mouvement: MouvementCaution) -> None:
+        self.append_many((mouvement,))
+
+    def append_many(self, mouvements: Iterable[MouvementCaution]) -> int:
+        """
+        Ajoute un lot de mouvements en une fois : le lot est entièrement validé avant
+        la première écriture, puis journalisé en un seul appel.
+        """
+        mouvements = list(mouvements)
+        with self._lock:
+            self._valider(mouvements)
+            if self._journal is not None:
+                with open(self._journal, 'a', encoding='utf-8') as fichier:
+                    fichier.write(''.join(map(self._ligne, mouvements)))
+            self._ajouter(mouvements)
+        return len(mouvements)
+
+    def _valider(self, mouvements: List[MouvementCaution]) -> None:
+        # Empreinte en cours par contrat, le lot étant appliqué dans l'ordre
+        en_cours: Dict[int, int] = {}
+        for mouvement in mouvements:
+            disponible = en_cours.get(mouvement.contrat_id)
+            if disponible is None:
+                solde = self._soldes_contrat.get(mouvement.contrat_id)
+                disponible = solde.en_cours if solde is not None else 0
+            if mouvement.type == EMPREINTE:
+                disponible += mouvement.centimes
+            elif mouvement.centimes > disponible:
+                raise InvalidCautionOperationException(
+                    f"Contrat {mouvement.contrat_id} : {mouvement.montant:.2f} € demandés, "
+                    f"{disponible / 100:.2f} € d'empreinte en cours.")
+            else:
+                disponible -= mouvement.centimes
+            en_cours[mouvement.contrat_id] = disponible
+
+    def _ajouter(self, mouvements: List[MouvementCaution]) -> None:
+        for mouvement in mouvements:
+            self._par_contrat.setdefault(mouvement.contrat_id, []).append(len(self._mouvements))
+            self._mouvements.append(mouvement)
+            solde = self._soldes_contrat.setdefault(mouvement.contrat_id, SoldeCaution())
+            avant = solde.en_cours
+            solde.appliquer(mouvement)
+            self._soldes_client.setdefault(mouvement.client_id, SoldeCaution()).appliquer(mouvement)
+            self._total_en_cours += solde.en_cours - avant
+            if mouvement.vehicule is not None:
+                self._vehicule_contrat.setdefault(mouvement.contrat_id, mouvement.vehicule)
+            vehicule = self._vehicule_contrat.get(mouvement.contrat_id)
+            if solde.en_cours:
+                self._en_cours[mouvement.contrat_id] = None
+                if vehicule is not None:
+                    self._en_cours_par_vehicule.setdefault(vehicule, {})[mouvement.contrat_id] = None
+            else:
+                self._en_cours.pop(mouvement.contrat_id, None)
+                contrats = self._en_cours_par_vehicule.get(vehicule)
+                if contrats is not None:
+                    contrats.pop(mouvement.contrat_id, None)
+                    if not contrats:
+                        del self._en_cours_par_vehicule[vehicule]
+
+    # ===== Lectures =====
+
+    def iter_all(self, contrat_id: Optional[int] = None) -> Iterator[MouvementCaution]:
+        if contrat_id is None:
+            return iter(self._mouvements)
+        return (self._mouvements[i] for i in self._par_contrat.get(contrat_id, ()))
+
+    def count_all(self) -> int:
+        return len(self._mouvements)
+
+    def balance_by_contract(self, contrat_id: int) -> SoldeCaution:
+        return dataclasses.replace(self._soldes_contrat.get(contrat_id) or SoldeCaution())
+
+    def balance_by_client(self, client_id) -> SoldeCaution:
+        return dataclasses.replace(self._soldes_client.get(client_id) or SoldeCaution())
+
+    def outstanding_total(self) -> int:
+        return self._total_en_cours
+
+    def iter_outstanding(self) -> Iterator[int]:
+        return iter(list(self._en_cours))
+
+    def iter_outstanding_by_vehicle(self, immatriculation: str) -> Iterator[int]:
+        return iter(list(self._en_cours_par_vehicule.get(immatriculation, ())))
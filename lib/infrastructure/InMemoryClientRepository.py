@@ -1,7 +1,8 @@
 from ..application.ClientRepositoryPort import ClientRepositoryPort
 from ..domain.client import Client
+from ..domain.vehicule import Vehicule
 from ..domain.exceptions import ClientNotFoundException, ClientAlreadyExistsException
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable
 
 class InMemoryClientRepository(ClientRepositoryPort):
     _instance = None
@@ -15,6 +16,10 @@ class InMemoryClientRepository(ClientRepositoryPort):
     def _initialize(self):
         self._clients = {}
         self._next_id = 1
+        # Historique append-only des véhicules loués, par client
+        self._historique = {}
+        # Index des clients ayant des locations en cours -> véhicules loués
+        self._locations_actives = {}
 
     def get_by_id(self, client_id: int) -> Optional[Client]:
         client = self._clients.get(client_id)
@@ -25,16 +30,43 @@ class InMemoryClientRepository(ClientRepositoryPort):
     def get_all(self) -> List[Client]:
         return list(self._clients.values())
 
+    def iter_all(self) -> Iterator[Client]:
+        return iter(tuple(self._clients.values()))
+
+    def count_all(self) -> int:
+        return len(self._clients)
+
     def save(self, client: Client) -> int:
-        if not hasattr(client, 'id') or client.id is None:
+        if client.id is None:
             client.id = self._next_id
             self._next_id += 1
         self._clients[client.id] = client
+        self._indexer_locations(client)
         return client.id
 
+    def _indexer_locations(self, client: Client) -> None:
+        actives = client.locations_actives
+        connues = self._locations_actives.get(client.id, ())
+        nouvelles = set(actives).difference(connues)
+        if nouvelles:
+            self._historique.setdefault(client.id, []).extend(nouvelles)
+        if actives:
+            self._locations_actives[client.id] = set(actives)
+        else:
+            self._locations_actives.pop(client.id, None)
+
+    def save_all(self, clients: Iterable[Client]) -> int:
+        compte = 0
+        for client in clients:
+            self.save(client)
+            compte += 1
+        return compte
+
     def delete(self, client_id: int) -> bool:
         if client_id in self._clients:
             del self._clients[client_id]
+            self._locations_actives.pop(client_id, None)
+            self._historique.pop(client_id, None)
             return True
         raise ClientNotFoundException(f"Client avec l'ID {client_id} non trouvé pour suppression.")
 
@@ -61,7 +93,17 @@ class InMemoryClientRepository(ClientRepositoryPort):
         raise ClientNotFoundException(f"Client avec l'email '{email}' non trouvé.")
 
     def find_with_active_rentals(self) -> List[Client]:
-        return [client for client in self._clients.values() if client.historique_locations]
+        return list(self.iter_with_active_rentals())
+
+    def iter_with_active_rentals(self) -> Iterator[Client]:
+        clients = [self._clients.get(client_id) for client_id in tuple(self._locations_actives)]
+        return (client for client in clients if client is not None)
+
+    def count_with_active_rentals(self) -> int:
+        return len(self._locations_actives)
+
+    def iter_historique(self, client_id: int) -> Iterator[Vehicule]:
+        return iter(self._historique.get(client_id, ()))
 
     def create_client(self, nom: str, prenom: str, permis: str, telephone: str, email: str, voitureLouer=None) -> Client:
         if any(client.permis == permis for client in self._clients.values()):
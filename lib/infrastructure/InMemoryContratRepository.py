@@ -1,5 +1,5 @@
 from ..application.ContratRepositoryPort import ContratRepositoryPort
-from ..domain.contratLocation import Contrat
+from ..domain.contratLocation import ContratLocation
 from ..domain.assurance import Assurance
 from ..domain.client import Client
 from ..domain.vehicule import Vehicule
@@ -9,7 +9,7 @@ from ..domain.exceptions import (
     ContratNotActiveException,
     InvalidDateFormatException
 )
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Iterator
 from datetime import date, datetime
 
 class InMemoryContratRepository(ContratRepositoryPort):
@@ -25,16 +25,22 @@ class InMemoryContratRepository(ContratRepositoryPort):
         self._contrats = {}
         self._next_id = 1
 
-    def get_by_id(self, contrat_id: int) -> Optional[Contrat]:
+    def get_by_id(self, contrat_id: int) -> Optional[ContratLocation]:
         contrat = self._contrats.get(contrat_id)
         if contrat is None:
             raise ContratNotFoundException(f"Contrat avec l'ID {contrat_id} non trouvé.")
         return contrat
 
-    def get_all(self) -> List[Contrat]:
+    def get_all(self) -> List[ContratLocation]:
         return list(self._contrats.values())
 
-    def save(self, contrat: Contrat) -> int:
+    def iter_all(self) -> Iterator[ContratLocation]:
+        return iter(tuple(self._contrats.values()))
+
+    def count_all(self) -> int:
+        return len(self._contrats)
+
+    def save(self, contrat: ContratLocation) -> int:
         if contrat.id is None:
             contrat.id = self._next_id
             self._next_id += 1
@@ -52,22 +58,29 @@ class InMemoryContratRepository(ContratRepositoryPort):
             return True
         return False
 
-    def find_by_client(self, client_id: int) -> List[Contrat]:
+    def find_by_client(self, client_id: int) -> List[ContratLocation]:
         return [c for c in self._contrats.values() if hasattr(c.client, 'id') and c.client.id == client_id]
 
-    def find_by_vehicule(self, vehicule_id: int) -> List[Contrat]:
+    def find_by_vehicule(self, vehicule_id: int) -> List[ContratLocation]:
         return [c for c in self._contrats.values() if hasattr(c.vehicule, 'id') and c.vehicule.id == vehicule_id]
 
-    def find_active_contracts(self, date_reference: Optional[date] = None) -> List[Contrat]:
+    def find_active_contracts(self, date_reference: Optional[date] = None) -> List[ContratLocation]:
+        return list(self.iter_active_contracts(date_reference))
+
+    def iter_active_contracts(self, date_reference: Optional[date] = None) -> Iterator[ContratLocation]:
         if date_reference is None:
             date_reference = date.today()
-        return [c for c in self._contrats.values() if c.est_actif and c.date_debut <= date_reference <= c.date_fin]
+        return (c for c in tuple(self._contrats.values()) if c.est_actif and c.dateDebut <= date_reference <= c.date_fin)
+
+    def count_active_contracts(self, date_reference: Optional[date] = None) -> int:
+        return sum(1 for _ in self.iter_active_contracts(date_reference))
 
     def close_contract(self, contrat_id: int, km_parcourus: int) -> bool:
         contrat = self.get_by_id(contrat_id)
         if contrat and contrat.est_actif:
-            contrat.vehicule.retourner(km_parcourus)
-            contrat.client.retourner_voiture(contrat.vehicule, km_parcourus)
+            # Le véhicule a pu être déjà rendu par le cas d'usage de restitution
+            if contrat.client.a_en_location(contrat.vehicule):
+                contrat.client.retourner_voiture(contrat.vehicule, km_parcourus)
             contrat.client.voitureLouer = None
             contrat.est_actif = False
             return True
@@ -75,7 +88,7 @@ class InMemoryContratRepository(ContratRepositoryPort):
 
     def create_contrat(self, client: Client, vehicule: Vehicule,
                        date_debut: Union[date, str], duree: int,
-                       assurance: Optional[Assurance] = None) -> Optional[Contrat]:
+                       assurance: Optional[Assurance] = None) -> Optional[ContratLocation]:
         if not vehicule.disponible:
             raise VehiculeNotAvailableException(f"Véhicule avec l'ID {vehicule.id} n'est pas disponible.")
 
@@ -87,13 +100,15 @@ class InMemoryContratRepository(ContratRepositoryPort):
 
         cout_total = vehicule.prix_journalier * duree
         caution = cout_total * 0.10
-        contrat = Contrat(
+        contrat = ContratLocation(
+            dateDebut=date_debut,
+            duree=duree,
+            caution=caution,
+            cout=cout_total,
+            etatInitialDuVehicule=100.0,
             client=client,
             vehicule=vehicule,
-            date_debut=date_debut,
-            duree=duree,
-            assurance=assurance,
-            caution=caution
+            assurance=assurance
         )
         client.louer_voiture(vehicule)
         self.save(contrat)
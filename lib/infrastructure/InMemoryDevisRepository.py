@@ -1,6 +1,6 @@
 from datetime import date
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Iterator
 
 from ..domain.immatriculation import Immatriculation
 from ..application.DevisRepositoryPort import DevisRepositoryPort
@@ -26,6 +26,12 @@ class InMemoryDevisRepository(DevisRepositoryPort):
     
     def get_all(self) -> List[Devis]:
         return list(self._devis.values())
+
+    def iter_all(self) -> Iterator[Devis]:
+        return iter(tuple(self._devis.values()))
+
+    def count_all(self) -> int:
+        return len(self._devis)
     
     def save(self, devis: Devis):
         self._devis[devis.id] = devis
@@ -1,6 +1,7 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable, Union
 from ..application.VehiculeRepositoryPort import VehiculeRepositoryPort
+from ..domain.dictionnaire import MARQUES, MODELES, TYPES_VEHICULE
 from ..domain.vehicule import Vehicule
 from ..domain.immatriculation import Immatriculation
 from ..domain.exceptions import VehiculeNotFoundException, VehiculeNotAvailableException
@@ -16,6 +17,20 @@ class InMemoryVehiculeRepository(VehiculeRepositoryPort):
 
     def _initialize(self):
         self._vehicules = {}
+        self._par_id = {}
+        self._next_id = 1
+        # Agence -> véhicules qui y sont rattachés (par immatriculation)
+        self._par_agence = {}
+        self._agence_de = {}
+
+    def _resoudre(self, vehicule: Union[int, Immatriculation]) -> Optional[Vehicule]:
+        """Retrouve un véhicule par son ID numérique ou par son immatriculation."""
+        if isinstance(vehicule, int) and not isinstance(vehicule, bool):
+            return self._par_id.get(vehicule)
+        return self._vehicules.get(vehicule)
+
+    def get_by_id(self, vehicule_id: int) -> Optional[Vehicule]:
+        return self._par_id.get(vehicule_id)
 
     def get_by_immatriculation(self, immatriculation: Immatriculation) -> Optional[Vehicule]:
         vehicule = self._vehicules.get(immatriculation)
@@ -25,59 +40,151 @@ class InMemoryVehiculeRepository(VehiculeRepositoryPort):
         return list(self._vehicules.values())
 
     def get_available(self) -> List[Vehicule]:
-        return [v for v in self._vehicules.values() if v.disponible]
+        return list(self.iter_available())
+
+    def iter_all(self) -> Iterator[Vehicule]:
+        # Instantané : une écriture pendant le parcours (sérialisation d'une réponse) ne le casse pas
+        return iter(tuple(self._vehicules.values()))
+
+    def iter_available(self) -> Iterator[Vehicule]:
+        return (v for v in tuple(self._vehicules.values()) if v.disponible)
+
+    def count_all(self) -> int:
+        return len(self._vehicules)
+
+    def count_available(self) -> int:
+        return sum(1 for v in self._vehicules.values() if v.disponible)
 
     def save(self, vehicule: Vehicule) -> int:
+        if vehicule.id is None:
+            existant = self._vehicules.get(vehicule.immatriculation)
+            if existant is not None and existant.id is not None:
+                vehicule.id = existant.id
+            else:
+                vehicule.id = self._next_id
+                self._next_id += 1
         self._vehicules[vehicule.immatriculation] = vehicule
-        return vehicule.immatriculation
-
-    def delete(self, vehicule: Immatriculation) -> bool:
-        if vehicule in self._vehicules:
-            del self._vehicules[vehicule]
+        self._par_id[vehicule.id] = vehicule
+        self._rattacher(vehicule)
+        return vehicule.id
+
+    def _rattacher(self, vehicule: Vehicule) -> None:
+        """Met à jour l'index par agence après l'enregistrement du véhicule."""
+        immatriculation = vehicule.immatriculation
+        precedente = self._agence_de.get(immatriculation)
+        if precedente is not None and precedente != vehicule.agence_id:
+            self._detacher(immatriculation)
+        if vehicule.agence_id is not None:
+            self._agence_de[immatriculation] = vehicule.agence_id
+            self._par_agence.setdefault(vehicule.agence_id, {})[immatriculation] = vehicule
+
+    def _detacher(self, immatriculation: Immatriculation) -> None:
+        agence_id = self._agence_de.pop(immatriculation, None)
+        if agence_id is not None:
+            vehicules = self._par_agence[agence_id]
+            vehicules.pop(immatriculation, None)
+            if not vehicules:
+                del self._par_agence[agence_id]
+
+    def save_all(self, vehicules: Iterable[Vehicule]) -> int:
+        compte = 0
+        for vehicule in vehicules:
+            self.save(vehicule)
+            compte += 1
+        return compte
+
+    def delete(self, vehicule: Union[int, Immatriculation]) -> bool:
+        existant = self._resoudre(vehicule)
+        if existant is not None:
+            del self._vehicules[existant.immatriculation]
+            self._par_id.pop(existant.id, None)
+            self._detacher(existant.immatriculation)
             return True
         raise VehiculeNotFoundException(f"Véhicule avec l'ID {vehicule} non trouvé pour suppression.")
 
-    def is_available(self, vehicule: Immatriculation) -> bool:
-        vehicule = self.get_by_immatriculastion(vehicule)
-        return vehicule.disponible
+    def is_available(self, vehicule: Union[int, Immatriculation]) -> bool:
+        vehicule = self._resoudre(vehicule)
+        return vehicule is not None and vehicule.disponible
 
-    def set_availability(self, vehicule: Immatriculation, disponible: bool) -> bool:
-        vehicule = self.get_by_immatriculation(vehicule)
+    def set_availability(self, vehicule: Union[int, Immatriculation], disponible: bool) -> bool:
+        vehicule = self._resoudre(vehicule)
+        if vehicule is None:
+            return False
         vehicule.disponible = disponible
         return True
 
-    def is_available_between(self, vehicule: Immatriculation, date_debut: date, date_fin: date) -> bool:
-        vehicule = self.get_by_immatriculation(vehicule)
-        if not vehicule.disponible:
+    def is_available_between(self, vehicule: Union[int, Immatriculation], date_debut: date, date_fin: date) -> bool:
+        vehicule = self._resoudre(vehicule)
+        if vehicule is None or not vehicule.disponible:
             return False
         return vehicule.disponible
 
-    def louer_vehicule(self, vehicule: Immatriculation) -> bool:
-        vehicule = self.get_by_immatriculation(vehicule)
+    def louer_vehicule(self, vehicule: Union[int, Immatriculation]) -> bool:
+        vehicule = self._resoudre(vehicule)
+        if vehicule is None:
+            return False
         if not vehicule.disponible:
             raise VehiculeNotAvailableException(f"Véhicule avec l'ID {vehicule} n'est pas disponible pour la location.")
         vehicule.louer()
         return True
 
-    def retourner_vehicule(self, vehicule: Immatriculation, km_parcourus: Immatriculation) -> bool:
-        vehicule = self.get_by_immatriculation(vehicule)
+    def retourner_vehicule(self, vehicule: Union[int, Immatriculation], km_parcourus: int) -> bool:
+        vehicule = self._resoudre(vehicule)
+        if vehicule is None:
+            return False
         vehicule.retourner(km_parcourus)
         return True
 
-    def calculate_rental_cost(self, vehicule: Immatriculation, duree: int) -> float:
-        vehicule = self.get_by_immatriculation(vehicule)
-        return vehicule.prix_journalier * duree
+    def calculate_rental_cost(self, vehicule: Union[int, Immatriculation], duree: int,
+                              date_debut: Optional[date] = None) -> float:
+        vehicule_trouve = self._resoudre(vehicule)
+        if vehicule_trouve is None:
+            raise VehiculeNotFoundException(f"Véhicule avec l'ID {vehicule} non trouvé.")
+        return vehicule_trouve.prix_journalier * duree
 
     def find_by_criteria(self, marque: Optional[str] = None,
                          modele: Optional[str] = None,
                          disponible: Optional[bool] = None,
                          type_vehicule: Optional[str] = None,
                          prix_max: Optional[float] = None) -> List[Vehicule]:
-        results = []
-        for vehicule in self._vehicules.values():
-            if marque and vehicule.marque.lower() != marque.lower():
+        return list(self.iter_by_criteria(marque, modele, disponible, type_vehicule, prix_max))
+
+    def iter_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return self._filtrer(tuple(self._vehicules.values()), marque, modele, disponible, type_vehicule, prix_max)
+
+    def iter_by_agence(self, agence_id: int,
+                       marque: Optional[str] = None,
+                       modele: Optional[str] = None,
+                       disponible: Optional[bool] = None,
+                       type_vehicule: Optional[str] = None,
+                       prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        # Copie : l'index peut changer pendant que l'appelant consomme l'itérateur
+        vehicules = tuple(self._par_agence.get(agence_id, {}).values())
+        return (v for v in self._filtrer(vehicules, marque, modele, disponible, type_vehicule, prix_max)
+                if v.agence_id == agence_id)
+
+    @staticmethod
+    def _filtrer(vehicules: Iterable[Vehicule], marque: Optional[str], modele: Optional[str],
+                 disponible: Optional[bool], type_vehicule: Optional[str],
+                 prix_max: Optional[float]) -> Iterator[Vehicule]:
+        # Les attributs texte sont encodés par dictionnaire : on compare aux variantes
+        # connues de la valeur cherchée au lieu de passer chaque véhicule en minuscules
+        marques = MARQUES.variantes(marque) if marque else None
+        modeles = MODELES.variantes(modele) if modele else None
+        if type_vehicule:
+            type_vehicule = TYPES_VEHICULE.canonique(type_vehicule)
+            if type_vehicule is None:
+                return
+        if marques is not None and not marques or modeles is not None and not modeles:
+            return
+        for vehicule in vehicules:
+            if marques is not None and vehicule.marque not in marques:
                 continue
-            if modele and vehicule.modele.lower() != modele.lower():
+            if modeles is not None and vehicule.modele not in modeles:
                 continue
             if disponible is not None and vehicule.disponible != disponible:
                 continue
@@ -85,8 +192,14 @@ class InMemoryVehiculeRepository(VehiculeRepositoryPort):
                 continue
             if prix_max is not None and vehicule.prix_journalier > prix_max:
                 continue
-            results.append(vehicule)
-        return results
+            yield vehicule
+
+    def count_by_criteria(self, marque: Optional[str] = None,
+                          modele: Optional[str] = None,
+                          disponible: Optional[bool] = None,
+                          type_vehicule: Optional[str] = None,
+                          prix_max: Optional[float] = None) -> int:
+        return sum(1 for _ in self.iter_by_criteria(marque, modele, disponible, type_vehicule, prix_max))
 
     def create_vehicule(self, marque: str, modele: str, annee: int,
                         immatriculation: Immatriculation, kilometrage: int,
@@ -0,0 +1,70 @@
+import threading
+from collections import Counter
+from typing import Dict, Hashable, Iterable, Tuple
+
+from ..domain.vehicule import Vehicule
+
+
+class OccupationFlotte:
+    """
+    Compteurs d'occupation par type de véhicule : véhicules suivis et véhicules loués.
+
+    Chaque véhicule est suivi sous une clé (son ID) avec son dernier type et son
+    dernier statut connus ; une mise à jour ne touche que les compteurs de ce véhicule
+    et le taux d'un type se lit en O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vider()
+
+    def _vider(self) -> None:
+        self._etats: Dict[Hashable, Tuple[str, bool]] = {}
+        self._totaux: Counter = Counter()
+        self._loues: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._etats)
+
+    def suivre(self, vehicule: Vehicule) -> None:
+        """Prend en compte le type et la disponibilité actuels du véhicule."""
+        cle = vehicule.id if vehicule.id is not None else vehicule.immatriculation
+        etat = (vehicule.typeVehicule, not vehicule.disponible)
+        with self._lock:
+            precedent = self._etats.get(cle)
+            if precedent == etat:
+                return
+            if precedent is not None:
+                self._decompter(*precedent)
+            self._etats[cle] = etat
+            self._totaux[etat[0]] += 1
+            self._loues[etat[0]] += etat[1]
+
+    def oublier(self, cle: Hashable) -> None:
+        with self._lock:
+            precedent = self._etats.pop(cle, None)
+            if precedent is not None:
+                self._decompter(*precedent)
+
+    def _decompter(self, type_vehicule: str, loue: bool) -> None:
+        self._totaux[type_vehicule] -= 1
+        self._loues[type_vehicule] -= loue
+        if not self._totaux[type_vehicule]:
+            del self._totaux[type_vehicule]
+            self._loues.pop(type_vehicule, None)
+
+    def reconstruire(self, vehicules: Iterable[Vehicule]) -> None:
+        with self._lock:
+            self._vider()
+        for vehicule in vehicules:
+            self.suivre(vehicule)
+
+    def taux(self, type_vehicule: str) -> float:
+        """Part des véhicules du type actuellement loués (0.0 pour un type inconnu)."""
+        total = self._totaux.get(type_vehicule, 0)
+        return self._loues.get(type_vehicule, 0) / total if total else 0.0
+
+    def instantane(self) -> Dict[str, Tuple[int, int]]:
+        """type -> (véhicules loués, véhicules suivis)"""
+        with self._lock:
+            return {type_vehicule: (self._loues[type_vehicule], total) for type_vehicule, total in self._totaux.items()}
@@ -0,0 +1,70 @@
+import os
+import signal
+import socket
+from typing import Any, Callable, Dict, List, Optional
+
+from .RateLimiter import SharedTokenBuckets
+from .SharedAvailability import SharedAvailability
+
+
+def _arreter(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve_prefork(create_app: Callable[[Dict[str, Any]], Any], workers: int,
+                  host: str = '127.0.0.1', port: int = 5000, capacity: int = 100_000,
+                  config: Optional[Dict[str, Any]] = None,
+                  preload: Optional[Callable[[Any], None]] = None) -> None:
+    """
+    Sert l'application avec `workers` processus qui partagent la même socket d'écoute.
+
+    Le segment de disponibilités est créé et le conteneur préchauffé avant le fork :
+    chaque worker hérite du catalogue chargé, des slots, des verrous et des instances
+    déjà construites (index et caches compris), sans rien reconstruire avant d'accepter
+    ses premières connexions. Seules la disponibilité et les seaux de limitation de
+    débit sont partagés : le catalogue doit être chargé par `preload(app)` avant le
+    fork, un véhicule créé ensuite n'étant connu que du worker qui l'a créé. Pour la
+    même raison, la tarification dynamique (DYNAMIC_PRICING) est refusée au démarrage.
+    """
+    from werkzeug.serving import make_server
+
+    disponibilites = SharedAvailability(capacity)
+    seaux = SharedTokenBuckets()
+    app = create_app({**(config or {}), 'SHARED_AVAILABILITY': disponibilites, 'SHARED_RATE_BUCKETS': seaux})
+    if preload is not None:
+        preload(app)
+    app.extensions['container'].warm()
+    signal.signal(signal.SIGTERM, _arreter)
+
+    ecoute = socket.create_server((host, port))
+    ecoute.set_inheritable(True)
+    enfants: List[int] = []
+    try:
+        for _ in range(workers):
+            pid = os.fork()
+            if pid == 0:
+                code = 0
+                try:
+                    make_server(host, port, app, fd=ecoute.fileno()).serve_forever()
+                except KeyboardInterrupt:
+                    pass
+                except BaseException:
+                    code = 1
+                finally:
+                    os._exit(code)
+            enfants.append(pid)
+        print(f"{workers} workers à l'écoute sur http://{host}:{port}")
+        for pid in enfants:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in enfants:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except ProcessLookupError:
+                pass
+    finally:
+        ecoute.close()
+        for partage in (disponibilites, seaux):
+            partage.close()
+            partage.unlink()
@@ -0,0 +1,56 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class ProcessPoolJobRunner:
+    """
+    Exécute des traitements CPU par lots dans un `ProcessPoolExecutor`.
+
+    La fonction et les éléments doivent être picklables (fonction de niveau module,
+    tuples de valeurs simples). Le pool est créé à la première utilisation et recréé
+    dans un processus issu d'un fork. Avec `max_workers=0`, ou s'il n'y a qu'un lot,
+    le calcul reste dans le processus appelant.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: str = 'spawn'):
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method))
+                self._pid = os.getpid()
+            return self._executor
+
+    def map_chunks(self, fonction: Callable[[Sequence[T]], List[R]], elements: Sequence[T],
+                   taille_lot: int) -> List[R]:
+        """Applique `fonction` à chaque lot de `elements` et concatène les résultats, dans l'ordre."""
+        lots = [elements[i:i + taille_lot] for i in range(0, len(elements), taille_lot)]
+        if self.max_workers == 0 or len(lots) <= 1:
+            resultats = map(fonction, lots)
+        else:
+            resultats = self._pool().map(fonction, lots)
+        return [resultat for lot in resultats for resultat in lot]
+
+    def warm(self) -> None:
+        """Démarre les processus du pool avant le premier vrai traitement."""
+        if self.max_workers:
+            list(self._pool().map(abs, range(self.max_workers)))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
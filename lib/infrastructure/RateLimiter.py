@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+# (capacité du seau, jetons rendus par seconde)
+Limite = Tuple[float, float]
+
+_SEAU = struct.Struct('dd')  # jetons restants, instant du dernier passage
+
+
+def _prendre(jetons: float, dernier: float, maintenant: float,
+             capacite: float, debit: float, cout: float) -> Tuple[float, float]:
+    """Remplit le seau depuis `dernier` puis y prend `cout` jetons : (jetons restants, attente)."""
+    jetons = min(capacite, jetons + max(0.0, maintenant - dernier) * debit)
+    if jetons >= cout:
+        return jetons - cout, 0.0
+    return jetons, (cout - jetons) / debit if debit > 0 else float('inf')
+
+
+class MemoryTokenBuckets:
+    """Seaux du processus courant ; les moins récemment utilisés sont oubliés au-delà de `max_cles`."""
+
+    def __init__(self, max_cles: int = 100_000):
+        self.max_cles = max_cles
+        self._seaux: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def prendre(self, cle: str, capacite: float, debit: float, cout: float, maintenant: float) -> float:
+        with self._lock:
+            seau = self._seaux.get(cle)
+            if seau is None:
+                seau = (capacite, maintenant)
+            else:
+                self._seaux.move_to_end(cle)
+            jetons, attente = _prendre(*seau, maintenant, capacite, debit, cout)
+            self._seaux[cle] = (jetons, maintenant)
+            if len(self._seaux) > self.max_cles:
+                # Un seau oublié repart plein, ce qui revient à le laisser se remplir
+                self._seaux.popitem(last=False)
+            return attente
+
+
+class SharedTokenBuckets:
+    """
+    Seaux partagés par les workers pré-forkés, dans un segment `shared_memory`.
+
+    Les clés sont hachées (crc32, stable d'un processus à l'autre) vers `nb_slots`
+    seaux : deux clés qui tombent sur le même slot partagent leur seau, ce qui ne peut
+    que durcir leur limite. Comme pour `SharedAvailability`, le segment et les verrous
+    doivent être créés avant le fork.
+    """
+
+    def __init__(self, nb_slots: int = 65536, nb_verrous: int = 64, name: Optional[str] = None):
+        self.nb_slots = nb_slots
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=nb_slots * _SEAU.size)
+        self._shm.buf[:nb_slots * _SEAU.size] = bytes(nb_slots * _SEAU.size)
+        self._pid_createur = os.getpid()
+        self._verrous = [multiprocessing.Lock() for _ in range(nb_verrous)]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def slot(self, cle: str) -> int:
+        return zlib.crc32(cle.encode('utf-8')) % self.nb_slots
+
+    def prendre(self, cle: str, capacite: float, debit: float, cout: float, maintenant: float) -> float:
+        slot = self.slot(cle)
+        position = slot * _SEAU.size
+        with self._verrous[slot % len(self._verrous)]:
+            jetons, dernier = _SEAU.unpack_from(self._shm.buf, position)
+            if dernier == 0.0:
+                # Slot jamais utilisé : seau plein
+                jetons, dernier = capacite, maintenant
+            jetons, attente = _prendre(jetons, dernier, maintenant, capacite, debit, cout)
+            _SEAU.pack_into(self._shm.buf, position, jetons, maintenant)
+            return attente
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Détruit le segment ; sans effet hors du processus qui l'a créé."""
+        if os.getpid() == self._pid_createur:
+            self._shm.unlink()
+
+
+class TokenBucketLimiter:
+    """
+    Limitation de débit par seau à jetons, par client et par route.
+
+    Chaque couple (route, client) a son seau de `capacite` jetons, rempli à raison de
+    `debit` jetons par seconde ; une requête consomme un jeton. `limites` permet de
+    fixer une autre limite pour certaines routes (nom d'endpoint Flask). Une capacité
+    nulle désactive la limitation de la route.
+    """
+
+    def __init__(self, capacite: float = 20, debit: float = 10.0,
+                 limites: Optional[Mapping[str, Limite]] = None,
+                 seaux=None, horloge: Callable[[], float] = time.monotonic):
+        self.defaut: Limite = (float(capacite), float(debit))
+        self.limites: Dict[str, Limite] = {route: (float(c), float(d)) for route, (c, d) in (limites or {}).items()}
+        self.seaux = seaux if seaux is not None else MemoryTokenBuckets()
+        self._horloge = horloge
+
+    def limite(self, route: str) -> Limite:
+        return self.limites.get(route, self.defaut)
+
+    def acquire(self, route: str, client: str, cout: float = 1.0) -> float:
+        """
+        :return: 0.0 si la requête passe, sinon le délai en secondes avant qu'elle puisse passer
+        """
+        capacite, debit = self.limite(route)
+        if capacite <= 0:
+            return 0.0
+        return self.seaux.prendre(f"{route}|{client}", capacite, debit, cout, self._horloge())
@@ -0,0 +1,116 @@
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from ..application.ContratRepositoryPort import ContratRepositoryPort
+from ..domain.assurance import Assurance
+from ..domain.client import Client
+from ..domain.contratLocation import ContratLocation
+from ..domain.vehicule import Vehicule
+from .UtilizationRollups import UtilizationRollups
+
+
+class RollupContratRepository(ContratRepositoryPort):
+    """
+    Décorateur qui reporte les créations et clôtures de contrats dans `UtilizationRollups`.
+
+    Un contrat actif occupe son véhicule sur [dateDebut, date_fin[ ; à sa clôture, la
+    période est ramenée au jour de restitution (restitution anticipée ou en retard),
+    ce jour-là n'étant pas compté, comme date_fin. Un contrat actif supprimé est
+    considéré comme annulé et ses jours sont libérés.
+    """
+
+    def __init__(self, repository: ContratRepositoryPort, rollups: UtilizationRollups,
+                 aujourd_hui: Callable[[], date] = date.today):
+        self.repository = repository
+        self.rollups = rollups
+        self._aujourd_hui = aujourd_hui
+        # contrat actif -> (véhicule, début, fin) tels que marqués dans les agrégats
+        self._periodes: Dict[int, Tuple[str, date, date]] = {}
+        # Agrégats neufs : tout l'historique est rejoué ; sinon seuls les contrats en cours
+        historique = not len(rollups)
+        for contrat in repository.iter_all():
+            if contrat.est_actif:
+                self._suivre(contrat)
+            elif historique:
+                rollups.mark(contrat.vehicule.immatriculation, contrat.dateDebut, contrat.date_fin)
+
+    def _suivre(self, contrat: ContratLocation) -> None:
+        periode = (str(contrat.vehicule.immatriculation), contrat.dateDebut, contrat.date_fin)
+        precedente = self._periodes.get(contrat.id)
+        if precedente == periode:
+            return
+        if precedente is not None:
+            self.rollups.mark(*precedente, rented=False)
+        self.rollups.mark(*periode)
+        self._periodes[contrat.id] = periode
+
+    def _cloturer(self, contrat_id: int, restitution: Optional[date]) -> None:
+        periode = self._periodes.pop(contrat_id, None)
+        if periode is None:
+            return
+        cle, debut, fin = periode
+        if restitution is None:
+            self.rollups.mark(cle, debut, fin, rented=False)
+            return
+        restitution = max(restitution, debut)
+        if restitution < fin:
+            self.rollups.mark(cle, restitution, fin, rented=False)
+        elif restitution > fin:
+            self.rollups.mark(cle, fin, restitution)
+
+    # ===== Lectures =====
+
+    def get_by_id(self, contrat_id: int) -> Optional[ContratLocation]:
+        return self.repository.get_by_id(contrat_id)
+
+    def get_all(self) -> List[ContratLocation]:
+        return self.repository.get_all()
+
+    def iter_all(self) -> Iterator[ContratLocation]:
+        return self.repository.iter_all()
+
+    def count_all(self) -> int:
+        return self.repository.count_all()
+
+    def find_by_client(self, client_id: int) -> List[ContratLocation]:
+        return self.repository.find_by_client(client_id)
+
+    def find_by_vehicule(self, vehicule_id: int) -> List[ContratLocation]:
+        return self.repository.find_by_vehicule(vehicule_id)
+
+    def find_active_contracts(self, date_reference: Optional[date] = None) -> List[ContratLocation]:
+        return self.repository.find_active_contracts(date_reference)
+
+    def iter_active_contracts(self, date_reference: Optional[date] = None) -> Iterator[ContratLocation]:
+        return self.repository.iter_active_contracts(date_reference)
+
+    def count_active_contracts(self, date_reference: Optional[date] = None) -> int:
+        return self.repository.count_active_contracts(date_reference)
+
+    # ===== Écritures =====
+
+    def save(self, contrat: ContratLocation) -> int:
+        contrat_id = self.repository.save(contrat)
+        if contrat.est_actif:
+            self._suivre(contrat)
+        return contrat_id
+
+    def delete(self, contrat_id: int) -> bool:
+        supprime = self.repository.delete(contrat_id)
+        if supprime:
+            self._cloturer(contrat_id, None)
+        return supprime
+
+    def close_contract(self, contrat_id: int, km_parcourus: int) -> bool:
+        cloture = self.repository.close_contract(contrat_id, km_parcourus)
+        if cloture:
+            self._cloturer(contrat_id, self._aujourd_hui())
+        return cloture
+
+    def create_contrat(self, client: Client, vehicule: Vehicule,
+                       date_debut: Union[date, str], duree: int,
+                       assurance: Optional[Assurance] = None) -> Optional[ContratLocation]:
+        contrat = self.repository.create_contrat(client, vehicule, date_debut, duree, assurance)
+        if contrat is not None:
+            self._suivre(contrat)
+        return contrat
@@ -0,0 +1,127 @@
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+
+from ..application.VehiculeRepositoryPort import VehiculeRepositoryPort
+from ..domain.vehicule import Vehicule
+from .VehiculeSearchIndex import VehiculeSearchIndex
+
+
+class SearchIndexVehiculeRepository(VehiculeRepositoryPort):
+    """
+    Décorateur qui tient l'index de recherche plein texte à jour à chaque création,
+    enregistrement ou suppression passant par lui. L'index est construit à partir du
+    contenu du repository décoré au moment de la décoration.
+    """
+
+    def __init__(self, repository: VehiculeRepositoryPort, index: VehiculeSearchIndex):
+        self.repository = repository
+        self.index = index
+        index.clear()
+        index.add_all(repository.iter_all())
+
+    def _lire(self, vehicule_id) -> Optional[Vehicule]:
+        if isinstance(vehicule_id, int) and not isinstance(vehicule_id, bool):
+            return self.repository.get_by_id(vehicule_id)
+        return self.repository.get_by_immatriculation(vehicule_id)
+
+    # ===== Lectures déléguées =====
+
+    def get_by_id(self, vehicule_id: int) -> Optional[Vehicule]:
+        return self.repository.get_by_id(vehicule_id)
+
+    def get_by_immatriculation(self, vehicule_id) -> Optional[Vehicule]:
+        return self.repository.get_by_immatriculation(vehicule_id)
+
+    def get_all(self) -> List[Vehicule]:
+        return self.repository.get_all()
+
+    def get_available(self) -> List[Vehicule]:
+        return self.repository.get_available()
+
+    def iter_all(self) -> Iterator[Vehicule]:
+        return self.repository.iter_all()
+
+    def iter_available(self) -> Iterator[Vehicule]:
+        return self.repository.iter_available()
+
+    def count_all(self) -> int:
+        return self.repository.count_all()
+
+    def count_available(self) -> int:
+        return self.repository.count_available()
+
+    def is_available(self, vehicule_id) -> bool:
+        return self.repository.is_available(vehicule_id)
+
+    def is_available_between(self, vehicule_id, date_debut: date, date_fin: date) -> bool:
+        return self.repository.is_available_between(vehicule_id, date_debut, date_fin)
+
+    def calculate_rental_cost(self, vehicule_id, duree: int, date_debut: Optional[date] = None) -> float:
+        return self.repository.calculate_rental_cost(vehicule_id, duree, date_debut)
+
+    def find_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> List[Vehicule]:
+        return self.repository.find_by_criteria(marque, modele, disponible, type_vehicule, prix_max)
+
+    def iter_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return self.repository.iter_by_criteria(marque, modele, disponible, type_vehicule, prix_max)
+
+    def iter_by_agence(self, agence_id: int,
+                       marque: Optional[str] = None,
+                       modele: Optional[str] = None,
+                       disponible: Optional[bool] = None,
+                       type_vehicule: Optional[str] = None,
+                       prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return self.repository.iter_by_agence(agence_id, marque, modele, disponible, type_vehicule, prix_max)
+
+    def count_by_criteria(self, marque: Optional[str] = None,
+                          modele: Optional[str] = None,
+                          disponible: Optional[bool] = None,
+                          type_vehicule: Optional[str] = None,
+                          prix_max: Optional[float] = None) -> int:
+        return self.repository.count_by_criteria(marque, modele, disponible, type_vehicule, prix_max)
+
+    # ===== Mutations (disponibilité, kilométrage et état ne sont pas indexés) =====
+
+    def save(self, vehicule: Vehicule) -> int:
+        result = self.repository.save(vehicule)
+        self.index.add(vehicule)
+        return result
+
+    def save_all(self, vehicules: Iterable[Vehicule]) -> int:
+        vehicules = list(vehicules)
+        result = self.repository.save_all(vehicules)
+        self.index.add_all(vehicules)
+        return result
+
+    def delete(self, vehicule_id) -> bool:
+        avant = self._lire(vehicule_id)
+        result = self.repository.delete(vehicule_id)
+        if avant is not None:
+            self.index.remove(avant.id if avant.id is not None else avant.immatriculation)
+        return result
+
+    def set_availability(self, vehicule_id, disponible: bool) -> bool:
+        return self.repository.set_availability(vehicule_id, disponible)
+
+    def louer_vehicule(self, vehicule_id) -> bool:
+        return self.repository.louer_vehicule(vehicule_id)
+
+    def retourner_vehicule(self, vehicule_id, km_parcourus: int) -> bool:
+        return self.repository.retourner_vehicule(vehicule_id, km_parcourus)
+
+    def create_vehicule(self, marque: str, modele: str, annee: int,
+                        immatriculation, kilometrage: int,
+                        prix_journalier: float, etat: str,
+                        type_vehicule: str) -> Vehicule:
+        vehicule = self.repository.create_vehicule(marque, modele, annee, immatriculation,
+                                                   kilometrage, prix_journalier, etat, type_vehicule)
+        self.index.add(vehicule)
+        return vehicule
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, Hashable, Optional, Tuple
+
+_ENTETE = struct.Struct('Q')  # prochain slot libre
+_VERSION = 4  # octets par compteur de version (uint32)
+
+
+class SharedAvailability:
+    """
+    Disponibilités des véhicules partagées entre processus, dans un segment
+    `multiprocessing.shared_memory`.
+
+    Chaque véhicule occupe un slot : un drapeau (1 octet) et un compteur de version.
+    Les écritures sont sérialisées par des verrous répartis par slot ; les lectures ne
+    prennent aucun verrou et relisent la version pour garantir un couple
+    (drapeau, version) cohérent (version impaire = écriture en cours).
+
+    Le segment et les verrous doivent être créés avant le fork des workers, qui en
+    héritent ; la table immatriculation -> slot remplie avant le fork est héritée aussi.
+    """
+
+    def __init__(self, capacity: int, nb_verrous: int = 64, name: Optional[str] = None):
+        taille = _ENTETE.size + capacity * (_VERSION + 1)
+        self.capacity = capacity
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=taille)
+        self._pid_createur = os.getpid()
+        debut_drapeaux = _ENTETE.size + capacity * _VERSION
+        self._versions = self._shm.buf[_ENTETE.size:debut_drapeaux].cast('I')
+        self._drapeaux = self._shm.buf[debut_drapeaux:debut_drapeaux + capacity]
+        self._verrous = [multiprocessing.Lock() for _ in range(nb_verrous)]
+        self._verrou_allocation = multiprocessing.Lock()
+        self.slots: Dict[Hashable, int] = {}
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    # ===== Allocation =====
+
+    def register(self, cle: Hashable, disponible: bool = True) -> int:
+        """Attribue un slot à `cle` s'il n'en a pas encore ; l'état initial n'est écrit qu'à ce moment-là."""
+        slot = self.slots.get(cle)
+        if slot is not None:
+            return slot
+        with self._verrou_allocation:
+            (slot,) = _ENTETE.unpack_from(self._shm.buf, 0)
+            if slot >= self.capacity:
+                raise MemoryError(f"Segment de disponibilités plein ({self.capacity} slots).")
+            _ENTETE.pack_into(self._shm.buf, 0, slot + 1)
+        self.slots[cle] = slot
+        self.set(slot, disponible)
+        return slot
+
+    def slot(self, cle: Hashable) -> Optional[int]:
+        return self.slots.get(cle)
+
+    def count_allocated(self) -> int:
+        return _ENTETE.unpack_from(self._shm.buf, 0)[0]
+
+    # ===== Lectures sans verrou =====
+
+    def read(self, slot: int) -> Tuple[bool, int]:
+        versions, drapeaux = self._versions, self._drapeaux
+        while True:
+            avant = versions[slot]
+            drapeau = drapeaux[slot]
+            if not avant & 1 and versions[slot] == avant:
+                return drapeau == 1, avant
+
+    def is_available(self, slot: int) -> bool:
+        return self.read(slot)[0]
+
+    def version(self, slot: int) -> int:
+        return self.read(slot)[1]
+
+    # ===== Écritures atomiques =====
+
+    def set(self, slot: int, disponible: bool) -> int:
+        with self._verrous[slot % len(self._verrous)]:
+            return self._ecrire(slot, disponible)
+
+    def transition(self, slot: int, depuis: bool, vers: bool) -> bool:
+        """Passe le slot de `depuis` à `vers` si et seulement s'il est dans l'état `depuis`."""
+        with self._verrous[slot % len(self._verrous)]:
+            if (self._drapeaux[slot] == 1) != depuis:
+                return False
+            self._ecrire(slot, vers)
+            return True
+
+    def _ecrire(self, slot: int, disponible: bool) -> int:
+        version = self._versions[slot]
+        self._versions[slot] = (version + 1) & 0xFFFFFFFF
+        self._drapeaux[slot] = 1 if disponible else 0
+        version = self._versions[slot] = (version + 2) & 0xFFFFFFFF
+        return version
+
+    # ===== Cycle de vie =====
+
+    def close(self) -> None:
+        self._versions.release()
+        self._drapeaux.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Détruit le segment ; sans effet hors du processus qui l'a créé."""
+        if os.getpid() == self._pid_createur:
+            self._shm.unlink()
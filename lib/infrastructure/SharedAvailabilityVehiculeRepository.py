@@ -0,0 +1,166 @@
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+
+from ..application.VehiculeRepositoryPort import VehiculeRepositoryPort
+from ..domain.exceptions import VehiculeNotAvailableException
+from ..domain.vehicule import Vehicule
+from .SharedAvailability import SharedAvailability
+
+
+class SharedAvailabilityVehiculeRepository(VehiculeRepositoryPort):
+    """
+    Décorateur qui fait de `SharedAvailability` la source de vérité de `disponible`.
+
+    Le catalogue (marque, kilométrage, prix...) reste celui du repository décoré, propre
+    à chaque processus ; seule la disponibilité est partagée. Les véhicules rendus par
+    ce repository ont leur attribut `disponible` resynchronisé à chaque lecture, et une
+    location n'aboutit que dans un seul processus à la fois.
+    """
+
+    def __init__(self, repository: VehiculeRepositoryPort, disponibilites: SharedAvailability):
+        self.repository = repository
+        self.disponibilites = disponibilites
+        for vehicule in repository.iter_all():
+            disponibilites.register(vehicule.immatriculation, vehicule.disponible)
+
+    def _slot(self, vehicule: Vehicule) -> int:
+        return self.disponibilites.register(vehicule.immatriculation, vehicule.disponible)
+
+    def _synchroniser(self, vehicule: Optional[Vehicule]) -> Optional[Vehicule]:
+        if vehicule is not None:
+            vehicule.disponible = self.disponibilites.is_available(self._slot(vehicule))
+        return vehicule
+
+    def _lire(self, vehicule_id) -> Optional[Vehicule]:
+        if isinstance(vehicule_id, int) and not isinstance(vehicule_id, bool):
+            return self.repository.get_by_id(vehicule_id)
+        return self.repository.get_by_immatriculation(vehicule_id)
+
+    def _publier(self, vehicule: Vehicule) -> None:
+        slot = self._slot(vehicule)
+        if self.disponibilites.is_available(slot) != vehicule.disponible:
+            self.disponibilites.set(slot, vehicule.disponible)
+
+    # ===== Lectures =====
+
+    def get_by_id(self, vehicule_id: int) -> Optional[Vehicule]:
+        return self._synchroniser(self.repository.get_by_id(vehicule_id))
+
+    def get_by_immatriculation(self, vehicule_id) -> Optional[Vehicule]:
+        return self._synchroniser(self.repository.get_by_immatriculation(vehicule_id))
+
+    def iter_all(self) -> Iterator[Vehicule]:
+        return map(self._synchroniser, self.repository.iter_all())
+
+    def get_all(self) -> List[Vehicule]:
+        return list(self.iter_all())
+
+    def iter_available(self) -> Iterator[Vehicule]:
+        return (v for v in self.iter_all() if v.disponible)
+
+    def get_available(self) -> List[Vehicule]:
+        return list(self.iter_available())
+
+    def count_all(self) -> int:
+        return self.repository.count_all()
+
+    def count_available(self) -> int:
+        return sum(1 for _ in self.iter_available())
+
+    def iter_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        # Le filtre de disponibilité est appliqué ici, sur l'état partagé
+        for vehicule in self.repository.iter_by_criteria(marque, modele, None, type_vehicule, prix_max):
+            self._synchroniser(vehicule)
+            if disponible is None or vehicule.disponible == disponible:
+                yield vehicule
+
+    def iter_by_agence(self, agence_id: int,
+                       marque: Optional[str] = None,
+                       modele: Optional[str] = None,
+                       disponible: Optional[bool] = None,
+                       type_vehicule: Optional[str] = None,
+                       prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        for vehicule in self.repository.iter_by_agence(agence_id, marque, modele, None, type_vehicule, prix_max):
+            self._synchroniser(vehicule)
+            if disponible is None or vehicule.disponible == disponible:
+                yield vehicule
+
+    def find_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> List[Vehicule]:
+        return list(self.iter_by_criteria(marque, modele, disponible, type_vehicule, prix_max))
+
+    def count_by_criteria(self, marque: Optional[str] = None,
+                          modele: Optional[str] = None,
+                          disponible: Optional[bool] = None,
+                          type_vehicule: Optional[str] = None,
+                          prix_max: Optional[float] = None) -> int:
+        return sum(1 for _ in self.iter_by_criteria(marque, modele, disponible, type_vehicule, prix_max))
+
+    def is_available(self, vehicule_id) -> bool:
+        vehicule = self._lire(vehicule_id)
+        return vehicule is not None and self.disponibilites.is_available(self._slot(vehicule))
+
+    def is_available_between(self, vehicule_id, date_debut: date, date_fin: date) -> bool:
+        return self.is_available(vehicule_id)
+
+    def calculate_rental_cost(self, vehicule_id, duree: int, date_debut: Optional[date] = None) -> float:
+        return self.repository.calculate_rental_cost(vehicule_id, duree, date_debut)
+
+    # ===== Écritures =====
+
+    def save(self, vehicule: Vehicule) -> int:
+        result = self.repository.save(vehicule)
+        self._publier(vehicule)
+        return result
+
+    def save_all(self, vehicules: Iterable[Vehicule]) -> int:
+        vehicules = list(vehicules)
+        result = self.repository.save_all(vehicules)
+        for vehicule in vehicules:
+            self._publier(vehicule)
+        return result
+
+    def delete(self, vehicule_id) -> bool:
+        return self.repository.delete(vehicule_id)
+
+    def set_availability(self, vehicule_id, disponible: bool) -> bool:
+        vehicule = self._lire(vehicule_id)
+        if vehicule is None:
+            return False
+        self.disponibilites.set(self._slot(vehicule), disponible)
+        return self.repository.set_availability(vehicule_id, disponible)
+
+    def louer_vehicule(self, vehicule_id) -> bool:
+        vehicule = self._lire(vehicule_id)
+        if vehicule is None:
+            return False
+        if not self.disponibilites.transition(self._slot(vehicule), depuis=True, vers=False):
+            vehicule.disponible = False
+            raise VehiculeNotAvailableException(f"Véhicule avec l'ID {vehicule_id} n'est pas disponible pour la location.")
+        # La location est acquise : le catalogue local suit
+        vehicule.disponible = True
+        return self.repository.louer_vehicule(vehicule_id)
+
+    def retourner_vehicule(self, vehicule_id, km_parcourus: int) -> bool:
+        vehicule = self._lire(vehicule_id)
+        if vehicule is None:
+            return False
+        retourne = self.disponibilites.transition(self._slot(vehicule), depuis=False, vers=True)
+        vehicule.disponible = not retourne
+        return self.repository.retourner_vehicule(vehicule_id, km_parcourus)
+
+    def create_vehicule(self, marque: str, modele: str, annee: int,
+                        immatriculation, kilometrage: int,
+                        prix_journalier: float, etat: str,
+                        type_vehicule: str) -> Vehicule:
+        vehicule = self.repository.create_vehicule(marque, modele, annee, immatriculation,
+                                                   kilometrage, prix_journalier, etat, type_vehicule)
+        self._publier(vehicule)
+        return vehicule
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Vol:
+    __slots__ = ('termine', 'valeur', 'erreur')
+
+    def __init__(self):
+        self.termine = threading.Event()
+        self.valeur = None
+        self.erreur = None
+
+
+class SingleFlight:
+    """
+    Regroupement des appels identiques simultanés (« single-flight »).
+
+    Le premier appel d'une clé exécute la fonction ; les appels de la même clé qui
+    arrivent pendant son exécution l'attendent et reçoivent son résultat (ou son
+    exception). Rien n'est conservé une fois l'appel terminé : ce n'est pas un cache.
+
+    `nouvelle_generation` est appelée à chaque écriture : un appel arrivé après une
+    écriture ne rejoint jamais un appel commencé avant elle.
+    """
+
+    def __init__(self):
+        self._vols: Dict[Tuple[int, Hashable], _Vol] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.executions = 0
+        self.partages = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def nouvelle_generation(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def do(self, cle: Hashable, fonction: Callable[[], Any]) -> Any:
+        with self._lock:
+            cle = (self._generation, cle)
+            vol = self._vols.get(cle)
+            proprietaire = vol is None
+            if proprietaire:
+                vol = self._vols[cle] = _Vol()
+                self.executions += 1
+            else:
+                self.partages += 1
+        if not proprietaire:
+            vol.termine.wait()
+            if vol.erreur is not None:
+                raise vol.erreur
+            return vol.valeur
+        try:
+            vol.valeur = fonction()
+        except BaseException as e:
+            vol.erreur = e
+            raise
+        finally:
+            with self._lock:
+                del self._vols[cle]
+            vol.termine.set()
+        return vol.valeur
+
+
+class AsyncSingleFlight:
+    """
+    Équivalent de `SingleFlight` pour le code asynchrone : les coroutines d'une même
+    boucle qui demandent la même clé attendent un seul futur, sans bloquer la boucle.
+    Les générations sont celles du `SingleFlight` associé.
+    """
+
+    def __init__(self, synchrone: SingleFlight):
+        self.synchrone = synchrone
+        self._vols: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]' = weakref.WeakKeyDictionary()
+        self.executions = 0
+        self.partages = 0
+
+    async def do(self, cle: Hashable, fonction: Callable[[], Awaitable[Any]]) -> Any:
+        boucle = asyncio.get_running_loop()
+        vols = self._vols.setdefault(boucle, {})
+        cle = (self.synchrone.generation, cle)
+        futur = vols.get(cle)
+        if futur is not None:
+            self.partages += 1
+            # shield : l'annulation d'un appelant n'annule pas l'appel partagé
+            return await asyncio.shield(futur)
+        futur = vols[cle] = boucle.create_future()
+        self.executions += 1
+        try:
+            valeur = await fonction()
+        except asyncio.CancelledError:
+            futur.cancel()
+            raise
+        except BaseException as e:
+            futur.set_exception(e)
+            futur.exception()  # évite l'avertissement si personne n'attendait
+            raise
+        else:
+            futur.set_result(valeur)
+            return valeur
+        finally:
+            del vols[cle]
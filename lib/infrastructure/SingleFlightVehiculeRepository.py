@@ -0,0 +1,153 @@
+import asyncio
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+
+from ..application.VehiculeRepositoryPort import VehiculeRepositoryPort
+from ..domain.vehicule import Vehicule
+from .SingleFlight import AsyncSingleFlight, SingleFlight
+
+
+class SingleFlightVehiculeRepository(VehiculeRepositoryPort):
+    """
+    Décorateur qui regroupe les lectures identiques simultanées vers le repository
+    décoré : pendant qu'une lecture est en cours, les mêmes lectures l'attendent et
+    partagent son résultat au lieu de solliciter le backend à leur tour.
+
+    Les méthodes `a*` sont les équivalents asynchrones : le backend est lu dans un
+    thread, et les coroutines d'une même boucle partagent la même lecture. Chaque
+    mutation ouvre une nouvelle génération, qu'aucune lecture antérieure ne sert.
+    """
+
+    def __init__(self, repository: VehiculeRepositoryPort, vol: Optional[SingleFlight] = None):
+        self.repository = repository
+        self.vol = vol if vol is not None else SingleFlight()
+        self.vol_async = AsyncSingleFlight(self.vol)
+
+    def partager(self, cle, fonction):
+        """Regroupe un calcul quelconque dérivé des véhicules (sérialisation, etc.)."""
+        return self.vol.do(cle, fonction)
+
+    async def apartager(self, cle, fonction):
+        return await self.vol_async.do(cle, lambda: asyncio.to_thread(fonction))
+
+    def _muter(self, operation):
+        try:
+            return operation()
+        finally:
+            self.vol.nouvelle_generation()
+
+    # ===== Lectures regroupées =====
+
+    def get_by_id(self, vehicule_id: int) -> Optional[Vehicule]:
+        return self.vol.do(('get_by_id', vehicule_id), lambda: self.repository.get_by_id(vehicule_id))
+
+    def get_by_immatriculation(self, vehicule_id) -> Optional[Vehicule]:
+        return self.vol.do(('get_by_immatriculation', vehicule_id),
+                           lambda: self.repository.get_by_immatriculation(vehicule_id))
+
+    def get_all(self) -> List[Vehicule]:
+        # Chaque appelant reçoit sa propre liste
+        return list(self.vol.do(('get_all',), lambda: tuple(self.repository.get_all())))
+
+    def get_available(self) -> List[Vehicule]:
+        return list(self.vol.do(('get_available',), lambda: tuple(self.repository.get_available())))
+
+    def count_all(self) -> int:
+        return self.vol.do(('count_all',), self.repository.count_all)
+
+    def count_available(self) -> int:
+        return self.vol.do(('count_available',), self.repository.count_available)
+
+    def is_available(self, vehicule_id) -> bool:
+        return self.vol.do(('is_available', vehicule_id), lambda: self.repository.is_available(vehicule_id))
+
+    def find_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> List[Vehicule]:
+        criteres = (marque, modele, disponible, type_vehicule, prix_max)
+        return list(self.vol.do(('find_by_criteria', criteres),
+                                lambda: tuple(self.repository.find_by_criteria(*criteres))))
+
+    def count_by_criteria(self, marque: Optional[str] = None,
+                          modele: Optional[str] = None,
+                          disponible: Optional[bool] = None,
+                          type_vehicule: Optional[str] = None,
+                          prix_max: Optional[float] = None) -> int:
+        criteres = (marque, modele, disponible, type_vehicule, prix_max)
+        return self.vol.do(('count_by_criteria', criteres), lambda: self.repository.count_by_criteria(*criteres))
+
+    # ===== Lectures asynchrones regroupées =====
+
+    async def aget_by_id(self, vehicule_id: int) -> Optional[Vehicule]:
+        return await self.apartager(('get_by_id', vehicule_id), lambda: self.repository.get_by_id(vehicule_id))
+
+    async def aget_by_immatriculation(self, vehicule_id) -> Optional[Vehicule]:
+        return await self.apartager(('get_by_immatriculation', vehicule_id),
+                                    lambda: self.repository.get_by_immatriculation(vehicule_id))
+
+    async def afind_by_criteria(self, marque: Optional[str] = None,
+                                modele: Optional[str] = None,
+                                disponible: Optional[bool] = None,
+                                type_vehicule: Optional[str] = None,
+                                prix_max: Optional[float] = None) -> List[Vehicule]:
+        criteres = (marque, modele, disponible, type_vehicule, prix_max)
+        return list(await self.apartager(('find_by_criteria', criteres),
+                                         lambda: tuple(self.repository.find_by_criteria(*criteres))))
+
+    # ===== Lectures déléguées (flux ou paramètres trop variés pour être partagés) =====
+
+    def iter_all(self) -> Iterator[Vehicule]:
+        return self.repository.iter_all()
+
+    def iter_available(self) -> Iterator[Vehicule]:
+        return self.repository.iter_available()
+
+    def iter_by_criteria(self, marque: Optional[str] = None,
+                         modele: Optional[str] = None,
+                         disponible: Optional[bool] = None,
+                         type_vehicule: Optional[str] = None,
+                         prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return self.repository.iter_by_criteria(marque, modele, disponible, type_vehicule, prix_max)
+
+    def iter_by_agence(self, agence_id: int,
+                       marque: Optional[str] = None,
+                       modele: Optional[str] = None,
+                       disponible: Optional[bool] = None,
+                       type_vehicule: Optional[str] = None,
+                       prix_max: Optional[float] = None) -> Iterator[Vehicule]:
+        return self.repository.iter_by_agence(agence_id, marque, modele, disponible, type_vehicule, prix_max)
+
+    def is_available_between(self, vehicule_id, date_debut: date, date_fin: date) -> bool:
+        return self.repository.is_available_between(vehicule_id, date_debut, date_fin)
+
+    def calculate_rental_cost(self, vehicule_id, duree: int, date_debut: Optional[date] = None) -> float:
+        return self.repository.calculate_rental_cost(vehicule_id, duree, date_debut)
+
+    # ===== Mutations =====
+
+    def save(self, vehicule: Vehicule) -> int:
+        return self._muter(lambda: self.repository.save(vehicule))
+
+    def save_all(self, vehicules: Iterable[Vehicule]) -> int:
+        return self._muter(lambda: self.repository.save_all(vehicules))
+
+    def delete(self, vehicule_id) -> bool:
+        return self._muter(lambda: self.repository.delete(vehicule_id))
+
+    def set_availability(self, vehicule_id, disponible: bool) -> bool:
+        return self._muter(lambda: self.repository.set_availability(vehicule_id, disponible))
+
+    def louer_vehicule(self, vehicule_id) -> bool:
+        return self._muter(lambda: self.repository.louer_vehicule(vehicule_id))
+
+    def retourner_vehicule(self, vehicule_id, km_parcourus: int) -> bool:
+        return self._muter(lambda: self.repository.retourner_vehicule(vehicule_id, km_parcourus))
+
+    def create_vehicule(self, marque: str, modele: str, annee: int,
+                        immatriculation, kilometrage: int,
+                        prix_journalier: float, etat: str,
+                        type_vehicule: str) -> Vehicule:
+        return self._muter(lambda: self.repository.create_vehicule(
+            marque, modele, annee, immatriculation, kilometrage, prix_journalier, etat, type_vehicule))
@@ -0,0 +1,184 @@
+import struct
+import threading
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, Union
+
+from ..application.UtilizationRollupsPort import UtilizationRollupsPort
+
+_MAGIC = b'UROL'
+_FORMAT = 1
+_ENTETE = struct.Struct('<4sHI')  # magic, version du format, nombre de véhicules
+_SERIE = struct.Struct('<HiI')  # longueur de la clé, ordinal du premier jour, octets du bitmap
+
+
+def _mois(ordinal: int) -> int:
+    jour = date.fromordinal(ordinal)
+    return jour.year * 12 + jour.month - 1
+
+
+def _premier_jour(mois: int) -> int:
+    return date(mois // 12, mois % 12 + 1, 1).toordinal()
+
+
+class _Serie:
+    """Jours loués d'un véhicule : un bit par jour à partir de `origine` (aligné sur 8 jours)."""
+
+    __slots__ = ('origine', 'bits', 'mois')
+
+    def __init__(self, origine: int, bits: bytearray = None):
+        self.origine = origine
+        self.bits = bits if bits is not None else bytearray()
+        # mois (année * 12 + mois - 1) -> nombre de jours loués
+        self.mois: Dict[int, int] = {}
+
+    @property
+    def fin(self) -> int:
+        return self.origine + 8 * len(self.bits)
+
+    def couvrir(self, debut: int, fin: int) -> None:
+        if not self.bits:
+            self.origine = debut - debut % 8
+        elif debut < self.origine:
+            ajout = (self.origine - debut + 7) // 8
+            self.bits[0:0] = bytes(ajout)
+            self.origine -= 8 * ajout
+        if fin > self.fin:
+            self.bits.extend(bytes((fin - self.fin + 7) // 8))
+
+    def compter(self, debut: int, fin: int) -> int:
+        debut, fin = max(debut, self.origine), min(fin, self.fin)
+        if fin <= debut:
+            return 0
+        a, b = debut - self.origine, fin - self.origine
+        valeur = int.from_bytes(self.bits[a // 8:(b + 7) // 8], 'little') >> (a % 8)
+        return (valeur & ((1 << (b - a)) - 1)).bit_count()
+
+    def recalculer_mois(self) -> None:
+        self.mois = {}
+        if not self.bits:
+            return
+        mois, dernier = _mois(self.origine), _mois(self.fin - 1)
+        while mois <= dernier:
+            jours = self.compter(_premier_jour(mois), _premier_jour(mois + 1))
+            if jours:
+                self.mois[mois] = jours
+            mois += 1
+
+
+class UtilizationRollups(UtilizationRollupsPort):
+    """
+    Agrégats d'utilisation de la flotte, tenus à jour au fil des contrats.
+
+    Pour chaque véhicule, un bitmap marque les jours loués et un dictionnaire compte
+    les jours loués par mois. Une mise à jour coûte O(durée du contrat), une requête
+    sur une fenêtre O(fenêtre / 8) ; aucun contrat n'est relu. Marquer un jour déjà
+    marqué est sans effet, si bien que rejouer un contrat est sans danger.
+
+    Le fichier écrit par `save` contient les bitmaps compressés (zlib) : une année
+    d'historique tient en 46 octets par véhicule avant compression.
+    """
+
+    def __init__(self):
+        self._series: Dict[str, _Serie] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, cle) -> bool:
+        return str(cle) in self._series
+
+    def keys(self) -> Iterator[str]:
+        return iter(list(self._series))
+
+    # ===== Mises à jour =====
+
+    def mark(self, cle, debut: date, fin: date, rented: bool = True) -> int:
+        """
+        Marque les jours [debut, fin[ du véhicule `cle` comme loués (ou libres).
+
+        :return: Le nombre de jours dont l'état a changé
+        """
+        debut, fin = debut.toordinal(), fin.toordinal()
+        if fin <= debut:
+            return 0
+        cle = str(cle)
+        with self._lock:
+            serie = self._series.get(cle)
+            if serie is None:
+                if not rented:
+                    return 0
+                serie = self._series[cle] = _Serie(debut)
+            if rented:
+                serie.couvrir(debut, fin)
+            else:
+                debut, fin = max(debut, serie.origine), min(fin, serie.fin)
+            bits, mois = serie.bits, serie.mois
+            changes = 0
+            for jour in range(debut, fin):
+                i = jour - serie.origine
+                octet, masque = i >> 3, 1 << (i & 7)
+                if bool(bits[octet] & masque) == rented:
+                    continue
+                bits[octet] ^= masque
+                cle_mois = _mois(jour)
+                mois[cle_mois] = mois.get(cle_mois, 0) + (1 if rented else -1)
+                if not mois[cle_mois]:
+                    del mois[cle_mois]
+                changes += 1
+            return changes
+
+    # ===== Requêtes =====
+
+    def rented_days(self, cle, debut: date, fin: date) -> int:
+        serie = self._series.get(str(cle))
+        return serie.compter(debut.toordinal(), fin.toordinal()) if serie is not None else 0
+
+    def utilization(self, cle, debut: date, fin: date) -> float:
+        """Jours loués / jours calendaires sur [debut, fin[."""
+        jours = (fin - debut).days
+        if jours <= 0:
+            raise ValueError("La période d'analyse doit durer au moins un jour.")
+        return self.rented_days(cle, debut, fin) / jours
+
+    def rented_days_by_month(self, cle) -> Dict[str, int]:
+        serie = self._series.get(str(cle))
+        if serie is None:
+            return {}
+        return {f"{m // 12:04d}-{m % 12 + 1:02d}": n for m, n in sorted(serie.mois.items())}
+
+    # ===== Persistance =====
+
+    def save(self, chemin: Union[str, Path]) -> int:
+        """Écrit les bitmaps dans `chemin` ; les agrégats mensuels sont recalculés au chargement."""
+        with self._lock:
+            series = [(cle.encode('utf-8'), serie.origine, bytes(serie.bits)) for cle, serie in self._series.items()]
+        compresseur = zlib.compressobj(6)
+        with open(chemin, 'wb') as fichier:
+            fichier.write(_ENTETE.pack(_MAGIC, _FORMAT, len(series)))
+            for cle, origine, bits in series:
+                fichier.write(compresseur.compress(_SERIE.pack(len(cle), origine, len(bits)) + cle + bits))
+            fichier.write(compresseur.flush())
+            return fichier.tell()
+
+    @classmethod
+    def load(cls, chemin: Union[str, Path]) -> 'UtilizationRollups':
+        contenu = Path(chemin).read_bytes()
+        magic, version, nombre = _ENTETE.unpack_from(contenu)
+        if magic != _MAGIC or version != _FORMAT:
+            raise ValueError(f"{chemin} n'est pas un fichier d'agrégats d'utilisation (format {_FORMAT}).")
+        donnees = zlib.decompress(contenu[_ENTETE.size:])
+        rollups = cls()
+        position = 0
+        for _ in range(nombre):
+            longueur, origine, taille = _SERIE.unpack_from(donnees, position)
+            position += _SERIE.size
+            cle = donnees[position:position + longueur].decode('utf-8')
+            position += longueur
+            serie = _Serie(origine, bytearray(donnees[position:position + taille]))
+            position += taille
+            serie.recalculer_mois()
+            rollups._series[cle] = serie
+        return rollups
@@ -0,0 +1,243 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from ..domain.vehicule import Vehicule
+
+_MOTS = re.compile(r'\w+')
+_SEPARATEURS = re.compile(r'\W+')
+
+
+def trigrammes(mot: str) -> FrozenSet[str]:
+    """Trigrammes d'un mot en minuscules, complété comme pg_trgm ("  mo", "mot ")."""
+    mot = f"  {mot} "
+    return frozenset(mot[i:i + 3] for i in range(len(mot) - 2))
+
+
+def similarite(mot: str, trigrammes_mot: FrozenSet[str], terme: str, trigrammes_terme: FrozenSet[str]) -> float:
+    """
+    Similarité de Jaccard des trigrammes ; un début de terme saisi ("20" pour "208")
+    ou un fragment du terme comptent davantage.
+    """
+    communs = len(trigrammes_mot & trigrammes_terme)
+    score = communs / (len(trigrammes_mot) + len(trigrammes_terme) - communs)
+    if terme.startswith(mot):
+        score = max(score, 0.5 + 0.5 * len(mot) / len(terme))
+    elif mot in terme:
+        score = max(score, 0.4 + 0.5 * len(mot) / len(terme))
+    return score
+
+
+class _Termes:
+    """Termes distincts et leur index inversé de trigrammes."""
+
+    def __init__(self):
+        self.trigrammes: Dict[str, FrozenSet[str]] = {}
+        self.par_trigramme: Dict[str, Set[str]] = defaultdict(set)
+
+    def ajouter(self, terme: str) -> None:
+        if terme not in self.trigrammes:
+            self.trigrammes[terme] = trigrammes(terme)
+            for trigramme in self.trigrammes[terme]:
+                self.par_trigramme[trigramme].add(terme)
+
+    def retirer(self, terme: str) -> None:
+        for trigramme in self.trigrammes.pop(terme, ()):
+            termes = self.par_trigramme[trigramme]
+            termes.discard(terme)
+            if not termes:
+                del self.par_trigramme[trigramme]
+
+    def proches(self, mot: str, seuil: float, max_candidats: Optional[int] = None) -> Dict[str, float]:
+        """Termes dont la similarité avec `mot` atteint `seuil`."""
+        trigrammes_mot = trigrammes(mot)
+        candidats: Set[str] = set()
+        for trigramme in trigrammes_mot:
+            termes = self.par_trigramme.get(trigramme)
+            if termes is not None:
+                if max_candidats is not None and len(termes) > max_candidats:
+                    # Trigramme trop courant (préfixe d'immatriculation...) : peu discriminant
+                    continue
+                candidats |= termes
+        scores = {}
+        for terme in candidats:
+            score = similarite(mot, trigrammes_mot, terme, self.trigrammes[terme])
+            if score >= seuil:
+                scores[terme] = score
+        return scores
+
+
+class VehiculeSearchIndex:
+    """
+    Recherche plein texte approchée sur la marque, le modèle, le type et l'immatriculation.
+
+    Marque, modèle et type prennent peu de valeurs distinctes : les véhicules sont
+    regroupés par triplet (marque, modèle, type) et la requête est évaluée sur ces
+    groupes, dont les mots sont indexés par trigrammes. Chaque mot de la requête doit
+    correspondre (approximativement) à un mot du groupe ; le score est la somme des
+    meilleures similarités. Les mots restants forment un fragment d'immatriculation,
+    cherché dans un index de trigrammes propre aux immatriculations. Le prix est lu sur
+    le véhicule au moment de la recherche et la disponibilité auprès de `disponibilite`
+    s'il est fourni (l'état partagé entre processus) ; l'index ne suit que les champs texte.
+    """
+
+    def __init__(self, seuil: float = 0.3, max_candidats_immatriculation: int = 1000):
+        self.seuil = seuil
+        self.max_candidats_immatriculation = max_candidats_immatriculation
+        self._lock = threading.RLock()
+        self._vider()
+
+    def _vider(self) -> None:
+        self._vehicules: Dict[object, Vehicule] = {}
+        self._groupe_de: Dict[object, Tuple[str, str, str]] = {}
+        self._plaque_de: Dict[object, str] = {}
+        # groupe -> IDs de ses véhicules (dict : ordre d'insertion conservé)
+        self._groupes: Dict[Tuple[str, str, str], Dict[object, None]] = {}
+        self._mots_groupes: Dict[str, Set[Tuple[str, str, str]]] = defaultdict(set)
+        self._termes = _Termes()
+        self._plaques: Dict[str, Set[object]] = defaultdict(set)
+        self._termes_plaques = _Termes()
+
+    def __len__(self) -> int:
+        return len(self._vehicules)
+
+    @staticmethod
+    def _mots(*textes: str) -> Set[str]:
+        return {mot for texte in textes for mot in _MOTS.findall(texte.lower())}
+
+    @staticmethod
+    def _plaque(vehicule: Vehicule) -> str:
+        # Sans séparateurs : "AB-123-CD 75" -> "ab123cd75", cherché par "ab123" ou "AB-123"
+        return _SEPARATEURS.sub('', str(vehicule.immatriculation).lower())
+
+    # ===== Maintenance incrémentale =====
+
+    def add(self, vehicule: Vehicule) -> None:
+        """Indexe un véhicule, ou le réindexe s'il l'était déjà (même ID)."""
+        cle = vehicule.id if vehicule.id is not None else vehicule.immatriculation
+        groupe = (vehicule.marque, vehicule.modele, vehicule.typeVehicule)
+        plaque = self._plaque(vehicule)
+        with self._lock:
+            self._vehicules[cle] = vehicule
+            if self._groupe_de.get(cle) != groupe:
+                self._retirer_du_groupe(cle)
+                self._groupe_de[cle] = groupe
+                if groupe not in self._groupes:
+                    self._groupes[groupe] = {}
+                    for mot in self._mots(*groupe):
+                        self._mots_groupes[mot].add(groupe)
+                        self._termes.ajouter(mot)
+                self._groupes[groupe][cle] = None
+            if self._plaque_de.get(cle) != plaque:
+                self._retirer_la_plaque(cle)
+                self._plaque_de[cle] = plaque
+                self._plaques[plaque].add(cle)
+                self._termes_plaques.ajouter(plaque)
+
+    def add_all(self, vehicules: Iterable[Vehicule]) -> None:
+        for vehicule in vehicules:
+            self.add(vehicule)
+
+    def remove(self, cle) -> None:
+        with self._lock:
+            if self._vehicules.pop(cle, None) is not None:
+                self._retirer_du_groupe(cle)
+                self._retirer_la_plaque(cle)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vider()
+
+    def _retirer_du_groupe(self, cle) -> None:
+        groupe = self._groupe_de.pop(cle, None)
+        if groupe is None:
+            return
+        membres = self._groupes[groupe]
+        del membres[cle]
+        if not membres:
+            del self._groupes[groupe]
+            for mot in self._mots(*groupe):
+                groupes = self._mots_groupes[mot]
+                groupes.discard(groupe)
+                if not groupes:
+                    del self._mots_groupes[mot]
+                    self._termes.retirer(mot)
+
+    def _retirer_la_plaque(self, cle) -> None:
+        plaque = self._plaque_de.pop(cle, None)
+        if plaque is None:
+            return
+        cles = self._plaques[plaque]
+        cles.discard(cle)
+        if not cles:
+            del self._plaques[plaque]
+            self._termes_plaques.retirer(plaque)
+
+    # ===== Recherche =====
+
+    def search(self, texte: str, disponible: Optional[bool] = None, prix_max: Optional[float] = None,
+               limit: int = 20, offset: int = 0,
+               disponibilite: Optional[Callable[[Vehicule], bool]] = None) -> List[Tuple[float, Vehicule]]:
+        """
+        :param disponibilite: Disponibilité courante d'un véhicule pour le filtre `disponible`
+            (par défaut, son attribut `disponible` tel qu'indexé)
+        :return: Couples (score, véhicule) par score décroissant, après les filtres structurés
+        """
+        mots = _MOTS.findall(texte.lower())
+        if not mots or limit <= 0:
+            return []
+        with self._lock:
+            # Score de chaque groupe pour chaque mot ; les mots qui ne correspondent à
+            # aucun groupe sont recollés et cherchés dans les immatriculations
+            scores_groupes: Optional[Dict[Tuple[str, str, str], float]] = None
+            mots_plaques = []
+            for mot in mots:
+                meilleurs: Dict[Tuple[str, str, str], float] = {}
+                for terme, score in self._termes.proches(mot, self.seuil).items():
+                    for groupe in self._mots_groupes[terme]:
+                        if score > meilleurs.get(groupe, 0.0):
+                            meilleurs[groupe] = score
+                if not meilleurs:
+                    mots_plaques.append(mot)
+                    continue
+                if scores_groupes is None:
+                    scores_groupes = meilleurs
+                else:
+                    scores_groupes = {g: s + meilleurs[g] for g, s in scores_groupes.items() if g in meilleurs}
+            if mots_plaques:
+                candidats = self._par_plaque(''.join(mots_plaques), scores_groupes)
+            else:
+                candidats = self._par_groupe(scores_groupes)
+            resultats = []
+            a_sauter = max(0, offset)
+            for score, vehicule in candidats:
+                if prix_max is not None and vehicule.prix_journalier > prix_max:
+                    continue
+                if disponible is not None and (disponibilite(vehicule) if disponibilite is not None
+                                               else vehicule.disponible) != disponible:
+                    continue
+                if a_sauter:
+                    a_sauter -= 1
+                    continue
+                resultats.append((round(score, 4), vehicule))
+                if len(resultats) >= limit:
+                    break
+            return resultats
+
+    def _par_groupe(self, scores_groupes):
+        for groupe, score in sorted(scores_groupes.items(), key=lambda element: -element[1]):
+            for cle in self._groupes[groupe]:
+                yield score, self._vehicules[cle]
+
+    def _par_plaque(self, fragment: str, scores_groupes):
+        scores: Dict[object, float] = {}
+        proches = self._termes_plaques.proches(fragment, self.seuil, self.max_candidats_immatriculation)
+        for plaque, score in proches.items():
+            for cle in self._plaques[plaque]:
+                scores[cle] = score
+        if scores_groupes is not None:
+            scores = {c: s + scores_groupes[self._groupe_de[c]] for c, s in scores.items()
+                      if self._groupe_de[c] in scores_groupes}
+        for cle, score in sorted(scores.items(), key=lambda element: -element[1]):
+            yield score, self._vehicules[cle]
@@ -1,7 +1,30 @@
-import sys
+import argparse
+
 from .lib.application.controllers import create_app
 
 app = create_app()
 
+
+def _charger_flotte(chemin: str):
+    def preload(application) -> None:
+        from .lib.infrastructure.FleetFileStore import open_fleet_file
+        flotte = application.extensions['container'].resolve('import_export_flotte')
+        rapport = flotte.importer_vehicules(open_fleet_file(chemin).read_chunks(10_000))
+        print(f"{rapport.lignes} véhicules chargés ({rapport.rejets} rejets)")
+    return preload
+
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="API de location de véhicules")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Nombre de processus (mode pré-fork, disponibilités en mémoire partagée)")
+    parser.add_argument('--fleet', help="Fichier CSV/Parquet de la flotte à charger avant le fork des workers")
+    args = parser.parse_args()
+    if args.workers > 1:
+        from .lib.infrastructure.PreforkServer import serve_prefork
+        serve_prefork(create_app, args.workers, args.host, args.port,
+                      preload=_charger_flotte(args.fleet) if args.fleet else None)
+    else:
+        app.run(host=args.host, port=args.port, debug=True)
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from ..lib.application.controllers import create_app
+from ..lib.application.use_cases.analyseContrats import AnalyseContrats
+from ..lib.domain.client import Client
+from ..lib.domain.contratLocation import ContratLocation
+from ..lib.infrastructure.ContratColumns import ContratColumns
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+
+@pytest.fixture
+def analyse():
+    contrats = InMemoryContratRepository()
+    contrats._initialize()
+    vehicules = InMemoryVehiculeRepository()
+    vehicules._initialize()
+    client = Client("Doe", "John", "123ABC", "0123456789", "john.doe@email", None)
+    citadine = vehicules.create_vehicule("Renault", "Clio", 2020, "AN-001", 1000, 40.0, "Nickel", "Citadine")
+    vehicules.create_vehicule("Renault", "Twingo", 2021, "AN-002", 1000, 35.0, "Nickel", "Citadine")
+    suv = vehicules.create_vehicule("Peugeot", "3008", 2022, "AN-003", 1000, 80.0, "Nickel", "SUV")
+    for debut, duree, vehicule in ((date(2025, 1, 28), 7, citadine), (date(2025, 1, 5), 2, suv),
+                                   (date(2025, 2, 10), 10, suv)):
+        contrats.save(ContratLocation(debut, duree, 0.0, vehicule.prix_journalier * duree, 100.0,
+                                      client, vehicule, None))
+    return AnalyseContrats(contrats, vehicules, ContratColumns.from_contrats)
+
+
+def test_revenus_par_mois(analyse):
+    assert analyse.revenus_par_mois() == [
+        {'mois': '2025-01', 'revenu': 440.0},
+        {'mois': '2025-02', 'revenu': 800.0},
+    ]
+
+
+def test_utilisation_par_type(analyse):
+    utilisation = analyse.utilisation_par_type(date(2025, 2, 1), date(2025, 3, 1))
+    # Citadines : 3 jours loués en février (28/01 + 7 jours) sur 2 véhicules x 28 jours
+    assert utilisation['Citadine'] == pytest.approx(3 / 56)
+    assert utilisation['SUV'] == pytest.approx(10 / 28)
+
+
+def test_durees(analyse):
+    durees = analyse.durees(bornes=(1, 5, 10))
+    assert durees['moyenne'] == pytest.approx(19 / 3)
+    assert durees['moyenne_par_type'] == {'Citadine': 7.0, 'SUV': 6.0}
+    assert [t['contrats'] for t in durees['histogramme']] == [1, 1, 1]
+
+
+def test_instantane_reconstruit_apres_un_nouveau_contrat(analyse):
+    premier = analyse.instantane()
+    contrat = next(analyse.contrat_repository.iter_all())
+    analyse.contrat_repository.save(ContratLocation(date(2025, 3, 1), 1, 0.0, 10.0, 100.0,
+                                                    contrat.client, contrat.vehicule, None))
+    assert analyse.instantane() is not premier
+    assert len(analyse.instantane()) == 4
+
+
+def test_endpoint_analytics(analyse):
+    client = create_app({'TESTING': True}, blueprints=['analytics']).test_client()
+    response = client.get('/api/analytics?debut=2025-02-01&fin=2025-03-01')
+    assert response.status_code == 200
+    assert response.get_json()['contrats'] == 3
+    assert client.get('/api/analytics?debut=hier').status_code == 400
@@ -0,0 +1,76 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from ..lib.application.container import create_container
+from ..lib.application.use_cases.signerContratDeLocation import SignerContratDeLocation
+from ..lib.domain.assurance import GrilleTarifaire
+from ..lib.domain.exceptions import AssuranceAlreadyExistsException, AssuranceNotFoundException
+from ..lib.infrastructure.InMemoryAssuranceRepository import InMemoryAssuranceRepository, charger_catalogue
+from ..lib.infrastructure.InMemoryCautionRepository import InMemoryCautionRepository
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+
+@pytest.fixture
+def assurances():
+    repository = InMemoryAssuranceRepository()
+    repository._initialize()
+    return repository
+
+
+def test_grille_par_type_et_tranche_de_duree():
+    grille = GrilleTarifaire.compiler({"SUV": [20.0, 15.0, 10.0], "*": [9.0, 8.0, 7.0]}, [1, 4, 8])
+    assert [grille.tarif("SUV", d) for d in (1, 3, 4, 7, 8, 365)] == [20.0, 20.0, 15.0, 15.0, 10.0, 10.0]
+    assert grille.tarif("Cabriolet", 5) == 8.0
+    with pytest.raises(ValueError):
+        grille.tarif("SUV", 0)
+    with pytest.raises(ValueError):
+        GrilleTarifaire.compiler({"SUV": [20.0]}, [1, 4])
+
+
+def test_index_par_nom(assurances):
+    (tiers,) = assurances.find_by_name("tiers")
+    assert assurances.get_by_id(tiers.id) is tiers
+    with pytest.raises(AssuranceAlreadyExistsException):
+        assurances.create_assurance("TIERS")
+
+    assurances.delete(tiers.id)
+    with pytest.raises(AssuranceNotFoundException):
+        assurances.find_by_name("Tiers")
+    assert assurances.count_all() == 1
+
+
+def test_catalogue_compile_une_seule_fois(assurances, tmp_path):
+    (tous_risques,) = assurances.find_by_name("Tous risques")
+    assert tous_risques.grille is charger_catalogue()["Tous risques"][1]
+    assert assurances.get_tarif(tous_risques.id, "SUV", 10) == 18.0
+    with pytest.raises(TypeError):
+        tous_risques.grille.tarifs["SUV"] = (0.0,)
+
+    chemin = tmp_path / "catalogue.json"
+    chemin.write_text(json.dumps({"bornes": [1, 8], "assurances": {
+        "Premium": {"tarif_journalier": 30.0, "tarifs": {"*": [30.0, 25.0]}}}}))
+    assert assurances.load_catalogue(str(chemin)) == 1
+    (premium,) = assurances.find_by_name("premium")
+    assert premium.grille is charger_catalogue(str(chemin))["Premium"][1]
+    assert premium.getTarif("Citadine", 10) == 25.0
+
+
+def test_signature_avec_assurance():
+    for repository in (InMemoryVehiculeRepository(), InMemoryClientRepository(), InMemoryContratRepository(),
+                       InMemoryCautionRepository(), InMemoryAssuranceRepository()):
+        repository._initialize()
+    container = create_container()
+    client = container.resolve('client_repository').create_client("Doe", "John", "123ABC", "0123456789", "j@d.fr")
+    vehicule = container.resolve('vehicule_repository').create_vehicule(
+        "Peugeot", "3008", 2022, "AS-001", 1000, 80.0, "Nickel", "SUV")
+    (tiers,) = container.resolve('assurance_repository').find_by_name("Tiers")
+
+    contrat = SignerContratDeLocation.main(client.id, vehicule.id, date.today() + timedelta(days=1), 5,
+                                           assurance_id=tiers.id, container=container)
+
+    assert contrat.assurance is tiers
+    assert contrat.cout == 80.0 * 5 + 11.0 * 5
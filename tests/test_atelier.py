@@ -0,0 +1,114 @@
+import pytest
+
+from ..lib.application.exceptions import AtelierSatureException
+from ..lib.application.use_cases.reparerVehicule import Atelier
+from ..lib.domain.devis import Devis
+from ..lib.domain.exceptions import InvalidPrestationStateException, VehiculeNotEligibleForDevisException
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+
+class Horloge:
+    def __init__(self):
+        self.instant = 0.0
+
+    def __call__(self):
+        return self.instant
+
+
+@pytest.fixture
+def vehiculeRepository():
+    repo = InMemoryVehiculeRepository()
+    repo._initialize()
+    return repo
+
+
+@pytest.fixture
+def horloge():
+    return Horloge()
+
+
+@pytest.fixture
+def atelier(vehiculeRepository, horloge):
+    return Atelier(vehiculeRepository, nb_baies=2, capacite_file=3, horloge=horloge)
+
+
+def _devis(vehiculeRepository, immatriculation, prix_journalier):
+    vehicule = vehiculeRepository.create_vehicule("Renault", "Clio", 2020, immatriculation, 1000,
+                                                  prix_journalier, "Endommagé", "Citadine")
+    return Devis(vehicule, 300.0)
+
+
+def test_priorite_au_cout_d_immobilisation(atelier, vehiculeRepository):
+    devis = [_devis(vehiculeRepository, f"AT-{i}", prix) for i, prix in enumerate((30.0, 40.0, 90.0, 60.0))]
+    prestations = [atelier.soumettre(d) for d in devis]
+
+    assert [p.etat for p in prestations] == ["En cours", "En cours", "En attente", "En attente"]
+    assert not vehiculeRepository.is_available("AT-2")
+
+    atelier.terminer(devis[0])
+
+    assert prestations[2].etat == "En cours" and prestations[2].baie == 1
+    assert prestations[3].etat == "En attente"
+    assert vehiculeRepository.get_by_immatriculation("AT-0").disponible
+
+
+def test_file_bornee(atelier, vehiculeRepository):
+    for i in range(5):
+        atelier.soumettre(_devis(vehiculeRepository, f"FB-{i}", 50.0))
+    with pytest.raises(AtelierSatureException):
+        atelier.soumettre(_devis(vehiculeRepository, "FB-5", 50.0))
+
+
+def test_transitions_et_annulation(atelier, vehiculeRepository):
+    en_cours = [atelier.soumettre(_devis(vehiculeRepository, f"TA-{i}", 50.0)) for i in range(2)]
+    attente = _devis(vehiculeRepository, "TA-2", 50.0)
+    atelier.soumettre(attente)
+
+    atelier.annuler(attente)
+    atelier.terminer(en_cours[0].devis)
+
+    assert atelier.metriques().profondeur_file == 0
+    with pytest.raises(InvalidPrestationStateException):
+        en_cours[0].demarrer(1, 0.0)
+
+
+def test_metriques(atelier, vehiculeRepository, horloge):
+    devis = [_devis(vehiculeRepository, f"ME-{i}", 50.0) for i in range(3)]
+    for d in devis:
+        atelier.soumettre(d)
+    horloge.instant = 10.0
+    atelier.terminer(devis[0])
+    horloge.instant = 20.0
+
+    metriques = atelier.metriques()
+    assert metriques.profondeur_max == 1
+    assert metriques.terminees == 1
+    assert metriques.attente_max == 10.0
+    assert metriques.attente_moyenne == pytest.approx(10.0 / 3)
+    # baie 1 : 0-10 puis 10-20, baie 2 : 0-20
+    assert metriques.utilisation_baies == pytest.approx(1.0)
+
+
+def test_vehicule_rendu_a_la_fin_de_sa_derniere_prestation(atelier, vehiculeRepository):
+    premier = _devis(vehiculeRepository, "DP-0", 50.0)
+    second = Devis(premier.vehicule, 120.0)
+    atelier.soumettre(premier)
+    atelier.soumettre(second)
+
+    atelier.terminer(premier)
+    assert not vehiculeRepository.is_available("DP-0")
+    atelier.annuler(second)
+    assert vehiculeRepository.is_available("DP-0")
+
+
+def test_vehicule_loue_ou_vole_refuse(atelier, vehiculeRepository):
+    loue = _devis(vehiculeRepository, "LV-0", 50.0)
+    vehiculeRepository.louer_vehicule("LV-0")
+    vole = _devis(vehiculeRepository, "LV-1", 50.0)
+    vole.vehicule.etat = "Volé"
+
+    for devis in (loue, vole):
+        with pytest.raises(VehiculeNotEligibleForDevisException):
+            atelier.soumettre(devis)
+    assert not vehiculeRepository.is_available("LV-0")
+    assert atelier.metriques().profondeur_file == 0
@@ -0,0 +1,94 @@
+import pytest
+
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.CachedVehiculeRepository import CachedVehiculeRepository
+
+CLIO = Immatriculation("AA-123-AA", "75")
+SUV = Immatriculation("CC-789-CC", "92")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def repository(clock):
+    inner = InMemoryVehiculeRepository()
+    inner._initialize()
+    inner.create_vehicule("Renault", "Clio", 2020, CLIO, 1000, 40.0, "Nickel", "Citadine")
+    inner.create_vehicule("Peugeot", "5008", 2022, SUV, 3000, 90.0, "Sale", "SUV")
+    return CachedVehiculeRepository(inner, maxsize=2, ttl=10.0, clock=clock)
+
+def test_hit_on_normalized_criteria(repository):
+    assert len(repository.find_by_criteria(marque="Renault")) == 1
+    assert len(repository.find_by_criteria(marque="RENAULT", modele="")) == 1
+    assert repository.stats.hits == 1
+    assert repository.stats.misses == 1
+
+def test_mutation_only_drops_matching_entries(repository):
+    repository.find_by_criteria(marque="renault")
+    repository.find_by_criteria(type_vehicule="SUV")
+
+    repository.set_availability(CLIO, False)
+
+    assert repository.stats.size == 1
+    repository.find_by_criteria(type_vehicule="SUV")
+    assert repository.stats.hits == 1
+
+def test_old_values_are_invalidated(repository):
+    assert len(repository.find_by_criteria(disponible=True)) == 2
+    repository.louer_vehicule(CLIO)
+    assert len(repository.find_by_criteria(disponible=True)) == 1
+
+def test_new_values_are_invalidated(repository):
+    assert repository.find_by_criteria(prix_max=50.0)[0].immatriculation == CLIO
+    vehicule = repository.get_by_immatriculation(SUV)
+    vehicule.prix_journalier = 45.0
+    repository.save(vehicule)
+    assert len(repository.find_by_criteria(prix_max=50.0)) == 2
+
+def test_ttl_expiry(repository, clock):
+    repository.find_by_criteria(marque="peugeot")
+    clock.now = 11.0
+    repository.find_by_criteria(marque="peugeot")
+    assert repository.stats.misses == 2
+
+def test_lru_eviction(repository):
+    repository.find_by_criteria(marque="renault")
+    repository.find_by_criteria(marque="peugeot")
+    repository.find_by_criteria(marque="renault")
+    repository.find_by_criteria(type_vehicule="SUV")
+    assert repository.stats.evictions == 1
+    repository.find_by_criteria(marque="renault")
+    assert repository.stats.hits == 2
+
+
+def test_iter_and_count_share_the_cached_entry(repository):
+    assert [v.immatriculation for v in repository.iter_by_criteria(marque="renault")] == [CLIO]
+    assert repository.count_by_criteria(marque="RENAULT") == 1
+    assert repository.find_by_criteria(marque="Renault")[0].immatriculation == CLIO
+    assert (repository.stats.hits, repository.stats.misses, repository.stats.size) == (2, 1, 1)
+
+    repository.set_availability(CLIO, False)
+    assert repository.count_by_criteria(marque="renault", disponible=True) == 0
+    assert repository.stats.misses == 2
+
+
+def test_route_search_served_from_cache(repository):
+    from ..lib.application.container import create_container
+    from ..lib.application.controllers import create_app
+    container = create_container()
+    container.register('vehicule_repository', lambda c: repository)
+    client = create_app({'TESTING': True}, container=container, blueprints=['vehicules']).test_client()
+
+    for _ in range(5):
+        assert client.get('/api/vehicules/search?marque=Renault').status_code == 200
+    assert client.get('/api/vehicules/count?marque=renault').status_code == 200
+    assert (repository.stats.hits, repository.stats.misses) == (5, 1)
@@ -0,0 +1,86 @@
+import pickle
+
+import pytest
+
+from ..lib.application.use_cases.chiffrageDevis import ChiffrageDevis
+from ..lib.domain.tarifAtelier import chiffrer, valeur_residuelle
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.InMemoryDevisRepository import InMemoryDevisRepository
+from ..lib.infrastructure.ProcessPoolJobRunner import ProcessPoolJobRunner
+
+
+@pytest.fixture
+def devisRepository():
+    repo = InMemoryDevisRepository()
+    repo._initialize()
+    return repo
+
+
+@pytest.fixture
+def demandes():
+    return [
+        (Vehicule("Renault", "Clio", 2015 + i % 8, f"CH-{i:03d}", 20_000 * i, 40.0, "Sale", "Citadine"),
+         [("plaquettes", 1), ("vidange", 1)] if i % 3 else [("embrayage", 1), ("courroie", 1)])
+        for i in range(40)
+    ]
+
+
+def test_chiffrage_d_une_intervention():
+    prix, valeur = chiffrer(2024, 0, "Citadine", 40.0, [("plaquettes", 2)], 2024)
+    assert prix == round((90.0 + 1.6 * 55.0) * 1.2, 2)
+    assert valeur == 40.0 * 450
+
+
+def test_valeur_residuelle_en_forme_close():
+    valeur = 40.0 * 450
+    for _ in range(5 * 12):
+        valeur *= 1 - 0.012
+    for _ in range(7):
+        valeur *= 1 - 0.025
+    assert valeur_residuelle(40.0, 2020, 75_000, 2025) == pytest.approx(valeur)
+    # Kilométrage aberrant : plancher atteint sans boucle de 100 000 tours
+    assert valeur_residuelle(40.0, 2020, 10 ** 9, 2025) == pytest.approx(40.0 * 450 * 0.08)
+
+
+def test_lots_dans_le_processus_appelant(devisRepository, demandes):
+    rapport = ChiffrageDevis(devisRepository, ProcessPoolJobRunner(max_workers=0), taille_lot=7) \
+        .chiffrer_devis(demandes, annee_reference=2025)
+
+    assert len(rapport.devis) == 40
+    assert devisRepository.count_all() == 40
+    assert [d.vehicule for d in rapport.devis] == [v for v, _ in demandes]
+    assert all(v.kilometrage > 0 for v in rapport.irreparables)
+
+
+def test_pool_de_processus_donne_les_memes_devis(devisRepository, demandes):
+    attendus = [d.prix for d in ChiffrageDevis(devisRepository, ProcessPoolJobRunner(max_workers=0))
+                .chiffrer_devis(demandes, annee_reference=2025).devis]
+    runner = ProcessPoolJobRunner(max_workers=2)
+    try:
+        rapport = ChiffrageDevis(devisRepository, runner, taille_lot=7).chiffrer_devis(demandes, annee_reference=2025)
+    finally:
+        runner.shutdown()
+
+    assert [d.prix for d in rapport.devis] == attendus
+
+
+def test_demandes_invalides_rejetees_sans_interrompre_le_lot(devisRepository, demandes):
+    vehicule = demandes[0][0]
+    demandes[3:3] = [(vehicule, [("turbo", 1)]), (vehicule, [("pneu", 0)]), (vehicule, [("pneu",)])]
+    runner = ProcessPoolJobRunner(max_workers=2)
+    try:
+        rapport = ChiffrageDevis(devisRepository, runner, taille_lot=7).chiffrer_devis(demandes, annee_reference=2025)
+    finally:
+        runner.shutdown()
+
+    assert len(rapport.devis) == devisRepository.count_all() == 40
+    assert rapport.rejets == 3
+    assert rapport.erreurs == [(3, "Pièce inconnue : 'turbo'"), (4, "Quantité invalide pour pneu : 0"),
+                               (5, "Opération invalide : ('pneu',)")]
+
+
+def test_demande_compacte_picklable(demandes):
+    vehicule, operations = demandes[0]
+    compacte = (vehicule.annee, vehicule.kilometrage, vehicule.typeVehicule, vehicule.prix_journalier,
+                tuple(operations), 2025)
+    assert len(pickle.dumps(compacte)) < len(pickle.dumps(vehicule))
@@ -0,0 +1,63 @@
+import gzip
+
+import pytest
+
+from ..lib.application.controllers import create_app
+from ..lib.infrastructure.CompressionCache import negocier
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+
+@pytest.fixture
+def app():
+    InMemoryVehiculeRepository()._initialize()
+    app = create_app({'TESTING': True}, blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    for i in range(50):
+        repository.create_vehicule("Renault", "Clio", 2020, f"GZ-{i:03d}", 1000, 40.0, "Nickel", "Citadine")
+    return app
+
+
+def test_negociation_accept_encoding():
+    assert negocier('gzip, br;q=0.5', ('br', 'gzip')) == 'gzip'
+    assert negocier('gzip;q=0, *', ('gzip',)) is None
+    assert negocier('*', ('br', 'gzip')) == 'br'
+    assert negocier('identity', ('gzip',)) is None
+    assert negocier(None, ('gzip',)) is None
+
+
+def test_catalogue_compresse_une_fois_par_version(app):
+    client = app.test_client()
+    cache = app.extensions['container'].resolve('compression')
+    brut = client.get('/api/vehicules')
+    assert 'Content-Encoding' not in brut.headers and brut.headers['Vary'] == 'Accept-Encoding'
+
+    reponses = [client.get('/api/vehicules', headers={'Accept-Encoding': 'gzip'}) for _ in range(3)]
+    assert reponses[0].headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(reponses[0].data) == brut.data
+    assert len(reponses[0].data) < len(brut.data) / 5
+    assert cache.compressions == 1 and cache.hits == 2
+
+    client.patch('/api/vehicules/1/availability', json={'disponible': False})
+    nouvelle = client.get('/api/vehicules', headers={'Accept-Encoding': 'gzip'})
+    assert nouvelle.headers['ETag'] != reponses[0].headers['ETag']
+    assert cache.compressions == 2
+
+
+def test_if_none_match_rend_304(app):
+    client = app.test_client()
+    premiere = client.get('/api/vehicules', headers={'Accept-Encoding': 'gzip'})
+    revalidation = client.get('/api/vehicules', headers={'Accept-Encoding': 'gzip',
+                                                         'If-None-Match': premiere.headers['ETag']})
+    assert revalidation.status_code == 304 and revalidation.data == b''
+
+    # Petits corps : ETag mais pas de compression
+    petit = client.get('/api/vehicules/1', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in petit.headers and petit.headers['ETag']
+
+
+def test_brotli_si_installe(app):
+    brotli = pytest.importorskip('brotli')
+    client = app.test_client()
+    reponse = client.get('/api/vehicules', headers={'Accept-Encoding': 'gzip, br'})
+    assert reponse.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(reponse.data) == client.get('/api/vehicules').data
@@ -0,0 +1,93 @@
+import multiprocessing
+from datetime import date, timedelta
+
+import pytest
+
+from ..lib.application.container import Container, create_container
+from ..lib.application.use_cases.ProposerDevisUseCase import ProposerDevisUseCase
+from ..lib.application.use_cases.signerContratDeLocation import SignerContratDeLocation
+from ..lib.infrastructure.CachedVehiculeRepository import CachedVehiculeRepository
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+
+class VehiculesDeTest(InMemoryVehiculeRepository):
+    _instance = None
+
+
+@pytest.fixture
+def container():
+    for repository in (InMemoryVehiculeRepository(), InMemoryClientRepository(), InMemoryContratRepository()):
+        repository._initialize()
+    return create_container()
+
+
+def test_instance_unique_par_conteneur(container):
+    vehicules = container.resolve('vehicule_repository')
+    assert isinstance(vehicules, CachedVehiculeRepository)
+    assert container.resolve('vehicule_repository') is vehicules
+    assert container.resolve('proposer_devis').vehiculeRepository is vehicules
+
+
+def test_changement_de_backend_par_configuration():
+    container = create_container({
+        'REPOSITORIES': {'vehicule_repository': f'{__name__}:VehiculesDeTest'},
+        'VEHICULE_CACHE_MAXSIZE': 0,
+        'SINGLE_FLIGHT': False,
+        'SEARCH_INDEX': False,
+    })
+    assert isinstance(container.resolve('vehicule_repository'), VehiculesDeTest)
+
+    with pytest.raises(ValueError):
+        create_container({'REPOSITORY_BACKEND': 'inconnu'}).resolve('client_repository')
+
+
+def test_instances_heritees_apres_fork(container):
+    avant = container.resolve('proposer_devis')
+    verrou = container._lock
+    container._pid = -1  # simule un processus enfant
+    assert container.resolve('proposer_devis') is avant
+    assert container._lock is not verrou
+    assert container.is_built('vehicule_repository')
+
+
+def _identites(container, noms, file):
+    file.put([(container.is_built(nom), id(container.resolve(nom))) for nom in noms])
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="fork indisponible")
+def test_worker_fork_garde_le_conteneur_prechauffe(container):
+    noms = ['vehicule_repository', 'vehicule_search', 'proposer_devis']
+    container.warm(*noms)
+    contexte = multiprocessing.get_context('fork')
+    file = contexte.Queue()
+    processus = contexte.Process(target=_identites, args=(container, noms, file))
+    processus.start()
+    resultats = file.get(timeout=10)
+    processus.join(10)
+    assert resultats == [(True, id(container.resolve(nom))) for nom in noms]
+
+
+def test_warm_construit_tout_d_avance():
+    container = Container()
+    container.register('a', lambda c: object())
+    assert container.warm().is_built('a')
+
+
+def test_use_case_sans_injection_utilise_le_conteneur_du_processus():
+    use_case = ProposerDevisUseCase()
+    assert use_case.vehiculeRepository is ProposerDevisUseCase().vehiculeRepository
+
+
+def test_signer_contrat_avec_repositories_du_conteneur(container):
+    client = container.resolve('client_repository').create_client("Doe", "John", "123ABC", "0123456789", "j@d.fr")
+    vehicule = container.resolve('vehicule_repository').create_vehicule(
+        "Renault", "Clio", 2021, "AA-111-AA", 1000, 40.0, "Nickel", "Citadine")
+
+    contrat = SignerContratDeLocation.main(client.id, vehicule.id, date.today() + timedelta(days=1), 3,
+                                           container=container)
+
+    assert contrat.cout == 120.0
+    assert not vehicule.disponible
+    assert not container.is_built('assurance_repository')
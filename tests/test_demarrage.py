@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ..lib.application.container import create_container
+from ..lib.application.controllers import create_app
+
+# Budget de démarrage à froid (somme des temps d'import mesurés par -X importtime)
+IMPORT_BUDGET_MS = float(os.environ.get('IMPORT_BUDGET_MS', 1500))
+PACKAGE = __package__.rpartition('.')[0]
+
+
+def _importtime(module: str):
+    """Renvoie {module importé: temps propre en µs} pour un interpréteur neuf."""
+    sortie = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=Path(__file__).resolve().parents[2], capture_output=True, text=True, check=True,
+    ).stderr
+    temps = {}
+    for ligne in sortie.splitlines():
+        if not ligne.startswith('import time:') or 'self [us]' in ligne:
+            continue
+        propre, _, nom = ligne[len('import time:'):].split('|')
+        temps[nom.strip()] = int(propre)
+    return temps
+
+
+def test_demarrage_sous_le_budget():
+    temps = _importtime(f'{PACKAGE}.main')
+
+    assert 'pytest' not in temps
+    assert not [nom for nom in temps if nom.startswith(f'{PACKAGE}.lib.infrastructure.')]
+    assert sum(temps.values()) / 1000 < IMPORT_BUDGET_MS
+
+
+def test_cas_d_usage_independants_de_l_infrastructure():
+    modules = sorted(chemin.stem for chemin in (Path(__file__).resolve().parents[1] / 'lib' / 'application'
+                                                / 'use_cases').glob('*.py') if chemin.stem != '__init__')
+    temps = _importtime(', '.join(f'{PACKAGE}.lib.application.use_cases.{module}' for module in modules))
+
+    assert f'{PACKAGE}.lib.application.use_cases.analyseContrats' in temps
+    assert not [nom for nom in temps if nom.startswith(f'{PACKAGE}.lib.infrastructure.')]
+
+
+def test_repositories_construits_a_la_premiere_requete():
+    container = create_container()
+    app = create_app({'TESTING': True}, container=container)
+    assert not container.is_built('vehicule_repository')
+
+    app.test_client().get('/api/vehicules/count')
+
+    assert container.is_built('vehicule_repository')
+
+
+def test_blueprints_a_la_demande():
+    app = create_app(blueprints=['main'])
+    assert 'vehicule_bp' not in app.blueprints
+    assert app.test_client().get('/').status_code == 200
+
+    with pytest.raises(ValueError):
+        create_app(blueprints=['inconnu'])
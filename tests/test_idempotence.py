@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from ..lib.application.controllers import create_app
+from ..lib.infrastructure.IdempotencyStore import IdempotencyStore
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+
+class VehiculesLents(InMemoryVehiculeRepository):
+    """Retours bloqués jusqu'à ce que le test les libère."""
+    _instance = None
+    appels = 0
+    liberation = threading.Event()
+
+    def retourner_vehicule(self, vehicule_id, km_parcourus: int) -> bool:
+        VehiculesLents.appels += 1
+        self.liberation.wait(5)
+        return super().retourner_vehicule(vehicule_id, km_parcourus)
+
+
+def _app(**config):
+    app = create_app({'TESTING': True, 'VEHICULE_CACHE_MAXSIZE': 0, 'SINGLE_FLIGHT': False,
+                      'SEARCH_INDEX': False, **config}, blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    repository._initialize()
+    repository.create_vehicule("Renault", "Clio", 2020, "ID-001", 1000, 40.0, "Nickel", "Citadine")
+    return app, repository
+
+
+@pytest.fixture
+def app():
+    return _app()
+
+
+def test_retour_rejoue_sans_recompter_les_kilometres(app):
+    app, repository = app
+    client = app.test_client()
+    assert client.post('/api/vehicules/1/rent').status_code == 200
+
+    entetes = {'Idempotency-Key': 'retour-1'}
+    premiere = client.post('/api/vehicules/1/return', json={'km_parcourus': 250}, headers=entetes)
+    rejouee = client.post('/api/vehicules/1/return', json={'km_parcourus': 250}, headers=entetes)
+
+    assert (premiere.status_code, rejouee.status_code) == (200, 200)
+    assert rejouee.get_json() == premiere.get_json()
+    assert rejouee.headers['Idempotent-Replayed'] == 'true'
+    assert repository.get_by_id(1).kilometrage == 1250
+
+
+def test_location_rejouee_et_cle_propre_au_client(app):
+    app, _ = app
+    client = app.test_client()
+    assert client.post('/api/vehicules/1/rent', headers={'Idempotency-Key': 'k'}).status_code == 200
+    assert client.post('/api/vehicules/1/rent', headers={'Idempotency-Key': 'k'}).status_code == 200
+    autre = client.post('/api/vehicules/1/rent', headers={'Idempotency-Key': 'k', 'X-Api-Key': 'autre'})
+    assert autre.status_code == 404
+
+
+def test_cle_reutilisee_pour_une_autre_requete(app):
+    app, _ = app
+    client = app.test_client()
+    client.post('/api/vehicules/1/rent')
+    client.post('/api/vehicules/1/return', json={'km_parcourus': 10}, headers={'Idempotency-Key': 'k'})
+    reponse = client.post('/api/vehicules/1/return', json={'km_parcourus': 20}, headers={'Idempotency-Key': 'k'})
+    assert reponse.status_code == 422
+
+
+def test_doublon_en_cours_refuse_sans_attendre():
+    app, repository = _app(REPOSITORIES={'vehicule_repository': f'{__name__}:VehiculesLents'})
+    VehiculesLents.appels = 0
+    VehiculesLents.liberation.clear()
+    app.test_client().post('/api/vehicules/1/rent')
+    admission = app.extensions['container'].resolve('admission')
+    admission.attente_max = 0
+
+    def retourner():
+        return app.test_client().post('/api/vehicules/1/return', json={'km_parcourus': 100},
+                                      headers={'Idempotency-Key': 'double'})
+
+    reponses = []
+    original = threading.Thread(target=lambda: reponses.append(retourner()))
+    original.start()
+    while not VehiculesLents.appels:
+        pass
+    # Toutes les autres places d'admission sont prises : les doublons n'en ont pas besoin
+    for _ in range(admission.max_en_cours - 1):
+        admission.entrer()
+    doublons = [retourner() for _ in range(3)]
+    VehiculesLents.liberation.set()
+    original.join()
+    rejouee = retourner()
+    for _ in range(admission.max_en_cours - 1):
+        admission.sortir()
+
+    assert VehiculesLents.appels == 1
+    assert [r.status_code for r in doublons] == [409] * 3
+    assert reponses[0].status_code == 200
+    assert (rejouee.status_code, rejouee.headers['Idempotent-Replayed']) == (200, 'true')
+    assert admission.rejetees == 0
+    assert repository.get_by_id(1).kilometrage == 1100
+
+
+def test_cle_liberee_si_admission_refusee(app):
+    app, repository = app
+    client = app.test_client()
+    client.post('/api/vehicules/1/rent')
+    admission = app.extensions['container'].resolve('admission')
+    admission.attente_max = 0
+    for _ in range(admission.max_en_cours):
+        admission.entrer()
+    entetes = {'Idempotency-Key': 'delestee'}
+    assert client.post('/api/vehicules/1/return', json={'km_parcourus': 10}, headers=entetes).status_code == 503
+
+    for _ in range(admission.max_en_cours):
+        admission.sortir()
+    assert client.post('/api/vehicules/1/return', json={'km_parcourus': 10}, headers=entetes).status_code == 200
+    assert repository.get_by_id(1).kilometrage == 1010
+
+
+def test_store_borne_avec_expiration():
+    maintenant = [0.0]
+    store = IdempotencyStore(maxsize=2, ttl=10.0, horloge=lambda: maintenant[0])
+    for cle in ('a', 'b', 'c'):
+        entree, proprietaire = store.begin(cle, 'e')
+        assert proprietaire
+        store.complete(cle, entree, (200, 'application/json', b'{}'))
+    assert len(store) == 2 and store.begin('b', 'e')[1] is False
+
+    maintenant[0] = 11.0
+    assert store.begin('b', 'e')[1] is True
+
+    entree, _ = store.begin('x', 'e')
+    store.abandon('x', entree)
+    assert entree.abandonnee and store.begin('x', 'e')[1] is True
@@ -0,0 +1,40 @@
+from ..lib.domain.client import Client
+from ..lib.domain.vehicule import Vehicule
+
+
+def _vehicule(immatriculation="AA-123-BB", kilometrage=1000):
+    return Vehicule("Renault", "Clio", 2020, immatriculation, kilometrage, 40.0, "Nickel", "Citadine")
+
+
+def _client():
+    return Client("Doe", "John", "123ABC", "0123456789", "john.doe@email", None)
+
+
+def test_vehicule_identifie_par_immatriculation():
+    assert _vehicule(kilometrage=1000) == _vehicule(kilometrage=5000)
+    assert _vehicule("AA-123-BB") != _vehicule("CC-456-DD")
+    assert hash(_vehicule()) == hash(_vehicule(kilometrage=9999))
+
+
+def test_vehicule_reste_dans_un_ensemble_apres_modification():
+    vehicule = _vehicule()
+    vehicules = {vehicule}
+    vehicule.retourner(250, "Sale")
+    assert vehicule in vehicules
+
+
+def test_clients_homonymes_distincts():
+    premier, second = _client(), _client()
+    assert premier != second
+    assert premier == premier
+    assert len({premier, second}) == 2
+
+
+def test_retourner_voiture_par_identite():
+    client = _client()
+    vehicule = _vehicule()
+    client.louer_voiture(vehicule)
+
+    client.retourner_voiture(_vehicule(kilometrage=vehicule.kilometrage), 100)
+
+    assert not client.a_en_location(vehicule)
@@ -0,0 +1,96 @@
+import csv
+import pytest
+
+from ..lib.application.use_cases.importExportFlotte import ImportExportFlotte, COLONNES_VEHICULE, TYPES_COLONNES
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.infrastructure.FleetFileStore import open_fleet_file
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+def ligne(numero, **valeurs):
+    base = {
+        "marque": "Renault", "modele": "Clio", "annee": "2020",
+        "immatriculation": f"AA-{numero:03d}-AA", "departement": "75",
+        "kilometrage": "1000", "prix_journalier": "40.0", "etat": "Nickel",
+        "type_vehicule": "Citadine", "disponible": "",
+    }
+    base.update(valeurs)
+    return base
+
+@pytest.fixture
+def vehiculeRepository():
+    repo = InMemoryVehiculeRepository()
+    repo._initialize()
+    return repo
+
+@pytest.fixture
+def flotte(vehiculeRepository):
+    return ImportExportFlotte(vehiculeRepository)
+
+def test_import_par_lots(flotte, vehiculeRepository):
+    lots = [[ligne(1), ligne(2)], [ligne(3)]]
+    rapport = flotte.importer_vehicules(lots)
+
+    assert rapport.lignes == 3
+    assert rapport.rejets == 0
+    assert vehiculeRepository.get_by_immatriculation(Immatriculation("AA-003-AA", "75")).disponible
+
+def test_import_rejette_les_lignes_invalides(flotte, vehiculeRepository):
+    sans_marque = ligne(2)
+    del sans_marque["marque"]
+    lots = [[ligne(1), sans_marque, ligne(3, annee="deux mille")], [ligne(1), ligne(4, disponible="non")]]
+    rapport = flotte.importer_vehicules(lots)
+
+    assert rapport.lignes == 2
+    assert [numero for numero, _ in rapport.erreurs] == [2, 3, 4]
+    assert "marque" in rapport.erreurs[0][1]
+    assert not vehiculeRepository.get_by_immatriculation(Immatriculation("AA-004-AA", "75")).disponible
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_aller_retour_fichier(tmp_path, flotte, vehiculeRepository, extension):
+    if extension == "parquet":
+        pytest.importorskip("pyarrow")
+    flotte.importer_vehicules([[ligne(i) for i in range(5)]])
+    fichier = open_fleet_file(tmp_path / f"flotte.{extension}")
+
+    assert fichier.write(COLONNES_VEHICULE, flotte.exporter_vehicules(), taille_lot=2, types=TYPES_COLONNES) == 5
+
+    vehiculeRepository._initialize()
+    lots = list(fichier.read_chunks(taille_lot=2))
+    assert [len(lot) for lot in lots] == [2, 2, 1]
+    assert flotte.importer_vehicules(lots).lignes == 5
+    assert vehiculeRepository.count_all() == 5
+
+def test_export_apres_creation_par_api(vehiculeRepository, tmp_path):
+    from ..fleet import main
+    from ..lib.application.container import create_container
+    from ..lib.application.controllers import create_app
+    container = create_container()
+    client = create_app({'TESTING': True}, container=container, blueprints=['vehicules']).test_client()
+    reponse = client.post('/api/vehicules', json={
+        "marque": "Renault", "modele": "Clio", "annee": 2021, "immatriculation": "ZZ-123-ZZ",
+        "kilometrage": 0, "prix_journalier": 45.0, "etat": "Nickel", "type_vehicule": "Citadine"})
+    assert reponse.status_code == 201
+
+    exportees = list(container.resolve('import_export_flotte').exporter_vehicules())
+    assert [(e["immatriculation"], e["departement"]) for e in exportees] == [("ZZ-123-ZZ", None)]
+
+    chemin = tmp_path / "flotte.csv"
+    assert main(['export', 'vehicules', str(chemin)], container=container) == 0
+    with open(chemin, newline="") as f:
+        assert [l["immatriculation"] for l in csv.DictReader(f)] == ["ZZ-123-ZZ"]
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_aller_retour_avec_immatriculations_sans_departement(tmp_path, flotte, vehiculeRepository, extension):
+    if extension == "parquet":
+        pytest.importorskip("pyarrow")
+    # Premier lot uniquement sans département, comme les véhicules créés par l'API
+    vehiculeRepository.create_vehicule("Renault", "Clio", 2021, "ZZ-123-ZZ", 0, 45.0, "Nickel", "Citadine")
+    flotte.importer_vehicules([[ligne(1)]])
+    fichier = open_fleet_file(tmp_path / f"flotte.{extension}")
+    assert fichier.write(COLONNES_VEHICULE, flotte.exporter_vehicules(), taille_lot=1, types=TYPES_COLONNES) == 2
+
+    vehiculeRepository._initialize()
+    rapport = flotte.importer_vehicules(fichier.read_chunks(taille_lot=1))
+    assert (rapport.lignes, rapport.rejets) == (2, 0)
+    assert vehiculeRepository.get_by_immatriculation("ZZ-123-ZZ").prix_journalier == 45.0
+    assert vehiculeRepository.get_by_immatriculation(Immatriculation("AA-001-AA", "75")) is not None
@@ -0,0 +1,109 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from ..lib.application.controllers import create_app
+from ..lib.infrastructure.AdmissionQueue import AdmissionQueue
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.RateLimiter import MemoryTokenBuckets, SharedTokenBuckets, TokenBucketLimiter
+
+
+class Horloge:
+    def __init__(self):
+        self.maintenant = 100.0
+
+    def __call__(self):
+        return self.maintenant
+
+
+@pytest.fixture
+def app():
+    InMemoryVehiculeRepository()._initialize()
+    app = create_app({'TESTING': True, 'RATE_LIMITS': {'vehicule_bp.louer_vehicule': (2, 0.01)}},
+                     blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    for i in range(5):
+        repository.create_vehicule("Renault", "Clio", 2020, f"RL-00{i}", 1000, 40.0, "Nickel", "Citadine")
+    return app
+
+
+def test_seau_a_jetons_par_client_et_par_route():
+    horloge = Horloge()
+    limiteur = TokenBucketLimiter(3, 1.0, {'lente': (1, 0.5)}, horloge=horloge)
+    assert [limiteur.acquire('route', 'a') for _ in range(4)] == [0.0, 0.0, 0.0, 1.0]
+    assert limiteur.acquire('route', 'b') == 0.0
+    assert limiteur.acquire('lente', 'a') == 0.0
+    assert limiteur.acquire('lente', 'a') == 2.0
+
+    horloge.maintenant += 1.5
+    assert limiteur.acquire('route', 'a') == 0.0
+    assert limiteur.acquire('route', 'a') == pytest.approx(0.5)
+
+
+def test_seaux_en_memoire_bornes():
+    seaux = MemoryTokenBuckets(max_cles=2)
+    for cle in ('a', 'b', 'c'):
+        seaux.prendre(cle, 1, 1.0, 1, 0.0)
+    assert list(seaux._seaux) == ['b', 'c']
+
+
+def _consommer(seaux, n):
+    limiteur = TokenBucketLimiter(10, 0.001, seaux=seaux)
+    for _ in range(n):
+        limiteur.acquire('route', 'client')
+
+
+def test_seaux_partages_entre_processus():
+    seaux = SharedTokenBuckets(nb_slots=128)
+    try:
+        processus = multiprocessing.get_context('fork').Process(target=_consommer, args=(seaux, 10))
+        processus.start()
+        processus.join()
+        assert TokenBucketLimiter(10, 0.001, seaux=seaux).acquire('route', 'client') > 0
+    finally:
+        seaux.close()
+        seaux.unlink()
+
+
+def test_admission_bornee_avec_delestage():
+    admission = AdmissionQueue(max_en_cours=1, taille_file=1, attente_max=1.0)
+    assert admission.entrer()
+    resultats = []
+    attente = threading.Thread(target=lambda: resultats.append(admission.entrer()))
+    attente.start()
+    while not admission.en_attente:
+        pass
+    assert not admission.entrer()  # file pleine : rejet immédiat
+    admission.sortir()
+    attente.join()
+    assert resultats == [True] and admission.rejetees == 1
+
+
+def test_location_limitee_par_adresse(app):
+    client = app.test_client()
+    # Changer de clé d'API à chaque requête ne donne pas de nouveau seau
+    statuts = [client.post(f'/api/vehicules/{i}/rent', headers={'X-Api-Key': f'cle-{i}'}).status_code
+               for i in (1, 2, 3)]
+    assert statuts == [200, 200, 429]
+
+    refus = client.post('/api/vehicules/4/rent', headers={'X-Api-Key': 'autre'})
+    assert int(refus.headers['Retry-After']) >= 1
+    assert client.post('/api/vehicules/4/rent', environ_base={'REMOTE_ADDR': '10.0.0.2'}).status_code == 200
+
+
+def test_delestage_des_ecritures_sans_bloquer_les_lectures(app):
+    admission = app.extensions['container'].resolve('admission')
+    client = app.test_client()
+    for _ in range(admission.max_en_cours):
+        admission.entrer()
+    admission.attente_max = 0
+
+    refus = client.post('/api/vehicules/1/rent')
+    assert refus.status_code == 503
+    assert refus.headers['Retry-After'] == '1'
+    assert client.get('/api/vehicules/1').status_code == 200
+
+    admission.sortir()
+    assert client.post('/api/vehicules/1/rent').status_code == 200
+    assert admission.en_cours == admission.max_en_cours - 1
@@ -0,0 +1,87 @@
+import pytest
+
+from ..lib.application.controllers import create_app
+from ..lib.application.use_cases.sessionVehicules import SessionVehicules
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+
+@pytest.fixture
+def app():
+    InMemoryVehiculeRepository()._initialize()
+    app = create_app({'TESTING': True, 'BATCH_MAX_OPERATIONS': 10}, blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    for i in (1, 2):
+        repository.create_vehicule("Renault", "Clio", 2020, f"LOT-{i}", 1000, 40.0, "Nickel", "Citadine")
+    return app
+
+
+def test_operations_d_un_ecran_en_une_requete(app):
+    client = app.test_client()
+    reponse = client.post('/api/vehicules/batch', json={'operations': [
+        {'op': 'set_availability', 'id': 1, 'disponible': True},
+        {'op': 'rental_cost', 'id': 1, 'duree': 3},
+        {'op': 'rent', 'id': 1},
+        {'op': 'get', 'id': 1},
+        {'op': 'count', 'disponible': True},
+        {'op': 'rent', 'id': 1},
+        {'op': 'get', 'id': 99},
+        {'op': 'envoler'},
+    ]})
+
+    assert reponse.status_code == 200
+    data = reponse.get_json()
+    assert data['committed'] is True and data['atomic'] is False
+    assert [r['status'] for r in data['results']] == [200, 200, 200, 200, 200, 404, 404, 400]
+    assert data['results'][1]['body'] == {'rental_cost': 120.0}
+    assert data['results'][3]['body']['disponible'] is False
+    assert data['results'][4]['body'] == {'count': 1}
+
+
+def test_lot_atomique_annule_en_bloc(app):
+    client = app.test_client()
+    reponse = client.post('/api/vehicules/batch', json={'atomic': True, 'operations': [
+        {'op': 'rent', 'id': 1},
+        {'op': 'rent', 'id': 2},
+        {'op': 'return', 'id': 2, 'km_parcourus': 50},
+        {'op': 'create', 'marque': "Peugeot", 'modele': "208", 'annee': 2022, 'immatriculation': "LOT-3",
+         'kilometrage': 0, 'prix_journalier': 45.0, 'etat': "Nickel", 'type_vehicule': "Citadine"},
+        {'op': 'delete', 'id': 2},
+        {'op': 'rent', 'id': 1},
+        {'op': 'get', 'id': 1},
+    ]})
+
+    assert reponse.status_code == 409
+    data = reponse.get_json()
+    assert data['committed'] is False
+    assert [r['status'] for r in data['results']] == [200, 200, 200, 201, 200, 404, 424]
+
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    assert repository.get_by_id(1).disponible is True
+    assert repository.get_by_id(2).kilometrage == 1000 and repository.get_by_id(2).disponible
+    assert repository.get_by_immatriculation("LOT-3") is None
+    assert repository.count_all() == 2
+
+
+def test_annulation_sans_ecraser_les_modifications_concurrentes(app):
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    session = SessionVehicules(repository)
+    session.louer_vehicule(1)
+    session.louer_vehicule(2)
+
+    # Écritures hors de la session, par les routes unitaires, avant l'annulation
+    clio = repository.get_by_id(1)
+    clio.prix_journalier = 55.0
+    repository.save(clio)
+    repository.retourner_vehicule(2, 100)
+
+    assert session.annuler() == [(2, 'disponible')]
+    assert (repository.get_by_id(1).disponible, repository.get_by_id(1).prix_journalier) == (True, 55.0)
+    assert (repository.get_by_id(2).disponible, repository.get_by_id(2).kilometrage) == (True, 1100)
+    assert session.mutations == 0
+
+
+def test_lot_invalide_ou_trop_grand(app):
+    client = app.test_client()
+    assert client.post('/api/vehicules/batch', json={'op': 'get'}).status_code == 400
+    trop = client.post('/api/vehicules/batch', json={'operations': [{'op': 'get', 'id': 1}] * 11})
+    assert trop.status_code == 413
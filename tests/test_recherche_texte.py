@@ -0,0 +1,71 @@
+import pytest
+
+from ..lib.application.controllers import create_app
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.VehiculeSearchIndex import VehiculeSearchIndex
+
+FLOTTE = [
+    ("Peugeot", "208", "Citadine", "AB-123-CD", 45.0),
+    ("Peugeot", "2008", "SUV", "AB-456-CD", 60.0),
+    ("Peugeot", "3008", "SUV", "EF-789-GH", 75.0),
+    ("Renault", "Clio", "Citadine", "IJ-012-KL", 40.0),
+    ("Tesla", "Model 3", "Berline", "MN-345-OP", 90.0),
+]
+
+
+@pytest.fixture
+def app():
+    InMemoryVehiculeRepository()._initialize()
+    app = create_app({'TESTING': True}, blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    for marque, modele, type_vehicule, plaque, prix in FLOTTE:
+        repository.create_vehicule(marque, modele, 2021, Immatriculation(plaque, "75"), 1000, prix, "Nickel",
+                                   type_vehicule)
+    return app
+
+
+def _modeles(resultats):
+    return [(v.marque, v.modele) for _, v in resultats]
+
+
+def test_recherche_approchee_et_classement():
+    index = VehiculeSearchIndex()
+    for i, (marque, modele, type_vehicule, plaque, prix) in enumerate(FLOTTE, 1):
+        index.add(Vehicule(marque, modele, 2021, Immatriculation(plaque, "75"), 0, prix, "Nickel",
+                           type_vehicule, True, i))
+
+    assert _modeles(index.search("peugeot 20")) == [("Peugeot", "208"), ("Peugeot", "2008")]
+    assert _modeles(index.search("Renaut")) == [("Renault", "Clio")]
+    assert _modeles(index.search("suv", prix_max=70.0)) == [("Peugeot", "2008")]
+    assert str(index.search("ab-456")[0][1].immatriculation) == "AB-456-CD 75"
+    assert index.search("zzz") == []
+    assert index.search("peugeot", limit=0) == []
+    assert index.search("peugeot", offset=-5) == index.search("peugeot")
+
+    # Maintenance incrémentale : réindexation sous le même ID, puis suppression
+    index.add(Vehicule("Renault", "Megane", 2021, Immatriculation("IJ-012-KL", "75"), 0, 40.0, "Nickel",
+                       "Berline", True, 4))
+    assert _modeles(index.search("clio")) == []
+    assert _modeles(index.search("megane")) == [("Renault", "Megane")]
+    index.remove(4)
+    assert index.search("renault") == [] and len(index) == 4
+
+
+def test_endpoint_combine_filtres_et_suit_les_mutations(app):
+    client = app.test_client()
+    client.patch('/api/vehicules/1/availability', json={'disponible': False})
+
+    reponse = client.get('/api/vehicules/search/text?q=peugeot&disponible=true&prix_max=70')
+    assert reponse.status_code == 200
+    assert [r['vehicule']['modele'] for r in reponse.get_json()] == ["2008"]
+    assert reponse.get_json()[0]['score'] > 0
+
+    client.delete('/api/vehicules/2')
+    client.post('/api/vehicules', json={"marque": "Peugeot", "modele": "208", "annee": 2024,
+                                        "immatriculation": "QR-678-ST", "kilometrage": 0, "prix_journalier": 50.0,
+                                        "etat": "Nickel", "type_vehicule": "Citadine"})
+    modeles = [r['vehicule']['modele'] for r in client.get('/api/vehicules/search/text?q=peugot 208').get_json()]
+    assert modeles == ["208", "208"]
+    assert client.get('/api/vehicules/search/text').status_code == 400
@@ -0,0 +1,117 @@
+import pytest
+from datetime import date, timedelta
+
+from ..lib.domain.client import Client
+from ..lib.domain.dictionnaire import MARQUES
+from ..lib.domain.vehicule import Vehicule
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+
+@pytest.fixture
+def vehiculeRepository():
+    repo = InMemoryVehiculeRepository()
+    repo._initialize()
+    repo.create_vehicule("Renault", "Clio", 2020, Immatriculation("AA-123-AA", "75"), 1000, 40.0, "Nickel", "Citadine")
+    repo.create_vehicule("Peugeot", "208", 2021, Immatriculation("BB-456-BB", "78"), 2000, 45.0, "Nickel", "Citadine")
+    repo.create_vehicule("Peugeot", "5008", 2022, Immatriculation("CC-789-CC", "92"), 3000, 90.0, "Sale", "SUV")
+    return repo
+
+@pytest.fixture
+def clientRepository():
+    repo = InMemoryClientRepository()
+    repo._initialize()
+    return repo
+
+@pytest.fixture
+def contratRepository():
+    repo = InMemoryContratRepository()
+    repo._initialize()
+    return repo
+
+def test_iter_by_criteria_is_lazy(vehiculeRepository):
+    resultats = vehiculeRepository.iter_by_criteria(marque="peugeot")
+    assert not isinstance(resultats, list)
+    assert next(resultats).modele == "208"
+
+def test_iter_matches_list_queries(vehiculeRepository):
+    assert list(vehiculeRepository.iter_all()) == vehiculeRepository.get_all()
+    assert list(vehiculeRepository.iter_available()) == vehiculeRepository.get_available()
+    assert list(vehiculeRepository.iter_by_criteria(prix_max=50.0)) == vehiculeRepository.find_by_criteria(prix_max=50.0)
+
+def test_attributs_encodes_par_dictionnaire(vehiculeRepository):
+    saisie = "".join(["Peu", "geot"])  # copie distincte, comme une ligne importée
+    vehicule = vehiculeRepository.create_vehicule(saisie, "208", 2023, Immatriculation("DD-000-DD", "75"),
+                                                  0, 45.0, "Nickel", "Citadine")
+    assert vehicule.marque is vehiculeRepository.get_by_id(2).marque
+    assert MARQUES.chaine(MARQUES.code("Peugeot")) is vehicule.marque
+    assert MARQUES.minuscule(vehicule.marque) == "peugeot"
+
+    vehiculeRepository.create_vehicule("PEUGEOT", "208", 2023, Immatriculation("EE-000-EE", "75"),
+                                       0, 45.0, "Nickel", "Citadine")
+    assert vehiculeRepository.count_by_criteria(marque="peugeot", modele="208") == 3
+    assert vehiculeRepository.count_by_criteria(marque="Inconnue") == 0
+    assert vehiculeRepository.count_by_criteria(type_vehicule="Inconnu") == 0
+
+def test_vehicule_counts(vehiculeRepository):
+    vehiculeRepository.set_availability(Immatriculation("AA-123-AA", "75"), False)
+    assert vehiculeRepository.count_all() == 3
+    assert vehiculeRepository.count_available() == 2
+    assert vehiculeRepository.count_by_criteria(marque="Peugeot", type_vehicule="SUV") == 1
+
+def test_client_active_rentals(clientRepository, vehiculeRepository):
+    client = clientRepository.create_client("Doe", "John", "123ABC", "0123456789", "john.doe@email")
+    clientRepository.create_client("Roe", "Jane", "456DEF", "0987654321", "jane.roe@email")
+    client.louer_voiture(vehiculeRepository.get_all()[0])
+    clientRepository.save(client)
+
+    assert clientRepository.count_all() == 2
+    assert clientRepository.count_with_active_rentals() == 1
+    assert list(clientRepository.iter_with_active_rentals()) == [client]
+
+def test_active_rentals_index_and_history(clientRepository, vehiculeRepository):
+    client = clientRepository.create_client("Doe", "John", "123ABC", "0123456789", "john.doe@email")
+    clio, peugeot, _ = vehiculeRepository.get_all()
+    client.louer_voiture(clio)
+    clientRepository.save(client)
+    client.retourner_voiture(clio, 120)
+    client.louer_voiture(peugeot)
+    clientRepository.save(client)
+
+    assert client.a_en_location(peugeot)
+    assert not client.a_en_location(clio)
+    assert clio.kilometrage == 1120 and clio.disponible
+    assert list(clientRepository.iter_historique(client.id)) == [clio, peugeot]
+
+    client.retourner_voiture(peugeot, 10)
+    clientRepository.save(client)
+    assert clientRepository.count_with_active_rentals() == 0
+    assert list(clientRepository.iter_historique(client.id)) == [clio, peugeot]
+
+def test_active_contracts(contratRepository, clientRepository, vehiculeRepository):
+    client = clientRepository.create_client("Doe", "John", "123ABC", "0123456789", "john.doe@email")
+    vehicule = vehiculeRepository.get_all()[0]
+    debut = date.today()
+    contratRepository.create_contrat(client, vehicule, debut, 7)
+
+    assert contratRepository.count_all() == 1
+    assert contratRepository.count_active_contracts(debut + timedelta(days=3)) == 1
+    assert contratRepository.count_active_contracts(debut + timedelta(days=30)) == 0
+    assert list(contratRepository.iter_active_contracts(debut)) == contratRepository.find_active_contracts(debut)
+
+def test_parcours_insensibles_aux_ecritures_concurrentes(vehiculeRepository, clientRepository):
+    parcours = [vehiculeRepository.iter_all(), vehiculeRepository.iter_available(),
+                vehiculeRepository.iter_by_criteria(marque="peugeot")]
+    premiers = [next(iterateur) for iterateur in parcours]
+    vehiculeRepository.create_vehicule("Peugeot", "308", 2023, Immatriculation("DD-000-DD", "75"), 0, 50.0,
+                                       "Nickel", "Berline")
+    assert [1 + len(list(iterateur)) for iterateur in parcours] == [3, 3, 2]
+    assert premiers[0].modele == "Clio"
+
+    client = Client("Doe", "John", "123ABC", "0123456789", "john.doe@email", None)
+    clientRepository.save(client)
+    clients = clientRepository.iter_all()
+    next(clients)
+    clientRepository.save(Client("Roe", "Jane", "456DEF", "0123456789", "jane.roe@email", None))
+    assert list(clients) == []
@@ -1,9 +1,11 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from ..lib.application.use_cases.restitutionVehicule import RestitutionVehicule
 from ..lib.domain.client import Client
 from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
 
 class TestRestitutionVoiture(unittest.TestCase):
 
@@ -41,8 +43,8 @@ class TestRestitutionVoiture(unittest.TestCase):
             typeVehicule="Citadine"
         )
 
-        # On simule l'ajout du véhicule dans l'historique de location du client
-        self.client.historique_locations.append(self.vehicule)
+        # On simule la location en cours du véhicule par le client
+        self.client.locations_actives.add(self.vehicule)
 
         # On prépare le mock : quand on appelle get_by_id, il renvoie notre client/vehicule
         self.mock_client_repo.get_by_id.return_value = self.client
@@ -69,7 +71,7 @@ class TestRestitutionVoiture(unittest.TestCase):
         self.assertEqual(result.etat, "Nickel")
         self.assertEqual(result.kilometrage, 25000 + nouveau_km)
         self.assertTrue(result.disponible)
-        self.assertNotIn(self.vehicule, self.client.historique_locations)
+        self.assertFalse(self.client.a_en_location(self.vehicule))
 
         # Vérifie qu'on a bien sauvegardé les modifications
         self.mock_vehicule_repo.save.assert_called_once_with(self.vehicule)
@@ -94,7 +96,7 @@ class TestRestitutionVoiture(unittest.TestCase):
         self.assertEqual(result.etat, "Sale")
         self.assertEqual(result.kilometrage, 25000 + nouveau_km)
         self.assertTrue(result.disponible)
-        self.assertNotIn(self.vehicule, self.client.historique_locations)
+        self.assertFalse(self.client.a_en_location(self.vehicule))
 
     def test_restituer_vehicule_endommage(self):
         """
@@ -115,7 +117,7 @@ class TestRestitutionVoiture(unittest.TestCase):
         self.assertEqual(result.etat, "Endommagé")
         self.assertEqual(result.kilometrage, 25000 + nouveau_km)
         self.assertTrue(result.disponible)
-        self.assertNotIn(self.vehicule, self.client.historique_locations)
+        self.assertFalse(self.client.a_en_location(self.vehicule))
 
     def test_restituer_vehicule_vole(self):
         """
@@ -143,7 +145,7 @@ class TestRestitutionVoiture(unittest.TestCase):
         # Si la logique code "volé" met disponible = False :
         # self.assertFalse(result.disponible) 
         # OU si vous laissez la disponibilité telle quelle, ajustez le test.
-        self.assertNotIn(self.vehicule, self.client.historique_locations)
+        self.assertFalse(self.client.a_en_location(self.vehicule))
 
     def test_restituer_vehicule_client_inexistant(self):
         """
@@ -177,11 +179,11 @@ class TestRestitutionVoiture(unittest.TestCase):
 
     def test_restituer_vehicule_non_loue_par_ce_client(self):
         """
-        Cas où le véhicule n'est pas dans l'historique_locations du client.
+        Cas où le véhicule n'est pas dans les locations en cours du client.
         => On s'attend à obtenir None
         """
-        # On vide l'historique de locations pour simuler
-        self.client.historique_locations.clear()
+        # On vide les locations en cours pour simuler
+        self.client.locations_actives.clear()
 
         result = self.use_case.restituer_vehicule(
             client_id=1,
@@ -205,5 +207,70 @@ class TestRestitutionVoiture(unittest.TestCase):
         self.assertIsNone(result)
 
 
+
+class TestRestitutionEnLot(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Repositories en mémoire : deux clients, trois véhicules loués.
+        """
+        self.client_repo = InMemoryClientRepository()
+        self.client_repo._initialize()
+        self.vehicule_repo = InMemoryVehiculeRepository()
+        self.vehicule_repo._initialize()
+        self.use_case = RestitutionVehicule(self.client_repo, self.vehicule_repo)
+
+        self.doe = self.client_repo.create_client("Doe", "John", "123ABC", "0123456789", "john.doe@email")
+        self.roe = self.client_repo.create_client("Roe", "Jane", "456DEF", "0987654321", "jane.roe@email")
+        self.ids = {}
+        for immatriculation, client in (("AA-111-AA", self.doe), ("BB-222-BB", self.doe), ("CC-333-CC", self.roe)):
+            vehicule = self.vehicule_repo.create_vehicule("Peugeot", "208", 2021, immatriculation,
+                                                          1000, 45.0, "Nickel", "Citadine")
+            vehicule.disponible = False
+            client.locations_actives.add(vehicule)
+            self.ids[immatriculation] = vehicule.id
+
+    def test_restitutions_groupees(self):
+        resultats = self.use_case.restituer_vehicules([
+            (self.doe.id, self.ids["AA-111-AA"], 100, "nickel"),
+            (self.roe.id, self.ids["CC-333-CC"], 50, "volé"),
+            (self.doe.id, self.ids["BB-222-BB"], 20, "Sale"),
+        ])
+
+        self.assertTrue(all(r.succes for r in resultats))
+        self.assertEqual(self.doe.locations_actives, set())
+        self.assertEqual(self.roe.locations_actives, set())
+        self.assertEqual(resultats[0].vehicule.kilometrage, 1100)
+        self.assertTrue(resultats[2].vehicule.disponible)
+        self.assertEqual(resultats[1].vehicule.etat, "Volé")
+        self.assertFalse(resultats[1].vehicule.disponible)
+
+    def test_erreurs_par_element(self):
+        resultats = self.use_case.restituer_vehicules([
+            (self.doe.id, self.ids["AA-111-AA"], 100, "nickel"),
+            (self.doe.id, self.ids["AA-111-AA"], 100, "nickel"),
+            (self.doe.id, self.ids["CC-333-CC"], 10, "nickel"),
+            (999, self.ids["BB-222-BB"], 10, "nickel"),
+            (self.doe.id, 999, 10, "nickel"),
+            (self.doe.id, self.ids["BB-222-BB"], 10, "bizarre"),
+        ])
+
+        self.assertEqual([r.succes for r in resultats], [True, False, False, False, False, False])
+        self.assertEqual(len(self.doe.locations_actives), 1)
+        self.assertEqual(len(self.roe.locations_actives), 1)
+
+    def test_un_seul_enregistrement_par_repository(self):
+        with patch.object(self.vehicule_repo, 'save_all') as save_vehicules, \
+             patch.object(self.client_repo, 'save_all') as save_clients:
+            self.use_case.restituer_vehicules([
+                (self.doe.id, self.ids["AA-111-AA"], 100, "nickel"),
+                (self.doe.id, self.ids["BB-222-BB"], 20, "sale"),
+            ])
+
+        save_vehicules.assert_called_once()
+        self.assertEqual(len(list(save_vehicules.call_args.args[0])), 2)
+        save_clients.assert_called_once_with([self.doe])
+
+
 if __name__ == '__main__':
     unittest.main()
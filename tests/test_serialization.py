@@ -0,0 +1,43 @@
+import json
+import pytest
+from datetime import date
+
+from ..lib.application.serialization import dumps, dumps_many
+from ..lib.domain.assurance import Assurance
+from ..lib.domain.client import Client
+from ..lib.domain.contratLocation import ContratLocation
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.vehicule import Vehicule
+
+@pytest.fixture
+def vehicule():
+    return Vehicule("Citroën", 'C3 "Aircross"', 2021, Immatriculation("AB-123-CD", "75"),
+                    25000, 45.5, "Nickel", "Citadine")
+
+@pytest.fixture
+def contrat(vehicule):
+    client = Client("Doe", "John", "123ABC", "0123456789", "john.doe@email", None)
+    return ContratLocation(date(2025, 6, 1), 7, 500.0, 318.5, 100.0, client, vehicule, Assurance("Tous risques"))
+
+def test_vehicule_matches_to_dict(vehicule):
+    assert json.loads(dumps(vehicule)) == vehicule.to_dict()
+
+def test_vehicule_with_plain_string_immatriculation(vehicule):
+    vehicule.immatriculation = "ABC123"
+    assert json.loads(dumps(vehicule))["immatriculation"] == "ABC123"
+
+def test_dumps_many(vehicule):
+    assert json.loads(dumps_many([vehicule, vehicule])) == [vehicule.to_dict()] * 2
+    assert dumps_many([]) == b"[]"
+
+def test_contrat(contrat):
+    data = json.loads(dumps(contrat))
+    assert data["dateDebut"] == "2025-06-01"
+    assert data["dateFin"] == "2025-06-08"
+    assert data["assurance"] == "Tous risques"
+    assert data["client"]["nom"] == "Doe"
+    assert data["vehicule"] == contrat.vehicule.to_dict()
+
+def test_contrat_sans_assurance(contrat):
+    contrat.assurance = None
+    assert json.loads(dumps(contrat))["assurance"] is None
@@ -0,0 +1,140 @@
+import contextlib
+import io
+import multiprocessing
+
+import pytest
+
+from datetime import date, timedelta
+
+from ..lib.application.container import create_container
+from ..lib.application.controllers import create_app
+from ..lib.application.exceptions import VehiculeNonDisponibleException
+from ..lib.application.use_cases.signerContratDeLocation import SignerContratDeLocation
+from ..lib.domain.exceptions import VehiculeNotAvailableException
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.SharedAvailability import SharedAvailability
+from ..lib.infrastructure.SharedAvailabilityVehiculeRepository import SharedAvailabilityVehiculeRepository
+
+fork = pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="fork indisponible")
+
+
+@pytest.fixture
+def disponibilites():
+    segment = SharedAvailability(capacity=64)
+    yield segment
+    segment.close()
+    segment.unlink()
+
+
+@pytest.fixture
+def repository(disponibilites):
+    catalogue = InMemoryVehiculeRepository()
+    catalogue._initialize()
+    for i in range(20):
+        catalogue.create_vehicule("Renault", "Clio", 2020, f"SH-{i:03d}", 1000, 40.0, "Nickel", "Citadine")
+    return SharedAvailabilityVehiculeRepository(catalogue, disponibilites)
+
+
+def _louer_tout(repository, resultats):
+    reussies = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for vehicule_id in range(1, 21):
+            try:
+                reussies += repository.louer_vehicule(vehicule_id)
+            except VehiculeNotAvailableException:
+                pass
+    resultats.put(reussies)
+
+
+def _signer_tout(container, client_id, demarrage, resultats):
+    # Vérification de disponibilité toujours passée, comme lue juste avant la location d'un autre worker
+    container.resolve('vehicule_repository').is_available_between = lambda *args: True
+    signes = 0
+    demarrage.wait()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for vehicule_id in range(1, 21):
+            try:
+                SignerContratDeLocation.main(client_id, vehicule_id, date.today() + timedelta(days=1), 3,
+                                             container=container)
+                signes += 1
+            except VehiculeNonDisponibleException:
+                pass
+    resultats.put(signes)
+
+
+def test_version_incrementee_a_chaque_ecriture(disponibilites):
+    slot = disponibilites.register("AA-111-AA")
+    disponible, version = disponibilites.read(slot)
+
+    assert disponible
+    assert disponibilites.transition(slot, depuis=True, vers=False)
+    assert not disponibilites.transition(slot, depuis=True, vers=False)
+    assert disponibilites.read(slot) == (False, version + 2)
+    assert disponibilites.register("AA-111-AA") == slot
+
+
+def test_filtre_de_disponibilite_lu_dans_l_etat_partage(repository, disponibilites):
+    vehicule = repository.get_by_id(3)
+    disponibilites.set(disponibilites.slot(vehicule.immatriculation), False)
+
+    assert repository.count_by_criteria(marque="renault", disponible=True) == 19
+    assert not repository.get_by_id(3).disponible
+
+
+@fork
+def test_une_seule_location_par_vehicule_entre_processus(repository):
+    contexte = multiprocessing.get_context('fork')
+    resultats = contexte.Queue()
+    workers = [contexte.Process(target=_louer_tout, args=(repository, resultats)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    total = sum(resultats.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join()
+
+    assert total == 20
+    assert repository.count_available() == 0
+
+
+def test_conteneur_branche_l_etat_partage(disponibilites):
+    InMemoryVehiculeRepository()._initialize()
+    container = create_container({'SHARED_AVAILABILITY': disponibilites})
+    assert isinstance(container.resolve('vehicule_repository'), SharedAvailabilityVehiculeRepository)
+
+
+def test_recherche_texte_filtree_sur_l_etat_partage(disponibilites):
+    InMemoryVehiculeRepository()._initialize()
+    app = create_app({'TESTING': True, 'SHARED_AVAILABILITY': disponibilites}, blueprints=['vehicules'])
+    repository = app.extensions['container'].resolve('vehicule_repository')
+    for i in range(3):
+        repository.create_vehicule("Renault", "Clio", 2020, f"TX-{i:03d}", 1000, 40.0, "Nickel", "Citadine")
+    # Loué par un autre processus : l'objet indexé ici se croit toujours disponible
+    disponibilites.set(disponibilites.slot("TX-001"), False)
+
+    reponse = app.test_client().get('/api/vehicules/search/text?q=clio&disponible=true')
+    assert [r['vehicule']['immatriculation'] for r in reponse.get_json()] == ["TX-000", "TX-002"]
+
+
+@fork
+def test_une_seule_signature_par_vehicule_entre_processus(repository, disponibilites):
+    for depot in (InMemoryClientRepository(), InMemoryContratRepository()):
+        depot._initialize()
+    container = create_container({'SHARED_AVAILABILITY': disponibilites, 'UTILISATION_ROLLUPS': False})
+    client = container.resolve('client_repository').create_client("Doe", "John", "123ABC", "0123456789", "j@d.fr")
+    container.warm('vehicule_repository', 'contrat_repository', 'caution_repository')
+
+    contexte = multiprocessing.get_context('fork')
+    demarrage = contexte.Barrier(4)
+    resultats = contexte.Queue()
+    workers = [contexte.Process(target=_signer_tout, args=(container, client.id, demarrage, resultats))
+               for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    total = sum(resultats.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join()
+
+    assert total == 20
+    assert container.resolve('vehicule_repository').count_available() == 0
@@ -1,293 +1,149 @@
-# from pathlib import Path
-# import pytest
-# from datetime import date, timedelta
-# from unittest.mock import MagicMock, patch
-
-# # Importer le module signerContratDeLocation et les exceptions
-# from ..lib.application.ContratRepositoryPort import ContratRepositoryPort
-# from ..lib.application.exceptions import (
-#     AssuranceInexistanteException,
-#     ClientInexistantException,
-#     ContratLocationException,
-#     DateInvalideException,
-#     DevisIntrouvable,
-#     EnregistrementContratException,
-#     VehiculeInexistantException,
-#     VehiculeNonDisponibleException
-# )
-
-
-# @pytest.fixture(autouse=True)
-# def verify_no_calls_after_test(request, mock_repositories):
-#     """
-#     Fixture automatique qui vérifie qu'aucun appel supplémentaire n'est fait après le test.
-#     S'applique automatiquement à tous les tests qui utilisent mock_repositories.
-#     """
-#     # Avant le test
-#     yield
-#     # Après le test
-    
-#     # Réinitialiser d'abord les mocks
-#     for repo in mock_repositories.values():
-#         repo.reset_mock()
-    
-#     # Vérifier qu'aucun autre appel n'est fait
-#     for repo_name, repo in mock_repositories.items():
-#         assert len(repo.mock_calls) == 0, f"Des méthodes supplémentaires ont été appelées sur le repository {repo_name} après la fin du test"
-
-# # Fixtures pour les mocks
-# @pytest.fixture
-# def mock_repositories():
-#     """Configure les repositories mockés pour les tests"""
-#     # Créer les mocks
-#     client_repo = MagicMock()
-#     vehicule_repo = MagicMock()
-#     assurance_repo = MagicMock()
-#     contrat_repo = MagicMock()
-    
-#     # Valeurs de retour par défaut
-#     client_repo.get_by_id.return_value = MagicMock(getNom=lambda: "Dupont", getPrenom=lambda: "Jean")
-#     vehicule_repo.get_by_id.return_value = MagicMock(getMarque=lambda: "Renault", getModele=lambda: "Clio")
-#     vehicule_repo.is_available_between.return_value = True
-#     vehicule_repo.calculate_rental_cost.return_value = 350.0  # 50€/jour pour 7 jours
-#     assurance_repo.get_by_id.return_value = MagicMock(getTarif=lambda: 10.0)
-#     contrat_repo.save.return_value = 123  # ID du contrat
-    
-#     # Patch les constructeurs des repositories dans la méthode _initialiser_repositories
-#     with patch('lib.use_cases.locationVehicule.signerContratDeLocation.ClientRepository', return_value=client_repo), \
-#          patch('lib.use_cases.locationVehicule.signerContratDeLocation.VehiculeRepository', return_value=vehicule_repo), \
-#          patch('lib.use_cases.locationVehicule.signerContratDeLocation.AssuranceRepository', return_value=assurance_repo), \
-#          patch('lib.use_cases.locationVehicule.signerContratDeLocation.ContratRepository', return_value=contrat_repo):
-        
-#         yield {
-#             'client': client_repo,
-#             'vehicule': vehicule_repo,
-#             'assurance': assurance_repo,
-#             'contrat': contrat_repo
-#         }
-
-# @pytest.fixture
-# def future_date():
-#     """Renvoie une date dans le futur pour les tests"""
-#     return date.today() + timedelta(days=1)
-
-
-# # Tests pour la fonction SignerContratDeLocation.main
-# def test_signer_contrat_success(mock_repositories, future_date):
-#     """Test du cas de succès pour la signature de contrat"""
-#     # Supprimer les prints pendant le test pour rendre la sortie plus propre
-#     with patch('builtins.print'):
-#         # Test avec les paramètres valides
-#         contrat = SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=7,
-#             assurance_id=3
-#         )
-    
-#     # Vérifier que le contrat a été créé correctement
-#     assert contrat is not None
-#     assert hasattr(contrat, 'id')
-#     assert contrat.id == 123
-    
-#     # Vérifier que les repositories ont été appelés correctement
-#     mock_repositories['client'].get_by_id.assert_called_once_with(1)
-#     mock_repositories['vehicule'].get_by_id.assert_called_once_with(2)
-#     mock_repositories['assurance'].get_by_id.assert_called_once_with(3)
-#     mock_repositories['vehicule'].is_available_between.assert_called_once()
-#     mock_repositories['contrat'].save.assert_called_once()
-#     mock_repositories['vehicule'].set_availability.assert_called_once_with(2, False)
-
-
-# def test_client_inexistant(mock_repositories, future_date):
-#     """Test de l'absence de client"""
-#     # Modifier le mock pour que le client n'existe pas
-#     mock_repositories['client'].get_by_id.return_value = None
-    
-#     # Vérifier que l'exception est levée
-#     with pytest.raises(ClientInexistantException), patch('builtins.print'):
-#         SignerContratDeLocation.main(
-#             client_id=-999,  # ID de client inexistant
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=7,
-#             assurance_id=3
-#         )
-
-
-# def test_vehicule_inexistant(mock_repositories, future_date):
-#     """Test de l'absence de véhicule"""
-#     # Modifier le mock pour que le véhicule n'existe pas
-#     mock_repositories['vehicule'].get_by_id.return_value = None
-    
-#     # Vérifier que l'exception est levée
-#     with pytest.raises(VehiculeInexistantException), patch('builtins.print'):
-#         SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=-999,  # ID de véhicule inexistant
-#             date_debut=future_date,
-#             duree=7,
-#             assurance_id=3
-#         )
-
-
-# def test_assurance_inexistante(mock_repositories, future_date):
-#     """Test de l'absence d'assurance"""
-#     # Modifier le mock pour que l'assurance n'existe pas
-#     mock_repositories['assurance'].get_by_id.return_value = None
-    
-#     # Vérifier que l'exception est levée
-#     with pytest.raises(AssuranceInexistanteException), patch('builtins.print'):
-#         SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=7,
-#             assurance_id=-999  # ID d'assurance inexistant
-#         )
-
-
-# def test_vehicule_non_disponible(mock_repositories, future_date):
-#     """Test de la non-disponibilité du véhicule"""
-#     # Modifier le mock pour que le véhicule ne soit pas disponible
-#     mock_repositories['vehicule'].is_available_between.return_value = False
-    
-#     # Vérifier que l'exception est levée
-#     with pytest.raises(VehiculeNonDisponibleException), patch('builtins.print'):
-#         SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=7,
-#             assurance_id=3
-#         )
-
-
-# def test_date_debut_passee(mock_repositories):
-#     """Test avec une date de début dans le passé"""
-#     # Date dans le passé
-#     past_date = date.today() - timedelta(days=1)
-    
-#     # Vérifier que l'exception est levée
-#     with pytest.raises(DateInvalideException), patch('builtins.print'):
-#         SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=past_date,  # Date dans le passé
-#             duree=7,
-#             assurance_id=3
-#         )
-
-
-# def test_duree_negative(mock_repositories, future_date):
-#     """Test avec une durée négative"""
-#     # Vérifier que l'exception est levée
-#     with pytest.raises(DateInvalideException), patch('builtins.print'):
-#         SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=-7,  # Durée négative
-#             assurance_id=3
-#         )
-
-
-# def test_sans_assurance(mock_repositories, future_date):
-#     """Test sans assurance (paramètre optionnel)"""
-#     with patch('builtins.print'):
-#         contrat = SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=7,
-#             assurance_id=None  # Pas d'assurance
-#         )
-    
-#     # Vérifier que le contrat a été créé correctement
-#     assert contrat is not None
-#     assert hasattr(contrat, 'id')
-    
-#     # Vérifier que l'assurance n'a pas été recherchée
-#     mock_repositories['assurance'].get_by_id.assert_not_called()
-
-
-# def test_erreur_enregistrement_contrat(mock_repositories, future_date):
-#     """Test de l'échec de l'enregistrement du contrat"""
-#     # Mock l'échec de l'enregistrement
-#     mock_repositories['contrat'].save.side_effect = Exception("Erreur de base de données")
-    
-#     # Vérifier que l'exception est levée
-#     with pytest.raises(EnregistrementContratException), patch('builtins.print'):
-#         SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=7,
-#             assurance_id=3
-#         )
-
-
-# def test_calcul_cout_avec_assurance(mock_repositories, future_date):
-#     """Test que le coût inclut bien l'assurance"""
-#     # Configurer les mocks pour les coûts
-#     vehicule_tarif = 50.0
-#     assurance_tarif = 10.0
-#     duree = 7
-#     vehicule_cout_total = vehicule_tarif * duree
-#     assurance_cout_total = assurance_tarif * duree
-    
-#     mock_repositories['vehicule'].calculate_rental_cost.return_value = vehicule_cout_total
-#     mock_repositories['assurance'].get_by_id.return_value = MagicMock(getTarif=lambda: assurance_tarif)
-    
-#     # Exécuter la fonction à tester
-#     with patch('builtins.print'):
-#         contrat = SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=duree,
-#             assurance_id=3
-#         )
-    
-#     # Vérifier que le coût total inclut l'assurance
-#     assert contrat.getCout() == vehicule_cout_total + assurance_cout_total
-
-
-# def test_calcul_cout_sans_assurance(mock_repositories, future_date):
-#     """Test que le coût est correctement calculé sans assurance"""
-#     # Configurer les mocks pour les coûts
-#     vehicule_tarif = 50.0
-#     duree = 7
-#     vehicule_cout_total = vehicule_tarif * duree
-    
-#     mock_repositories['vehicule'].calculate_rental_cost.return_value = vehicule_cout_total
-    
-#     # Exécuter la fonction à tester
-#     with patch('builtins.print'):
-#         contrat = SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=duree,
-#             assurance_id=None  # Pas d'assurance
-#         )
-    
-#     # Vérifier que le coût total n'inclut pas l'assurance
-#     assert contrat.getCout() == vehicule_cout_total
-
-
-# def test_exception_inattendue_convertie(mock_repositories, future_date):
-#     """Test qu'une exception inattendue est convertie en ContratLocationError"""
-#     # Faire en sorte que get_by_id lève une exception inattendue
-#     mock_repositories['client'].get_by_id.side_effect = ValueError("Erreur inattendue")
-    
-#     # Vérifier que l'exception est convertie en ContratLocationError
-#     with pytest.raises(ContratLocationException), patch('builtins.print'):
-#         SignerContratDeLocation.main(
-#             client_id=1,
-#             vehicule_id=2,
-#             date_debut=future_date,
-#             duree=7,
-#             assurance_id=3
-#         )
\ No newline at end of file
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from ..lib.application.container import create_container
+from ..lib.application.exceptions import (
+    AssuranceInexistanteException,
+    ClientInexistantException,
+    DateInvalideException,
+    EnregistrementContratException,
+    VehiculeInexistantException,
+    VehiculeNonDisponibleException
+)
+from ..lib.application.use_cases.signerContratDeLocation import SignerContratDeLocation
+from ..lib.infrastructure.DynamicPricingVehiculeRepository import DynamicPricingVehiculeRepository
+from ..lib.infrastructure.InMemoryAssuranceRepository import InMemoryAssuranceRepository
+from ..lib.infrastructure.InMemoryCautionRepository import InMemoryCautionRepository
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+# Occupation, anticipation et durée neutres hormis une remise de 20 % : 32 €/jour au lieu de 40
+POLITIQUE_REMISE = {'occupation': [(0, 0.8)], 'anticipation': [(0, 1.0)], 'duree': [(1, 1.0)]}
+
+
+@pytest.fixture
+def demain():
+    return date.today() + timedelta(days=1)
+
+
+def agence(config=None):
+    """Conteneur sur des repositories vides, avec un client et une Clio à 40 €/jour."""
+    for repository in (InMemoryVehiculeRepository(), InMemoryClientRepository(), InMemoryContratRepository(),
+                       InMemoryCautionRepository(), InMemoryAssuranceRepository()):
+        repository._initialize()
+    container = create_container({'UTILISATION_ROLLUPS': False, **(config or {})})
+    client = container.resolve('client_repository').create_client("Dupont", "Jean", "123ABC", "0123456789", "j@d.fr")
+    vehicule = container.resolve('vehicule_repository').create_vehicule(
+        "Renault", "Clio", 2021, "AB-123-CD", 1000, 40.0, "Nickel", "Citadine")
+    return container, client, vehicule
+
+
+def signer(container, client_id, vehicule_id, date_debut, duree=3, assurance_id=None):
+    with patch('builtins.print'):
+        return SignerContratDeLocation.main(client_id, vehicule_id, date_debut, duree, assurance_id,
+                                            container=container)
+
+
+def tiers(container):
+    (assurance,) = container.resolve('assurance_repository').find_by_name("Tiers")
+    return assurance
+
+
+def test_signer_contrat_sans_assurance(demain):
+    container, client, vehicule = agence()
+    contrat = signer(container, client.id, vehicule.id, demain)
+
+    assert contrat.id is not None
+    assert contrat.cout == 120.0
+    assert contrat.assurance is None
+    assert container.resolve('contrat_repository').get_by_id(contrat.id) is contrat
+    assert not container.resolve('vehicule_repository').get_by_id(vehicule.id).disponible
+    # L'assurance n'est pas résolue quand aucune n'est demandée
+    assert not container.is_built('assurance_repository')
+
+
+@pytest.mark.parametrize("tarification_dynamique, cout", [(False, 144.0), (True, 120.0)])
+def test_cout_avec_assurance(demain, tarification_dynamique, cout):
+    container, client, vehicule = agence({'DYNAMIC_PRICING': tarification_dynamique,
+                                          'DYNAMIC_PRICING_POLICY': POLITIQUE_REMISE})
+    repository = container.resolve('vehicule_repository')
+    assert isinstance(repository, DynamicPricingVehiculeRepository) is tarification_dynamique
+
+    # Tiers sur une Citadine, tranche 1-3 jours de la grille : 8 €/jour
+    contrat = signer(container, client.id, vehicule.id, demain, 3, tiers(container).id)
+    assert contrat.assurance.nom == "Tiers"
+    assert contrat.cout == cout
+
+
+def test_tarif_assurance_degressif_selon_la_duree(demain):
+    container, client, vehicule = agence()
+    # 8 jours : tranche 8-14 de la grille, 6 €/jour
+    contrat = signer(container, client.id, vehicule.id, demain, 8, tiers(container).id)
+    assert contrat.cout == 40.0 * 8 + 6.0 * 8
+
+
+def test_empreinte_de_caution_bloquee(demain):
+    container, client, vehicule = agence()
+    contrat = signer(container, client.id, vehicule.id, demain)
+
+    caution = container.resolve('utilisation_caution')
+    assert contrat.caution == 500.0
+    assert caution.solde_contrat(contrat.id).en_cours == 50000
+    assert caution.solde_client(client.id).bloque == 50000
+    assert caution.empreintes_en_cours() == 500.0
+
+
+def test_assurance_inexistante(demain):
+    container, client, vehicule = agence()
+    with pytest.raises(AssuranceInexistanteException):
+        signer(container, client.id, vehicule.id, demain, assurance_id=999)
+
+    # Rien n'est enregistré ni bloqué
+    assert container.resolve('vehicule_repository').get_by_id(vehicule.id).disponible
+    assert container.resolve('contrat_repository').count_all() == 0
+    assert container.resolve('utilisation_caution').empreintes_en_cours() == 0.0
+
+
+def test_client_ou_vehicule_inexistant(demain):
+    container, client, vehicule = agence()
+    with pytest.raises(ClientInexistantException):
+        signer(container, 999, vehicule.id, demain)
+    with pytest.raises(VehiculeInexistantException):
+        signer(container, client.id, 999, demain)
+
+
+def test_parametres_invalides(demain):
+    container, client, vehicule = agence()
+    with pytest.raises(DateInvalideException):
+        signer(container, client.id, vehicule.id, date.today() - timedelta(days=1))
+    with pytest.raises(DateInvalideException):
+        signer(container, client.id, vehicule.id, demain, duree=-7)
+
+
+def test_vehicule_deja_loue(demain):
+    container, client, vehicule = agence()
+    signer(container, client.id, vehicule.id, demain)
+    with pytest.raises(VehiculeNonDisponibleException):
+        signer(container, client.id, vehicule.id, demain)
+
+
+def test_erreur_enregistrement_contrat(demain):
+    container, client, vehicule = agence()
+    with patch.object(container.resolve('contrat_repository'), 'save', side_effect=Exception("Base indisponible")):
+        with pytest.raises(EnregistrementContratException):
+            signer(container, client.id, vehicule.id, demain)
+    assert container.resolve('vehicule_repository').get_by_id(vehicule.id).disponible
+
+
+def test_repositories_resolus_a_la_demande():
+    container, _, _ = agence()
+    repositories = SignerContratDeLocation._initialiser_repositories(container)
+
+    assert list(repositories) == ['client', 'vehicule', 'assurance', 'contrat', 'caution']
+    assert not container.is_built('assurance_repository')
+    assert repositories['assurance'] is container.resolve('assurance_repository')
+    with pytest.raises(KeyError):
+        repositories['devis']
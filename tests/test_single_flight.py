@@ -0,0 +1,122 @@
+import asyncio
+import threading
+
+import pytest
+
+from ..lib.application.controllers import create_app
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.SingleFlight import SingleFlight
+from ..lib.infrastructure.SingleFlightVehiculeRepository import SingleFlightVehiculeRepository
+
+
+class VehiculesLents(InMemoryVehiculeRepository):
+    """Lectures par identifiant bloquées jusqu'à ce que le test les libère."""
+    _instance = None
+    appels = 0
+    liberation = threading.Event()
+
+    def get_by_id(self, vehicule_id):
+        VehiculesLents.appels += 1
+        self.liberation.wait(5)
+        return super().get_by_id(vehicule_id)
+
+
+@pytest.fixture
+def backend():
+    backend = VehiculesLents()
+    backend._initialize()
+    backend.create_vehicule("Renault", "Clio", 2020, "SF-001", 1000, 40.0, "Nickel", "Citadine")
+    VehiculesLents.appels = 0
+    VehiculesLents.liberation.clear()
+    return backend
+
+
+def _en_parallele(n, cible, vol):
+    """Libère le backend une fois que les n appels ont rejoint la même lecture."""
+    resultats = []
+    fils = [threading.Thread(target=lambda: resultats.append(cible())) for _ in range(n)]
+    for f in fils:
+        f.start()
+    while vol.partages < n - 1:
+        pass
+    VehiculesLents.liberation.set()
+    for f in fils:
+        f.join()
+    return resultats
+
+
+def test_lectures_simultanees_partagees(backend):
+    repository = SingleFlightVehiculeRepository(backend)
+    resultats = _en_parallele(8, lambda: repository.get_by_id(1), repository.vol)
+
+    assert VehiculesLents.appels == 1
+    assert len(resultats) == 8 and all(v is resultats[0] for v in resultats)
+    assert repository.vol.executions + repository.vol.partages == 8
+
+
+def test_erreur_transmise_a_tous_les_appelants():
+    vol = SingleFlight()
+    depart, erreurs = threading.Event(), []
+
+    def echouer():
+        depart.wait(5)
+        raise KeyError('backend indisponible')
+
+    def appeler():
+        try:
+            vol.do('cle', echouer)
+        except KeyError as e:
+            erreurs.append(e)
+
+    fils = [threading.Thread(target=appeler) for _ in range(4)]
+    for f in fils:
+        f.start()
+    while vol.executions + vol.partages < 4:
+        pass
+    depart.set()
+    for f in fils:
+        f.join()
+    assert len(erreurs) == 4 and vol.executions == 1
+    assert vol.do('cle', lambda: 'ok') == 'ok'  # rien n'est retenu après l'appel
+
+
+def test_lecture_apres_mutation_non_partagee(backend):
+    repository = SingleFlightVehiculeRepository(backend)
+    lecteur = threading.Thread(target=lambda: repository.get_by_id(1))
+    lecteur.start()
+    while not VehiculesLents.appels:
+        pass
+    repository.set_availability(1, False)
+
+    second = threading.Thread(target=lambda: repository.get_by_id(1))
+    second.start()
+    while VehiculesLents.appels < 2:
+        pass
+    VehiculesLents.liberation.set()
+    lecteur.join()
+    second.join()
+    assert VehiculesLents.appels == 2
+
+
+def test_lectures_asynchrones_partagees(backend):
+    repository = SingleFlightVehiculeRepository(backend)
+    VehiculesLents.liberation.set()
+
+    async def herde():
+        return await asyncio.gather(*(repository.aget_by_id(1) for _ in range(50)))
+
+    vehicules = asyncio.run(herde())
+    assert VehiculesLents.appels == 1
+    assert {v.immatriculation for v in vehicules} == {"SF-001"}
+
+
+def test_requetes_get_simultanees_servies_par_une_lecture(backend):
+    app = create_app({'TESTING': True, 'VEHICULE_CACHE_MAXSIZE': 0,
+                      'REPOSITORIES': {'vehicule_repository': f'{__name__}:VehiculesLents'}},
+                     blueprints=['vehicules'])
+    vol = app.extensions['container'].resolve('single_flight')
+    reponses = _en_parallele(6, lambda: app.test_client().get('/api/vehicules/1'), vol)
+
+    assert VehiculesLents.appels == 1
+    assert {r.status_code for r in reponses} == {200}
+    assert len({r.data for r in reponses}) == 1
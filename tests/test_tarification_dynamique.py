@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+
+import pytest
+
+from ..lib.application.container import create_container
+from ..lib.application.controllers import create_app
+from ..lib.application.use_cases.signerContratDeLocation import SignerContratDeLocation
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.tarification import POLITIQUE_PAR_DEFAUT, PolitiqueTarifaire
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.DynamicPricingVehiculeRepository import DynamicPricingVehiculeRepository
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.SharedAvailability import SharedAvailability
+
+AUJOURD_HUI = date(2026, 6, 1)
+POLITIQUE = PolitiqueTarifaire.compiler(
+    occupation=[(0, 0.9), (50, 1.0), (75, 1.2)],
+    anticipation=[(0, 1.1), (7, 1.0), (30, 0.9)],
+    duree=[(1, 1.0), (7, 0.9)],
+    plancher=0.8, plafond=1.25,
+)
+
+
+@pytest.fixture
+def vehicules():
+    repository = InMemoryVehiculeRepository()
+    repository._initialize()
+    for i in range(4):
+        repository.save(Vehicule("Renault", "Clio", 2022, Immatriculation(f"AB-{i:03d}-CD", "75"), 0, 50.0,
+                                 "Nickel", "Citadine"))
+    repository.save(Vehicule("Peugeot", "3008", 2022, Immatriculation("EF-000-GH", "75"), 0, 80.0, "Nickel",
+                             "SUV", disponible=False))
+    return repository
+
+
+def test_politique_precalculee_et_bornee():
+    assert POLITIQUE.coefficient(0.0, 10, 3) == 0.9
+    assert POLITIQUE.coefficient(0.74, 10, 3) == 1.0
+    assert POLITIQUE.coefficient(1.0, 10, 3) == 1.2
+    # 1.2 * 1.1 plafonné ; 0.9 * 0.9 * 0.9 relevé au plancher
+    assert POLITIQUE.coefficient(0.8, 0, 1) == 1.25
+    assert POLITIQUE.coefficient(0.1, 400, 60) == 0.8
+    assert POLITIQUE.prix_journalier(50.0, 0.6, 10, 3) == 50.0
+    assert POLITIQUE_PAR_DEFAUT.coefficient(0.6, 5, 2) == 1.0
+    with pytest.raises(ValueError):
+        PolitiqueTarifaire.compiler([(0, 1.0), (120, 1.5)], [(0, 1.0)], [(1, 1.0)])
+
+
+def test_compteurs_suivent_locations_et_retours(vehicules):
+    tarifs = DynamicPricingVehiculeRepository(vehicules, POLITIQUE, horloge=lambda: AUJOURD_HUI)
+    debut = AUJOURD_HUI + timedelta(days=10)
+    assert tarifs.occupation.instantane() == {"Citadine": (0, 4), "SUV": (1, 1)}
+    assert tarifs.calculate_rental_cost(1, 3, debut) == 135.0
+    assert tarifs.calculate_rental_cost(5, 3, debut) == 288.0
+
+    tarifs.louer_vehicule(1)
+    tarifs.set_availability(2, False)
+    assert tarifs.occupation.taux("Citadine") == 0.5
+    assert tarifs.calculate_rental_cost(3, 3, debut) == 150.0
+    tarifs.louer_vehicule(3)
+    assert tarifs.calculate_rental_cost(4, 3, debut) == 180.0
+    # Dernière minute (plafonnée) puis longue durée réservée à l'avance
+    assert tarifs.calculate_rental_cost(4, 3, AUJOURD_HUI) == 187.5
+    assert tarifs.calculate_rental_cost(4, 7, AUJOURD_HUI + timedelta(days=45)) == 340.2
+
+    tarifs.retourner_vehicule(1, 100)
+    tarifs.delete(3)
+    assert tarifs.occupation.instantane()["Citadine"] == (1, 3)
+    vehicule = tarifs.get_by_id(4)
+    vehicule.typeVehicule = "SUV"
+    tarifs.save(vehicule)
+    assert tarifs.occupation.instantane() == {"Citadine": (1, 2), "SUV": (1, 2)}
+    # Sans date de début : départ immédiat
+    assert tarifs.calculate_rental_cost(2, 1) == pytest.approx(50.0 * 1.0 * 1.1)
+
+
+def test_cout_du_contrat_et_route_avec_la_tarification_dynamique(vehicules):
+    InMemoryClientRepository()._initialize()
+    InMemoryContratRepository()._initialize()
+    container = create_container({'DYNAMIC_PRICING': True, 'DYNAMIC_PRICING_POLICY': {
+        'occupation': [(0, 0.8)], 'anticipation': [(0, 1.0)], 'duree': [(1, 1.0)]}})
+    repository = container.resolve('vehicule_repository')
+    assert isinstance(repository, DynamicPricingVehiculeRepository)
+    client = container.resolve('client_repository').create_client("Doe", "John", "123ABC", "0123456789", "j@d.fr")
+
+    contrat = SignerContratDeLocation.main(client.id, 1, date.today() + timedelta(days=1), 3, container=container)
+    assert contrat.cout == 120.0
+    assert repository.occupation.taux("Citadine") == 0.25
+
+    client_http = create_app({'TESTING': True}, container=container, blueprints=['vehicules']).test_client()
+    debut = (date.today() + timedelta(days=5)).isoformat()
+    assert client_http.get(f'/api/vehicules/2/rental_cost?duree=2&date_debut={debut}').get_json() == {
+        'rental_cost': 80.0}
+    assert client_http.get('/api/vehicules/2/rental_cost?duree=2&date_debut=demain').status_code == 400
+
+
+def test_refusee_avec_les_disponibilites_partagees(vehicules):
+    disponibilites = SharedAvailability(16)
+    try:
+        container = create_container({'DYNAMIC_PRICING': True, 'SHARED_AVAILABILITY': disponibilites})
+        with pytest.raises(ValueError):
+            container.resolve('vehicule_repository')
+        with pytest.raises(ValueError):
+            create_app({'TESTING': True, 'WARM_CONTAINER': True, 'DYNAMIC_PRICING': True,
+                        'SHARED_AVAILABILITY': disponibilites})
+        assert create_container({'SHARED_AVAILABILITY': disponibilites}).resolve('politique_tarifaire') is None
+    finally:
+        disponibilites.close()
+        disponibilites.unlink()
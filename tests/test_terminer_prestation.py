@@ -1,5 +1,6 @@
 import pytest
 
+from ..lib.application.use_cases.RealiserPrestationUseCase import RealiserPrestationUseCase
 from ..lib.application.use_cases.TerminerPrestationUseCase import TerminerPrestationUseCase, DevisIntrouvable
 from ..lib.domain.vehicule import Vehicule
 from ..lib.domain.devis import Devis
@@ -10,7 +11,8 @@ def prestationUseCase():
 
 @pytest.fixture
 def vehicule():
-    return Vehicule("marque", "modele", 1980, "aa-123-aa", 1000, 50.0, "etat", "voiture")
+    # Immatriculation propre à ce module : l'atelier du conteneur est partagé avec test_realiser_prestation
+    return Vehicule("marque", "modele", 1980, "tp-123-aa", 1000, 50.0, "etat", "voiture")
 
 @pytest.fixture
 def devis(vehicule):
@@ -22,4 +24,11 @@ def test_terminer_prestation_use_case_invalid_devis(prestationUseCase):
         prestationUseCase.terminerPrestation(devis)
 
 def test_realiser_prestation_valid(prestationUseCase, devis):
+    RealiserPrestationUseCase(prestationUseCase.atelier).realiserPrestation(devis)
     prestation = prestationUseCase.terminerPrestation(devis)
+    assert prestation.etat == "Terminée"
+    assert devis.vehicule.disponible
+
+def test_terminer_prestation_non_demarree(prestationUseCase, devis):
+    with pytest.raises(DevisIntrouvable):
+        prestationUseCase.terminerPrestation(devis)
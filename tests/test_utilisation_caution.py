@@ -0,0 +1,135 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from ..lib.application.container import create_container
+from ..lib.application.use_cases.restitutionVehicule import RestitutionVehicule
+from ..lib.application.use_cases.signerContratDeLocation import SignerContratDeLocation
+from ..lib.application.use_cases.utilisationCaution import UtilisationCaution
+from ..lib.domain.caution import EMPREINTE, LIBERATION, PRELEVEMENT
+from ..lib.domain.exceptions import InvalidCautionOperationException
+from ..lib.infrastructure.InMemoryCautionRepository import InMemoryCautionRepository
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+MAINTENANT = datetime(2025, 3, 31, 18, 0)
+
+
+@pytest.fixture
+def agence():
+    for repository in (InMemoryVehiculeRepository(), InMemoryClientRepository(),
+                       InMemoryContratRepository(), InMemoryCautionRepository()):
+        repository._initialize()
+    container = create_container({'UTILISATION_ROLLUPS': False})
+    client = container.resolve('client_repository').create_client("Doe", "John", "123ABC", "0123456789", "j@d.fr")
+    vehicules = [container.resolve('vehicule_repository').create_vehicule(
+        "Renault", "Clio", 2021, f"CA-00{i}", 1000, 40.0, "Nickel", "Citadine") for i in range(3)]
+    contrats = [SignerContratDeLocation.main(client.id, v.id, date.today() + timedelta(days=1), 3, container=container)
+                for v in vehicules]
+    caution = UtilisationCaution(container.resolve('caution_repository'), container.resolve('contrat_repository'),
+                                 horloge=lambda: MAINTENANT)
+    return container, caution, client, contrats
+
+
+def test_empreinte_bloquee_a_la_signature(agence):
+    _, caution, client, contrats = agence
+    assert caution.solde_contrat(contrats[0].id).en_cours == 50000
+    assert caution.solde_client(client.id).bloque == 150000
+    assert caution.empreintes_en_cours() == 1500.0
+
+
+def test_prelevement_partiel_puis_liberation(agence):
+    _, caution, client, contrats = agence
+    caution.prelever(contrats[0], 120.5, "Rayure portière")
+    with pytest.raises(InvalidCautionOperationException):
+        caution.prelever(contrats[0], 400.0, "Pare-chocs")
+
+    caution.liberer(contrats[0])
+    solde = caution.solde_contrat(contrats[0].id)
+    assert (solde.preleve, solde.libere, solde.en_cours) == (12050, 37950, 0)
+    assert [m.type for m in caution.caution_repository.iter_all(contrats[0].id)] == [EMPREINTE, PRELEVEMENT, LIBERATION]
+    assert caution.liberer(contrats[0]) is None
+    assert caution.empreintes_en_cours() == 1000.0
+
+
+def test_cloture_journaliere_en_un_lot(agence):
+    _, caution, client, contrats = agence
+    rapport = caution.cloture_journaliere([(contrats[0], "nickel"), (contrats[1], "Endommagé"),
+                                           (contrats[2], "volé"), (contrats[0], "sale")])
+
+    assert rapport.contrats == 3
+    assert (rapport.preleve, rapport.libere) == (750.0, 750.0)
+    assert rapport.erreurs == [(contrats[0].id, "Contrat déjà réglé dans ce lot.")]
+    assert caution.empreintes_en_cours() == 0.0
+    assert list(caution.caution_repository.iter_outstanding()) == []
+
+
+def test_reglement_apres_restitution_des_vehicules(agence):
+    container, caution, client, contrats = agence
+    client.locations_actives.update(c.vehicule for c in contrats[:2])
+    restitution = RestitutionVehicule(container.resolve('client_repository'), container.resolve('vehicule_repository'))
+    resultats = restitution.restituer_vehicules([(client.id, contrats[0].vehicule.id, 120, "endommagé"),
+                                                 (client.id, contrats[1].vehicule.id, 80, "nickel")])
+
+    rapport = caution.regler_restitutions(resultats)
+    assert (rapport.contrats, rapport.preleve, rapport.libere) == (2, 250.0, 750.0)
+    assert caution.solde_contrat(contrats[2].id).en_cours == 50000
+
+
+def test_reglement_du_contrat_du_client_qui_restitue(agence):
+    container, caution, client, contrats = agence
+    vehicule = contrats[0].vehicule
+    # Le véhicule est reloué à un autre client avant le règlement du premier contrat
+    autre = container.resolve('client_repository').create_client("Roe", "Jane", "456DEF", "0987654321", "j@r.fr")
+    container.resolve('vehicule_repository').set_availability(vehicule.id, True)
+    relocation = SignerContratDeLocation.main(autre.id, vehicule.id, date.today() + timedelta(days=5), 3,
+                                              container=container)
+    client.locations_actives.add(vehicule)
+    restitution = RestitutionVehicule(container.resolve('client_repository'), container.resolve('vehicule_repository'))
+    resultats = restitution.restituer_vehicules([(client.id, vehicule.id, 120, "nickel")])
+
+    contrat_repository = container.resolve('contrat_repository')
+    with patch.object(contrat_repository, 'get_by_id', wraps=contrat_repository.get_by_id) as lecture:
+        rapport = caution.regler_restitutions(resultats)
+    # Seules les empreintes du véhicule restitué sont lues
+    assert lecture.call_count == 1
+    assert (rapport.contrats, rapport.libere) == (1, 500.0)
+    assert caution.solde_contrat(contrats[0].id).en_cours == 0
+    assert caution.solde_contrat(relocation.id).en_cours == 50000
+    assert list(caution.caution_repository.iter_outstanding_by_vehicle("CA-000")) == [relocation.id]
+
+
+def test_restitution_du_conteneur_regle_les_cautions(agence):
+    container, caution, client, contrats = agence
+    client.locations_actives.update(c.vehicule for c in contrats)
+    restitution = container.resolve('restitution_vehicule')
+
+    assert restitution.restituer_vehicule(client.id, contrats[0].vehicule.id, 50, "volé") is contrats[0].vehicule
+    solde = caution.solde_contrat(contrats[0].id)
+    assert (solde.preleve, solde.en_cours) == (50000, 0)
+
+    resultats = restitution.restituer_vehicules([(client.id, contrats[1].vehicule.id, 120, "endommagé"),
+                                                 (client.id, contrats[2].vehicule.id, 80, "nickel"),
+                                                 (client.id, contrats[2].vehicule.id, 80, "nickel")])
+    assert [r.succes for r in resultats] == [True, True, False]
+    assert caution.solde_contrat(contrats[1].id).preleve == 25000
+    assert caution.solde_contrat(contrats[2].id).libere == 50000
+    assert caution.solde_client(client.id).en_cours == 0
+    assert caution.empreintes_en_cours() == 0.0
+
+
+def test_journal_en_ajout_seul(agence, tmp_path):
+    _, caution, client, contrats = agence
+    journal = tmp_path / "cautions.jsonl"
+    registre = InMemoryCautionRepository()
+    registre.attach_journal(journal)
+    caution.regler(contrats[1], "Endommagé")
+    caution.bloquer(contrats[1], "Prolongation")
+
+    registre._initialize()
+    assert registre.attach_journal(journal) == 3
+    assert registre.balance_by_contract(contrats[1].id).preleve == 25000
+    assert registre.balance_by_client(client.id).libere == 25000
+    assert {m.vehicule for m in registre.iter_all(contrats[1].id)} == {"CA-001"}
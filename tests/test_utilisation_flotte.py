@@ -0,0 +1,119 @@
+from datetime import date
+
+import pytest
+
+from ..lib.application.container import create_container
+from ..lib.application.use_cases.restitutionVehicule import RestitutionVehicule
+from ..lib.application.use_cases.utilisationFlotte import UtilisationFlotte
+from ..lib.domain.client import Client
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryContratRepository import InMemoryContratRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+from ..lib.infrastructure.RollupContratRepository import RollupContratRepository
+from ..lib.infrastructure.UtilizationRollups import UtilizationRollups
+
+AUJOURD_HUI = date(2025, 3, 31)
+
+
+@pytest.fixture
+def flotte():
+    contrats = InMemoryContratRepository()
+    contrats._initialize()
+    vehicules = InMemoryVehiculeRepository()
+    vehicules._initialize()
+    rollups = UtilizationRollups()
+    repository = RollupContratRepository(contrats, rollups, aujourd_hui=lambda: AUJOURD_HUI)
+    clio = vehicules.create_vehicule("Renault", "Clio", 2020, "UT-001", 1000, 40.0, "Nickel", "Citadine")
+    vehicules.create_vehicule("Renault", "Twingo", 2021, "UT-002", 1000, 35.0, "Nickel", "Citadine")
+    client = Client("Doe", "John", "123ABC", "0123456789", "john.doe@email", None)
+    return repository, UtilisationFlotte(rollups, vehicules, aujourd_hui=lambda: AUJOURD_HUI), clio, client
+
+
+def test_creation_et_cloture_de_contrats(flotte):
+    repository, utilisation, clio, client = flotte
+    contrat = repository.create_contrat(client, clio, date(2025, 3, 25), 10)
+    assert utilisation.jours_par_mois(clio) == {'2025-03': 7, '2025-04': 3}
+
+    # Restitution anticipée le 31 mars : les jours non consommés sont libérés
+    assert repository.close_contract(contrat.id, 200)
+    assert utilisation.jours_par_mois(clio) == {'2025-03': 6}
+
+    clio.disponible = True
+    repository.create_contrat(client, clio, "2025-02-01", 15)
+    assert utilisation.taux(clio, jours=59) == pytest.approx(21 / 59)
+
+
+def test_restitution_en_retard_et_annulation(flotte):
+    repository, utilisation, clio, client = flotte
+    contrat = repository.create_contrat(client, clio, date(2025, 3, 1), 5)
+    assert repository.close_contract(contrat.id, 100)  # restitué le 31 mars
+    assert utilisation.jours_par_mois(clio) == {'2025-03': 30}
+
+    clio.disponible = True
+    annule = repository.create_contrat(client, clio, date(2025, 4, 1), 5)
+    repository.delete(annule.id)
+    assert '2025-04' not in utilisation.jours_par_mois(clio)
+
+
+def test_restitution_cloture_le_contrat(flotte):
+    repository, utilisation, clio, client = flotte
+    clients = InMemoryClientRepository()
+    clients._initialize()
+    clients.save(client)
+    vehicules = utilisation.vehicule_repository
+    restitution = RestitutionVehicule(clients, vehicules, contrat_repository=repository)
+    contrat = repository.create_contrat(client, clio, date(2025, 3, 25), 10)
+
+    # Restitution anticipée le 31 mars par le cas d'usage : le contrat est clôturé
+    assert restitution.restituer_vehicule(client.id, clio.id, 200, "nickel") is clio
+    assert not contrat.est_actif
+    assert clio.kilometrage == 1200
+    assert utilisation.jours_par_mois(clio) == {'2025-03': 6}
+
+    # Même chose pour une vague de restitutions
+    contrat = repository.create_contrat(client, clio, date(2025, 3, 28), 10)
+    (resultat,) = restitution.restituer_vehicules([(client.id, clio.id, 50, "sale")])
+    assert resultat.succes and not contrat.est_actif
+    assert utilisation.jours_par_mois(clio) == {'2025-03': 6}
+
+
+def test_candidats_a_la_vente(flotte):
+    repository, utilisation, clio, client = flotte
+    repository.create_contrat(client, clio, date(2025, 1, 1), 60)
+
+    candidats = utilisation.candidats_a_la_vente(jours=90, seuil=0.5)
+    assert [(str(v.immatriculation), taux) for v, taux in candidats] == [("UT-002", 0.0)]
+
+
+def test_requete_sur_une_fenetre():
+    rollups = UtilizationRollups()
+    assert rollups.mark("AB-1", date(2024, 12, 30), date(2025, 1, 3)) == 4
+    assert rollups.mark("AB-1", date(2025, 1, 1), date(2025, 1, 5)) == 2
+    assert rollups.rented_days("AB-1", date(2024, 1, 1), date(2026, 1, 1)) == 6
+    assert rollups.rented_days("AB-1", date(2025, 1, 2), date(2025, 1, 4)) == 2
+    assert rollups.utilization("AB-1", date(2025, 1, 1), date(2025, 1, 11)) == pytest.approx(0.4)
+    assert rollups.rented_days("inconnu", date(2025, 1, 1), date(2025, 2, 1)) == 0
+    with pytest.raises(ValueError):
+        rollups.utilization("AB-1", date(2025, 1, 1), date(2025, 1, 1))
+
+
+def test_aller_retour_sur_disque(tmp_path):
+    rollups = UtilizationRollups()
+    for i in range(50):
+        rollups.mark(f"AB-{i}", date(2015, 1, 1 + i % 28), date(2024, 12, 31))
+    chemin = tmp_path / "utilisation.bin"
+    taille = rollups.save(chemin)
+
+    relus = UtilizationRollups.load(chemin)
+    assert taille < 50 * 3650 // 8
+    assert relus.rented_days_by_month("AB-7") == rollups.rented_days_by_month("AB-7")
+    assert relus.rented_days("AB-7", date(2020, 1, 1), date(2021, 1, 1)) == 366
+
+
+def test_conteneur_branche_les_agregats(tmp_path):
+    InMemoryContratRepository()._initialize()
+    container = create_container({'UTILISATION_ROLLUPS_PATH': str(tmp_path / "agregats.bin")})
+    assert isinstance(container.resolve('contrat_repository'), RollupContratRepository)
+    utilisation = container.resolve('utilisation_flotte')
+    assert utilisation.rollups is container.resolve('utilisation_rollups')
+    assert utilisation.sauvegarder() > 0
@@ -1,16 +1,11 @@
 import pytest
-from flask import Flask, jsonify
-from ..lib.application.controllers.VehiculeController import vehicule_bp, VehiculeController
+from ..lib.application.controllers import create_app
 from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
 
 @pytest.fixture
 def app():
-    app = Flask(__name__)
-    app.config['TESTING'] = True
-    repository = InMemoryVehiculeRepository()
-    vehicule_controller = VehiculeController(repository)
-    app.register_blueprint(vehicule_bp, url_prefix='/api')
-    return app
+    InMemoryVehiculeRepository()._initialize()
+    return create_app({'TESTING': True}, blueprints=['vehicules'])
 
 @pytest.fixture
 def client(app):
@@ -97,4 +92,43 @@ def test_find_by_criteria(client):
     data = response.get_json()
     assert len(data) > 0
     assert data[0]['marque'] == "Toyota"
-    assert data[0]['modele'] == "Corolla"
\ No newline at end of file
+    assert data[0]['modele'] == "Corolla"
+def test_get_all_vehicules_paginated(client):
+    for immatriculation in ("PAG001", "PAG002", "PAG003"):
+        client.post('/api/vehicules', json={
+            "marque": "Renault",
+            "modele": "Clio",
+            "annee": 2021,
+            "immatriculation": immatriculation,
+            "kilometrage": 1000,
+            "prix_journalier": 40.0,
+            "etat": "Bon",
+            "type_vehicule": "Citadine"
+        })
+    response = client.get('/api/vehicules?limit=2')
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+
+def test_count_vehicules(client):
+    client.post('/api/vehicules', json={
+        "marque": "Toyota",
+        "modele": "Yaris",
+        "annee": 2022,
+        "immatriculation": "CNT001",
+        "kilometrage": 500,
+        "prix_journalier": 35.0,
+        "etat": "Bon",
+        "type_vehicule": "Citadine"
+    })
+    response = client.get('/api/vehicules/count?marque=toyota&modele=yaris&prix_max=40')
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 1
+
+def test_pagination_negative_refusee(client):
+    for url in ('/api/vehicules', '/api/vehicules/available', '/api/vehicules/search?marque=renault',
+                '/api/vehicules/search/text?q=renault'):
+        for parametres in ('offset=-1', 'limit=-1', 'offset=-2&limit=3'):
+            response = client.get(f'{url}{"&" if "?" in url else "?"}{parametres}')
+            assert response.status_code == 400, (url, parametres)
+            assert 'error' in response.get_json()
+    assert client.get('/api/vehicules?offset=0&limit=0').get_json() == []
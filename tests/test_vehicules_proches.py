@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from ..lib.application.controllers import create_app
+from ..lib.application.use_cases.restitutionVehicule import RestitutionVehicule
+from ..lib.application.use_cases.vehiculesProches import VehiculesProches
+from ..lib.domain.agence import Agence
+from ..lib.domain.client import Client
+from ..lib.domain.immatriculation import Immatriculation
+from ..lib.domain.vehicule import Vehicule
+from ..lib.infrastructure.AgenceSpatialIndex import AgenceSpatialIndex
+from ..lib.infrastructure.InMemoryAgenceRepository import InMemoryAgenceRepository
+from ..lib.infrastructure.InMemoryClientRepository import InMemoryClientRepository
+from ..lib.infrastructure.InMemoryVehiculeRepository import InMemoryVehiculeRepository
+
+PARIS = (48.8566, 2.3522)
+LYON = (45.7640, 4.8357)
+MARSEILLE = (43.2965, 5.3698)
+
+
+@pytest.fixture
+def repositories():
+    agences = InMemoryAgenceRepository()
+    agences._initialize()
+    vehicules = InMemoryVehiculeRepository()
+    vehicules._initialize()
+    clients = InMemoryClientRepository()
+    clients._initialize()
+    for nom, (latitude, longitude) in [("Paris", PARIS), ("Lyon", LYON), ("Marseille", MARSEILLE)]:
+        agences.create_agence(nom, latitude, longitude)
+    flotte = [("Renault", "Clio", 40.0, 1), ("Renault", "Clio", 42.0, 3), ("Peugeot", "3008", 75.0, 2),
+              ("Renault", "Clio", 41.0, 2)]
+    for i, (marque, modele, prix, agence_id) in enumerate(flotte):
+        vehicules.save(Vehicule(marque, modele, 2022, Immatriculation(f"AB-{i:03d}-CD", "75"), 1000, prix,
+                                "Nickel", "Citadine", agence_id=agence_id))
+    return agences, vehicules, clients
+
+
+def test_index_spatial_parcourt_les_agences_par_distance_croissante():
+    hasard = random.Random(5)
+    agences = [Agence(f"A{i}", hasard.uniform(-80, 80), hasard.uniform(-180, 180), i) for i in range(500)]
+    index = AgenceSpatialIndex(agences)
+    for _ in range(20):
+        latitude, longitude = hasard.uniform(-90, 90), hasard.uniform(-180, 180)
+        attendu = sorted(a.distance_km(latitude, longitude) for a in agences)
+        obtenu = [distance for _, (distance, _) in zip(range(25), index.iter_nearest(latitude, longitude))]
+        assert obtenu == pytest.approx(attendu[:25])
+        assert len(list(index.iter_nearest(latitude, longitude))) == 500
+    assert list(AgenceSpatialIndex([]).iter_nearest(*PARIS)) == []
+
+
+def test_plus_proches_suit_les_filtres_et_la_restitution(repositories):
+    agences, vehicules, clients = repositories
+    proches = VehiculesProches(agences, vehicules)
+
+    # Depuis Dijon : Lyon (~175 km), puis Paris (~260 km), puis Marseille
+    resultats = proches.plus_proches(47.3220, 5.0415, k=2, marque="renault", modele="clio")
+    assert [(r.agence.nom, r.vehicule.prix_journalier) for r in resultats] == [("Lyon", 41.0), ("Paris", 40.0)]
+    assert resultats[0].distance_km == pytest.approx(175, abs=10)
+    assert proches.plus_proches(*LYON, k=5, prix_max=41.0, rayon_km=100) == [
+        proches.plus_proches(*LYON, k=1, modele="clio")[0]]
+
+    # La Clio de Paris, louée, est rendue à Marseille
+    clio = vehicules.get_by_id(1)
+    client = Client("Doe", "John", "123ABC", "0123456789", "john.doe@email", None)
+    clients.save(client)
+    vehicules.louer_vehicule(clio.id)
+    client.locations_actives.add(clio)
+    assert [r.agence.nom for r in proches.plus_proches(*PARIS, k=3, modele="clio")] == ["Lyon", "Marseille"]
+
+    restitution = RestitutionVehicule(clients, vehicules, agences)
+    assert restitution.restituer_vehicule(client.id, clio.id, 800, "nickel", agence_id=99) is None
+    assert restitution.restituer_vehicule(client.id, clio.id, 800, "nickel", agence_id=3) is clio
+    assert clio.agence_id == 3 and clio.disponible
+    assert [v.id for v in vehicules.iter_by_agence(3)] == [2, 1]
+    assert list(vehicules.iter_by_agence(1)) == []
+
+
+def test_endpoint_nearest(repositories):
+    app = create_app({'TESTING': True}, blueprints=['vehicules'])
+    client = app.test_client()
+    client.patch('/api/vehicules/4/availability', json={'disponible': False})
+
+    reponse = client.get(f'/api/vehicules/nearest?lat={LYON[0]}&lon={LYON[1]}&k=2&modele=Clio')
+    assert reponse.status_code == 200
+    assert [(r['agence']['nom'], r['vehicule']['id']) for r in reponse.get_json()] == [("Marseille", 2),
+                                                                                       ("Paris", 1)]
+    assert reponse.get_json()[0]['vehicule']['agenceId'] == 3
+    assert client.get('/api/vehicules/nearest?lat=45.7').status_code == 400